@@ -0,0 +1,14 @@
+#!/bin/sh
+
+# Serves the long-poll sync change endpoint (/api/v1/sync/changed/, see
+# SyncChangedView) from the ASGI application, so waiting clients hold a
+# pending future in one event loop instead of a gunicorn thread each.
+# nginx routes only that path here; everything else stays on gunicorn.
+
+BINDARG=/var/run/uvicorn.sock
+
+exec uvicorn tt.asgi:application \
+  --workers 1 \
+  --uds $BINDARG \
+  --timeout-graceful-shutdown 5 \
+  --no-access-log
@@ -53,3 +53,22 @@ class SyncDeletionLogAdmin( admin.ModelAdmin ):
     list_filter = ( 'object_type', 'deleted_at' )
     search_fields = [ 'uuid', 'trip_uuid' ]
     readonly_fields = ( 'uuid', 'object_type', 'trip_uuid', 'deleted_by', 'deleted_at' )
+
+
+@admin.register( models.SyncChange )
+class SyncChangeAdmin( admin.ModelAdmin ):
+    show_full_result_count = False
+
+    list_display = (
+        'id',
+        'object_type',
+        'uuid',
+        'trip_uuid',
+        'version',
+        'is_deleted',
+        'created_datetime',
+    )
+
+    list_filter = ( 'object_type', 'is_deleted', 'created_datetime' )
+    search_fields = [ 'uuid', 'trip_uuid' ]
+    readonly_fields = ( 'object_type', 'uuid', 'trip_uuid', 'version', 'is_deleted', 'created_datetime' )
@@ -60,6 +60,19 @@ class APIFields:
     OPEN_DAYS_TIMES = 'open_days_times'
     LOCATION_NOTES = 'location_notes'
 
+    # -------------------------------------------------------------------------
+    # Batch operations
+    # -------------------------------------------------------------------------
+    OPERATIONS = 'operations'
+    ACTION = 'action'
+    DATA = 'data'
+    RESULTS = 'results'
+    NEXT_CURSOR = 'next_cursor'
+    STATUS = 'status'
+    ERRORS = 'errors'
+    LOCATION = 'location'
+    GMM_IDS = 'gmm_ids'
+
     # -------------------------------------------------------------------------
     # Location Notes
     # -------------------------------------------------------------------------
@@ -102,3 +115,6 @@ class APIFields:
     SYNC_VERSIONS = 'versions'  # Location sync uses version-only pattern
     SYNC_TRIP = 'trip'
     SYNC_LOCATION = 'location'
+    SYNC_CURSOR = 'cursor'
+    SYNC_RESYNC_REQUIRED = 'resync_required'
+    SYNC_CHANGED = 'changed'
@@ -0,0 +1,25 @@
+"""
+Management command to write buffered API token usage to the database.
+
+Token authentication buffers last_used_at in Redis rather than updating
+the token row on every request. Requests flush the buffer once its oldest
+entry is a few minutes old; run this to persist the buffered times now
+(e.g., before inspecting token usage or shutting down Redis).
+
+Usage:
+    python manage.py flush_api_token_usage
+"""
+from django.core.management.base import BaseCommand
+
+from tt.apps.common.command_utils import CommandLoggerMixin
+
+from ...services import APITokenUsageBuffer
+
+
+class Command( BaseCommand, CommandLoggerMixin ):
+    help = 'Write buffered API token last_used_at times to the database'
+
+    def handle(self, *args, **options):
+        updated_count = APITokenUsageBuffer.flush()
+        self.success( f'Updated last_used_at for {updated_count} token(s)' )
+        return
@@ -0,0 +1,46 @@
+"""
+Management command to prune old entries from the sync change feed.
+
+Deletes SyncChange rows older than the retention period. Clients whose
+cursor predates the oldest remaining row are answered with a full resync.
+The newest row is always kept so the feed position survives quiet periods.
+Writing changes already prunes with the default retention once a day
+(SyncFeedPruner); run this to prune now or with a different retention.
+
+Usage:
+    python manage.py prune_sync_changes
+    python manage.py prune_sync_changes --days 60
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tt.apps.common import datetimeproxy
+from tt.apps.common.command_utils import CommandLoggerMixin
+
+from ...models import SyncChange
+
+
+class Command( BaseCommand, CommandLoggerMixin ):
+    help = 'Delete sync change feed entries older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=SyncChange.RETENTION.days,
+            help=f'Retention in days (default: {SyncChange.RETENTION.days})',
+        )
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError( '--days must be at least 1' )
+
+        if not SyncChange.objects.exists():
+            self.success( 'Sync change feed is empty.' )
+            return
+
+        cutoff = datetimeproxy.now() - timedelta( days = options['days'] )
+        deleted_count = SyncChange.objects.prune( older_than = cutoff )
+        self.success( f'Deleted {deleted_count} sync change(s) older than {cutoff.isoformat()}' )
+        return
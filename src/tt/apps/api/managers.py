@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from django.db import models
+
+
+class SyncChangeManager(models.Manager):
+    """Manager for SyncChange model."""
+
+    def record_change(self,
+                      object_type,
+                      uuid: UUID,
+                      trip_uuid: UUID,
+                      version: Optional[int] = None,
+                      is_deleted: bool = False):
+        return self.create(
+            object_type=object_type,
+            uuid=uuid,
+            trip_uuid=trip_uuid,
+            version=version,
+            is_deleted=is_deleted,
+        )
+
+    def record_changes(self, changes: List[Dict[str, Any]]):
+        """
+        Bulk variant of record_change (one insert). bulk_create sends no
+        post_save, so callers must raise the sync watermarks themselves
+        (SyncWatermarks.bump_for_trip).
+        """
+        return self.bulk_create([self.model(**change) for change in changes])
+
+    def get_id_range(self) -> Tuple[Optional[int], Optional[int]]:
+        """Return (oldest, newest) retained change ids, or (None, None) if empty."""
+        id_range = self.aggregate(min_id=models.Min('id'), max_id=models.Max('id'))
+        return id_range['min_id'], id_range['max_id']
+
+    def get_settled_id(self, after_id: int, max_id: int, settled_before: datetime) -> int:
+        """
+        Newest id in (after_id, max_id] below which no change can still appear.
+
+        An id missing from the visible rows may belong to a transaction that
+        has not committed yet.  Gaps among rows inserted at or after
+        settled_before hold the settled id back; rows inserted earlier count
+        as settled, along with any gaps between them.  after_id must itself
+        be settled (e.g., a client's cursor, or 0).
+        """
+        if max_id <= after_id:
+            return max_id
+        recent_ids = list(
+            self.filter(id__gt=after_id, created_datetime__gte=settled_before)
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        if not recent_ids:
+            return max_id
+
+        settled_id = self.filter(id__gt=after_id, id__lt=recent_ids[0]).aggregate(
+            models.Max('id')
+        )['id__max']
+        if settled_id is None:
+            # Without a settled row to anchor on, a fresh feed starts at its first id
+            settled_id = after_id if after_id else recent_ids[0] - 1
+        for change_id in recent_ids:
+            if change_id != settled_id + 1:
+                break
+            settled_id = change_id
+            continue
+        return settled_id
+
+    def prune(self, older_than: datetime) -> int:
+        """
+        Delete changes inserted before older_than, always keeping the newest
+        so the feed position survives quiet periods.  Returns rows deleted.
+        """
+        newest_id = self.order_by('-id').values_list('id', flat=True).first()
+        if newest_id is None:
+            return 0
+        deleted_count, _ = self.filter(created_datetime__lt=older_than, id__lt=newest_id).delete()
+        return deleted_count
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.7 on 2026-10-16 19:27
+
+import tt.apps.api.enums
+import tt.apps.common.model_fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_add_sync_deletion_log'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', tt.apps.common.model_fields.LabeledEnumField(default='location', enum_class=tt.apps.api.enums.SyncObjectType, max_length=32, use_safe_conversion=True, verbose_name='Object Type')),
+                ('uuid', models.UUIDField()),
+                ('trip_uuid', models.UUIDField()),
+                ('version', models.PositiveIntegerField(blank=True, null=True)),
+                ('is_deleted', models.BooleanField(default=False)),
+                ('created_datetime', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['object_type', 'id'], name='api_synccha_object__340aa6_idx'), models.Index(fields=['trip_uuid', 'object_type', 'id'], name='api_synccha_trip_uu_5d05f3_idx')],
+            },
+        ),
+    ]
@@ -1,6 +1,8 @@
 import uuid
 
 from datetime import timedelta
+from typing import Dict
+from uuid import UUID
 
 from django.conf import settings
 from django.db import models
@@ -9,6 +11,7 @@ from tt.apps.common import datetimeproxy
 from tt.apps.common.model_fields import LabeledEnumField
 
 from .enums import SyncObjectType, TokenType
+from . import managers
 
 
 class APIToken( models.Model ):
@@ -83,9 +86,18 @@ class SyncableModel( models.Model ):
     - created_datetime: Record creation timestamp
     - modified_datetime: Last modification timestamp
 
-    The version increment uses F() expressions to avoid race conditions
-    on concurrent saves.
+    The version increment is done by the database in the UPDATE statement
+    (an F() expression), so concurrent saves never lose an increment, and
+    only the new version is read back.  increment_versions() is the bulk
+    counterpart for services that write many rows at once.
+
+    Every save is also appended to the SyncChange feed, so subclasses must
+    set SYNC_OBJECT_TYPE and SYNC_TRIP_UUID_FIELD and implement
+    get_sync_trip_uuid().
     """
+    SYNC_OBJECT_TYPE : SyncObjectType = None
+    SYNC_TRIP_UUID_FIELD : str = None  # Lookup of get_sync_trip_uuid() for bulk reads
+
     uuid = models.UUIDField(
         default = uuid.uuid4,
         unique = True,
@@ -99,16 +111,64 @@ class SyncableModel( models.Model ):
         abstract = True
 
     def save( self, *args, **kwargs ):
-        if self.pk:
-            # Get the current version from DB (in case of concurrent modifications)
-            current_version = self.__class__.objects.filter(
-                pk = self.pk
-            ).values_list( 'version', flat = True ).first()
-            if current_version is not None:
-                self.version = current_version + 1
-        super().save( *args, **kwargs )
+        is_update = bool( self.pk ) and not self._state.adding
+        if is_update:
+            previous_version = self.version
+            self.version = models.F( 'version' ) + 1
+            update_fields = kwargs.get( 'update_fields' )
+            if update_fields is not None:
+                kwargs['update_fields'] = set( update_fields ) | { 'version', 'modified_datetime' }
+        try:
+            super().save( *args, **kwargs )
+        except Exception:
+            if is_update:
+                self.version = previous_version
+            raise
+        if is_update:
+            self.refresh_from_db( fields = [ 'version' ] )
+        SyncChange.objects.record_change(
+            object_type = self.SYNC_OBJECT_TYPE,
+            uuid = self.uuid,
+            trip_uuid = self.get_sync_trip_uuid(),
+            version = self.version,
+        )
         return
 
+    @classmethod
+    def increment_versions( cls, pks ) -> Dict[UUID, int]:
+        """
+        Bulk counterpart of save() for rows whose field values were written
+        in bulk (e.g., bulk_update): increments version and modified_datetime
+        in one UPDATE, reads back the new versions and records the changes
+        in one insert.  Returns the new versions by uuid.
+
+        Bulk inserts send no post_save, so callers raise the sync watermarks
+        themselves (SyncWatermarks.bump_for_trip).
+        """
+        pks = list( pks )
+        if not pks:
+            return {}
+        queryset = cls.objects.filter( pk__in = pks )
+        queryset.update(
+            version = models.F( 'version' ) + 1,
+            modified_datetime = datetimeproxy.now(),
+        )
+        rows = list( queryset.values_list( 'uuid', 'version', cls.SYNC_TRIP_UUID_FIELD ))
+        SyncChange.objects.record_changes([
+            {
+                'object_type': cls.SYNC_OBJECT_TYPE,
+                'uuid': object_uuid,
+                'trip_uuid': trip_uuid,
+                'version': version,
+            }
+            for object_uuid, version, trip_uuid in rows
+        ])
+        return { object_uuid: version for object_uuid, version, _ in rows }
+
+    def get_sync_trip_uuid( self ):
+        """ UUID of the trip whose sync feed this object belongs to. """
+        raise NotImplementedError
+
 
 class SyncDeletionLog( models.Model ):
     """
@@ -139,3 +199,48 @@ class SyncDeletionLog( models.Model ):
         indexes = [
             models.Index( fields = ['trip_uuid', 'deleted_at'] ),
         ]
+
+
+class SyncChange( models.Model ):
+    """
+    Append-only change feed behind the opaque sync cursor.
+
+    One row is written for every SyncableModel save and every synced
+    deletion. The auto-increment id is the monotonic change sequence, so a
+    client holding a cursor (the last id it has seen) syncs with an indexed
+    range read instead of comparing its wall-clock timestamps with ours.
+
+    Ids are assigned at insert but become visible at commit, so a lower id
+    can appear after a higher one.  Cursors only advance past ids whose
+    gaps are settled (SyncChangeManager.get_settled_id): a missing id
+    inserted within SETTLE_INTERVAL may still be committed, older gaps are
+    rolled back or pruned.
+
+    Rows older than RETENTION are pruned (prune_sync_changes, and daily as
+    changes are written); cursors pointing before the oldest retained row
+    require a full resync.
+    """
+    RETENTION = timedelta( days = 30 )
+    SETTLE_INTERVAL = timedelta( minutes = 2 )
+
+    objects = managers.SyncChangeManager()
+
+    object_type = LabeledEnumField(
+        SyncObjectType,
+        'Object Type',
+    )
+    uuid = models.UUIDField()
+    trip_uuid = models.UUIDField()
+    version = models.PositiveIntegerField( null = True, blank = True )
+    is_deleted = models.BooleanField( default = False )
+    created_datetime = models.DateTimeField( auto_now_add = True, db_index = True )
+
+    class Meta:
+        indexes = [
+            models.Index( fields = ['object_type', 'id'] ),
+            models.Index( fields = ['trip_uuid', 'object_type', 'id'] ),
+        ]
+
+    def __str__(self) -> str:
+        action = 'deleted' if self.is_deleted else f'v{self.version}'
+        return f"#{self.id} {self.object_type} {self.uuid} ({action})"
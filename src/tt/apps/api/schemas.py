@@ -22,3 +22,13 @@ class APITokenData:
     """
     api_token      : APIToken
     api_token_str  : str
+
+
+@dataclass
+class APITokenAuthData:
+    """
+    Cached result of authenticating an api_token_str (see APITokenAuthCache).
+    """
+    token_id       : int
+    user_id        : int
+    is_active      : bool
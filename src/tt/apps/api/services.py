@@ -1,14 +1,23 @@
+import copy
 import hashlib
+import json
 import logging
 import secrets
-from typing import Optional, Tuple
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, Iterable, Optional, Tuple
 
 from django.contrib.auth import get_user_model
 from django.db.models import QuerySet
 
+from tt.apps.common import datetimeproxy
+from tt.apps.common.redis_client import get_redis_client
+
 from .enums import TokenType
 from .models import APIToken
-from .schemas import APITokenData, APITokenGenerationData
+from .schemas import APITokenAuthData, APITokenData, APITokenGenerationData
 from .utils import clean_str
 
 logger = logging.getLogger( __name__ )
@@ -104,13 +113,18 @@ class APITokenService:
         # Hash the full token string
         api_token_hash = cls._hash_api_token_str( api_token_str )
 
+        cached_user = APITokenAuthCache.get_user( api_token_hash )
+        if cached_user is not None:
+            return cached_user
+
         # Find tokens with matching lookup_key
         tokens = APIToken.objects.filter( lookup_key = lookup_key ).select_related('user')
 
         # Use constant-time comparison to prevent timing attacks
         for token in tokens:
             if secrets.compare_digest( token.api_token_hash, api_token_hash ):
-                token.record_usage()
+                APITokenAuthCache.set( api_token_hash, token )
+                APITokenUsageBuffer.record_usage( token.id )
                 return token.user
 
         return None
@@ -167,6 +181,7 @@ class APITokenService:
             return False, error
 
         token.delete()
+        APITokenAuthCache.revoke([ token.api_token_hash ])
         return True, None
 
     # -------------------------------------------------------------------------
@@ -185,3 +200,320 @@ class APITokenService:
         if token_type is not None:
             qs = qs.filter( token_type = token_type )
         return qs.order_by( '-created_at' )
+
+
+class APITokenAuthCache:
+    """
+    Two-tier cache for token authentication, keyed by api_token_hash.
+
+    Tiers:
+    - Local: bounded in-process LRU holding the authenticated user, so a
+      hit needs no Redis or database access at all
+    - Redis: api:token:auth:{api_token_hash} -> APITokenAuthData JSON,
+      shared by all processes; a hit costs one primary key user lookup
+
+    Invalid tokens are never cached.  Entries are dropped on delete_token
+    (and any other token deletion) and when a user is deactivated.  That
+    drop reaches Redis and the local tier of the invalidating process;
+    other processes' local entries expire within TTL_LOCAL, which bounds
+    how long a revoked token can still be used.
+
+    Deletion also writes a revocation marker (api:token:revoked:{hash})
+    that outlives any Redis entry.  A request that read the token row just
+    before the delete may cache it again afterwards; set() skips revoked
+    tokens and a Redis hit is rejected while the marker exists, so such a
+    late write can never authenticate the revoked token.
+    """
+
+    MAX_LOCAL_ENTRIES = 1000
+    TTL_LOCAL = 10          # seconds
+    TTL_REDIS = 15 * 60     # 15 minutes
+    TTL_REVOKED = TTL_REDIS + 60
+
+    _local_entries = OrderedDict()  # api_token_hash -> ( expires_at, APITokenAuthData, user )
+    _local_lock = threading.Lock()
+
+    @classmethod
+    def _get_cache_key( cls, api_token_hash : str ) -> str:
+        """
+        Format: api:token:auth:{api_token_hash}
+        """
+        return ':'.join([ 'api', 'token', 'auth', api_token_hash ])
+
+    @classmethod
+    def _get_revoked_key( cls, api_token_hash : str ) -> str:
+        """
+        Format: api:token:revoked:{api_token_hash}
+        """
+        return ':'.join([ 'api', 'token', 'revoked', api_token_hash ])
+
+    @classmethod
+    def get_user( cls, api_token_hash : str ) -> Optional[User]:
+        """
+        Returns the active user for a previously authenticated token, or None
+        if not cached (callers then authenticate against the database).
+        """
+        local_entry = cls._get_local( api_token_hash )
+        if local_entry:
+            auth_data, user = local_entry
+            APITokenUsageBuffer.record_usage( auth_data.token_id )
+            # Copy so request-level changes to the user never leak across requests
+            return copy.copy( user )
+
+        auth_data = cls._get_redis( api_token_hash )
+        if not auth_data or not auth_data.is_active:
+            return None
+        user = User.objects.filter( pk = auth_data.user_id ).first()
+        if not user or not user.is_active:
+            cls.invalidate([ api_token_hash ])
+            return None
+
+        cls._set_local( api_token_hash, auth_data, user )
+        APITokenUsageBuffer.record_usage( auth_data.token_id )
+        return copy.copy( user )
+
+    @classmethod
+    def set( cls, api_token_hash : str, api_token : APIToken ) -> None:
+        auth_data = APITokenAuthData(
+            token_id = api_token.id,
+            user_id = api_token.user_id,
+            is_active = api_token.user.is_active,
+        )
+        if not auth_data.is_active:
+            return
+        try:
+            redis_client = get_redis_client()
+            if redis_client and redis_client.exists( cls._get_revoked_key( api_token_hash )):
+                return
+        except Exception as e:
+            logger.warning( f"Redis error checking token revocation: {e}" )
+            redis_client = None
+        cls._set_local( api_token_hash, auth_data, copy.copy( api_token.user ))
+        try:
+            if redis_client:
+                redis_client.set(
+                    cls._get_cache_key( api_token_hash ),
+                    json.dumps( auth_data.__dict__ ),
+                    ex = cls.TTL_REDIS,
+                )
+        except Exception as e:
+            logger.warning( f"Redis error caching token auth: {e}" )
+        return
+
+    @classmethod
+    def invalidate( cls, api_token_hashes : Iterable[str] ) -> None:
+        api_token_hashes = list( api_token_hashes )
+        if not api_token_hashes:
+            return
+        with cls._local_lock:
+            for api_token_hash in api_token_hashes:
+                cls._local_entries.pop( api_token_hash, None )
+                continue
+        try:
+            redis_client = get_redis_client()
+            if redis_client:
+                redis_client.delete( *[ cls._get_cache_key( x ) for x in api_token_hashes ] )
+        except Exception as e:
+            logger.warning( f"Redis error invalidating token auth: {e}" )
+        return
+
+    @classmethod
+    def revoke( cls, api_token_hashes : Iterable[str] ) -> None:
+        """ Invalidate deleted tokens and keep them from being cached again. """
+        api_token_hashes = list( api_token_hashes )
+        if not api_token_hashes:
+            return
+        try:
+            redis_client = get_redis_client()
+            if redis_client:
+                pipeline = redis_client.pipeline( transaction = False )
+                for api_token_hash in api_token_hashes:
+                    pipeline.set( cls._get_revoked_key( api_token_hash ), 1, ex = cls.TTL_REVOKED )
+                    continue
+                pipeline.execute()
+        except Exception as e:
+            logger.warning( f"Redis error revoking token auth: {e}" )
+        cls.invalidate( api_token_hashes )
+        return
+
+    @classmethod
+    def invalidate_user( cls, user : User ) -> None:
+        """ Drop all cached authentications for the user's tokens. """
+        cls.invalidate( APIToken.objects.filter( user = user ).values_list( 'api_token_hash', flat = True ))
+        return
+
+    @classmethod
+    def clear_local( cls ) -> None:
+        with cls._local_lock:
+            cls._local_entries.clear()
+        return
+
+    @classmethod
+    def _get_local( cls, api_token_hash : str ):
+        with cls._local_lock:
+            local_entry = cls._local_entries.get( api_token_hash )
+            if local_entry is None:
+                return None
+            expires_at, auth_data, user = local_entry
+            if expires_at <= time.monotonic():
+                del cls._local_entries[api_token_hash]
+                return None
+            cls._local_entries.move_to_end( api_token_hash )
+            return auth_data, user
+
+    @classmethod
+    def _set_local( cls, api_token_hash : str, auth_data : APITokenAuthData, user : User ) -> None:
+        with cls._local_lock:
+            cls._local_entries[api_token_hash] = ( time.monotonic() + cls.TTL_LOCAL, auth_data, user )
+            cls._local_entries.move_to_end( api_token_hash )
+            while len( cls._local_entries ) > cls.MAX_LOCAL_ENTRIES:
+                cls._local_entries.popitem( last = False )
+                continue
+        return
+
+    @classmethod
+    def _get_redis( cls, api_token_hash : str ) -> Optional[APITokenAuthData]:
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                return None
+            pipeline = redis_client.pipeline( transaction = False )
+            pipeline.get( cls._get_cache_key( api_token_hash ))
+            pipeline.exists( cls._get_revoked_key( api_token_hash ))
+            cached_json, is_revoked = pipeline.execute()
+            if not cached_json or is_revoked:
+                return None
+            return APITokenAuthData( **json.loads( cached_json ))
+        except Exception as e:
+            logger.warning( f"Redis error getting token auth: {e}" )
+            return None
+
+
+class APITokenUsageBuffer:
+    """
+    Write-behind buffer for APIToken.last_used_at.
+
+    Authentication records usage in a Redis hash (token id -> epoch seconds)
+    instead of updating the token row on every request; flush() writes the
+    buffered times in batches.  Each process buffers a token at most once per
+    BUFFER_INTERVAL.  If Redis is unavailable, usage falls back to a direct,
+    throttled update.
+
+    Flushing needs no scheduler: the request that records usage once the
+    oldest buffered entry is FLUSH_INTERVAL old runs the flush (one request
+    at a time, via a short Redis lock).  The flush_api_token_usage command
+    flushes on demand.
+    """
+
+    BUFFER_KEY = 'api:token:last_used'
+    BUFFER_STARTED_KEY = 'api:token:last_used:started'
+    FLUSH_LOCK_KEY = 'api:token:last_used:flush_lock'
+    BUFFER_INTERVAL = 60    # seconds
+    FLUSH_INTERVAL = 300    # seconds
+    FLUSH_LOCK_TTL = 60     # seconds
+    FLUSH_BATCH_SIZE = 500
+
+    _last_buffered = {}  # token_id -> time.monotonic() of last buffer write
+    _last_buffered_lock = threading.Lock()
+
+    @classmethod
+    def record_usage( cls, token_id : int ) -> None:
+        now_monotonic = time.monotonic()
+        with cls._last_buffered_lock:
+            last_buffered = cls._last_buffered.get( token_id )
+            if last_buffered is not None and ( now_monotonic - last_buffered ) < cls.BUFFER_INTERVAL:
+                return
+            cls._last_buffered[token_id] = now_monotonic
+            if len( cls._last_buffered ) > APITokenAuthCache.MAX_LOCAL_ENTRIES:
+                cls._last_buffered.clear()
+
+        now = datetimeproxy.now()
+        try:
+            redis_client = get_redis_client()
+            if redis_client:
+                pipeline = redis_client.pipeline()
+                pipeline.hset( cls.BUFFER_KEY, str( token_id ), now.timestamp() )
+                pipeline.set( cls.BUFFER_STARTED_KEY, time.time(), nx = True )
+                pipeline.get( cls.BUFFER_STARTED_KEY )
+                _, _, buffer_started = pipeline.execute()
+                if buffer_started and ( time.time() - float( buffer_started )) >= cls.FLUSH_INTERVAL:
+                    cls._flush_from_request( redis_client )
+                return
+        except Exception as e:
+            logger.warning( f"Redis error buffering token usage: {e}" )
+
+        APIToken.objects.filter( pk = token_id ).exclude(
+            last_used_at__gt = now - APIToken.USAGE_UPDATE_INTERVAL,
+        ).update( last_used_at = now )
+        return
+
+    @classmethod
+    def clear_local( cls ) -> None:
+        with cls._last_buffered_lock:
+            cls._last_buffered.clear()
+        return
+
+    @classmethod
+    def _flush_from_request( cls, redis_client ) -> None:
+        if not redis_client.set( cls.FLUSH_LOCK_KEY, 1, nx = True, ex = cls.FLUSH_LOCK_TTL ):
+            return
+        try:
+            cls.flush()
+        except Exception as e:
+            logger.warning( f"Error flushing token usage: {e}" )
+        finally:
+            redis_client.delete( cls.FLUSH_LOCK_KEY )
+        return
+
+    @classmethod
+    def flush( cls ) -> int:
+        """
+        Write buffered usage times to the database.  Returns tokens updated.
+
+        The buffer is renamed before reading so usage recorded during the
+        flush goes to a fresh buffer for the next run.
+        """
+        redis_client = get_redis_client()
+        if not redis_client:
+            return 0
+        flushing_key = f'{cls.BUFFER_KEY}:flushing'
+        if not redis_client.exists( flushing_key ):
+            # Cleared before the rename, so the fresh buffer's first entry restarts the clock
+            redis_client.delete( cls.BUFFER_STARTED_KEY )
+            # A leftover flushing key is from a failed run; retry it first.
+            try:
+                redis_client.rename( cls.BUFFER_KEY, flushing_key )
+            except Exception:
+                # Nothing buffered
+                return 0
+        buffered = redis_client.hgetall( flushing_key )
+
+        usage_times = {}
+        for token_id, timestamp in buffered.items():
+            try:
+                usage_times[int( token_id )] = datetime.fromtimestamp( float( timestamp ), tz = dt_timezone.utc )
+            except ValueError:
+                continue
+
+        updated_count = cls._write_usage_times( usage_times )
+        redis_client.delete( flushing_key )
+        return updated_count
+
+    @classmethod
+    def _write_usage_times( cls, usage_times : Dict[int, datetime] ) -> int:
+        updated_count = 0
+        token_ids = sorted( usage_times )
+        for start in range( 0, len( token_ids ), cls.FLUSH_BATCH_SIZE ):
+            batch_ids = token_ids[start:start + cls.FLUSH_BATCH_SIZE]
+            tokens = list( APIToken.objects.filter( pk__in = batch_ids ).only( 'id', 'last_used_at' ))
+            changed_tokens = []
+            for token in tokens:
+                last_used_at = usage_times[token.id]
+                if token.last_used_at is None or token.last_used_at < last_used_at:
+                    token.last_used_at = last_used_at
+                    changed_tokens.append( token )
+                continue
+            APIToken.objects.bulk_update( changed_tokens, [ 'last_used_at' ] )
+            updated_count += len( changed_tokens )
+            continue
+        return updated_count
@@ -1,14 +1,39 @@
 """
-Signal handlers for sync infrastructure.
+Signal handlers for sync infrastructure and API token auth caching.
 """
-from django.db.models.signals import pre_delete
+import threading
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
 from tt.apps.locations.models import Location
+from tt.apps.members.models import TripMember
 from tt.apps.trips.models import Trip
 
 from .enums import SyncObjectType
-from .models import SyncDeletionLog
+from .models import APIToken, SyncChange, SyncDeletionLog
+from .services import APITokenAuthCache
+from .sync import SyncMembershipCache, SyncWatermarks
+
+User = get_user_model()
+
+_bulk_deletion_state = threading.local()
+
+
+@contextmanager
+def location_deletions_logged_in_bulk():
+    """
+    For callers that write the SyncDeletionLog and SyncChange rows for a
+    bulk Location deletion themselves: skips the per-row logging below.
+    """
+    _bulk_deletion_state.active = True
+    try:
+        yield
+    finally:
+        _bulk_deletion_state.active = False
 
 
 @receiver( pre_delete, sender = Location )
@@ -23,12 +48,20 @@ def log_location_deletion( sender, instance, **kwargs ):
     in the signal. This can be enhanced later with middleware/context
     if auditing of who deleted is needed.
     """
+    if getattr( _bulk_deletion_state, 'active', False ):
+        return
     SyncDeletionLog.objects.create(
         uuid = instance.uuid,
         object_type = SyncObjectType.LOCATION,
         trip_uuid = instance.trip.uuid,
         deleted_by = None,
     )
+    SyncChange.objects.record_change(
+        object_type = SyncObjectType.LOCATION,
+        uuid = instance.uuid,
+        trip_uuid = instance.trip.uuid,
+        is_deleted = True,
+    )
     return
 
 
@@ -48,4 +81,70 @@ def log_trip_deletion( sender, instance, **kwargs ):
         trip_uuid = instance.uuid,
         deleted_by = None,
     )
+    SyncChange.objects.record_change(
+        object_type = SyncObjectType.TRIP,
+        uuid = instance.uuid,
+        trip_uuid = instance.uuid,
+        is_deleted = True,
+    )
+    return
+
+
+@receiver( post_save, sender = TripMember )
+def log_trip_member_change( sender, instance, **kwargs ):
+    """
+    Record a trip change when a membership is added or changed.
+
+    The trip itself is unchanged, but it newly appears in (or changes
+    permissions for) the member's sync feed.
+    """
+    SyncChange.objects.record_change(
+        object_type = SyncObjectType.TRIP,
+        uuid = instance.trip.uuid,
+        trip_uuid = instance.trip.uuid,
+        version = instance.trip.version,
+    )
+    return
+
+
+@receiver( post_save, sender = TripMember )
+@receiver( post_delete, sender = TripMember )
+def invalidate_sync_membership( sender, instance, **kwargs ):
+    """
+    On commit, so a concurrent probe cannot re-cache the old memberships.
+    """
+    user_id = instance.user_id
+    transaction.on_commit( lambda: SyncMembershipCache.invalidate( user_id ))
+    return
+
+
+@receiver( post_save, sender = SyncChange )
+def bump_sync_watermarks( sender, instance, created, **kwargs ):
+    """
+    Raise the Redis sync watermarks for every change feed entry, which covers
+    Trip, Location and TripMember saves and the logged deletions.
+    """
+    if created:
+        SyncWatermarks.bump_for_change( instance )
+    return
+
+
+@receiver( post_delete, sender = APIToken )
+def invalidate_deleted_token_auth( sender, instance, **kwargs ):
+    """
+    Covers token deletion outside APITokenService.delete_token, including
+    the cascade when a user is deleted.
+    """
+    APITokenAuthCache.revoke([ instance.api_token_hash ])
+    return
+
+
+@receiver( post_save, sender = User )
+def invalidate_inactive_user_token_auth( sender, instance, **kwargs ):
+    """
+    Deactivated users must stop authenticating right away, so drop their
+    cached token authentications.
+    """
+    if not instance.is_active:
+        APITokenAuthCache.invalidate_user( instance )
     return
@@ -1,19 +1,580 @@
 """
 Sync envelope generation for client-server data synchronization.
 """
+import asyncio
+import base64
+import logging
+import weakref
+from collections import defaultdict
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Set, Tuple
 from uuid import UUID
 
+import redis.asyncio
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
+from tt.apps.common.redis_client import get_redis_client
+from tt.apps.common.tiered_cache import TieredCache
 from tt.apps.locations.models import Location
+from tt.apps.members.models import TripMember
 from tt.apps.trips.api.serializers import TripSerializer
 from tt.apps.trips.models import Trip
 
 from .constants import APIFields as F
 from .enums import SyncObjectType
-from .models import SyncDeletionLog
+from .models import SyncChange, SyncDeletionLog
+
+logger = logging.getLogger(__name__)
+
+
+class SyncCursor:
+    """
+    Opaque client-facing encoding of a SyncChange feed position.
+
+    Clients store and echo the cursor back without interpreting it, which
+    leaves room to change what it encodes later (hence the version prefix).
+
+    A position is the settled change id to resume after plus the newest id
+    already sent (see SyncChange on settling).  Once the two are equal the
+    cursor holds just the id ('c1:'), otherwise both ('c2:').
+    """
+    PREFIX = 'c1:'
+    UNSETTLED_PREFIX = 'c2:'
+
+    @classmethod
+    def encode( cls, change_id : int, seen_change_id : Optional[int] = None ) -> str:
+        if seen_change_id is None or seen_change_id <= change_id:
+            raw = f'{cls.PREFIX}{change_id}'
+        else:
+            raw = f'{cls.UNSETTLED_PREFIX}{change_id}:{seen_change_id}'
+        return base64.urlsafe_b64encode( raw.encode( 'ascii' )).decode( 'ascii' ).rstrip( '=' )
+
+    @classmethod
+    def decode( cls, cursor : str ) -> Optional[int]:
+        """ Returns the change id to resume after, or None if the cursor is not one of ours. """
+        position = cls.decode_position( cursor )
+        if position is None:
+            return None
+        return position[0]
+
+    @classmethod
+    def decode_position( cls, cursor : str ) -> Optional[Tuple[int, int]]:
+        """ Returns (change id, seen change id), or None if the cursor is not one of ours. """
+        try:
+            padded = cursor + '=' * ( -len( cursor ) % 4 )
+            raw = base64.urlsafe_b64decode( padded.encode( 'ascii' )).decode( 'ascii' )
+        except ( ValueError, UnicodeError ):
+            return None
+        if raw.startswith( cls.PREFIX ):
+            change_ids = [ raw[len( cls.PREFIX ):] ] * 2
+        elif raw.startswith( cls.UNSETTLED_PREFIX ):
+            change_ids = raw[len( cls.UNSETTLED_PREFIX ):].split( ':' )
+        else:
+            return None
+        if len( change_ids ) != 2 or not all( change_id.isdigit() for change_id in change_ids ):
+            return None
+        change_id, seen_change_id = ( int( change_id ) for change_id in change_ids )
+        if seen_change_id < change_id:
+            return None
+        return change_id, seen_change_id
+
+
+class SyncFeedPruner:
+    """
+    Prunes the SyncChange feed as changes are written, so it stays bounded
+    without a scheduler.  A Redis key (sync:prune:lock) expiring after
+    PRUNE_INTERVAL lets one commit per interval run the prune; without Redis
+    nothing is pruned until prune_sync_changes is run.
+    """
+
+    LOCK_KEY = 'sync:prune:lock'
+    PRUNE_INTERVAL = 86400  # 1 day
+
+    @classmethod
+    def prune_if_due( cls ) -> None:
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                return
+            if not redis_client.set( cls.LOCK_KEY, 1, nx = True, ex = cls.PRUNE_INTERVAL ):
+                return
+        except Exception as e:
+            logger.warning( f"Redis error checking sync feed prune: {e}" )
+            return
+        try:
+            deleted_count = SyncChange.objects.prune(
+                older_than = timezone.now() - SyncChange.RETENTION,
+            )
+            logger.info( f"Pruned {deleted_count} sync change(s)" )
+        except Exception as e:
+            logger.warning( f"Error pruning sync changes: {e}" )
+        return
+
+
+class SyncWatermarks:
+    """
+    Per-user and per-trip "last changed" watermarks in Redis.
+
+    Lets SyncEnvelopeBuilder answer polls with an empty delta, without any
+    database queries, when nothing relevant changed after the client's
+    cursor or since timestamp.
+
+    Each watermark is a sorted set with two members whose scores only ever
+    increase (ZADD GT), so out-of-order writers cannot move it backwards:
+    - change_id: newest relevant SyncChange id (cursor sync)
+    - changed_at: newest relevant change time in epoch seconds (since sync)
+
+    Scopes:
+    - sync:watermark:user:{user_id}: trip changes and membership changes for
+      any trip the user belongs to (the trip part of the envelope)
+    - sync:watermark:trip:{trip_uuid}: any change within the trip (the
+      location part of the envelope)
+    - sync:watermark:feed: any change at all, so cursors from beyond the
+      end of the feed (e.g., after a database restore) are not trusted
+
+    Watermarks are raised whenever a SyncChange row is written (Trip,
+    Location and TripMember saves, and the deletions that also write
+    SyncDeletionLog). A missing watermark means unknown, never unchanged.
+    When a database sync finds nothing new for a scope, the client's
+    position is a valid upper bound and seeds it, so idle clients reach the
+    fast path without waiting for a change. Redis errors disable the fast
+    path (fail open to the database).
+    """
+
+    TTL = 7 * 86400         # 7 days
+    CHANGE_ID = 'change_id'
+    CHANGED_AT = 'changed_at'
+    STATS_KEY = 'sync:watermark:stats'
+    STAT_HITS = 'hits'
+    STAT_MISSES = 'misses'
+
+    @classmethod
+    def _get_user_key( cls, user_id : int ) -> str:
+        return ':'.join([ 'sync', 'watermark', 'user', str( user_id ) ])
+
+    @classmethod
+    def _get_trip_key( cls, trip_uuid : UUID ) -> str:
+        return ':'.join([ 'sync', 'watermark', 'trip', str( trip_uuid ) ])
+
+    @classmethod
+    def _get_feed_key( cls ) -> str:
+        return ':'.join([ 'sync', 'watermark', 'feed' ])
+
+    @classmethod
+    def _get_keys( cls, user_id : Optional[int], trip_uuid : Optional[UUID] ):
+        keys = []
+        if user_id is not None:
+            keys.append( cls._get_user_key( user_id ))
+        if trip_uuid:
+            keys.append( cls._get_trip_key( trip_uuid ))
+        return keys
+
+    @classmethod
+    def _raise_watermarks( cls, keys, scores : Dict[str, float] ) -> None:
+        if not keys:
+            return
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                return
+            pipeline = redis_client.pipeline( transaction = False )
+            for key in keys:
+                pipeline.zadd( key, scores, gt = True )
+                pipeline.expire( key, cls.TTL )
+                continue
+            pipeline.execute()
+        except Exception as e:
+            logger.warning( f"Redis error raising sync watermarks: {e}" )
+        return
+
+    @classmethod
+    def bump_for_change( cls, sync_change : SyncChange ) -> None:
+        """ Raise the watermarks of every scope the change appears in. """
+        user_ids = []
+        if sync_change.object_type == SyncObjectType.TRIP:
+            user_ids = list( TripMember.objects.filter(
+                trip__uuid = sync_change.trip_uuid,
+            ).values_list( 'user_id', flat = True ))
+
+        keys = [ cls._get_user_key( user_id ) for user_id in user_ids ]
+        keys.append( cls._get_trip_key( sync_change.trip_uuid ))
+        keys.append( cls._get_feed_key() )
+        cls._raise_watermarks( keys, {
+            cls.CHANGE_ID: sync_change.id,
+            cls.CHANGED_AT: sync_change.created_datetime.timestamp(),
+        })
+
+        # Waiters sync as soon as they are woken, so wake them only once the
+        # change is visible to other connections.
+        transaction.on_commit( lambda: SyncNotifications.publish(
+            user_ids = user_ids,
+            trip_uuid = sync_change.trip_uuid,
+            change_id = sync_change.id,
+        ))
+        transaction.on_commit( SyncFeedPruner.prune_if_due )
+        return
+
+    @classmethod
+    def bump_for_trip( cls, trip_uuid : UUID ) -> None:
+        """
+        Raise watermarks after location changes for the trip were recorded in
+        bulk (SyncChangeManager.record_changes), which sends no post_save.
+        """
+        sync_change = SyncChange.objects.filter( trip_uuid = trip_uuid ).order_by( '-id' ).first()
+        if sync_change:
+            cls.bump_for_change( sync_change )
+        return
+
+    @classmethod
+    def seed( cls,
+              user_id          : Optional[int],
+              trip_uuid        : Optional[UUID],
+              after_change_id  : Optional[int]       = None,
+              since            : Optional[datetime]  = None ) -> None:
+        """
+        Record that the database had no changes after the given position for
+        these scopes, i.e., the position is an upper bound of their watermark.
+        """
+        if after_change_id is not None:
+            scores = { cls.CHANGE_ID: after_change_id }
+        elif since is not None:
+            scores = { cls.CHANGED_AT: since.timestamp() }
+        else:
+            return
+        cls._raise_watermarks( cls._get_keys( user_id, trip_uuid ), scores )
+        return
+
+    @classmethod
+    def is_unchanged( cls,
+                      user_id          : int,
+                      trip_uuid        : Optional[UUID],
+                      after_change_id  : Optional[int]       = None,
+                      since            : Optional[datetime]  = None ) -> bool:
+        """ True only if all scopes are known to have no changes after the position. """
+        return cls.has_changes(
+            user_id = user_id,
+            trip_uuid = trip_uuid,
+            after_change_id = after_change_id,
+            since = since,
+        ) is False
+
+    @classmethod
+    def has_changes( cls,
+                     user_id          : int,
+                     trip_uuid        : Optional[UUID],
+                     after_change_id  : Optional[int]       = None,
+                     since            : Optional[datetime]  = None ) -> Optional[bool]:
+        """
+        True if any scope has (or may have) changes after the position,
+        False if none is known to, and None if Redis is unavailable.
+        """
+        if after_change_id is not None:
+            member = cls.CHANGE_ID
+        elif since is not None:
+            member = cls.CHANGED_AT
+        else:
+            return True
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                return None
+            pipeline = redis_client.pipeline( transaction = False )
+            pipeline.zscore( cls._get_feed_key(), cls.CHANGE_ID )
+            for key in cls._get_keys( user_id, trip_uuid ):
+                pipeline.zscore( key, member )
+                continue
+            feed_watermark, *watermarks = pipeline.execute()
+        except Exception as e:
+            logger.warning( f"Redis error reading sync watermarks: {e}" )
+            return None
+
+        if after_change_id is not None:
+            if feed_watermark is None or after_change_id > feed_watermark:
+                return True
+        for watermark in watermarks:
+            if watermark is None:
+                return True
+            if after_change_id is not None and after_change_id < watermark:
+                return True
+            # Since sync returns changes at or after since, so equal is a change
+            if after_change_id is None and since.timestamp() <= watermark:
+                return True
+            continue
+        return False
+
+    @classmethod
+    def record_fast_path( cls, hit : bool ) -> None:
+        try:
+            redis_client = get_redis_client()
+            if redis_client:
+                redis_client.hincrby( cls.STATS_KEY, cls.STAT_HITS if hit else cls.STAT_MISSES, 1 )
+        except Exception as e:
+            logger.warning( f"Redis error recording sync watermark stats: {e}" )
+        return
+
+    @classmethod
+    def get_stats( cls ) -> Dict[str, int]:
+        """ Fast path hit/miss counts for syncs that carried a cursor or since. """
+        stats = {}
+        try:
+            redis_client = get_redis_client()
+            if redis_client:
+                stats = redis_client.hgetall( cls.STATS_KEY ) or {}
+        except Exception as e:
+            logger.warning( f"Redis error reading sync watermark stats: {e}" )
+        return {
+            cls.STAT_HITS: int( stats.get( cls.STAT_HITS, 0 )),
+            cls.STAT_MISSES: int( stats.get( cls.STAT_MISSES, 0 )),
+        }
+
+
+class SyncMembershipCache:
+    """
+    Trip uuids of each user's memberships, so the sync change probe
+    (SyncChangedView) can check trip access without a database query.
+
+    Cached per user in a TieredCache and invalidated on commit of any
+    TripMember save or delete for the user (see signals).  Other processes
+    may see a removed membership for up to TieredCache.TTL_LOCAL_SECS, which
+    only exposes whether the trip changed, never its data.
+    """
+
+    TTL_SECS = 3600
+
+    _cache = TieredCache( namespace = 'sync:members' )
+
+    @classmethod
+    def is_member( cls, user_id : int, trip_uuid : UUID ) -> bool:
+        trip_uuids = cls._cache.get_or_load(
+            str( user_id ),
+            lambda: [
+                str( member_trip_uuid )
+                for member_trip_uuid in TripMember.objects.filter(
+                    user_id = user_id,
+                ).values_list( 'trip__uuid', flat = True )
+            ],
+            ttl_secs = cls.TTL_SECS,
+        )
+        return str( trip_uuid ) in trip_uuids
+
+    @classmethod
+    def invalidate( cls, user_id : int ) -> None:
+        cls._cache.invalidate( str( user_id ))
+        return
+
+
+class SyncNotifications:
+    """
+    Redis pub/sub wake-ups for clients waiting on sync changes (see
+    SyncChangedView).
+
+    Every SyncChange publishes its id, after commit, on the channels of the
+    scopes whose watermarks it raises (see SyncWatermarks):
+    - sync:notify:user:{user_id}
+    - sync:notify:trip:{trip_uuid}
+
+    Waiting is asyncio-based, so an idle client costs a pending future
+    rather than a request thread.  Each event loop has one listener
+    (SyncNotificationListener) holding a single pattern subscription and
+    waking its local waiters, so the number of Redis connections does not
+    grow with the number of clients.  A waiter registers before checking the
+    watermarks, so a change landing in between is not missed.
+    """
+
+    CHANNEL_PATTERN = 'sync:notify:*'
+
+    @classmethod
+    def _get_user_channel( cls, user_id : int ) -> str:
+        return ':'.join([ 'sync', 'notify', 'user', str( user_id ) ])
+
+    @classmethod
+    def _get_trip_channel( cls, trip_uuid : UUID ) -> str:
+        return ':'.join([ 'sync', 'notify', 'trip', str( trip_uuid ) ])
+
+    @classmethod
+    def publish( cls, user_ids : List[int], trip_uuid : UUID, change_id : int ) -> None:
+        channels = [ cls._get_user_channel( user_id ) for user_id in user_ids ]
+        channels.append( cls._get_trip_channel( trip_uuid ))
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                return
+            pipeline = redis_client.pipeline( transaction = False )
+            for channel in channels:
+                pipeline.publish( channel, change_id )
+                continue
+            pipeline.execute()
+        except Exception as e:
+            logger.warning( f"Redis error publishing sync notifications: {e}" )
+        return
+
+    @classmethod
+    async def wait_for_change( cls,
+                               user_id          : int,
+                               trip_uuid        : Optional[UUID],
+                               after_change_id  : int,
+                               timeout          : float           ) -> Optional[bool]:
+        """
+        Wait until a change after the cursor position is known for the
+        user's trips (or the given trip's locations), or until the timeout.
+
+        Returns True if there are (or may be) changes to sync, False on
+        timeout, and None if Redis is unavailable.
+        """
+        listener = None
+        if timeout > 0:
+            listener = await SyncNotificationListener.get_listener()
+            if listener is None:
+                return None
+
+        channels = [ cls._get_user_channel( user_id ) ]
+        if trip_uuid:
+            channels.append( cls._get_trip_channel( trip_uuid ))
+        waiter = SyncNotificationWaiter( after_change_id = after_change_id )
+        if listener:
+            listener.add_waiter( channels, waiter )
+        try:
+            is_changed = await sync_to_async( SyncWatermarks.has_changes, thread_sensitive = False )(
+                user_id = user_id,
+                trip_uuid = trip_uuid,
+                after_change_id = after_change_id,
+            )
+            if is_changed is not False or not listener:
+                return is_changed
+            try:
+                return await asyncio.wait_for( waiter.future, timeout = timeout )
+            except asyncio.TimeoutError:
+                return False
+        finally:
+            if listener:
+                listener.remove_waiter( channels, waiter )
+
+
+class SyncNotificationWaiter:
+
+    def __init__( self, after_change_id : int ):
+        self.after_change_id = after_change_id
+        self.future = asyncio.get_running_loop().create_future()
+        return
+
+    def notify( self, change_id : int ) -> None:
+        if change_id > self.after_change_id and not self.future.done():
+            self.future.set_result( True )
+        return
+
+
+class SyncNotificationListener:
+    """
+    One pattern subscription to the sync notification channels per event
+    loop, dispatching to the waiters registered in that loop.
+
+    If the subscription fails, all of its waiters are woken as changed
+    (the clients then sync, i.e., fail open) and the next wait starts a new
+    listener.
+    """
+
+    READY_TIMEOUT_SECS = 5
+
+    _listeners = weakref.WeakKeyDictionary()
+
+    def __init__( self ):
+        self._waiters : Dict[str, Set[SyncNotificationWaiter]] = defaultdict( set )
+        self._ready = asyncio.Event()
+        self._is_closed = False
+        self._task = None
+        return
+
+    @classmethod
+    async def get_listener( cls ) -> Optional['SyncNotificationListener']:
+        """ The running loop's subscribed listener, or None if Redis is unavailable. """
+        loop = asyncio.get_running_loop()
+        listener = cls._listeners.get( loop )
+        if listener is None or listener._is_closed:
+            # Respect the shared client's circuit breaker before connecting
+            if not await sync_to_async( get_redis_client, thread_sensitive = False )():
+                return None
+            listener = cls()
+            listener._task = loop.create_task( listener._listen() )
+            cls._listeners[loop] = listener
+        try:
+            await asyncio.wait_for( listener._ready.wait(), timeout = cls.READY_TIMEOUT_SECS )
+        except asyncio.TimeoutError:
+            return None
+        if listener._is_closed:
+            return None
+        return listener
+
+    def add_waiter( self, channels : List[str], waiter : SyncNotificationWaiter ) -> None:
+        for channel in channels:
+            self._waiters[channel].add( waiter )
+            continue
+        return
+
+    def remove_waiter( self, channels : List[str], waiter : SyncNotificationWaiter ) -> None:
+        for channel in channels:
+            channel_waiters = self._waiters.get( channel )
+            if channel_waiters is None:
+                continue
+            channel_waiters.discard( waiter )
+            if not channel_waiters:
+                del self._waiters[channel]
+            continue
+        return
+
+    async def _listen( self ) -> None:
+        redis_client = redis.asyncio.Redis(
+            host = settings.REDIS_HOST,
+            port = settings.REDIS_PORT or 6379,
+            socket_connect_timeout = self.READY_TIMEOUT_SECS,
+            decode_responses = True,
+        )
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.psubscribe( SyncNotifications.CHANNEL_PATTERN )
+            async for message in pubsub.listen():
+                if message['type'] == 'psubscribe':
+                    self._ready.set()
+                elif message['type'] == 'pmessage':
+                    self._dispatch( message['channel'], message['data'] )
+                continue
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning( f"Redis error listening for sync notifications: {e}" )
+        finally:
+            self._close()
+            try:
+                await pubsub.aclose()
+                await redis_client.aclose()
+            except Exception:
+                pass
+        return
+
+    def _dispatch( self, channel : str, data : str ) -> None:
+        try:
+            change_id = int( data )
+        except ( TypeError, ValueError ):
+            return
+        for waiter in list( self._waiters.get( channel, ())):
+            waiter.notify( change_id )
+            continue
+        return
+
+    def _close( self ) -> None:
+        self._is_closed = True
+        for channel_waiters in self._waiters.values():
+            for waiter in channel_waiters:
+                if not waiter.future.done():
+                    waiter.future.set_result( True )
+                continue
+            continue
+        self._waiters.clear()
+        self._ready.set()
+        return
 
 
 class SyncEnvelopeBuilder:
@@ -34,6 +595,23 @@ class SyncEnvelopeBuilder:
     - Filtered by modified_datetime >= since
     - Includes deletion log for explicit deletion tracking
     - Note: Locations still use version-only pattern (out of scope for now)
+
+    Cursor sync:
+    - Every envelope includes an opaque cursor for the SyncChange feed
+    - With X-Sync-Cursor, trips and locations come from the feed entries
+      after the cursor (same envelope shape, X-Sync-Since is ignored)
+    - An expired or unknown cursor gets a full snapshot flagged with
+      resync_required, so the client replaces rather than merges its data
+    - Every visible change is sent, but the cursor only advances to the
+      settled id, so changes committed late below it are sent next time
+      (along with the unsettled changes already sent, again)
+
+    Unchanged fast path:
+    - With a cursor or since, SyncWatermarks is checked first; if nothing
+      changed after that position the delta is empty and no database
+      queries are made (the client's cursor is echoed back)
+    - Skipped for unsettled cursors: a late commit below an id already sent
+      does not raise the watermarks
     """
 
     def __init__(
@@ -41,10 +619,12 @@ class SyncEnvelopeBuilder:
         user,
         since: Optional[datetime] = None,
         trip_uuid: Optional[UUID] = None,
+        cursor: Optional[str] = None,
     ):
         self.user = user
         self.since = since
         self.trip_uuid = trip_uuid
+        self.cursor = cursor
 
     def build( self ) -> dict:
         """
@@ -62,13 +642,89 @@ class SyncEnvelopeBuilder:
         if not self.user.is_authenticated:
             return envelope
 
+        after_change_id = None
+        is_settled = True
+        if self.cursor is not None:
+            position = SyncCursor.decode_position( self.cursor )
+            if position is not None:
+                after_change_id, seen_change_id = position
+                is_settled = bool( seen_change_id == after_change_id )
+        since = self.since if self.cursor is None else None
+
+        if ( after_change_id is not None and is_settled ) or since is not None:
+            is_unchanged = SyncWatermarks.is_unchanged(
+                user_id = self.user.id,
+                trip_uuid = self.trip_uuid,
+                after_change_id = after_change_id,
+                since = since,
+            )
+            SyncWatermarks.record_fast_path( hit = is_unchanged )
+            if is_unchanged:
+                return self._build_unchanged( envelope )
+
+        # Read the feed position before any data so that changes made while
+        # building are re-sent next time rather than skipped.
+        min_change_id, max_change_id = SyncChange.objects.get_id_range()
+        self.max_change_id = max_change_id or 0
+        is_cursor_current = self._is_cursor_current( after_change_id, min_change_id, max_change_id )
+        settled_change_id = SyncChange.objects.get_settled_id(
+            after_id = after_change_id if is_cursor_current else 0,
+            max_id = self.max_change_id,
+            settled_before = self.as_of - SyncChange.SETTLE_INTERVAL,
+        )
+        envelope[F.SYNC_CURSOR] = SyncCursor.encode( settled_change_id, self.max_change_id )
+
+        if self.cursor is not None:
+            if is_cursor_current:
+                envelope[F.SYNC_TRIP] = self._build_trip_changes( after_change_id )
+                if self.trip_uuid:
+                    envelope[F.SYNC_LOCATION] = self._build_location_changes( after_change_id )
+                self._seed_watermarks( envelope, after_change_id = after_change_id )
+                return envelope
+
+            envelope[F.SYNC_RESYNC_REQUIRED] = True
+            self.since = None
+
         envelope[F.SYNC_TRIP] = self._build_trip_sync()
 
         if self.trip_uuid:
             envelope[F.SYNC_LOCATION] = self._build_location_sync()
 
+        if since is not None:
+            self._seed_watermarks( envelope, since = since )
         return envelope
 
+    def _build_unchanged( self, envelope : dict ) -> dict:
+        if self.cursor is not None:
+            envelope[F.SYNC_CURSOR] = self.cursor
+        envelope[F.SYNC_TRIP] = {
+            F.SYNC_UPDATES: {},
+            F.SYNC_DELETED: [],
+        }
+        if self.trip_uuid:
+            envelope[F.SYNC_LOCATION] = {
+                F.SYNC_VERSIONS: {},
+                F.SYNC_DELETED: [],
+            }
+        return envelope
+
+    def _seed_watermarks( self,
+                          envelope         : dict,
+                          after_change_id  : Optional[int]       = None,
+                          since            : Optional[datetime]  = None ) -> None:
+        trip_sync = envelope[F.SYNC_TRIP]
+        location_sync = envelope.get( F.SYNC_LOCATION )
+        trip_unchanged = not ( trip_sync[F.SYNC_UPDATES] or trip_sync[F.SYNC_DELETED] )
+        location_unchanged = bool( location_sync is not None
+                                   and not ( location_sync[F.SYNC_VERSIONS] or location_sync[F.SYNC_DELETED] ))
+        SyncWatermarks.seed(
+            user_id = self.user.id if trip_unchanged else None,
+            trip_uuid = self.trip_uuid if location_unchanged else None,
+            after_change_id = after_change_id,
+            since = since,
+        )
+        return
+
     def _build_trip_sync( self ) -> dict:
         """
         Returns full trip data for delta sync.
@@ -142,3 +798,71 @@ class SyncEnvelopeBuilder:
         ]
 
         return result
+
+    @staticmethod
+    def _is_cursor_current( after_change_id : Optional[int],
+                            min_change_id   : Optional[int],
+                            max_change_id   : Optional[int] ) -> bool:
+        """
+        A cursor is usable if no change after it has been pruned and it does
+        not point past the end of the feed (e.g., after a database restore).
+        """
+        if after_change_id is None:
+            return False
+        if max_change_id is None:
+            return bool( after_change_id == 0 )
+        if after_change_id > max_change_id:
+            return False
+        return bool( after_change_id >= min_change_id - 1 )
+
+    def _get_latest_changes( self, after_change_id : int, **filters ) -> Dict[UUID, SyncChange]:
+        """ Latest feed entry per object after the cursor, oldest first. """
+        if after_change_id >= self.max_change_id:
+            return {}
+        changes = SyncChange.objects.filter(
+            id__gt = after_change_id,
+            id__lte = self.max_change_id,
+            **filters,
+        ).only( 'uuid', 'version', 'is_deleted' ).order_by( 'id' )
+
+        latest_changes = {}
+        for change in changes:
+            latest_changes.pop( change.uuid, None )
+            latest_changes[change.uuid] = change
+            continue
+        return latest_changes
+
+    def _build_trip_changes( self, after_change_id : int ) -> dict:
+        """
+        Trip delta from the change feed: only changed trips are loaded (and
+        access checked), and deletions come from the same ordered feed.
+        """
+        latest_changes = self._get_latest_changes(
+            after_change_id,
+            object_type = SyncObjectType.TRIP,
+        )
+        changed_uuids = [ uuid for uuid, change in latest_changes.items() if not change.is_deleted ]
+
+        updates = {}
+        if changed_uuids:
+            queryset = Trip.objects.for_user( self.user ).filter( uuid__in = changed_uuids )
+            serializer = TripSerializer( queryset, many = True )
+            updates = { trip[F.UUID]: trip for trip in serializer.data }
+
+        return {
+            F.SYNC_UPDATES: updates,
+            F.SYNC_DELETED: [ str( uuid ) for uuid, change in latest_changes.items() if change.is_deleted ],
+        }
+
+    def _build_location_changes( self, after_change_id : int ) -> dict:
+        """ Location versions and deletions from the change feed (no Location reads). """
+        latest_changes = self._get_latest_changes(
+            after_change_id,
+            trip_uuid = self.trip_uuid,
+            object_type = SyncObjectType.LOCATION,
+        )
+        return {
+            F.SYNC_VERSIONS: { str( uuid ): change.version
+                               for uuid, change in latest_changes.items() if not change.is_deleted },
+            F.SYNC_DELETED: [ str( uuid ) for uuid, change in latest_changes.items() if change.is_deleted ],
+        }
@@ -1,19 +1,27 @@
 """
-Tests for APIToken model business logic.
+Tests for APIToken and SyncableModel model business logic.
 
 Focuses on high-value testing of:
 - record_usage() throttling logic (15-minute update interval)
 - Database write efficiency (avoiding excessive updates)
+- Atomic version increments, single and bulk, under concurrent writers
 """
 from datetime import timedelta
 import logging
+import threading
+from unittest import skipIf
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.db import close_old_connections, connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 
-from tt.apps.api.models import APIToken
+from tt.apps.api.models import APIToken, SyncChange
 from tt.apps.common import datetimeproxy
+from tt.apps.locations.models import Location
+from tt.apps.trips.models import Trip
+from tt.apps.trips.tests.synthetic_data import TripSyntheticData
 
 logging.disable(logging.CRITICAL)
 
@@ -259,3 +267,184 @@ class APITokenRecordUsageThrottlingTestCase(TestCase):
         """Test USAGE_UPDATE_INTERVAL is 15 minutes."""
         expected_interval = timedelta(minutes=15)
         self.assertEqual(APIToken.USAGE_UPDATE_INTERVAL, expected_interval)
+
+
+
+class SyncableModelVersionTestCase(TestCase):
+    """Test SyncableModel.save() and increment_versions() version handling."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='syncable@example.com', password='testpass123')
+        cls.trip = TripSyntheticData.create_test_trip(user=cls.user, title='Versioned Trip')
+
+    def test_create_starts_at_version_one(self):
+        location = Location.objects.create(trip=self.trip, title='New')
+        self.assertEqual(location.version, 1)
+
+    def test_save_increments_in_update_without_prior_read(self):
+        """Test the UPDATE comes first and only version is read back."""
+        location = Location.objects.create(trip=self.trip, title='Before')
+        location.title = 'After'
+
+        with CaptureQueriesContext(connection) as context:
+            location.save()
+
+        sql = [query['sql'] for query in context.captured_queries]
+        self.assertTrue(sql[0].startswith('UPDATE'))
+        self.assertIn('"version" + 1', sql[0])
+        self.assertTrue(sql[1].startswith('SELECT "locations_location"."id", "locations_location"."version"'))
+        self.assertEqual(location.version, 2)
+
+    def test_stale_instances_do_not_lose_increments(self):
+        location = Location.objects.create(trip=self.trip, title='Shared')
+        first = Location.objects.get(pk=location.pk)
+        second = Location.objects.get(pk=location.pk)
+
+        first.save()
+        second.save()
+
+        self.assertEqual(first.version, 2)
+        self.assertEqual(second.version, 3)
+        self.assertEqual(Location.objects.get(pk=location.pk).version, 3)
+
+    def test_update_fields_also_writes_version(self):
+        location = Location.objects.create(trip=self.trip, title='Before')
+        location.title = 'After'
+        location.save(update_fields=['title'])
+
+        location.refresh_from_db()
+        self.assertEqual(location.title, 'After')
+        self.assertEqual(location.version, 2)
+
+    def test_save_records_resolved_version(self):
+        self.trip.save()
+        change = SyncChange.objects.filter(uuid=self.trip.uuid).order_by('-id').first()
+        self.assertEqual(change.version, self.trip.version)
+        self.assertIsInstance(self.trip.version, int)
+
+    def test_increment_versions_bulk(self):
+        """Test increment_versions uses a fixed number of queries and records changes."""
+        locations = [Location.objects.create(trip=self.trip, title=f'L{n}') for n in range(5)]
+        Location.objects.filter(pk=locations[0].pk).update(version=7)
+
+        with self.assertNumQueries(3):
+            versions = Location.increment_versions([location.pk for location in locations])
+
+        self.assertEqual(versions[locations[0].uuid], 8)
+        self.assertEqual(versions[locations[1].uuid], 2)
+        changes = SyncChange.objects.filter(uuid__in=versions.keys(), version__in=[2, 8])
+        self.assertEqual(changes.count(), 5)
+        self.assertEqual({change.trip_uuid for change in changes}, {self.trip.uuid})
+
+    def test_increment_versions_for_trips(self):
+        versions = Trip.increment_versions([self.trip.pk])
+        self.assertEqual(versions, {self.trip.uuid: self.trip.version + 1})
+
+    def test_increment_versions_empty(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(Location.increment_versions([]), {})
+
+
+class SyncableModelInterleavedWriteTestCase(TestCase):
+    """
+    Test writers interleaving inside save() never lose increments.
+
+    Another writer's complete save is run right before this save's UPDATE
+    statement, i.e., in the window where a read-then-write increment
+    would go stale.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='interleaved@example.com', password='testpass123')
+        cls.trip = TripSyntheticData.create_test_trip(user=cls.user, title='Interleaved Trip')
+
+    def save_with_interleaved_writer(self, instance, other_write):
+        state = {'interleaved': False}
+
+        def interleave_before_update(execute, sql, params, many, context):
+            if not state['interleaved'] and sql.startswith('UPDATE'):
+                state['interleaved'] = True
+                other_write()
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(interleave_before_update):
+            instance.save()
+        self.assertTrue(state['interleaved'])
+
+    def test_interleaved_save(self):
+        location = Location.objects.create(trip=self.trip, title='Contended')
+        stale = Location.objects.get(pk=location.pk)
+
+        self.save_with_interleaved_writer(
+            location, lambda: Location.objects.get(pk=location.pk).save()
+        )
+
+        self.assertEqual(location.version, 3)
+        self.assertEqual(Location.objects.get(pk=location.pk).version, 3)
+        stale.save()
+        self.assertEqual(stale.version, 4)
+
+    def test_interleaved_bulk_increment(self):
+        location = Location.objects.create(trip=self.trip, title='Contended')
+
+        self.save_with_interleaved_writer(
+            location, lambda: Location.increment_versions([location.pk])
+        )
+
+        self.assertEqual(Location.objects.get(pk=location.pk).version, 3)
+
+
+@skipIf(connection.vendor == 'sqlite', 'SQLite in-memory test databases reject concurrent writers')
+class SyncableModelConcurrencyTestCase(TransactionTestCase):
+    """Test concurrent writer threads never lose version increments."""
+
+    THREAD_COUNT = 4
+    SAVES_PER_THREAD = 5
+
+    def setUp(self):
+        self.user = User.objects.create_user(email='concurrent@example.com', password='testpass123')
+        self.trip = TripSyntheticData.create_test_trip(user=self.user, title='Concurrent Trip')
+        self.location = Location.objects.create(trip=self.trip, title='Contended')
+
+    def run_concurrently(self, work):
+        barrier = threading.Barrier(self.THREAD_COUNT)
+        errors = []
+
+        def worker():
+            try:
+                barrier.wait()
+                for _ in range(self.SAVES_PER_THREAD):
+                    work()
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+            finally:
+                close_old_connections()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.THREAD_COUNT)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_concurrent_saves_of_stale_instances(self):
+        def work():
+            # Each save works from a stale copy, as concurrent requests would.
+            Location.objects.get(pk=self.location.pk).save()
+
+        self.run_concurrently(work)
+
+        expected = 1 + self.THREAD_COUNT * self.SAVES_PER_THREAD
+        self.assertEqual(Location.objects.get(pk=self.location.pk).version, expected)
+
+    def test_concurrent_bulk_and_single_increments(self):
+        def work():
+            Location.increment_versions([self.location.pk])
+            Location.objects.get(pk=self.location.pk).save()
+
+        self.run_concurrently(work)
+
+        expected = 1 + 2 * self.THREAD_COUNT * self.SAVES_PER_THREAD
+        self.assertEqual(Location.objects.get(pk=self.location.pk).version, expected)
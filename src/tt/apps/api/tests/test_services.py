@@ -6,24 +6,39 @@ Focuses on high-value testing of:
 - Authentication logic and security (constant-time comparison)
 - Hash verification
 - Usage tracking integration
+- Two-tier authentication cache and buffered usage tracking
 """
 import hashlib
+import json
 import logging
 import secrets
+import time
+from io import StringIO
 from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
 
 from tt.apps.api.enums import TokenType
 from tt.apps.api.models import APIToken
-from tt.apps.api.services import APITokenService
+from tt.apps.api.services import APITokenAuthCache, APITokenService, APITokenUsageBuffer
+from tt.apps.common.redis_client import get_redis_client
 
 logging.disable(logging.CRITICAL)
 
 User = get_user_model()
 
 
+def clear_token_caches():
+    APITokenAuthCache.clear_local()
+    APITokenUsageBuffer.clear_local()
+    redis_client = get_redis_client()
+    keys = list(redis_client.scan_iter(match='api:token:*'))
+    if keys:
+        redis_client.delete(*keys)
+
+
 class APITokenServiceTestCase(TestCase):
     """Test APITokenService business logic and security."""
 
@@ -36,9 +51,10 @@ class APITokenServiceTestCase(TestCase):
         )
 
     def setUp(self):
-        """Reset time proxy for each test."""
+        """Reset time proxy and token caches for each test."""
         from tt.apps.common import datetimeproxy
         datetimeproxy.reset()
+        clear_token_caches()
 
     def tearDown(self):
         """Reset time after test."""
@@ -129,17 +145,16 @@ class APITokenServiceTestCase(TestCase):
         self.assertIsNotNone(authenticated_user)
         self.assertEqual(authenticated_user, self.user)
 
-    def test_authenticate_calls_record_usage_on_success(self):
-        """Test authenticate calls record_usage() on successful authentication."""
+    def test_authenticate_buffers_usage_on_success(self):
+        """Test authenticate buffers usage instead of writing the token row."""
         result = APITokenService.create_token(self.user, 'Test Token')
 
-        # Mock record_usage to verify it's called
-        with patch.object(APIToken, 'record_usage') as mock_record_usage:
+        with patch.object(APITokenUsageBuffer, 'record_usage') as mock_record_usage:
             authenticated_user = APITokenService.authenticate(result.api_token_str)
 
-            # Verify record_usage was called
             self.assertIsNotNone(authenticated_user)
-            mock_record_usage.assert_called_once()
+            mock_record_usage.assert_called_once_with(result.api_token.id)
+        self.assertIsNone(APIToken.objects.get(pk=result.api_token.id).last_used_at)
 
     # -------------------------------------------------------------------------
     # Authentication Tests - Invalid Tokens
@@ -593,3 +608,231 @@ class APITokenServiceTestCase(TestCase):
         tokens = APITokenService.list_tokens( self.user )
 
         self.assertEqual( tokens.count(), 0 )
+
+
+class APITokenAuthCacheTestCase(TestCase):
+    """Test the two-tier token authentication cache and its invalidation."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='cacheuser@example.com', password='testpass123')
+
+    def setUp(self):
+        clear_token_caches()
+        self.result = APITokenService.create_token(self.user, 'Test Token')
+        self.api_token_str = self.result.api_token_str
+
+    def test_repeat_authentication_served_from_local_cache(self):
+        """Test a cached token authenticates without any database queries."""
+        APITokenService.authenticate(self.api_token_str)
+
+        with self.assertNumQueries(0):
+            user = APITokenService.authenticate(self.api_token_str)
+        self.assertEqual(user, self.user)
+
+    def test_redis_tier_needs_only_user_lookup(self):
+        """Test another process (empty local tier) loads just the user."""
+        APITokenService.authenticate(self.api_token_str)
+        APITokenAuthCache.clear_local()
+
+        with self.assertNumQueries(1):
+            user = APITokenService.authenticate(self.api_token_str)
+        self.assertEqual(user, self.user)
+
+    def test_cached_user_is_a_copy(self):
+        """Test changes to a returned user do not leak into later requests."""
+        first = APITokenService.authenticate(self.api_token_str)
+        first.first_name = 'Changed'
+
+        second = APITokenService.authenticate(self.api_token_str)
+        self.assertIsNot(first, second)
+        self.assertNotEqual(second.first_name, 'Changed')
+
+    def test_invalid_token_not_cached(self):
+        """Test failed authentications always go to the database."""
+        bad_token_str = self.api_token_str[:-4] + 'XXXX'
+        self.assertIsNone(APITokenService.authenticate(bad_token_str))
+        self.assertIsNone(APITokenService.authenticate(bad_token_str))
+        self.assertEqual(len(APITokenAuthCache._local_entries), 0)
+
+    def test_delete_token_invalidates_cache(self):
+        APITokenService.authenticate(self.api_token_str)
+
+        APITokenService.delete_token(self.user, self.result.api_token.lookup_key)
+
+        self.assertIsNone(APITokenService.authenticate(self.api_token_str))
+
+    def test_revoked_token_not_recached_by_concurrent_request(self):
+        """Test a request that read the token row before deletion cannot cache it afterwards."""
+        api_token_hash = self.result.api_token.api_token_hash
+        stale_token = APIToken.objects.select_related('user').get(pk=self.result.api_token.id)
+
+        APITokenService.delete_token(self.user, self.result.api_token.lookup_key)
+        APITokenAuthCache.set(api_token_hash, stale_token)
+
+        self.assertIsNone(APITokenAuthCache.get_user(api_token_hash))
+        APITokenAuthCache.clear_local()
+        self.assertIsNone(APITokenAuthCache.get_user(api_token_hash))
+        self.assertIsNone(APITokenService.authenticate(self.api_token_str))
+
+    def test_revoked_token_redis_entry_rejected(self):
+        """Test a Redis entry written after revocation (set() passed its check first) never authenticates."""
+        api_token_hash = self.result.api_token.api_token_hash
+        stale_token = self.result.api_token
+
+        APITokenService.delete_token(self.user, stale_token.lookup_key)
+        get_redis_client().set(
+            APITokenAuthCache._get_cache_key(api_token_hash),
+            json.dumps({'token_id': stale_token.id, 'user_id': self.user.id, 'is_active': True}),
+        )
+        APITokenAuthCache.clear_local()
+
+        self.assertIsNone(APITokenService.authenticate(self.api_token_str))
+
+    def test_other_deletion_invalidates_cache(self):
+        """Test deleting the token outside the service still invalidates."""
+        APITokenService.authenticate(self.api_token_str)
+
+        APIToken.objects.filter(pk=self.result.api_token.id).delete()
+
+        self.assertIsNone(APITokenService.authenticate(self.api_token_str))
+
+    def test_user_deactivation_invalidates_cache(self):
+        APITokenService.authenticate(self.api_token_str)
+
+        self.user.is_active = False
+        self.user.save()
+
+        user = APITokenService.authenticate(self.api_token_str)
+        self.assertFalse(user.is_active)
+        self.assertEqual(len(APITokenAuthCache._local_entries), 0)
+
+    def test_local_tier_is_bounded(self):
+        with patch.object(APITokenAuthCache, 'MAX_LOCAL_ENTRIES', 2):
+            for index in range(3):
+                result = APITokenService.create_token(self.user, f'Bounded {index}')
+                APITokenService.authenticate(result.api_token_str)
+            self.assertEqual(len(APITokenAuthCache._local_entries), 2)
+
+    def test_local_entries_expire(self):
+        APITokenService.authenticate(self.api_token_str)
+
+        with patch.object(APITokenAuthCache, 'TTL_LOCAL', 0):
+            APITokenAuthCache.clear_local()
+            APITokenService.authenticate(self.api_token_str)
+            with self.assertNumQueries(1):
+                APITokenService.authenticate(self.api_token_str)
+
+    def test_redis_failure_falls_back_to_database(self):
+        with patch('tt.apps.api.services.get_redis_client', side_effect=Exception('down')):
+            user = APITokenService.authenticate(self.api_token_str)
+            APITokenAuthCache.clear_local()
+            user = APITokenService.authenticate(self.api_token_str)
+        self.assertEqual(user, self.user)
+        # Usage falls back to a direct (throttled) update
+        self.assertIsNotNone(APIToken.objects.get(pk=self.result.api_token.id).last_used_at)
+
+
+class APITokenUsageBufferTestCase(TestCase):
+    """Test write-behind buffering and flushing of last_used_at."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='usageuser@example.com', password='testpass123')
+
+    def setUp(self):
+        clear_token_caches()
+
+    def test_usage_buffered_and_flushed(self):
+        results = [APITokenService.create_token(self.user, f'Token {index}') for index in range(3)]
+        for result in results[:2]:
+            APITokenService.authenticate(result.api_token_str)
+        self.assertFalse(APIToken.objects.filter(last_used_at__isnull=False).exists())
+
+        self.assertEqual(APITokenUsageBuffer.flush(), 2)
+
+        used = set(APIToken.objects.filter(last_used_at__isnull=False).values_list('id', flat=True))
+        self.assertEqual(used, {results[0].api_token.id, results[1].api_token.id})
+        self.assertEqual(APITokenUsageBuffer.flush(), 0)
+
+    def test_flush_writes_in_batches(self):
+        results = [APITokenService.create_token(self.user, f'Token {index}') for index in range(5)]
+        for result in results:
+            APITokenService.authenticate(result.api_token_str)
+
+        with patch.object(APITokenUsageBuffer, 'FLUSH_BATCH_SIZE', 2):
+            with self.assertNumQueries(6):
+                self.assertEqual(APITokenUsageBuffer.flush(), 5)
+
+    def test_flush_does_not_move_last_used_backwards(self):
+        import datetime
+        import pytz
+        from tt.apps.common import datetimeproxy
+
+        result = APITokenService.create_token(self.user, 'Token')
+        datetimeproxy.set(datetime.datetime(2024, 1, 1, tzinfo=pytz.UTC))
+        try:
+            APITokenService.authenticate(result.api_token_str)
+        finally:
+            datetimeproxy.reset()
+        later = datetime.datetime(2024, 6, 1, tzinfo=pytz.UTC)
+        APIToken.objects.filter(pk=result.api_token.id).update(last_used_at=later)
+
+        self.assertEqual(APITokenUsageBuffer.flush(), 0)
+        self.assertEqual(APIToken.objects.get(pk=result.api_token.id).last_used_at, later)
+
+    def test_usage_buffered_once_per_interval(self):
+        result = APITokenService.create_token(self.user, 'Token')
+        APITokenService.authenticate(result.api_token_str)
+        get_redis_client().delete(APITokenUsageBuffer.BUFFER_KEY)
+
+        APITokenService.authenticate(result.api_token_str)
+
+        self.assertFalse(get_redis_client().exists(APITokenUsageBuffer.BUFFER_KEY))
+
+    def test_request_flushes_once_buffer_is_old(self):
+        first = APITokenService.create_token(self.user, 'First')
+        second = APITokenService.create_token(self.user, 'Second')
+        APITokenService.authenticate(first.api_token_str)
+        redis_client = get_redis_client()
+        redis_client.set(
+            APITokenUsageBuffer.BUFFER_STARTED_KEY,
+            time.time() - APITokenUsageBuffer.FLUSH_INTERVAL - 1,
+        )
+
+        APITokenService.authenticate(second.api_token_str)
+
+        self.assertFalse(APIToken.objects.filter(last_used_at__isnull=True).exists())
+        self.assertFalse(redis_client.exists(APITokenUsageBuffer.BUFFER_KEY))
+        self.assertFalse(redis_client.exists(APITokenUsageBuffer.BUFFER_STARTED_KEY))
+        self.assertFalse(redis_client.exists(APITokenUsageBuffer.FLUSH_LOCK_KEY))
+
+    def test_request_does_not_flush_recent_buffer(self):
+        first = APITokenService.create_token(self.user, 'First')
+        second = APITokenService.create_token(self.user, 'Second')
+        APITokenService.authenticate(first.api_token_str)
+        APITokenService.authenticate(second.api_token_str)
+
+        self.assertFalse(APIToken.objects.filter(last_used_at__isnull=False).exists())
+        self.assertEqual(APITokenUsageBuffer.flush(), 2)
+
+    def test_request_skips_flush_while_another_is_flushing(self):
+        result = APITokenService.create_token(self.user, 'Token')
+        redis_client = get_redis_client()
+        redis_client.set(APITokenUsageBuffer.FLUSH_LOCK_KEY, 1)
+        redis_client.set(APITokenUsageBuffer.BUFFER_STARTED_KEY, 0)
+
+        APITokenService.authenticate(result.api_token_str)
+
+        self.assertIsNone(APIToken.objects.get(pk=result.api_token.id).last_used_at)
+        self.assertTrue(redis_client.hexists(APITokenUsageBuffer.BUFFER_KEY, str(result.api_token.id)))
+
+    def test_flush_command(self):
+        result = APITokenService.create_token(self.user, 'Token')
+        APITokenService.authenticate(result.api_token_str)
+
+        out = StringIO()
+        call_command('flush_api_token_usage', stdout=out)
+
+        self.assertIn('Updated last_used_at for 1 token(s)', out.getvalue())
+        self.assertIsNotNone(APIToken.objects.get(pk=result.api_token.id).last_used_at)
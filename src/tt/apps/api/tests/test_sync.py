@@ -5,18 +5,35 @@ Focuses on high-value testing of:
 - SyncableModel version increment behavior
 - SyncDeletionLog creation on Location deletion
 - SyncEnvelopeBuilder query logic
+- SyncChange feed and cursor-based delta sync
+- SyncWatermarks unchanged fast path
+- SyncMembershipCache invalidation
 """
 import logging
 from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+from uuid import uuid4
 
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
 from django.test import TestCase
 from django.utils import timezone
 
 from tt.apps.api.enums import SyncObjectType
-from tt.apps.api.models import SyncDeletionLog
-from tt.apps.api.sync import SyncEnvelopeBuilder
+from tt.apps.api.models import SyncChange, SyncDeletionLog
+from tt.apps.api.sync import (
+    SyncCursor,
+    SyncEnvelopeBuilder,
+    SyncFeedPruner,
+    SyncMembershipCache,
+    SyncWatermarks,
+)
+from tt.apps.common.redis_client import get_redis_client
 from tt.apps.locations.models import Location
+from tt.apps.members.models import TripMember
+from tt.apps.trips.enums import TripPermissionLevel
 from tt.apps.trips.tests.synthetic_data import TripSyntheticData
 
 logging.disable(logging.CRITICAL)
@@ -543,3 +560,448 @@ class SyncEnvelopeBuilderAsOfTestCase(TestCase):
         as_of = datetime.fromisoformat(envelope['as_of'].replace('Z', '+00:00'))
         self.assertGreaterEqual(as_of.timestamp(), before.timestamp())
         self.assertLessEqual(as_of.timestamp(), after.timestamp())
+
+
+# =============================================================================
+# SyncChange Feed and Cursor Tests
+# =============================================================================
+
+class SyncCursorTestCase(TestCase):
+    """Test SyncCursor encoding."""
+
+    def test_round_trip(self):
+        for change_id in (0, 1, 12345678901):
+            self.assertEqual(SyncCursor.decode(SyncCursor.encode(change_id)), change_id)
+
+    def test_invalid_cursors_decode_to_none(self):
+        for cursor in ('', 'garbage!', 'MTIz', SyncCursor.encode(5)[:-2] + '$$'):
+            self.assertIsNone(SyncCursor.decode(cursor))
+
+    def test_unsettled_round_trip(self):
+        cursor = SyncCursor.encode(5, 8)
+
+        self.assertEqual(SyncCursor.decode_position(cursor), (5, 8))
+        self.assertEqual(SyncCursor.decode(cursor), 5)
+        self.assertEqual(SyncCursor.decode_position(SyncCursor.encode(5, 5)), (5, 5))
+        self.assertEqual(SyncCursor.encode(5, 5), SyncCursor.encode(5))
+
+
+class SyncChangeFeedTestCase(TestCase):
+    """Test SyncChange rows written by saves and deletions."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='testuser@example.com',
+            password='testpass123'
+        )
+
+    def test_saves_and_deletions_append_to_feed(self):
+        trip = TripSyntheticData.create_test_trip(user=self.user, title='Test Trip')
+        location = Location.objects.create(trip=trip, title='Test Location')
+        location.title = 'Renamed'
+        location.save()
+        location_uuid = location.uuid
+        location.delete()
+
+        changes = list(SyncChange.objects.filter(uuid=location_uuid).order_by('id'))
+        self.assertEqual([change.version for change in changes], [1, 2, None])
+        self.assertEqual([change.is_deleted for change in changes], [False, False, True])
+        self.assertTrue(all(change.trip_uuid == trip.uuid for change in changes))
+
+    def test_trip_member_added_records_trip_change(self):
+        trip = TripSyntheticData.create_test_trip(user=self.user, title='Test Trip')
+        other_user = User.objects.create_user(email='other@example.com', password='testpass123')
+        last_id = SyncChange.objects.latest('id').id
+
+        TripMember.objects.create(trip=trip, user=other_user, permission_level=TripPermissionLevel.VIEWER)
+
+        change = SyncChange.objects.get(id__gt=last_id)
+        self.assertEqual(change.object_type, SyncObjectType.TRIP)
+        self.assertEqual(change.uuid, trip.uuid)
+
+
+class SyncEnvelopeBuilderCursorTestCase(TestCase):
+    """Test SyncEnvelopeBuilder delta sync from a cursor."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='testuser@example.com',
+            password='testpass123'
+        )
+        cls.other_user = User.objects.create_user(
+            email='other@example.com',
+            password='testpass123'
+        )
+
+    def current_cursor(self):
+        return SyncEnvelopeBuilder(self.user).build()['cursor']
+
+    def test_envelope_includes_cursor(self):
+        TripSyntheticData.create_test_trip(user=self.user, title='Test Trip')
+
+        envelope = SyncEnvelopeBuilder(self.user).build()
+
+        self.assertEqual(SyncCursor.decode(envelope['cursor']), SyncChange.objects.latest('id').id)
+
+    def test_anonymous_envelope_has_no_cursor(self):
+        envelope = SyncEnvelopeBuilder(AnonymousUser()).build()
+        self.assertNotIn('cursor', envelope)
+
+    def test_cursor_returns_only_later_changes(self):
+        old_trip = TripSyntheticData.create_test_trip(user=self.user, title='Old Trip')
+        old_location = Location.objects.create(trip=old_trip, title='Old Location')
+        cursor = self.current_cursor()
+
+        new_trip = TripSyntheticData.create_test_trip(user=self.user, title='New Trip')
+        new_location = Location.objects.create(trip=old_trip, title='New Location')
+
+        envelope = SyncEnvelopeBuilder(self.user, trip_uuid=old_trip.uuid, cursor=cursor).build()
+
+        self.assertEqual(list(envelope['trip']['updates']), [str(new_trip.uuid)])
+        self.assertEqual(envelope['location']['versions'], {str(new_location.uuid): 1})
+        self.assertNotIn(str(old_location.uuid), envelope['location']['versions'])
+        self.assertNotIn('resync_required', envelope)
+
+    def test_cursor_ignores_since_and_clock_skew(self):
+        trip = TripSyntheticData.create_test_trip(user=self.user, title='Test Trip')
+        cursor = self.current_cursor()
+        trip.title = 'Updated'
+        trip.save()
+
+        future_since = timezone.now() + timedelta(days=1)
+        envelope = SyncEnvelopeBuilder(self.user, since=future_since, cursor=cursor).build()
+
+        self.assertIn(str(trip.uuid), envelope['trip']['updates'])
+
+    def test_cursor_excludes_inaccessible_trips(self):
+        cursor = self.current_cursor()
+        TripSyntheticData.create_test_trip(user=self.other_user, title='Other Trip')
+
+        envelope = SyncEnvelopeBuilder(self.user, cursor=cursor).build()
+
+        self.assertEqual(envelope['trip']['updates'], {})
+
+    def test_cursor_reports_deletions(self):
+        trip = TripSyntheticData.create_test_trip(user=self.user, title='Test Trip')
+        location = Location.objects.create(trip=trip, title='Test Location')
+        cursor = self.current_cursor()
+        location_uuid = location.uuid
+        location.delete()
+
+        envelope = SyncEnvelopeBuilder(self.user, trip_uuid=trip.uuid, cursor=cursor).build()
+
+        self.assertEqual(envelope['location']['deleted'], [str(location_uuid)])
+        self.assertEqual(envelope['location']['versions'], {})
+
+    def test_created_then_deleted_reports_only_deletion(self):
+        cursor = self.current_cursor()
+        trip = TripSyntheticData.create_test_trip(user=self.user, title='Short-lived Trip')
+        trip_uuid = trip.uuid
+        trip.delete()
+
+        envelope = SyncEnvelopeBuilder(self.user, cursor=cursor).build()
+
+        self.assertEqual(envelope['trip']['updates'], {})
+        self.assertEqual(envelope['trip']['deleted'], [str(trip_uuid)])
+
+    def test_current_cursor_is_single_query(self):
+        trip = TripSyntheticData.create_test_trip(user=self.user, title='Test Trip')
+        cursor = self.current_cursor()
+
+        with self.assertNumQueries(1):
+            envelope = SyncEnvelopeBuilder(self.user, trip_uuid=trip.uuid, cursor=cursor).build()
+
+        self.assertEqual(envelope['cursor'], cursor)
+        self.assertEqual(envelope['trip']['updates'], {})
+        self.assertEqual(envelope['location']['versions'], {})
+
+    def test_uncommitted_change_holds_cursor_back(self):
+        """A change id still invisible (uncommitted) is not skipped by the cursor."""
+        trip = TripSyntheticData.create_test_trip(user=self.user, title='Test Trip')
+        cursor = self.current_cursor()
+        first = Location.objects.create(trip=trip, title='First')
+        second = Location.objects.create(trip=trip, title='Second')
+        pending_change = SyncChange.objects.get(uuid=first.uuid)
+        pending_id = pending_change.id
+        pending_change.delete()
+
+        envelope = SyncEnvelopeBuilder(self.user, trip_uuid=trip.uuid, cursor=cursor).build()
+
+        self.assertEqual(envelope['location']['versions'], {str(second.uuid): 1})
+        settled_id, seen_id = SyncCursor.decode_position(envelope['cursor'])
+        self.assertEqual(settled_id, SyncCursor.decode(cursor))
+        self.assertEqual(seen_id, SyncChange.objects.latest('id').id)
+
+        # The change commits late, below the id already sent
+        pending_change.id = pending_id
+        pending_change.save(force_insert=True)
+        envelope = SyncEnvelopeBuilder(self.user, trip_uuid=trip.uuid, cursor=envelope['cursor']).build()
+
+        self.assertEqual(envelope['location']['versions'], {str(first.uuid): 1, str(second.uuid): 1})
+        self.assertEqual(SyncCursor.decode_position(envelope['cursor']), (seen_id, seen_id))
+        self.assertGreater(seen_id, pending_id)
+
+    def test_old_gap_is_settled(self):
+        """A gap older than the settle interval (e.g., a rollback) does not hold the cursor back."""
+        trip = TripSyntheticData.create_test_trip(user=self.user, title='Test Trip')
+        cursor = self.current_cursor()
+        first = Location.objects.create(trip=trip, title='First')
+        Location.objects.create(trip=trip, title='Second')
+        SyncChange.objects.filter(uuid=first.uuid).delete()
+        SyncChange.objects.update(created_datetime=timezone.now() - SyncChange.SETTLE_INTERVAL * 2)
+
+        envelope = SyncEnvelopeBuilder(self.user, trip_uuid=trip.uuid, cursor=cursor).build()
+
+        latest_id = SyncChange.objects.latest('id').id
+        self.assertEqual(SyncCursor.decode_position(envelope['cursor']), (latest_id, latest_id))
+
+    def test_pruned_cursor_requires_full_resync(self):
+        trip = TripSyntheticData.create_test_trip(user=self.user, title='Test Trip')
+        cursor = self.current_cursor()
+        Location.objects.create(trip=trip, title='Test Location')
+        SyncChange.objects.filter(id__lte=SyncCursor.decode(cursor) + 1).delete()
+
+        envelope = SyncEnvelopeBuilder(self.user, cursor=cursor).build()
+
+        self.assertTrue(envelope['resync_required'])
+        self.assertIn(str(trip.uuid), envelope['trip']['updates'])
+
+    def test_unknown_cursor_requires_full_resync(self):
+        trip = TripSyntheticData.create_test_trip(user=self.user, title='Test Trip')
+
+        for cursor in ('not-a-cursor', SyncCursor.encode(10 ** 9)):
+            envelope = SyncEnvelopeBuilder(self.user, cursor=cursor).build()
+            self.assertTrue(envelope['resync_required'])
+            self.assertIn(str(trip.uuid), envelope['trip']['updates'])
+
+
+class PruneSyncChangesCommandTestCase(TestCase):
+    """Test prune_sync_changes management command."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='testuser@example.com',
+            password='testpass123'
+        )
+
+    def test_prunes_old_changes_but_keeps_newest(self):
+        TripSyntheticData.create_test_trip(user=self.user, title='Trip 1')
+        TripSyntheticData.create_test_trip(user=self.user, title='Trip 2')
+        newest_id = SyncChange.objects.latest('id').id
+        SyncChange.objects.update(created_datetime=timezone.now() - timedelta(days=90))
+
+        call_command('prune_sync_changes', stdout=StringIO())
+
+        self.assertEqual(list(SyncChange.objects.values_list('id', flat=True)), [newest_id])
+
+    def test_writes_prune_once_per_interval(self):
+        get_redis_client().delete(SyncFeedPruner.LOCK_KEY)
+        trip = TripSyntheticData.create_test_trip(user=self.user, title='Trip 1')
+        SyncChange.objects.update(created_datetime=timezone.now() - SyncChange.RETENTION * 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            trip.title = 'Renamed'
+            trip.save()
+        self.assertEqual(SyncChange.objects.count(), 1)
+
+        SyncChange.objects.update(created_datetime=timezone.now() - SyncChange.RETENTION * 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            trip.title = 'Renamed Again'
+            trip.save()
+        self.assertEqual(SyncChange.objects.count(), 2)
+
+
+# =============================================================================
+# SyncWatermarks Fast Path Tests
+# =============================================================================
+
+class SyncWatermarksTestCase(TestCase):
+    """Test the Redis watermark fast path of SyncEnvelopeBuilder."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='testuser@example.com',
+            password='testpass123'
+        )
+        cls.other_user = User.objects.create_user(
+            email='other@example.com',
+            password='testpass123'
+        )
+
+    def setUp(self):
+        redis_client = get_redis_client()
+        for key in redis_client.scan_iter('sync:watermark:*'):
+            redis_client.delete(key)
+        self.trip = TripSyntheticData.create_test_trip(user=self.user, title='Test Trip')
+
+    def sync(self, cursor=None, since=None, trip_uuid=None):
+        return SyncEnvelopeBuilder(self.user, since=since, trip_uuid=trip_uuid, cursor=cursor).build()
+
+    def test_unchanged_cursor_makes_no_queries(self):
+        cursor = self.sync()['cursor']
+
+        with self.assertNumQueries(0):
+            envelope = self.sync(cursor=cursor, trip_uuid=self.trip.uuid)
+
+        self.assertEqual(envelope['cursor'], cursor)
+        self.assertEqual(envelope['trip'], {'updates': {}, 'deleted': []})
+        self.assertEqual(envelope['location'], {'versions': {}, 'deleted': []})
+        self.assertEqual(SyncWatermarks.get_stats(), {'hits': 1, 'misses': 0})
+
+    def test_trip_change_defeats_fast_path(self):
+        cursor = self.sync()['cursor']
+        self.trip.title = 'Updated'
+        self.trip.save()
+
+        envelope = self.sync(cursor=cursor)
+
+        self.assertIn(str(self.trip.uuid), envelope['trip']['updates'])
+        self.assertEqual(SyncWatermarks.get_stats(), {'hits': 0, 'misses': 1})
+
+    def test_location_change_defeats_fast_path_for_its_trip_only(self):
+        other_trip = TripSyntheticData.create_test_trip(user=self.user, title='Other Trip')
+        cursor = self.sync()['cursor']
+        location = Location.objects.create(trip=self.trip, title='New Location')
+
+        with self.assertNumQueries(0):
+            self.sync(cursor=cursor)
+            self.sync(cursor=cursor, trip_uuid=other_trip.uuid)
+
+        envelope = self.sync(cursor=cursor, trip_uuid=self.trip.uuid)
+        self.assertIn(str(location.uuid), envelope['location']['versions'])
+
+    def test_quiet_scope_is_seeded_by_database_sync(self):
+        """Another user's changes move the feed but not this user's watermark."""
+        cursor = self.sync()['cursor']
+        TripSyntheticData.create_test_trip(user=self.other_user, title='Other Trip')
+        later_cursor = self.sync(cursor=cursor)['cursor']
+
+        with self.assertNumQueries(0):
+            self.sync(cursor=later_cursor)
+
+    def test_unseeded_watermark_uses_database(self):
+        cursor = self.sync()['cursor']
+        redis_client = get_redis_client()
+        redis_client.delete(f'sync:watermark:user:{self.user.id}')
+
+        with self.assertNumQueries(1):
+            self.sync(cursor=cursor)
+
+    def test_since_fast_path(self):
+        since = timezone.now() + timedelta(seconds=1)
+        self.sync(since=since)
+
+        with self.assertNumQueries(0):
+            self.sync(since=since + timedelta(seconds=1))
+
+        self.trip.title = 'Updated'
+        self.trip.save()
+        envelope = self.sync(since=since - timedelta(minutes=5))
+        self.assertIn(str(self.trip.uuid), envelope['trip']['updates'])
+
+    def test_new_member_watermark_raised(self):
+        other_trip = TripSyntheticData.create_test_trip(user=self.other_user, title='Shared Trip')
+        cursor = self.sync()['cursor']
+        self.sync(cursor=cursor)
+
+        TripMember.objects.create(
+            trip=other_trip,
+            user=self.user,
+            permission_level=TripPermissionLevel.VIEWER,
+        )
+
+        envelope = self.sync(cursor=cursor)
+        self.assertIn(str(other_trip.uuid), envelope['trip']['updates'])
+
+    def test_redis_unavailable_falls_back_to_database(self):
+        cursor = self.sync()['cursor']
+        self.trip.title = 'Updated'
+        self.trip.save()
+
+        with patch('tt.apps.api.sync.get_redis_client', return_value=None):
+            envelope = self.sync(cursor=cursor)
+
+        self.assertIn(str(self.trip.uuid), envelope['trip']['updates'])
+
+    def test_change_published_on_commit(self):
+        pubsub = get_redis_client().pubsub()
+        self.addCleanup(pubsub.close)
+        pubsub.subscribe(f'sync:notify:user:{self.user.id}', f'sync:notify:trip:{self.trip.uuid}')
+
+        def get_notifications():
+            notifications = {}
+            message = pubsub.get_message(timeout=0.5)
+            while message:
+                if message['type'] == 'message':
+                    notifications[message['channel']] = message['data']
+                message = pubsub.get_message(timeout=0.5)
+                continue
+            return notifications
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.trip.title = 'Updated'
+            self.trip.save()
+        self.assertEqual({}, get_notifications())
+
+        for callback in callbacks:
+            callback()
+        change_id = str(SyncChange.objects.order_by('-id').first().id)
+        self.assertEqual(
+            {
+                f'sync:notify:user:{self.user.id}': change_id,
+                f'sync:notify:trip:{self.trip.uuid}': change_id,
+            },
+            get_notifications(),
+        )
+
+
+# =============================================================================
+# SyncMembershipCache Tests
+# =============================================================================
+
+class SyncMembershipCacheTestCase(TestCase):
+    """Test the cached trip memberships used by the sync change probe."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='testuser@example.com',
+            password='testpass123'
+        )
+        cls.other_user = User.objects.create_user(
+            email='other@example.com',
+            password='testpass123'
+        )
+        cls.trip = TripSyntheticData.create_test_trip(user=cls.user, title='Test Trip')
+
+    def setUp(self):
+        SyncMembershipCache._cache.clear_local()
+        SyncMembershipCache.invalidate(self.user.id)
+        SyncMembershipCache.invalidate(self.other_user.id)
+
+    def test_cached_after_first_check(self):
+        self.assertTrue(SyncMembershipCache.is_member(self.user.id, self.trip.uuid))
+
+        with self.assertNumQueries(0):
+            self.assertTrue(SyncMembershipCache.is_member(self.user.id, self.trip.uuid))
+            self.assertFalse(SyncMembershipCache.is_member(self.user.id, uuid4()))
+
+    def test_membership_change_invalidates_on_commit(self):
+        self.assertFalse(SyncMembershipCache.is_member(self.other_user.id, self.trip.uuid))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            member = TripSyntheticData.add_trip_member(
+                trip=self.trip,
+                user=self.other_user,
+                permission_level=TripPermissionLevel.VIEWER,
+                added_by=self.user,
+            )
+        self.assertTrue(SyncMembershipCache.is_member(self.other_user.id, self.trip.uuid))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            member.delete()
+        self.assertFalse(SyncMembershipCache.is_member(self.other_user.id, self.trip.uuid))
@@ -0,0 +1,88 @@
+"""
+Tests for API throttling.
+
+Tests that the DRF throttles use the shared Redis rate limiter, report the
+remaining quota and fail open.
+"""
+import logging
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from tt.apps.api.throttling import APIAnonRateThrottle, APIUserRateThrottle
+from tt.apps.common.middleware import RateLimitHeadersMiddleware
+from tt.apps.common.redis_client import get_redis_client
+
+logging.disable(logging.CRITICAL)
+
+User = get_user_model()
+
+
+class UserThrottle(APIUserRateThrottle):
+    rate = '3/hour'
+
+
+class AnonThrottle(APIAnonRateThrottle):
+    rate = '2/hour'
+
+
+class ThrottledView(APIView):
+    permission_classes = []
+    throttle_classes = [UserThrottle, AnonThrottle]
+
+    def get(self, request):
+        return Response({'ok': True})
+
+
+class RedisRateThrottleTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='throttled@example.com', password='pass')
+
+    def setUp(self):
+        redis_client = get_redis_client()
+        for key in redis_client.scan_iter('rate_limit:*'):
+            redis_client.delete(key)
+        self.factory = APIRequestFactory()
+        self.view = RateLimitHeadersMiddleware(ThrottledView.as_view())
+
+    def get(self, user=None, remote_addr='10.0.0.1'):
+        request = self.factory.get('/throttled/', REMOTE_ADDR=remote_addr)
+        if user:
+            force_authenticate(request, user=user)
+        response = self.view(request)
+        response.render()
+        return response
+
+    def test_user_limit_enforced_with_headers(self):
+        responses = [self.get(user=self.user) for _ in range(4)]
+
+        self.assertEqual([response.status_code for response in responses], [200, 200, 200, 429])
+        self.assertEqual(responses[0]['X-RateLimit-Limit'], '3')
+        self.assertEqual(responses[0]['X-RateLimit-Remaining'], '2')
+        self.assertEqual(responses[3]['X-RateLimit-Remaining'], '0')
+        self.assertTrue(responses[3].has_header('Retry-After'))
+
+    def test_anon_limit_is_per_address(self):
+        self.get()
+        self.get()
+
+        self.assertEqual(self.get().status_code, 429)
+        self.assertEqual(self.get(remote_addr='10.0.0.2').status_code, 200)
+
+    def test_authenticated_user_not_counted_as_anon(self):
+        responses = [self.get(user=self.user) for _ in range(3)]
+
+        self.assertEqual([response.status_code for response in responses], [200, 200, 200])
+
+    def test_fails_open_without_redis(self):
+        with patch('tt.apps.common.rate_limit.get_redis_client', return_value=None):
+            responses = [self.get(user=self.user) for _ in range(5)]
+
+        self.assertEqual({response.status_code for response in responses}, {200})
+        self.assertFalse(responses[0].has_header('X-RateLimit-Limit'))
@@ -3,12 +3,16 @@ Tests for API views.
 
 Focuses on high-value testing of:
 - SyncableAPIView response wrapping behavior
-- Header parsing (X-Sync-Since, X-Sync-Trip)
+- Header parsing (X-Sync-Since, X-Sync-Trip, X-Sync-Cursor)
 - Sync envelope inclusion for authenticated requests
 - ExtensionStatusView response format
+- SyncChangedView change probe and long-poll
 """
 import logging
+import threading
+import time
 from datetime import datetime
+from unittest.mock import patch
 from uuid import uuid4
 
 from django.contrib.auth import get_user_model
@@ -18,7 +22,10 @@ from rest_framework.response import Response
 from rest_framework.test import APIClient, APIRequestFactory
 
 from tt.apps.api.services import APITokenService
-from tt.apps.api.views import SyncableAPIView
+from tt.apps.api.sync import SyncCursor, SyncMembershipCache, SyncNotifications
+from tt.apps.api.views import SyncableAPIView, SyncChangedView
+from tt.apps.common.redis_client import get_redis_client
+from tt.apps.locations.models import Location
 from tt.apps.trips.tests.synthetic_data import TripSyntheticData
 
 logging.disable(logging.CRITICAL)
@@ -277,6 +284,31 @@ class SyncableAPIViewLocationSyncTestCase(TestCase):
         self.assertIn('versions', sync['location'])
         self.assertIn('deleted', sync['location'])
 
+    def test_sync_cursor_header_returns_delta(self):
+        """Test X-Sync-Cursor limits sync to changes after the cursor."""
+        old_trip = TripSyntheticData.create_test_trip(
+            user=self.user,
+            title='Old Trip'
+        )
+        view = TestSyncableView.as_view()
+
+        request = self.factory.get('/test/')
+        request.user = self.user
+        cursor = view(request).data['sync']['cursor']
+
+        new_trip = TripSyntheticData.create_test_trip(
+            user=self.user,
+            title='New Trip'
+        )
+        request = self.factory.get('/test/')
+        request.user = self.user
+        request.META['HTTP_X_SYNC_CURSOR'] = cursor
+        sync = view(request).data['sync']
+
+        self.assertIn(str(new_trip.uuid), sync['trip']['updates'])
+        self.assertNotIn(str(old_trip.uuid), sync['trip']['updates'])
+        self.assertNotEqual(sync['cursor'], cursor)
+
     def test_location_sync_excluded_without_trip_header(self):
         """Test location sync excluded when X-Sync-Trip header absent."""
         TripSyntheticData.create_test_trip(
@@ -375,3 +407,187 @@ class ExtensionStatusViewTestCase( TestCase ):
         self.assertEqual( response.status_code, 200 )
         sync = response.json()['sync']
         self.assertIn( str( trip.uuid ), sync['trip']['updates'] )
+
+
+# =============================================================================
+# SyncChangedView Tests
+# =============================================================================
+
+class SyncChangedViewTestCase( TestCase ):
+    """Test GET /api/v1/sync/changed/ endpoint."""
+
+    URL = '/api/v1/sync/changed/'
+
+    @classmethod
+    def setUpTestData( cls ):
+        cls.user = User.objects.create_user(
+            email = 'prober@example.com',
+            password = 'testpass123'
+        )
+        cls.other_user = User.objects.create_user(
+            email = 'other@example.com',
+            password = 'testpass123'
+        )
+        cls.token_data = APITokenService.create_token( cls.user, 'Test Token' )
+        cls.trip = TripSyntheticData.create_test_trip( user = cls.user, title = 'Test Trip' )
+        cls.other_trip = TripSyntheticData.create_test_trip( user = cls.other_user, title = 'Other Trip' )
+
+    def setUp( self ):
+        redis_client = get_redis_client()
+        for key in redis_client.scan_iter( 'sync:watermark:*' ):
+            redis_client.delete( key )
+        SyncMembershipCache.invalidate( self.user.id )
+        # Any change sets the feed watermark
+        self.trip.save()
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION = 'Bearer ' + self.token_data.api_token_str
+        )
+
+    def sync( self ):
+        """ Full sync, then a cursor sync that seeds the watermarks. Returns the cursor. """
+        cursor = self.client.get( '/api/v1/extension/status/' ).json()['sync']['cursor']
+        self.client.get(
+            '/api/v1/extension/status/',
+            HTTP_X_SYNC_CURSOR = cursor,
+            HTTP_X_SYNC_TRIP = str( self.trip.uuid ),
+        )
+        return cursor
+
+    def probe( self, cursor, trip_uuid = None ):
+        url = f'{self.URL}?cursor={cursor}'
+        if trip_uuid:
+            url += f'&trip={trip_uuid}'
+        return self.client.get( url )
+
+    def test_unchanged_without_queries( self ):
+        cursor = self.sync()
+        self.probe( cursor, trip_uuid = self.trip.uuid )  # Warm up the membership cache
+
+        with self.assertNumQueries( 0 ):
+            response = self.probe( cursor, trip_uuid = self.trip.uuid )
+
+        self.assertEqual( response.status_code, 200 )
+        self.assertEqual( response.json()['data'], { 'changed': False } )
+
+    def test_trip_change_reported( self ):
+        cursor = self.sync()
+        self.trip.title = 'Renamed'
+        self.trip.save()
+
+        response = self.probe( cursor )
+
+        self.assertEqual( response.json()['data'], { 'changed': True } )
+
+    def test_location_change_reported_for_trip_only( self ):
+        cursor = self.sync()
+        Location.objects.create( trip = self.trip, title = 'New Location' )
+
+        self.assertEqual( self.probe( cursor ).json()['data'], { 'changed': False } )
+        response = self.probe( cursor, trip_uuid = self.trip.uuid )
+        self.assertEqual( response.json()['data'], { 'changed': True } )
+
+    def test_other_trip_change_not_reported( self ):
+        cursor = self.sync()
+        self.other_trip.title = 'Renamed'
+        self.other_trip.save()
+
+        response = self.probe( cursor, trip_uuid = self.trip.uuid )
+
+        self.assertEqual( response.json()['data'], { 'changed': False } )
+
+    def test_unknown_watermark_reports_change( self ):
+        cursor = self.sync()
+        get_redis_client().delete( f'sync:watermark:user:{self.user.id}' )
+
+        response = self.probe( cursor )
+
+        self.assertEqual( response.json()['data'], { 'changed': True } )
+
+    def test_unsettled_cursor_reports_change( self ):
+        """ A late commit below an id already sent does not raise the watermarks. """
+        seen_change_id = SyncCursor.decode( self.sync() )
+        cursor = SyncCursor.encode( seen_change_id - 1, seen_change_id )
+
+        response = self.probe( cursor, trip_uuid = self.trip.uuid )
+
+        self.assertEqual( response.json()['data'], { 'changed': True } )
+
+    def test_trip_requires_membership( self ):
+        cursor = self.sync()
+
+        response = self.probe( cursor, trip_uuid = self.other_trip.uuid )
+
+        self.assertEqual( response.status_code, 404 )
+
+    def test_invalid_parameters_rejected( self ):
+        cursor = self.sync()
+
+        self.assertEqual( self.client.get( self.URL ).status_code, 400 )
+        self.assertEqual( self.probe( 'garbage' ).status_code, 400 )
+        self.assertEqual( self.probe( cursor, trip_uuid = 'not-a-uuid' ).status_code, 400 )
+
+    def test_requires_authentication( self ):
+        self.client.credentials()
+
+        response = self.client.get( f'{self.URL}?cursor=abc' )
+
+        self.assertEqual( response.status_code, 401 )
+
+    def test_redis_unavailable_returns_503( self ):
+        cursor = self.sync()
+
+        with patch( 'tt.apps.api.sync.get_redis_client', return_value = None ):
+            response = self.probe( cursor )
+            wait_response = self.client.get( f'{self.URL}?cursor={cursor}&wait=1' )
+
+        self.assertEqual( response.status_code, 503 )
+        self.assertEqual( response['Retry-After'], str( SyncChangedView.RETRY_AFTER_SECS ))
+        self.assertEqual( wait_response.status_code, 503 )
+
+    def test_wait_times_out_unchanged( self ):
+        cursor = self.sync()
+
+        started = time.monotonic()
+        response = self.client.get( f'{self.URL}?cursor={cursor}&trip={self.trip.uuid}&wait=0.5' )
+
+        self.assertGreaterEqual( time.monotonic() - started, 0.5 )
+        self.assertEqual( response.json()['data'], { 'changed': False } )
+
+    def test_wait_woken_by_notification( self ):
+        cursor = self.sync()
+        change_id = SyncCursor.decode( cursor ) + 1
+        publisher = threading.Timer( 0.3, SyncNotifications.publish, kwargs = {
+            'user_ids': [],
+            'trip_uuid': self.trip.uuid,
+            'change_id': change_id,
+        })
+        publisher.start()
+        self.addCleanup( publisher.cancel )
+
+        started = time.monotonic()
+        response = self.client.get( f'{self.URL}?cursor={cursor}&trip={self.trip.uuid}&wait=10' )
+
+        self.assertLess( time.monotonic() - started, 5 )
+        self.assertEqual( response.json()['data'], { 'changed': True } )
+
+    def test_wait_ignores_other_trip_notification( self ):
+        cursor = self.sync()
+        publisher = threading.Timer( 0.2, SyncNotifications.publish, kwargs = {
+            'user_ids': [ self.other_user.id ],
+            'trip_uuid': self.other_trip.uuid,
+            'change_id': SyncCursor.decode( cursor ) + 1,
+        })
+        publisher.start()
+        self.addCleanup( publisher.cancel )
+
+        response = self.client.get( f'{self.URL}?cursor={cursor}&trip={self.trip.uuid}&wait=0.6' )
+
+        self.assertEqual( response.json()['data'], { 'changed': False } )
+
+    def test_invalid_wait_rejected( self ):
+        cursor = self.sync()
+
+        response = self.client.get( f'{self.URL}?cursor={cursor}&wait=soon' )
+
+        self.assertEqual( response.status_code, 400 )
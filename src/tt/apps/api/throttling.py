@@ -2,16 +2,55 @@
 DRF throttling classes for API rate limiting.
 
 Provides rate limiting for both authenticated and unauthenticated API requests.
+Limits are checked with the shared Redis limiter (tt.apps.common.rate_limit)
+rather than DRF's cache-based request history.
 """
 
-from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+from rest_framework.throttling import AnonRateThrottle, SimpleRateThrottle, UserRateThrottle
 
+from tt.apps.common.rate_limit import RateLimiter, RateLimitHeaders
 
-class APIUserRateThrottle( UserRateThrottle ):
+
+class RedisRateThrottle( SimpleRateThrottle ):
+    """
+    SimpleRateThrottle using RateLimiter.  Subclasses still provide the
+    scope and get_cache_key().  Allows requests when Redis is unavailable.
+    """
+    algorithm = RateLimiter.SLIDING_WINDOW
+
+    rate_limit_result = None
+
+    def allow_request( self, request, view ):
+        if self.rate is None:
+            return True
+
+        key = self.get_cache_key( request, view )
+        if key is None:
+            return True
+
+        limiter = RateLimiter(
+            limit = self.num_requests,
+            period_secs = self.duration,
+            algorithm = self.algorithm,
+        )
+        self.rate_limit_result = limiter.hit( key )
+        if self.rate_limit_result is None:
+            return True
+
+        RateLimitHeaders.attach( request, self.rate_limit_result )
+        return self.rate_limit_result.allowed
+
+    def wait( self ):
+        if self.rate_limit_result is None:
+            return None
+        return self.rate_limit_result.retry_after_secs
+
+
+class APIUserRateThrottle( RedisRateThrottle, UserRateThrottle ):
     """Rate limit for authenticated API users."""
     scope = 'api_user'
 
 
-class APIAnonRateThrottle( AnonRateThrottle ):
+class APIAnonRateThrottle( RedisRateThrottle, AnonRateThrottle ):
     """Rate limit for unauthenticated API requests (auth attempts)."""
     scope = 'api_anon'
@@ -3,6 +3,7 @@ from django.urls import path, include
 from .views import (
     CurrentUserView,
     ExtensionStatusView,
+    SyncChangedView,
     TokenCollectionView,
     TokenItemView,
 )
@@ -14,6 +15,7 @@ urlpatterns = [
     path('v1/tokens/<str:lookup_key>/', TokenItemView.as_view(), name='api-token-item'),
     path('v1/me/', CurrentUserView.as_view(), name='api-current-user'),
     path('v1/extension/status/', ExtensionStatusView.as_view(), name='api-extension-status'),
+    path('v1/sync/changed/', SyncChangedView.as_view(), name='api-sync-changed'),
 
     # Feature-specific delegated API routes
     path('v1/client-config/', include('tt.apps.client_config.api.urls')),
@@ -2,16 +2,21 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from rest_framework import status
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, JsonResponse
+from django.views import View
+from rest_framework import exceptions, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
+from .authentication import APITokenDRFAuthAdapter
 from .constants import APIFields as F
 from .messages import APIMessages as M
 from .services import APITokenService
-from .sync import SyncEnvelopeBuilder
+from .sync import SyncCursor, SyncEnvelopeBuilder, SyncMembershipCache, SyncNotifications
 from .utils import get_str
 
 from tt.apps.client_config.services import ClientConfigService
@@ -139,6 +144,7 @@ class SyncableAPIView( TtApiView ):
     for the request context (authenticated user, anonymous, etc.).
 
     Sync headers:
+        X-Sync-Cursor: Opaque cursor from a previous envelope (preferred)
         X-Sync-Since: ISO 8601 timestamp for incremental sync
         X-Sync-Trip: UUID of the current/active trip for location scoping
     """
@@ -163,7 +169,8 @@ class SyncableAPIView( TtApiView ):
     def _build_sync_envelope( self, request: Request ) -> dict:
         since = self._parse_sync_since( request )
         trip_uuid = self._parse_sync_trip( request )
-        builder = SyncEnvelopeBuilder( request.user, since, trip_uuid )
+        cursor = request.headers.get( 'X-Sync-Cursor' ) or None
+        builder = SyncEnvelopeBuilder( request.user, since, trip_uuid, cursor = cursor )
         return builder.build()
 
     def _parse_sync_since( self, request: Request ) -> Optional[datetime]:
@@ -201,3 +208,123 @@ class ExtensionStatusView( SyncableAPIView ):
             F.UUID: str( request.user.uuid ),
             F.CONFIG_VERSION: ClientConfigService.get_version(),
         })
+
+
+class SyncChangedView( View ):
+    """
+    Long-poll for sync changes, so idle clients need not run full syncs.
+
+    GET /api/v1/sync/changed/?cursor={cursor}[&trip={uuid}][&wait={seconds}]
+
+    Answers whether anything after the cursor (from a previous sync
+    envelope) changed for the user's trips, or for the given trip's
+    locations, waiting up to `wait` seconds (default 0, at most
+    MAX_WAIT_SECS) for a change to happen.  Returns {"data": {"changed":
+    true|false}}, like TtApiView; after true, the client runs a normal sync
+    and waits again with the new cursor.  The answer comes from the Redis
+    sync watermarks and the wake-up from Redis pub/sub (SyncNotifications),
+    and the trip access check from SyncMembershipCache, so with token auth
+    also cached a wait makes no database queries.  Without Redis, returns
+    503 and the client falls back to polling.
+
+    This is an async Django view rather than a DRF one: waiting must not
+    hold a request thread, so production serves this path from the ASGI
+    application (src/bin/docker-start-uvicorn.sh, routed by nginx) while
+    the rest of the site stays on gunicorn.  Only Bearer token
+    authentication is accepted.  An unsettled cursor always reports a
+    change, since a late commit below an id already sent does not raise the
+    watermarks.
+    """
+
+    MAX_WAIT_SECS = 55
+    RETRY_AFTER_SECS = 60
+
+    async def get( self, request: HttpRequest ) -> JsonResponse:
+        user, error_response = await sync_to_async( self._authenticate )( request )
+        if error_response:
+            return error_response
+
+        cursor = request.GET.get( 'cursor' )
+        position = SyncCursor.decode_position( cursor ) if cursor else None
+        if position is None:
+            return JsonResponse(
+                { F.ERROR: 'A valid cursor is required' },
+                status = status.HTTP_400_BAD_REQUEST,
+            )
+        after_change_id, seen_change_id = position
+
+        try:
+            wait_secs = float( request.GET.get( 'wait', 0 ))
+        except ValueError:
+            return JsonResponse(
+                { F.ERROR: 'wait must be a number of seconds' },
+                status = status.HTTP_400_BAD_REQUEST,
+            )
+        wait_secs = min( max( wait_secs, 0 ), self.MAX_WAIT_SECS )
+
+        trip_uuid = None
+        trip_uuid_str = request.GET.get( 'trip' )
+        if trip_uuid_str:
+            try:
+                trip_uuid = UUID( trip_uuid_str )
+            except ValueError:
+                return JsonResponse(
+                    { F.ERROR: 'Invalid trip UUID format' },
+                    status = status.HTTP_400_BAD_REQUEST,
+                )
+            if not await sync_to_async( SyncMembershipCache.is_member )( user.id, trip_uuid ):
+                return JsonResponse(
+                    { 'detail': exceptions.NotFound.default_detail },
+                    status = status.HTTP_404_NOT_FOUND,
+                )
+
+        if seen_change_id > after_change_id:
+            return self._changed_response( True )
+
+        is_changed = await SyncNotifications.wait_for_change(
+            user_id = user.id,
+            trip_uuid = trip_uuid,
+            after_change_id = after_change_id,
+            timeout = wait_secs,
+        )
+        if is_changed is None:
+            response = JsonResponse(
+                { F.ERROR: 'Change detection is unavailable' },
+                status = status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+            response['Retry-After'] = str( self.RETRY_AFTER_SECS )
+            return response
+        return self._changed_response( is_changed )
+
+    def _authenticate( self, request: HttpRequest ):
+        """ Returns ( user, None ), or ( None, error response ) as DRF would answer. """
+        authenticator = APITokenDRFAuthAdapter()
+        try:
+            user_auth = authenticator.authenticate( request )
+        except exceptions.AuthenticationFailed as e:
+            return None, self._unauthorized_response( e.detail )
+        if user_auth is None:
+            return None, self._unauthorized_response( exceptions.NotAuthenticated.default_detail )
+
+        request.user = user_auth[0]
+        for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+            throttle = throttle_class()
+            if throttle.allow_request( request, self ):
+                continue
+            response = JsonResponse(
+                { 'detail': exceptions.Throttled.default_detail },
+                status = status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+            retry_after_secs = throttle.wait()
+            if retry_after_secs is not None:
+                response['Retry-After'] = str( int( retry_after_secs ))
+            return None, response
+        return request.user, None
+
+    def _unauthorized_response( self, detail ) -> JsonResponse:
+        response = JsonResponse( { 'detail': str( detail ) }, status = status.HTTP_401_UNAUTHORIZED )
+        response['WWW-Authenticate'] = APITokenDRFAuthAdapter.keyword
+        return response
+
+    def _changed_response( self, is_changed : bool ) -> JsonResponse:
+        return JsonResponse( { 'data': { F.SYNC_CHANGED: is_changed } } )
@@ -8,12 +8,12 @@ efficient caching and signal-based invalidation.
 import hashlib
 import json
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List
 
 from django.conf import settings
 
 from tt.apps.api.constants import APIFields as F
-from tt.apps.common.redis_client import get_redis_client
+from tt.apps.common.tiered_cache import TieredCache
 from tt.apps.contacts.enums import ContactType
 from tt.apps.locations.enums import AdvancedBookingType, DesirabilityType
 from tt.apps.locations.models import LocationCategory
@@ -29,17 +29,20 @@ class ClientConfigService:
     Service for building and caching client configuration.
 
     Aggregates location categories/subcategories into a single payload with
-    version hash for efficient sync. Uses Redis caching with infinite TTL
-    and signal-based invalidation when source data changes.
+    version hash for efficient sync. Uses the shared two-tier cache (see
+    TieredCache) with infinite TTL and signal-based invalidation when source
+    data changes.
 
     Cache Strategy:
     - Infinite TTL (no expiration)
     - Invalidated via signals when LocationCategory or LocationSubCategory changes
+    - Other processes see the invalidation within TieredCache.TTL_LOCAL_SECS
     - Version is MD5 hash of payload for change detection
     """
 
-    CACHE_KEY_PAYLOAD = 'client_config:payload'
-    CACHE_KEY_VERSION = 'client_config:version'
+    CACHE_KEY_PAYLOAD = 'payload'
+
+    _cache = TieredCache(namespace='client_config')
 
     @classmethod
     def get_config_serialized(cls) -> Dict[str, Any]:
@@ -47,44 +50,26 @@ class ClientConfigService:
         Get the full client config, serialized for API response.
 
         Returns cached serialized config if available, otherwise builds,
-        serializes, and caches it.
+        serializes, and caches it. The result is shared with other callers
+        and must not be modified.
 
         Returns:
             Dict with 'config_version' and 'location_categories' keys, ready for API response
         """
-        # Try cache first
-        cached = cls._get_cached_payload()
-        if cached is not None:
-            return cached
-
-        # Cache miss - build, serialize, and cache
-        return cls._build_and_cache_config()
+        return cls._cache.get_or_load(cls.CACHE_KEY_PAYLOAD, cls._build_config)
 
     @classmethod
     def get_version(cls) -> str:
         """
         Get just the config version hash.
 
-        More efficient than get_config_serialized() when only version is needed
-        (e.g., for ExtensionStatusView).
+        Usually served from the in-process cache tier, so this costs no
+        more than reading the full config.
 
         Returns:
             MD5 hash string of the config payload
         """
-        # Try cache first
-        try:
-            redis_client = get_redis_client()
-            if redis_client:
-                cached_version = redis_client.get(cls.CACHE_KEY_VERSION)
-                if cached_version:
-                    logger.debug("Cache hit for config version")
-                    return cached_version  # Already a string (decode_responses=True)
-        except Exception as e:
-            logger.warning(f"Redis error getting config version: {e}")
-
-        # Cache miss - need to build full config to get version
-        config = cls._build_and_cache_config()
-        return config[F.CONFIG_VERSION]
+        return cls.get_config_serialized()[F.CONFIG_VERSION]
 
     @classmethod
     def invalidate_cache(cls) -> None:
@@ -94,42 +79,7 @@ class ClientConfigService:
         Called by signal handlers when LocationCategory or LocationSubCategory
         changes. Next request will rebuild the config from the database.
         """
-        try:
-            redis_client = get_redis_client()
-            if not redis_client:
-                return
-
-            deleted_payload = redis_client.delete(cls.CACHE_KEY_PAYLOAD)
-            deleted_version = redis_client.delete(cls.CACHE_KEY_VERSION)
-
-            if deleted_payload or deleted_version:
-                logger.info("Invalidated client config cache")
-            else:
-                logger.debug("No client config cache to invalidate")
-
-        except Exception as e:
-            logger.warning(f"Redis error invalidating client config cache: {e}")
-
-    @classmethod
-    def _get_cached_payload(cls) -> Optional[Dict[str, Any]]:
-        """
-        Get serialized config from cache if available.
-
-        Returns:
-            Cached serialized config dict or None if not cached
-        """
-        try:
-            redis_client = get_redis_client()
-            if redis_client:
-                cached_data = redis_client.get(cls.CACHE_KEY_PAYLOAD)
-                if cached_data:
-                    logger.debug("Cache hit for client config")
-                    return json.loads(cached_data)
-                logger.debug("Cache miss for client config")
-        except Exception as e:
-            logger.warning(f"Redis error getting cached config: {e}")
-
-        return None
+        cls._cache.invalidate_all()
 
     @classmethod
     def _build_enum_type_list(cls, enum_class) -> List[Dict[str, str]]:
@@ -147,9 +97,9 @@ class ClientConfigService:
         ]
 
     @classmethod
-    def _build_and_cache_config(cls) -> Dict[str, Any]:
+    def _build_config(cls) -> Dict[str, Any]:
         """
-        Build config from database, serialize it, and cache.
+        Build config from database and serialize it.
 
         Returns:
             Serialized config dict with version and location_categories
@@ -179,30 +129,5 @@ class ClientConfigService:
         # Update version in serialized output
         serialized[F.CONFIG_VERSION] = version
 
-        # Cache the result
-        cls._cache_payload(serialized, version)
-
+        logger.debug(f"Built client config (version={version})")
         return serialized
-
-    @classmethod
-    def _cache_payload(cls, payload: Dict[str, Any], version: str) -> None:
-        """
-        Store serialized config in Redis cache with infinite TTL.
-        """
-        try:
-            redis_client = get_redis_client()
-            if not redis_client:
-                logger.debug("Redis not available, skipping cache storage")
-                return
-
-            # Cache full payload
-            payload_json = json.dumps(payload)
-            redis_client.set(cls.CACHE_KEY_PAYLOAD, payload_json)
-
-            # Cache version separately for efficient lookups
-            redis_client.set(cls.CACHE_KEY_VERSION, version)
-
-            logger.debug(f"Cached client config (version={version})")
-
-        except Exception as e:
-            logger.warning(f"Redis error caching client config: {e}")
@@ -204,8 +204,8 @@ class ClientConfigServiceTestCase(TestCase):
     def test_get_config_serialized_uses_cache_on_second_call(self):
         """Test get_config_serialized returns cached result on subsequent calls."""
         with patch.object(
-            ClientConfigService, '_build_and_cache_config',
-            wraps=ClientConfigService._build_and_cache_config
+            ClientConfigService, '_build_config',
+            wraps=ClientConfigService._build_config
         ) as mock_build:
             # First call should build
             ClientConfigService.get_config_serialized()
@@ -218,8 +218,8 @@ class ClientConfigServiceTestCase(TestCase):
     def test_invalidate_cache_causes_rebuild(self):
         """Test invalidate_cache causes next get_config_serialized to rebuild."""
         with patch.object(
-            ClientConfigService, '_build_and_cache_config',
-            wraps=ClientConfigService._build_and_cache_config
+            ClientConfigService, '_build_config',
+            wraps=ClientConfigService._build_config
         ) as mock_build:
             # First call builds
             ClientConfigService.get_config_serialized()
@@ -235,7 +235,7 @@ class ClientConfigServiceTestCase(TestCase):
     def test_get_config_serialized_works_without_redis(self):
         """Test get_config_serialized works when Redis is unavailable."""
         with patch(
-            'tt.apps.client_config.services.get_redis_client',
+            'tt.apps.common.tiered_cache.get_redis_client',
             return_value=None
         ):
             # Should still return valid config
@@ -247,7 +247,7 @@ class ClientConfigServiceTestCase(TestCase):
     def test_get_version_works_without_redis(self):
         """Test get_version works when Redis is unavailable."""
         with patch(
-            'tt.apps.client_config.services.get_redis_client',
+            'tt.apps.common.tiered_cache.get_redis_client',
             return_value=None
         ):
             # Should still return valid version
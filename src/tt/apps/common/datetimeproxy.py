@@ -8,13 +8,15 @@ subclass this to override methods to simulate a different wall clock
 time than actually exists.
 """
 
+import bisect
 import datetime
 import calendar
+import functools
 import pytz
 import logging
 from email.utils import format_datetime
 from email.utils import parsedate_to_datetime
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from django.conf import settings
 from django.utils import timezone
@@ -431,32 +433,11 @@ def offset_to_timezone( offset_minutes : int, reference_datetime : datetime.date
     Returns:
         IANA timezone name (e.g., 'America/New_York') or fallback Etc/GMT format
     """
-    from tt.constants import TIMEZONE_NAME_LIST
-
     # Find timezone that has this offset at the given datetime
     # This is important because DST changes which timezone has which offset
-    target_offset = datetime.timedelta(minutes=offset_minutes)
-
-    # First, try to match against our preferred short-list of common timezones
-    for tz_name in TIMEZONE_NAME_LIST:
-        try:
-            tz = pytz.timezone(tz_name)
-            # Check what offset this timezone has at the reference datetime
-            tz_dt = reference_datetime.astimezone(tz)
-            if tz_dt.utcoffset() == target_offset:
-                return tz_name
-        except Exception:
-            continue
-
-    # If no match in preferred list, fall back to any common timezone
-    for tz_name in pytz.common_timezones:
-        try:
-            tz = pytz.timezone(tz_name)
-            tz_dt = reference_datetime.astimezone(tz)
-            if tz_dt.utcoffset() == target_offset:
-                return tz_name
-        except Exception:
-            continue
+    tz_name = _find_timezone_for_offset(offset_minutes, reference_datetime)
+    if tz_name:
+        return tz_name
 
     # Final fallback: create a fixed offset timezone name if no match found
     sign = '+' if offset_minutes >= 0 else '-'
@@ -502,35 +483,80 @@ def gps_to_timezone(latitude: float, longitude: float) -> Optional[str]:
         The latitude parameter is currently unused but retained for API compatibility
         if a more sophisticated implementation is added later.
     """
-    from tt.constants import TIMEZONE_NAME_LIST
-
     # Estimate UTC offset from longitude (each 15 degrees = 1 hour)
     offset_hours = round(longitude / 15)
     offset_minutes = offset_hours * 60
 
     # Find a timezone that matches this offset
     # Use current time as reference for DST consideration
-    reference_dt = now()
-    target_offset = datetime.timedelta(minutes=offset_minutes)
+    return _find_timezone_for_offset(offset_minutes, now())
 
-    # First try preferred timezones
-    for tz_name in TIMEZONE_NAME_LIST:
+
+def _find_timezone_for_offset( offset_minutes : int, reference_datetime : datetime.datetime ) -> Optional[str]:
+    """
+    The first timezone in TIMEZONE_NAME_LIST, then pytz.common_timezones,
+    whose UTC offset at reference_datetime is offset_minutes (None if none).
+    """
+    reference_utc = reference_datetime.astimezone(pytz.utc).replace(tzinfo=None)
+    period_starts, period_offset_maps = _get_offset_timezone_table(reference_utc.year)
+    offset_map = period_offset_maps[bisect.bisect_right(period_starts, reference_utc)]
+    return offset_map.get(datetime.timedelta(minutes=offset_minutes))
+
+
+@functools.lru_cache( maxsize = 32 )
+def _get_offset_timezone_table(
+        year : int ) -> Tuple[List[datetime.datetime], List[Dict[datetime.timedelta, str]]]:
+    """
+    Offset to timezone lookup for one (UTC) year, built on first use.
+
+    The year is split into periods at every instant where some candidate
+    timezone changes its UTC offset (DST and other transitions).  Within a
+    period no offsets change, so for each one we keep a map from UTC offset
+    to the first candidate, in preference order, that has it.  This gives
+    the same answers as converting the reference datetime to every
+    candidate, with one conversion per candidate and transition per year
+    rather than hundreds per lookup.
+
+    Returns:
+        (period_starts, period_offset_maps): naive UTC start of the 2nd and
+        later periods, and one offset map per period.
+    """
+    from tt.constants import TIMEZONE_NAME_LIST
+
+    candidates = []
+    for tz_name in dict.fromkeys(list(TIMEZONE_NAME_LIST) + list(pytz.common_timezones)):
         try:
-            tz = pytz.timezone(tz_name)
-            tz_dt = reference_dt.astimezone(tz)
-            if tz_dt.utcoffset() == target_offset:
-                return tz_name
+            candidates.append(( tz_name, pytz.timezone(tz_name) ))
         except Exception:
             continue
 
-    # Fall back to common timezones
-    for tz_name in pytz.common_timezones:
-        try:
-            tz = pytz.timezone(tz_name)
-            tz_dt = reference_dt.astimezone(tz)
-            if tz_dt.utcoffset() == target_offset:
-                return tz_name
-        except Exception:
+    year_start = datetime.datetime(year, 1, 1)
+    transitions = {}
+    for index, ( _, tz ) in enumerate(candidates):
+        # Fixed offset timezones have no transition times
+        for transition_time in getattr(tz, '_utc_transition_times', ()):
+            if transition_time.year == year and transition_time > year_start:
+                transitions.setdefault(transition_time, []).append(index)
             continue
+        continue
 
-    return None
+    def get_offset( tz, utc_datetime ):
+        return pytz.utc.localize(utc_datetime).astimezone(tz).utcoffset()
+
+    def get_offset_map( offsets ):
+        offset_map = {}
+        for ( tz_name, _ ), offset in zip(candidates, offsets):
+            offset_map.setdefault(offset, tz_name)
+            continue
+        return offset_map
+
+    offsets = [ get_offset(tz, year_start) for _, tz in candidates ]
+    period_starts = sorted(transitions)
+    period_offset_maps = [ get_offset_map(offsets) ]
+    for period_start in period_starts:
+        for index in transitions[period_start]:
+            offsets[index] = get_offset(candidates[index][1], period_start)
+            continue
+        period_offset_maps.append(get_offset_map(offsets))
+        continue
+    return period_starts, period_offset_maps
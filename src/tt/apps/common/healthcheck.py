@@ -2,7 +2,7 @@ from typing import Dict
 
 from django.db import connection
 
-from .redis_client import get_redis_client
+from .redis_client import CacheNotAvailableError, get_redis_client
 
 
 def do_healthcheck( db_layer = True, cache_layer = True ) -> Dict[ str, str ]:
@@ -23,7 +23,10 @@ def do_healthcheck( db_layer = True, cache_layer = True ) -> Dict[ str, str ]:
 
     if cache_layer:
         try:
-            get_redis_client().ping()
+            redis_client = get_redis_client()
+            if not redis_client:
+                raise CacheNotAvailableError( 'Redis unavailable (circuit open)' )
+            redis_client.ping()
         except Exception as e:
             status['cache'] = f'unhealthy: {str(e)}'
             status['is_healthy'] = False
@@ -0,0 +1,17 @@
+from .rate_limit import RateLimitHeaders
+
+
+class RateLimitHeadersMiddleware(object):
+    """
+    Adds the remaining quota of any rate limit checked while handling the
+    request (DRF throttles, rate_limit decorator) to the response.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        return
+
+    def __call__(self, request):
+        response = self.get_response( request )
+        RateLimitHeaders.apply( request, response )
+        return response
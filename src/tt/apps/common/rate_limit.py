@@ -1,27 +1,336 @@
 """
-Rate limiting utilities for Django views.
+Rate limiting for Django views and DRF throttles.
 
-Provides decorators for rate limiting view methods using Django's cache framework.
-"""
+One Redis-backed limiter engine (RateLimiter) with two algorithms:
+
+- Sliding window: a weighted count of the current and previous fixed
+  windows.  Close to a true sliding log, but O(1) state per key instead of
+  a timestamp per request.
+- Token bucket: allows bursts up to the limit, refilling evenly over the
+  period.
 
+Each check is a single Redis round trip (one Lua script).  On Redis servers
+without scripting the same state change runs as a WATCH/MULTI transaction.
+If Redis is unavailable, requests are allowed (fail open).
+
+The rate_limit decorator and the DRF throttles in tt.apps.api.throttling
+both use it, and RateLimitHeadersMiddleware adds the remaining quota to
+responses.
+"""
+import logging
+import math
+import time
+from dataclasses import dataclass
 from functools import wraps
+from typing import List, Optional, Tuple
+
+import redis
+from django.http import HttpRequest, HttpResponse
+
+from .redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RateLimitResult:
+    allowed           : bool
+    limit             : int
+    remaining         : int
+    retry_after_secs  : Optional[float]  = None   # Only when not allowed
+
+
+# State changes, in Lua for the single round trip path.  These must match
+# the Python versions in RateLimiter (_slide_window, _refill_bucket).
+
+SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber( ARGV[1] )
+local period_ms = tonumber( ARGV[2] )
+local now_ms = tonumber( ARGV[3] )
+local cost = tonumber( ARGV[4] )
+local window = math.floor( now_ms / period_ms )
+local state = redis.call( 'HMGET', KEYS[1], 'w', 'c', 'p' )
+local state_window = tonumber( state[1] )
+local current = tonumber( state[2] ) or 0
+local previous = tonumber( state[3] ) or 0
+if state_window == window - 1 then
+    previous = current
+    current = 0
+elseif state_window ~= window then
+    previous = 0
+    current = 0
+end
+local weight = ( period_ms - ( now_ms - window * period_ms )) / period_ms
+if previous * weight + current + cost > limit then
+    return { 0, current, previous }
+end
+current = current + cost
+redis.call( 'HSET', KEYS[1], 'w', window, 'c', current, 'p', previous )
+redis.call( 'PEXPIRE', KEYS[1], 2 * period_ms )
+return { 1, current, previous }
+"""
+
+TOKEN_BUCKET_SCRIPT = """
+local limit = tonumber( ARGV[1] )
+local period_ms = tonumber( ARGV[2] )
+local now_ms = tonumber( ARGV[3] )
+local cost = tonumber( ARGV[4] )
+local state = redis.call( 'HMGET', KEYS[1], 't', 'ts' )
+local tokens = tonumber( state[1] )
+local updated_ms = tonumber( state[2] )
+if tokens == nil or updated_ms == nil then
+    tokens = limit
+    updated_ms = now_ms
+end
+tokens = math.min( limit, tokens + math.max( 0, now_ms - updated_ms ) * limit / period_ms )
+local allowed = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+end
+redis.call( 'HSET', KEYS[1], 't', tostring( tokens ), 'ts', now_ms )
+redis.call( 'PEXPIRE', KEYS[1], period_ms )
+return { allowed, tostring( tokens ) }
+"""
+
+
+class RateLimiter:
+    """
+    Allows up to limit requests per period_secs for each key.
+
+    Usage:
+        limiter = RateLimiter( limit = 100, period_secs = 3600 )
+        result = limiter.hit( f'my_operation:{user.id}' )
+        if result and not result.allowed:
+            ...
+
+    hit() returns None when Redis is unavailable; callers should allow the
+    request.
+    """
+
+    SLIDING_WINDOW = 'sliding_window'
+    TOKEN_BUCKET = 'token_bucket'
+
+    KEY_PREFIXES = {
+        SLIDING_WINDOW: 'rate_limit:sw',
+        TOKEN_BUCKET: 'rate_limit:tb',
+    }
+    SCRIPTS = {
+        SLIDING_WINDOW: SLIDING_WINDOW_SCRIPT,
+        TOKEN_BUCKET: TOKEN_BUCKET_SCRIPT,
+    }
+    MAX_TRANSACTION_ATTEMPTS = 5
+
+    # Cleared when the server turns out not to support scripting
+    _scripting_supported = True
+    _registered_scripts = {}
 
-from django.core.cache import cache
-from django.http import HttpResponse
+    def __init__( self,
+                  limit        : int,
+                  period_secs  : float,
+                  algorithm    : str    = SLIDING_WINDOW ):
+        if algorithm not in self.SCRIPTS:
+            raise ValueError( f'Unknown rate limit algorithm: {algorithm}' )
+        self.limit = limit
+        self.period_ms = max( 1, int( period_secs * 1000 ))
+        self.algorithm = algorithm
+        return
 
+    def hit( self, key : str, cost : int = 1 ) -> Optional[RateLimitResult]:
+        """ Count a request against the key's quota, if the quota allows it. """
+        redis_key = f'{self.KEY_PREFIXES[self.algorithm]}:{key}'
+        now_ms = self._now_ms()
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                return None
+            state = None
+            if RateLimiter._scripting_supported:
+                state = self._run_script( redis_client, redis_key, now_ms, cost )
+            if state is None:
+                state = self._run_transaction( redis_client, redis_key, now_ms, cost )
+        except Exception as e:
+            logger.warning( f"Redis error checking rate limit: {e}" )
+            return None
+        if state is None:
+            return None
 
-def rate_limit( key_prefix: str, limit: int, period_secs: int ):
+        if self.algorithm == self.SLIDING_WINDOW:
+            allowed, current, previous = state
+            return self._window_result( bool( allowed ), int( current ), int( previous ), now_ms, cost )
+        allowed, tokens = state
+        return self._bucket_result( bool( allowed ), float( tokens ), cost )
+
+    def _now_ms( self ) -> int:
+        return int( time.time() * 1000 )
+
+    def _run_script( self, redis_client, redis_key : str, now_ms : int, cost : int ) -> Optional[list]:
+        script = self._get_script( redis_client )
+        try:
+            return script( keys = [ redis_key ], args = [ self.limit, self.period_ms, now_ms, cost ] )
+        except redis.exceptions.ResponseError as e:
+            if 'unknown command' not in str( e ).lower():
+                raise
+            logger.warning( f"Redis does not support scripting, rate limits use transactions: {e}" )
+            RateLimiter._scripting_supported = False
+            return None
+
+    def _get_script( self, redis_client ):
+        registry_key = ( id( redis_client ), self.algorithm )
+        script = RateLimiter._registered_scripts.get( registry_key )
+        if script is None:
+            script = redis_client.register_script( self.SCRIPTS[self.algorithm] )
+            RateLimiter._registered_scripts[registry_key] = script
+        return script
+
+    def _run_transaction( self, redis_client, redis_key : str, now_ms : int, cost : int ) -> Optional[list]:
+        """ Same state change as the script, as an optimistic transaction. """
+        with redis_client.pipeline() as pipeline:
+            for _ in range( self.MAX_TRANSACTION_ATTEMPTS ):
+                try:
+                    pipeline.watch( redis_key )
+                    if self.algorithm == self.SLIDING_WINDOW:
+                        state, mapping = self._slide_window( pipeline.hmget( redis_key, 'w', 'c', 'p' ),
+                                                             now_ms, cost )
+                    else:
+                        state, mapping = self._refill_bucket( pipeline.hmget( redis_key, 't', 'ts' ),
+                                                              now_ms, cost )
+                    pipeline.multi()
+                    if mapping:
+                        pipeline.hset( redis_key, mapping = mapping )
+                        pipeline.pexpire( redis_key, self._get_expiry_ms() )
+                    pipeline.execute()
+                    return state
+                except redis.exceptions.WatchError:
+                    continue
+        logger.warning( f"Rate limit state kept changing, allowing request: {redis_key}" )
+        return None
+
+    def _get_expiry_ms( self ) -> int:
+        if self.algorithm == self.SLIDING_WINDOW:
+            return 2 * self.period_ms
+        return self.period_ms
+
+    def _slide_window( self, stored : List[Optional[str]], now_ms : int, cost : int ) -> Tuple[list, dict]:
+        state_window = int( stored[0] ) if stored[0] is not None else None
+        current = int( stored[1] or 0 )
+        previous = int( stored[2] or 0 )
+        window = now_ms // self.period_ms
+        if state_window == window - 1:
+            previous = current
+            current = 0
+        elif state_window != window:
+            previous = 0
+            current = 0
+        weight = ( self.period_ms - ( now_ms - window * self.period_ms )) / self.period_ms
+        if previous * weight + current + cost > self.limit:
+            return [ 0, current, previous ], {}
+        current += cost
+        return [ 1, current, previous ], { 'w': window, 'c': current, 'p': previous }
+
+    def _refill_bucket( self, stored : List[Optional[str]], now_ms : int, cost : int ) -> Tuple[list, dict]:
+        if stored[0] is None or stored[1] is None:
+            tokens = float( self.limit )
+            updated_ms = now_ms
+        else:
+            tokens = float( stored[0] )
+            updated_ms = int( stored[1] )
+        tokens = min( self.limit, tokens + max( 0, now_ms - updated_ms ) * self.limit / self.period_ms )
+        allowed = 0
+        if tokens >= cost:
+            tokens -= cost
+            allowed = 1
+        # Same precision as Lua's tostring()
+        tokens_str = '%.14g' % tokens
+        return [ allowed, tokens_str ], { 't': tokens_str, 'ts': now_ms }
+
+    def _window_result( self,
+                        allowed   : bool,
+                        current   : int,
+                        previous  : int,
+                        now_ms    : int,
+                        cost      : int ) -> RateLimitResult:
+        elapsed_ms = now_ms % self.period_ms
+        weight = ( self.period_ms - elapsed_ms ) / self.period_ms
+        remaining = max( 0, math.floor( self.limit - previous * weight - current ))
+        if allowed:
+            return RateLimitResult( allowed = True, limit = self.limit, remaining = remaining )
+
+        # When will previous * weight + current + cost fit within the limit?
+        if current + cost > self.limit and not current:
+            # A single request costing more than the limit never fits
+            retry_ms = self.period_ms
+        elif current + cost <= self.limit:
+            fit_weight = ( self.limit - current - cost ) / previous
+            retry_ms = self.period_ms * ( 1 - fit_weight ) - elapsed_ms
+        else:
+            # Only after this window's count becomes the previous one
+            fit_weight = max( 0, self.limit - cost ) / current
+            retry_ms = ( self.period_ms - elapsed_ms ) + self.period_ms * ( 1 - fit_weight )
+        return RateLimitResult(
+            allowed = False,
+            limit = self.limit,
+            remaining = remaining,
+            retry_after_secs = max( 0.001, retry_ms / 1000 ),
+        )
+
+    def _bucket_result( self, allowed : bool, tokens : float, cost : int ) -> RateLimitResult:
+        result = RateLimitResult( allowed = allowed, limit = self.limit, remaining = math.floor( tokens ))
+        if not allowed:
+            retry_ms = ( cost - tokens ) * self.period_ms / self.limit
+            result.retry_after_secs = max( 0.001, retry_ms / 1000 )
+        return result
+
+
+class RateLimitHeaders:
+    """
+    Remaining quota response headers.  Limiters attach their result to the
+    request and RateLimitHeadersMiddleware (or the rate_limit decorator)
+    applies the most restrictive one to the response.
+    """
+
+    REQUEST_ATTR = '_tt_rate_limit_result'
+
+    LIMIT = 'X-RateLimit-Limit'
+    REMAINING = 'X-RateLimit-Remaining'
+    RETRY_AFTER = 'Retry-After'
+
+    @classmethod
+    def attach( cls, request : HttpRequest, result : RateLimitResult ) -> None:
+        # DRF Request wraps the HttpRequest the middleware sees
+        request = getattr( request, '_request', request )
+        existing = getattr( request, cls.REQUEST_ATTR, None )
+        if existing is None or result.remaining < existing.remaining or not result.allowed:
+            setattr( request, cls.REQUEST_ATTR, result )
+        return
+
+    @classmethod
+    def apply( cls, request : HttpRequest, response : HttpResponse ) -> None:
+        request = getattr( request, '_request', request )
+        result = getattr( request, cls.REQUEST_ATTR, None )
+        if result is None:
+            return
+        response[cls.LIMIT] = str( result.limit )
+        response[cls.REMAINING] = str( result.remaining )
+        if result.retry_after_secs is not None and not response.has_header( cls.RETRY_AFTER ):
+            response[cls.RETRY_AFTER] = str( math.ceil( result.retry_after_secs ))
+        return
+
+
+def rate_limit( key_prefix  : str,
+                limit       : int,
+                period_secs : int,
+                algorithm   : str = RateLimiter.SLIDING_WINDOW ):
     """
     Rate limiting decorator for Django class-based view methods.
 
-    Uses Django's cache framework with proper TTL handling:
-    - cache.add() sets TTL only on first request (when key doesn't exist)
-    - cache.incr() atomically increments without resetting TTL
+    Limits are per user (see RateLimiter) and fail open without Redis.
 
     Args:
-        key_prefix: Prefix for cache key (e.g., 'api_token_ops')
+        key_prefix: Prefix for the limit key (e.g., 'api_token_ops')
         limit: Maximum requests allowed in the period_secs
         period_secs: Time period_secs in seconds
+        algorithm: RateLimiter.SLIDING_WINDOW or RateLimiter.TOKEN_BUCKET
 
     Returns:
         429 response if rate limit exceeded, otherwise proceeds to view
@@ -32,33 +341,25 @@ def rate_limit( key_prefix: str, limit: int, period_secs: int ):
             def post(self, request, *args, **kwargs):
                 ...
     """
+    limiter = RateLimiter( limit = limit, period_secs = period_secs, algorithm = algorithm )
+
     def decorator(view_func):
         @wraps(view_func)
         def wrapped(self, request, *args, **kwargs):
-            user_id = request.user.id
-            cache_key = f'rate_limit:{key_prefix}:{user_id}'
-
-            # Try to add key with initial value 1 (only succeeds if key doesn't exist)
-            # This sets the TTL only once when the window starts
-            if cache.add( cache_key, 1, period_secs ):
-                # Key was created, this is first request in window
+            result = limiter.hit( f'{key_prefix}:{request.user.id}' )
+            if result is None:
                 return view_func( self, request, *args, **kwargs )
 
-            # Key exists, increment and check limit
-            try:
-                count = cache.incr( cache_key )
-            except ValueError:
-                # Key expired between add() and incr(), treat as first request
-                cache.set( cache_key, 1, period_secs )
-                return view_func( self, request, *args, **kwargs )
-
-            if count > limit:
-                return HttpResponse(
+            RateLimitHeaders.attach( request, result )
+            if result.allowed:
+                response = view_func( self, request, *args, **kwargs )
+            else:
+                response = HttpResponse(
                     'Rate limit exceeded. Please try again later.',
                     status = 429,
                     content_type = 'text/plain',
                 )
-
-            return view_func( self, request, *args, **kwargs )
+            RateLimitHeaders.apply( request, response )
+            return response
         return wrapped
     return decorator
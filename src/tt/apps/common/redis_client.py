@@ -1,86 +1,338 @@
+"""
+Process-wide Redis client.
+
+The client uses an explicit, bounded connection pool whose idle connections
+are health checked (PING) before reuse.  A circuit breaker tracks connection
+failures: after repeated failures (or if Redis is down at process start)
+get_redis_client() returns None for a cool-down period, so callers skip
+Redis immediately instead of each waiting on socket timeouts.  After the
+cool-down, one caller probes the server; success closes the circuit, and
+failure reopens it with a longer (exponential backoff) cool-down.
+
+Callers keep their existing pattern: None means Redis is unavailable, and
+errors from individual commands are still raised to them.  The get_many,
+set_many, delete_many and execute_pipeline helpers do several operations in
+one round trip and handle both cases themselves.
+"""
 import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
 import redis
 
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
-# We want to allow running without the redis dependency, so it is not
-# enough to see a "None" for the client to know whether we tried to
-# initialize the client or not.
-#
-_g_global_redis_initialized_attempted = False
 
-# According to docs, the Redis client is thread safe.
-#
-_g_global_redis_client = None
+class RedisCircuitBreaker:
+    """
+    Closed: Redis is used.  Open: Redis is skipped until the cool-down ends.
+    Half-open (cool-down over): a single caller is let through to probe.
+    """
 
+    FAILURE_THRESHOLD = 3
+    BASE_COOL_DOWN_SECS = 5
+    MAX_COOL_DOWN_SECS = 300
 
-def initialize_global_cache_client():
+    def __init__( self ):
+        self._lock = threading.Lock()
+        self._failure_count = 0
+        self._open_count = 0
+        self._opened_at = None
+        return
+
+    @property
+    def is_open( self ) -> bool:
+        return self._opened_at is not None
+
+    @property
+    def cool_down_secs( self ) -> float:
+        backoff = self.BASE_COOL_DOWN_SECS * ( 2 ** max( 0, self._open_count - 1 ))
+        return min( backoff, self.MAX_COOL_DOWN_SECS )
+
+    def allow_request( self ) -> bool:
+        """ False while open; True for closed, or for the one half-open probe. """
+        if self._opened_at is None:
+            return True
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._now() - self._opened_at < self.cool_down_secs:
+                return False
+            # Restart the cool-down so that concurrent callers keep skipping
+            # Redis while this one probes.
+            self._opened_at = self._now()
+            return True
+
+    def record_success( self ) -> None:
+        if self._failure_count == 0 and self._opened_at is None:
+            return
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info( 'Redis is reachable again, closing circuit breaker' )
+            self._failure_count = 0
+            self._open_count = 0
+            self._opened_at = None
+        return
+
+    def record_failure( self ) -> None:
+        with self._lock:
+            self._failure_count += 1
+            if self._opened_at is not None:
+                # Failed probe
+                self._open_count += 1
+                self._opened_at = self._now()
+            elif self._failure_count >= self.FAILURE_THRESHOLD:
+                self._open_count = 1
+                self._opened_at = self._now()
+            else:
+                return
+        logger.warning( f'Redis unavailable, skipping it for {self.cool_down_secs:.0f}s' )
+        return
+
+    def trip( self ) -> None:
+        """ Open immediately, e.g., when Redis is down at process start. """
+        with self._lock:
+            self._failure_count = max( self._failure_count, self.FAILURE_THRESHOLD )
+            self._open_count += 1
+            self._opened_at = self._now()
+        return
+
+    def _now( self ) -> float:
+        return time.monotonic()
+
+
+class ManagedPipeline( redis.client.Pipeline ):
+    """ Pipeline that reports connection failures to the circuit breaker. """
+
+    def __init__( self, *args, circuit_breaker : RedisCircuitBreaker, **kwargs ):
+        super().__init__( *args, **kwargs )
+        self.circuit_breaker = circuit_breaker
+        return
+
+    def execute( self, raise_on_error = True ):
+        return _track( self.circuit_breaker, super().execute, raise_on_error )
+
+    def immediate_execute_command( self, *args, **options ):
+        return _track( self.circuit_breaker, super().immediate_execute_command, *args, **options )
+
+
+class ManagedRedis( redis.StrictRedis ):
+    """ Client that reports connection failures to the circuit breaker. """
+
+    def __init__( self, *args, circuit_breaker : RedisCircuitBreaker, **kwargs ):
+        super().__init__( *args, **kwargs )
+        self.circuit_breaker = circuit_breaker
+        return
+
+    def execute_command( self, *args, **options ):
+        return _track( self.circuit_breaker, super().execute_command, *args, **options )
+
+    def pipeline( self, transaction = True, shard_hint = None ) -> ManagedPipeline:
+        return ManagedPipeline(
+            self.connection_pool,
+            self.response_callbacks,
+            transaction,
+            shard_hint,
+            circuit_breaker = self.circuit_breaker,
+        )
+
+
+def _track( circuit_breaker : RedisCircuitBreaker, func : Callable, *args, **kwargs ):
+    try:
+        result = func( *args, **kwargs )
+    except ( redis.exceptions.ConnectionError, redis.exceptions.TimeoutError ):
+        circuit_breaker.record_failure()
+        raise
+    circuit_breaker.record_success()
+    return result
+
+
+class RedisClientManager:
     """
-    Need to call this once at process start if you want to use cache-based
-    features.
+    Owns the connection pool, client and circuit breaker for one server.
     """
-    global _g_global_redis_initialized_attempted
-    global _g_global_redis_client
 
-    if _g_global_redis_initialized_attempted:
+    MAX_CONNECTIONS = 50
+    POOL_TIMEOUT_SECS = 5          # Waiting for a free pooled connection
+    SOCKET_TIMEOUT_SECS = 5
+    SOCKET_CONNECT_TIMEOUT_SECS = 2
+    HEALTH_CHECK_INTERVAL_SECS = 30
+
+    def __init__( self, host : str, port : int, db : int = 0 ):
+        self.host = host
+        self.port = port or 6379
+        self.circuit_breaker = RedisCircuitBreaker()
+        self.connection_pool = redis.BlockingConnectionPool(
+            host = self.host,
+            port = self.port,
+            db = db,
+            max_connections = self.MAX_CONNECTIONS,
+            timeout = self.POOL_TIMEOUT_SECS,
+            socket_timeout = self.SOCKET_TIMEOUT_SECS,
+            socket_connect_timeout = self.SOCKET_CONNECT_TIMEOUT_SECS,
+            health_check_interval = self.HEALTH_CHECK_INTERVAL_SECS,
+            decode_responses = True,
+        )
+        self.client = ManagedRedis(
+            connection_pool = self.connection_pool,
+            circuit_breaker = self.circuit_breaker,
+        )
+        self._connect()
         return
-    _g_global_redis_initialized_attempted = True
-    
-    if _g_global_redis_client:
-        _g_global_redis_client = None  # No good way to explicitly "close" this
 
-    host, port = ( settings.REDIS_HOST, settings.REDIS_PORT )
-    if not port:
-        port = 6379
+    def _connect( self ) -> None:
+        logger.info( "Attempting to connect to Redis at %s:%s ..." % ( self.host, self.port ))
+        try:
+            self.client.ping()
+            logger.info( "Successfully connected to Redis at %s:%s" % ( self.host, self.port ))
+        except redis.exceptions.RedisError as e:
+            logger.error( f'Could not connect to Redis server: {e}' )
+            self.circuit_breaker.trip()
+        return
 
-    logger.info( "Attempting to connect to Redis at %s:%s ..." % ( host, port ))
+    def get_client( self ) -> Optional[ManagedRedis]:
+        if not self.circuit_breaker.is_open:
+            return self.client
+        if not self.circuit_breaker.allow_request():
+            return None
+        # Half-open: probe with a cheap command rather than the caller's
+        try:
+            self.client.ping()
+        except redis.exceptions.RedisError:
+            return None
+        return self.client
 
-    try:
-        _g_global_redis_client = redis.StrictRedis( host = host,
-                                                    port = port,
-                                                    db = 0,
-                                                    socket_timeout = 5,
-                                                    socket_connect_timeout = 5,
-                                                    decode_responses = True )
-        _g_global_redis_client.ping()
-        logger.info( "Successfully connected to Redis at %s:%s" % ( host, port ))
-        
-    except ( ConnectionRefusedError, redis.exceptions.ConnectionError ) as e:
-        logger.error( f'Could not connect to Redis server: {e}' )
-        _g_global_redis_client = None
-    except ValueError as ve:
-        logger.exception( f'Problem seting up Redis client: {ve}' )
-        _g_global_redis_client = None
-        
+    def close( self ) -> None:
+        self.connection_pool.disconnect()
+        return
+
+
+# According to docs, the Redis client is thread safe.
+#
+_g_redis_client_manager = None
+_g_redis_client_manager_lock = threading.Lock()
+
+
+def initialize_global_cache_client():
+    """
+    Called on first use; can also be called at process start to connect
+    eagerly.
+    """
+    global _g_redis_client_manager
+
+    if _g_redis_client_manager:
+        return
+    with _g_redis_client_manager_lock:
+        if _g_redis_client_manager:
+            return
+        try:
+            _g_redis_client_manager = RedisClientManager(
+                host = settings.REDIS_HOST,
+                port = settings.REDIS_PORT,
+            )
+        except ValueError as ve:
+            logger.exception( f'Problem seting up Redis client: {ve}' )
     return
 
 
 def exists_redis_client():
-    if not _g_global_redis_client:
-        initialize_global_cache_client()
-    return _g_global_redis_client is not None
-       
+    return get_redis_client() is not None
 
-def get_redis_client():
-    if not _g_global_redis_client:
+
+def get_redis_client() -> Optional[ManagedRedis]:
+    """ The client, or None while Redis is unavailable (see module docs). """
+    if not _g_redis_client_manager:
         initialize_global_cache_client()
-    return _g_global_redis_client
+    if not _g_redis_client_manager:
+        return None
+    return _g_redis_client_manager.get_client()
 
 
 def clear_redis_client():
-    global _g_global_redis_client_initialized
-    global _g_global_redis_client
-    if _g_global_redis_client:
-        logger.info( "Clearing existing Redis connection" )
-        _g_global_redis_client_initialized = False
-        _g_global_redis_client = None  # No good way to explicitly "close" this
+    global _g_redis_client_manager
+    with _g_redis_client_manager_lock:
+        if _g_redis_client_manager:
+            logger.info( "Clearing existing Redis connection" )
+            _g_redis_client_manager.close()
+            _g_redis_client_manager = None
     return
 
 
-class CacheNotAvailableError(Exception):
-    pass
+def get_many( keys : Iterable[str] ) -> Dict[str, Optional[str]]:
+    """
+    Fetch several keys in one round trip (MGET).  Missing keys, and all
+    keys when Redis is unavailable, map to None.
+    """
+    keys = list( keys )
+    if not keys:
+        return {}
+    values = [ None ] * len( keys )
+    try:
+        redis_client = get_redis_client()
+        if redis_client:
+            values = redis_client.mget( keys )
+    except Exception as e:
+        logger.warning( f"Redis error getting keys: {e}" )
+    return dict( zip( keys, values ))
+
+
+def set_many( mapping : Dict[str, str], ttl_secs : Optional[int] = None ) -> bool:
+    """ Store several keys in one round trip.  Returns False if not stored. """
+    if not mapping:
+        return True
+
+    def build( pipeline ):
+        for key, value in mapping.items():
+            if ttl_secs:
+                pipeline.setex( key, ttl_secs, value )
+            else:
+                pipeline.set( key, value )
+            continue
+        return
+
+    return execute_pipeline( build ) is not None
+
+
+def delete_many( keys : Iterable[str] ) -> int:
+    """ Delete several keys in one round trip.  Returns the number deleted. """
+    keys = list( keys )
+    if not keys:
+        return 0
+    try:
+        redis_client = get_redis_client()
+        if redis_client:
+            return redis_client.delete( *keys )
+    except Exception as e:
+        logger.warning( f"Redis error deleting keys: {e}" )
+    return 0
+
 
+def execute_pipeline( build        : Callable[[redis.client.Pipeline], None],
+                      transaction  : bool                                     = False ) -> Optional[List]:
+    """
+    Queue commands with build( pipeline ) and send them in one round trip.
+    Returns the command results, or None if Redis is unavailable or failed.
 
-    
+    Usage:
+        results = execute_pipeline( lambda pipeline: (
+            pipeline.get( 'a' ),
+            pipeline.hgetall( 'b' ),
+        ))
+    """
+    try:
+        redis_client = get_redis_client()
+        if not redis_client:
+            return None
+        pipeline = redis_client.pipeline( transaction = transaction )
+        build( pipeline )
+        return pipeline.execute()
+    except Exception as e:
+        logger.warning( f"Redis error executing pipeline: {e}" )
+        return None
+
+
+class CacheNotAvailableError(Exception):
+    pass
@@ -2,10 +2,12 @@ import datetime
 import logging
 import pytz
 import unittest
+from unittest.mock import patch
 
 from django.utils import timezone
 
 import tt.apps.common.datetimeproxy as datetimeproxy
+from tt.constants import TIMEZONE_NAME_LIST
 
 logging.disable(logging.CRITICAL)
 
@@ -334,3 +336,68 @@ class TestGpsToTimezone(unittest.TestCase):
         self.assertGreaterEqual(offset.total_seconds(), 0)
         self.assertLessEqual(offset.total_seconds(), 1 * 3600)
     
+
+
+class TestOffsetToTimezone(unittest.TestCase):
+    """Test the precomputed UTC offset to timezone lookup."""
+
+    OFFSET_MINUTES_LIST = [ -600, -420, -300, -240, -210, 0, 60, 120, 330, 345, 540, 630, 17 ]
+
+    def scan_timezones( self, offset_minutes, reference_datetime ):
+        """Reference answer: convert to every candidate, in preference order."""
+        target_offset = datetime.timedelta( minutes = offset_minutes )
+        for tz_name in list( TIMEZONE_NAME_LIST ) + list( pytz.common_timezones ):
+            try:
+                if reference_datetime.astimezone( pytz.timezone( tz_name )).utcoffset() == target_offset:
+                    return tz_name
+            except Exception:
+                continue
+        return None
+
+    def test_matches_scan_around_transitions(self):
+        period_starts, _ = datetimeproxy._get_offset_timezone_table( 2024 )
+        reference_datetimes = [ pytz.utc.localize( datetime.datetime( 2024, 1, 1 )) ]
+        for period_start in period_starts[::4]:
+            reference_datetime = pytz.utc.localize( period_start )
+            reference_datetimes += [ reference_datetime, reference_datetime - datetime.timedelta( seconds = 1 ) ]
+            continue
+
+        for reference_datetime in reference_datetimes:
+            for offset_minutes in self.OFFSET_MINUTES_LIST:
+                expected = self.scan_timezones( offset_minutes, reference_datetime )
+                if expected is None:
+                    expected = datetimeproxy.offset_to_timezone( offset_minutes, reference_datetime )
+                    self.assertTrue( expected.startswith( 'Etc/GMT' ))
+                self.assertEqual( expected,
+                                  datetimeproxy.offset_to_timezone( offset_minutes, reference_datetime ),
+                                  f'{offset_minutes} at {reference_datetime}' )
+                continue
+            continue
+        return
+
+    def test_dst_period_changes_answer(self):
+        winter_dt = pytz.utc.localize( datetime.datetime( 2024, 1, 15, 12, 0 ))
+        summer_dt = pytz.utc.localize( datetime.datetime( 2024, 7, 15, 12, 0 ))
+
+        winter_tz = pytz.timezone( datetimeproxy.offset_to_timezone( -300, winter_dt ))
+        summer_tz = pytz.timezone( datetimeproxy.offset_to_timezone( -300, summer_dt ))
+
+        self.assertEqual( datetime.timedelta( hours = -5 ), winter_dt.astimezone( winter_tz ).utcoffset() )
+        self.assertEqual( datetime.timedelta( hours = -5 ), summer_dt.astimezone( summer_tz ).utcoffset() )
+        self.assertNotEqual( winter_tz.zone, summer_tz.zone )
+        return
+
+    def test_unknown_offset_falls_back_to_etc(self):
+        reference_datetime = pytz.utc.localize( datetime.datetime( 2024, 6, 15 ))
+        self.assertEqual( 'Etc/GMT+0:17', datetimeproxy.offset_to_timezone( 17, reference_datetime ))
+        return
+
+    def test_lookups_do_not_convert_timezones(self):
+        reference_datetime = pytz.utc.localize( datetime.datetime( 2023, 3, 1 ))
+        datetimeproxy.offset_to_timezone( 60, reference_datetime )
+
+        with patch.object( datetimeproxy.pytz, 'timezone', side_effect = AssertionError ):
+            for day in range( 1, 29 ):
+                datetimeproxy.offset_to_timezone( 60, reference_datetime.replace( day = day ))
+                continue
+        return
@@ -1,160 +1,269 @@
 """
-Tests for rate limiting decorator.
+Tests for rate limiting.
 
-Tests the rate_limit decorator used to protect Django views from abuse.
+Tests the RateLimiter engine (sliding window and token bucket), the remaining
+quota headers and the rate_limit decorator used to protect Django views from
+abuse.
 """
 
 import logging
-from unittest.mock import patch
+from unittest import skipUnless
+from unittest.mock import Mock, patch
 
+import redis
 from django.contrib.auth import get_user_model
 from django.http import HttpResponse
 from django.test import TestCase, RequestFactory
 from django.views import View
 
-from tt.apps.common.rate_limit import rate_limit
+from tt.apps.common.middleware import RateLimitHeadersMiddleware
+from tt.apps.common.rate_limit import RateLimiter, RateLimitHeaders, RateLimitResult, rate_limit
+from tt.apps.common.redis_client import get_redis_client
 
 logging.disable( logging.CRITICAL )
 
 User = get_user_model()
 
 
+def clear_rate_limits():
+    redis_client = get_redis_client()
+    for key in redis_client.scan_iter( 'rate_limit:*' ):
+        redis_client.delete( key )
+
+
+def is_scripting_supported():
+    try:
+        get_redis_client().eval( 'return 1', 0 )
+        return True
+    except Exception:
+        return False
+
+
+class RateLimiterTestCase( TestCase ):
+    """Test RateLimiter algorithms, with a controlled clock."""
+
+    START_MS = 1_000_000 * 60_000  # On a window boundary for a 60s period
+
+    def setUp(self):
+        clear_rate_limits()
+        self.now_ms = self.START_MS
+        patcher = patch.object( RateLimiter, '_now_ms', side_effect=lambda: self.now_ms )
+        patcher.start()
+        self.addCleanup( patcher.stop )
+
+    def hit_many(self, limiter, count, key='user:1'):
+        return [ limiter.hit( key ) for _ in range( count ) ]
+
+    def test_sliding_window_allows_up_to_limit(self):
+        limiter = RateLimiter( limit=3, period_secs=60 )
+
+        results = self.hit_many( limiter, 4 )
+
+        self.assertEqual( [ result.allowed for result in results ], [ True, True, True, False ] )
+        self.assertEqual( [ result.remaining for result in results ], [ 2, 1, 0, 0 ] )
+        self.assertIsNone( results[0].retry_after_secs )
+        self.assertGreater( results[3].retry_after_secs, 0 )
+
+    def test_sliding_window_weighs_previous_window(self):
+        limiter = RateLimiter( limit=10, period_secs=60 )
+        self.hit_many( limiter, 10 )
+
+        # Halfway into the next window, half of the previous count still counts
+        self.now_ms = self.START_MS + 90_000
+        results = self.hit_many( limiter, 6 )
+
+        self.assertEqual( [ result.allowed for result in results ], [ True ] * 5 + [ False ] )
+
+    def test_sliding_window_retry_after_is_accurate(self):
+        limiter = RateLimiter( limit=10, period_secs=60 )
+        self.hit_many( limiter, 10 )
+        self.now_ms = self.START_MS + 90_000
+        self.hit_many( limiter, 5 )
+
+        denied = limiter.hit( 'user:1' )
+        self.now_ms += int( denied.retry_after_secs * 1000 ) + 1
+
+        self.assertTrue( limiter.hit( 'user:1' ).allowed )
+
+    def test_sliding_window_forgets_old_windows(self):
+        limiter = RateLimiter( limit=3, period_secs=60 )
+        self.hit_many( limiter, 3 )
+
+        self.now_ms = self.START_MS + 120_000
+
+        self.assertEqual( limiter.hit( 'user:1' ).remaining, 2 )
+
+    def test_token_bucket_allows_burst_then_refills(self):
+        limiter = RateLimiter( limit=4, period_secs=60, algorithm=RateLimiter.TOKEN_BUCKET )
+
+        results = self.hit_many( limiter, 5 )
+        self.assertEqual( [ result.allowed for result in results ], [ True ] * 4 + [ False ] )
+        self.assertAlmostEqual( results[4].retry_after_secs, 15, places=2 )
+
+        self.now_ms += 15_000
+        self.assertTrue( limiter.hit( 'user:1' ).allowed )
+        self.assertFalse( limiter.hit( 'user:1' ).allowed )
+
+    def test_keys_are_independent(self):
+        limiter = RateLimiter( limit=1, period_secs=60 )
+
+        self.assertTrue( limiter.hit( 'user:1' ).allowed )
+        self.assertTrue( limiter.hit( 'user:2' ).allowed )
+        self.assertFalse( limiter.hit( 'user:1' ).allowed )
+
+    def test_fails_open_without_redis(self):
+        limiter = RateLimiter( limit=1, period_secs=60 )
+
+        with patch( 'tt.apps.common.rate_limit.get_redis_client', return_value=None ):
+            self.assertIsNone( limiter.hit( 'user:1' ) )
+
+    def test_fails_open_on_redis_error(self):
+        limiter = RateLimiter( limit=1, period_secs=60 )
+
+        with patch( 'tt.apps.common.rate_limit.get_redis_client',
+                    side_effect=redis.exceptions.ConnectionError( 'down' ) ):
+            self.assertIsNone( limiter.hit( 'user:1' ) )
+
+    def test_falls_back_to_transaction_without_scripting(self):
+        limiter = RateLimiter( limit=2, period_secs=60 )
+        script = Mock( side_effect=redis.exceptions.ResponseError( "unknown command 'evalsha'" ) )
+
+        with patch.object( RateLimiter, '_scripting_supported', True ):
+            with patch.object( RateLimiter, '_get_script', return_value=script ):
+                results = self.hit_many( limiter, 3 )
+                self.assertFalse( RateLimiter._scripting_supported )
+
+        self.assertEqual( [ result.allowed for result in results ], [ True, True, False ] )
+
+    def test_unknown_algorithm_rejected(self):
+        with self.assertRaises( ValueError ):
+            RateLimiter( limit=1, period_secs=60, algorithm='leaky' )
+
+    @skipUnless( is_scripting_supported(), 'Redis server does not support scripting' )
+    def test_script_matches_transaction(self):
+        for algorithm in [ RateLimiter.SLIDING_WINDOW, RateLimiter.TOKEN_BUCKET ]:
+            limiter = RateLimiter( limit=5, period_secs=60, algorithm=algorithm )
+            with self.subTest( algorithm=algorithm ):
+                scripted = []
+                transacted = []
+                for offset_ms in [ 0, 1_000, 2_000, 3_000, 4_000, 5_000, 65_000, 90_000, 91_000 ]:
+                    self.now_ms = self.START_MS + offset_ms
+                    scripted.append( limiter.hit( 'scripted' ) )
+                    with patch.object( RateLimiter, '_scripting_supported', False ):
+                        transacted.append( limiter.hit( 'transacted' ) )
+                self.assertEqual( scripted, transacted )
+
+
+class RateLimitHeadersTestCase( TestCase ):
+    """Test remaining quota headers."""
+
+    def setUp(self):
+        self.request = RequestFactory().get( '/test/' )
+
+    def test_most_restrictive_result_is_applied(self):
+        RateLimitHeaders.attach( self.request, RateLimitResult( allowed=True, limit=100, remaining=40 ) )
+        RateLimitHeaders.attach( self.request, RateLimitResult( allowed=True, limit=10, remaining=3 ) )
+        RateLimitHeaders.attach( self.request, RateLimitResult( allowed=True, limit=1000, remaining=900 ) )
+
+        response = RateLimitHeadersMiddleware( lambda request: HttpResponse( 'OK' ) )( self.request )
+
+        self.assertEqual( response['X-RateLimit-Limit'], '10' )
+        self.assertEqual( response['X-RateLimit-Remaining'], '3' )
+        self.assertFalse( response.has_header( 'Retry-After' ) )
+
+    def test_denied_result_sets_retry_after(self):
+        RateLimitHeaders.attach(
+            self.request,
+            RateLimitResult( allowed=False, limit=10, remaining=0, retry_after_secs=2.2 ),
+        )
+
+        response = RateLimitHeadersMiddleware( lambda request: HttpResponse( status=429 ) )( self.request )
+
+        self.assertEqual( response['Retry-After'], '3' )
+
+    def test_no_headers_without_rate_limit(self):
+        response = RateLimitHeadersMiddleware( lambda request: HttpResponse( 'OK' ) )( self.request )
+
+        self.assertFalse( response.has_header( 'X-RateLimit-Limit' ) )
+
+
 class RateLimitDecoratorTestCase( TestCase ):
     """Test rate_limit decorator behavior."""
 
     def setUp(self):
         """Create test user and request factory."""
+        clear_rate_limits()
         self.user = User.objects.create_user(
             email='testuser@example.com',
             password='testpass123',
         )
         self.factory = RequestFactory()
 
-    def _make_view_class(self, limit, period_secs):
+    def _make_view_class(self, limit, period_secs, key_prefix='test_ops'):
         """Create a test view class with rate limiting."""
         class TestView( View ):
-            @rate_limit( 'test_ops', limit=limit, period_secs=period_secs )
+            @rate_limit( key_prefix, limit=limit, period_secs=period_secs )
             def post(self, request, *args, **kwargs):
                 return HttpResponse( 'OK', status=200 )
 
         return TestView
 
-    def test_first_request_succeeds(self):
-        """Test first request within rate limit succeeds."""
-        with patch( 'tt.apps.common.rate_limit.cache' ) as mock_cache:
-            mock_cache.add.return_value = True  # Key didn't exist, was created
-
-            ViewClass = self._make_view_class( limit=10, period_secs=3600 )
-            view = ViewClass.as_view()
-
-            request = self.factory.post( '/test/' )
-            request.user = self.user
-
-            response = view( request )
-
-            self.assertEqual( response.status_code, 200 )
-            mock_cache.add.assert_called_once()
+    def _post(self, view, user=None):
+        request = self.factory.post( '/test/' )
+        request.user = user or self.user
+        return view( request )
 
     def test_requests_under_limit_succeed(self):
-        """Test requests under rate limit all succeed."""
-        with patch( 'tt.apps.common.rate_limit.cache' ) as mock_cache:
-            # Simulate incrementing counter (key exists)
-            mock_cache.add.return_value = False
-            mock_cache.incr.side_effect = [2, 3, 4, 5]  # Return incrementing counts
-
-            ViewClass = self._make_view_class( limit=10, period_secs=3600 )
-            view = ViewClass.as_view()
+        """Test requests under rate limit all succeed, with remaining quota headers."""
+        view = self._make_view_class( limit=10, period_secs=3600 ).as_view()
 
-            request = self.factory.post( '/test/' )
-            request.user = self.user
+        for i in range( 4 ):
+            response = self._post( view )
+            self.assertEqual( response.status_code, 200, f'Request {i+1} should succeed' )
 
-            # Make 4 requests, all should succeed
-            for i in range( 4 ):
-                response = view( request )
-                self.assertEqual( response.status_code, 200, f'Request {i+1} should succeed' )
+        self.assertEqual( response['X-RateLimit-Limit'], '10' )
+        self.assertEqual( response['X-RateLimit-Remaining'], '6' )
 
     def test_requests_over_limit_return_429(self):
         """Test requests over rate limit return 429."""
-        with patch( 'tt.apps.common.rate_limit.cache' ) as mock_cache:
-            mock_cache.add.return_value = False  # Key exists
-            mock_cache.incr.return_value = 11  # Over limit of 10
-
-            ViewClass = self._make_view_class( limit=10, period_secs=3600 )
-            view = ViewClass.as_view()
-
-            request = self.factory.post( '/test/' )
-            request.user = self.user
-
-            response = view( request )
-
-            self.assertEqual( response.status_code, 429 )
-            self.assertIn( 'Rate limit', response.content.decode() )
+        view = self._make_view_class( limit=2, period_secs=3600 ).as_view()
+        self._post( view )
+        self._post( view )
 
-    def test_cache_key_includes_user_id(self):
-        """Test cache key includes user ID for per-user limiting."""
-        with patch( 'tt.apps.common.rate_limit.cache' ) as mock_cache:
-            mock_cache.add.return_value = True
+        response = self._post( view )
 
-            ViewClass = self._make_view_class( limit=10, period_secs=3600 )
-            view = ViewClass.as_view()
+        self.assertEqual( response.status_code, 429 )
+        self.assertIn( 'Rate limit', response.content.decode() )
+        self.assertEqual( response['X-RateLimit-Remaining'], '0' )
+        self.assertTrue( response.has_header( 'Retry-After' ) )
 
-            request = self.factory.post( '/test/' )
-            request.user = self.user
-
-            view( request )
-
-            # Check that cache.add was called with a key containing the user ID
-            call_args = mock_cache.add.call_args
-            cache_key = call_args[0][0]
-            self.assertIn( str( self.user.id ), cache_key )
-            self.assertIn( 'test_ops', cache_key )
+    def test_limit_is_per_user(self):
+        """Test users have independent limits."""
+        other_user = User.objects.create_user(
+            email='otheruser@example.com',
+            password='testpass123',
+        )
+        view = self._make_view_class( limit=1, period_secs=3600 ).as_view()
+        self._post( view )
 
-    def test_handles_cache_race_condition(self):
-        """Test decorator handles race condition when key expires between add and incr."""
-        with patch( 'tt.apps.common.rate_limit.cache' ) as mock_cache:
-            # Simulate: add returns False (key exists), but incr raises ValueError (key expired)
-            mock_cache.add.return_value = False
-            mock_cache.incr.side_effect = ValueError( 'Key not found' )
+        self.assertEqual( self._post( view, user=other_user ).status_code, 200 )
+        self.assertEqual( self._post( view ).status_code, 429 )
 
-            ViewClass = self._make_view_class( limit=10, period_secs=3600 )
-            view = ViewClass.as_view()
+    def test_different_key_prefixes_are_independent(self):
+        """Test different key prefixes create independent rate limits."""
+        view_a = self._make_view_class( limit=1, period_secs=3600, key_prefix='prefix_a' ).as_view()
+        view_b = self._make_view_class( limit=1, period_secs=3600, key_prefix='prefix_b' ).as_view()
+        self._post( view_a )
 
-            request = self.factory.post( '/test/' )
-            request.user = self.user
+        self.assertEqual( self._post( view_b ).status_code, 200 )
+        self.assertEqual( self._post( view_a ).status_code, 429 )
 
-            response = view( request )
+    def test_fails_open_without_redis(self):
+        """Test requests proceed when Redis is unavailable."""
+        view = self._make_view_class( limit=1, period_secs=3600 ).as_view()
 
-            # Should succeed and set a new key
-            self.assertEqual( response.status_code, 200 )
-            mock_cache.set.assert_called_once()
+        with patch( 'tt.apps.common.rate_limit.get_redis_client', return_value=None ):
+            responses = [ self._post( view ) for _ in range( 3 ) ]
 
-    def test_different_key_prefixes_are_independent(self):
-        """Test different key prefixes create independent rate limits."""
-        with patch( 'tt.apps.common.rate_limit.cache' ) as mock_cache:
-            mock_cache.add.return_value = True
-
-            # Two views with different prefixes
-            class View1( View ):
-                @rate_limit( 'prefix_a', limit=10, period_secs=3600 )
-                def post(self, request):
-                    return HttpResponse( 'View1' )
-
-            class View2( View ):
-                @rate_limit( 'prefix_b', limit=10, period_secs=3600 )
-                def post(self, request):
-                    return HttpResponse( 'View2' )
-
-            request = self.factory.post( '/test/' )
-            request.user = self.user
-
-            View1.as_view()( request )
-            View2.as_view()( request )
-
-            # Both should use different cache keys
-            calls = mock_cache.add.call_args_list
-            self.assertEqual( len( calls ), 2 )
-            key1 = calls[0][0][0]
-            key2 = calls[1][0][0]
-            self.assertIn( 'prefix_a', key1 )
-            self.assertIn( 'prefix_b', key2 )
-            self.assertNotEqual( key1, key2 )
+        self.assertEqual( [ response.status_code for response in responses ], [ 200, 200, 200 ] )
+        self.assertFalse( responses[0].has_header( 'X-RateLimit-Limit' ) )
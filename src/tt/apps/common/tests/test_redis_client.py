@@ -0,0 +1,176 @@
+"""
+Tests for the managed Redis client.
+
+Covers the circuit breaker, failure tracking on the client and pipelines,
+recovery after Redis comes back, and the multi-key helpers.
+"""
+import logging
+import socket
+from unittest.mock import patch
+
+import redis
+from django.test import SimpleTestCase
+
+from tt.apps.common import redis_client as redis_client_module
+from tt.apps.common.redis_client import (
+    RedisCircuitBreaker,
+    RedisClientManager,
+    delete_many,
+    execute_pipeline,
+    get_many,
+    get_redis_client,
+    set_many,
+)
+
+logging.disable(logging.CRITICAL)
+
+
+def get_unused_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class RedisCircuitBreakerTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        self.breaker = RedisCircuitBreaker()
+        patcher = patch.object(RedisCircuitBreaker, '_now', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_opens_after_repeated_failures(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow_request())
+
+        self.breaker.record_failure()
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_success_resets_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_single_probe_after_cool_down(self):
+        self.breaker.trip()
+        self.now += RedisCircuitBreaker.BASE_COOL_DOWN_SECS
+
+        self.assertTrue(self.breaker.allow_request())
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_failed_probes_back_off_exponentially(self):
+        self.breaker.trip()
+        cool_downs = []
+        for _ in range(4):
+            cool_downs.append(self.breaker.cool_down_secs)
+            self.now += self.breaker.cool_down_secs
+            self.assertTrue(self.breaker.allow_request())
+            self.breaker.record_failure()
+
+        self.assertEqual(cool_downs, [5, 10, 20, 40])
+
+    def test_cool_down_is_capped(self):
+        for _ in range(20):
+            self.breaker.trip()
+
+        self.assertEqual(self.breaker.cool_down_secs, RedisCircuitBreaker.MAX_COOL_DOWN_SECS)
+
+    def test_successful_probe_closes(self):
+        self.breaker.trip()
+        self.now += RedisCircuitBreaker.BASE_COOL_DOWN_SECS
+        self.breaker.allow_request()
+        self.breaker.record_success()
+
+        self.assertFalse(self.breaker.is_open)
+        self.assertEqual(self.breaker.cool_down_secs, RedisCircuitBreaker.BASE_COOL_DOWN_SECS)
+
+
+class RedisClientManagerTestCase(SimpleTestCase):
+
+    def test_down_at_start_skips_redis_until_cool_down(self):
+        manager = RedisClientManager(host='127.0.0.1', port=get_unused_port())
+        self.addCleanup(manager.close)
+
+        self.assertTrue(manager.circuit_breaker.is_open)
+        with patch.object(manager.client, 'ping') as mock_ping:
+            self.assertIsNone(manager.get_client())
+        mock_ping.assert_not_called()
+
+    def test_reconnects_when_redis_comes_back(self):
+        real_kwargs = get_redis_client().connection_pool.connection_kwargs
+        with patch.object(redis_client_module.ManagedRedis, 'ping',
+                          side_effect=redis.exceptions.ConnectionError('down')):
+            manager = RedisClientManager(host=real_kwargs['host'], port=real_kwargs['port'])
+        self.addCleanup(manager.close)
+        self.assertIsNone(manager.get_client())
+
+        manager.circuit_breaker._opened_at -= RedisCircuitBreaker.BASE_COOL_DOWN_SECS
+
+        self.assertIs(manager.get_client(), manager.client)
+        self.assertFalse(manager.circuit_breaker.is_open)
+
+    def test_command_failures_open_circuit(self):
+        manager = RedisClientManager(host='127.0.0.1', port=get_unused_port())
+        self.addCleanup(manager.close)
+        manager.circuit_breaker.record_success()
+
+        for _ in range(RedisCircuitBreaker.FAILURE_THRESHOLD):
+            with self.assertRaises(redis.exceptions.ConnectionError):
+                manager.client.get('key')
+        self.assertIsNone(manager.get_client())
+
+    def test_pipeline_failures_are_tracked(self):
+        manager = RedisClientManager(host='127.0.0.1', port=get_unused_port())
+        self.addCleanup(manager.close)
+        manager.circuit_breaker.record_success()
+
+        for _ in range(RedisCircuitBreaker.FAILURE_THRESHOLD):
+            pipeline = manager.client.pipeline()
+            pipeline.get('key')
+            with self.assertRaises(redis.exceptions.ConnectionError):
+                pipeline.execute()
+        self.assertTrue(manager.circuit_breaker.is_open)
+
+
+class RedisHelpersTestCase(SimpleTestCase):
+
+    KEYS = ['test:helpers:a', 'test:helpers:b', 'test:helpers:c']
+
+    def setUp(self):
+        get_redis_client().delete(*self.KEYS)
+
+    def test_set_and_get_many(self):
+        self.assertTrue(set_many({'test:helpers:a': '1', 'test:helpers:b': '2'}, ttl_secs=60))
+
+        self.assertEqual(get_many(self.KEYS), {
+            'test:helpers:a': '1',
+            'test:helpers:b': '2',
+            'test:helpers:c': None,
+        })
+        self.assertGreater(get_redis_client().ttl('test:helpers:a'), 0)
+
+    def test_delete_many(self):
+        set_many({'test:helpers:a': '1', 'test:helpers:b': '2'})
+
+        self.assertEqual(delete_many(self.KEYS), 2)
+        self.assertEqual(delete_many([]), 0)
+
+    def test_execute_pipeline(self):
+        results = execute_pipeline(lambda pipeline: (
+            pipeline.set('test:helpers:a', 'x'),
+            pipeline.get('test:helpers:a'),
+        ))
+
+        self.assertEqual(results, [True, 'x'])
+
+    def test_helpers_without_redis(self):
+        with patch.object(redis_client_module, 'get_redis_client', return_value=None):
+            self.assertEqual(get_many(['test:helpers:a']), {'test:helpers:a': None})
+            self.assertFalse(set_many({'test:helpers:a': '1'}))
+            self.assertEqual(delete_many(['test:helpers:a']), 0)
+            self.assertIsNone(execute_pipeline(lambda pipeline: pipeline.get('test:helpers:a')))
@@ -0,0 +1,180 @@
+"""
+Tests for the two-tier service cache.
+
+Covers local and Redis tiers, per-key TTLs, stale serving and single-flight
+loading, namespace invalidation, metrics, and running without Redis.
+"""
+import json
+import logging
+import threading
+import time
+import uuid
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase
+
+from tt.apps.common.redis_client import get_redis_client
+from tt.apps.common.tiered_cache import TieredCache
+
+logging.disable(logging.CRITICAL)
+
+
+class TieredCacheTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.namespace = f'test:tiered:{uuid.uuid4().hex}'
+        self.cache = TieredCache(namespace=self.namespace)
+        self.redis_client = get_redis_client()
+        self.addCleanup(self.delete_namespace_keys)
+
+    def delete_namespace_keys(self):
+        for key in self.redis_client.scan_iter(f'{self.namespace}:*'):
+            self.redis_client.delete(key)
+
+    def other_process_cache(self):
+        """A second cache on the same namespace, with its own local tier."""
+        return TieredCache(namespace=self.namespace)
+
+    def test_loads_once_then_serves_locally(self):
+        loader = Mock(return_value={'a': 1})
+
+        first = self.cache.get_or_load('key', loader)
+        with patch('tt.apps.common.tiered_cache.get_redis_client') as mock_get_redis:
+            second = self.cache.get_or_load('key', loader)
+
+        self.assertEqual(first, {'a': 1})
+        self.assertEqual(second, {'a': 1})
+        loader.assert_called_once()
+        mock_get_redis.assert_not_called()
+
+    def test_other_process_reads_from_redis(self):
+        self.cache.get_or_load('key', lambda: [1, 2])
+        loader = Mock()
+
+        value = self.other_process_cache().get_or_load('key', loader)
+
+        self.assertEqual(value, [1, 2])
+        loader.assert_not_called()
+
+    def test_ttl_is_per_key(self):
+        self.cache.get_or_load('short', lambda: 1, ttl_secs=100)
+        self.cache.get_or_load('forever', lambda: 2)
+
+        short_ttl = self.redis_client.ttl(self.cache._get_redis_key('short'))
+        self.assertGreater(short_ttl, 100)
+        self.assertLessEqual(short_ttl, 100 + TieredCache.STALE_GRACE_SECS)
+        self.assertEqual(self.redis_client.ttl(self.cache._get_redis_key('forever')), -1)
+
+    def test_expired_value_is_reloaded(self):
+        redis_key = self.cache._get_redis_key('key')
+        self.redis_client.set(redis_key, json.dumps({'v': 'old', 'x': time.time() - 1}))
+
+        value = self.cache.get_or_load('key', lambda: 'new', ttl_secs=60)
+
+        self.assertEqual(value, 'new')
+        self.assertEqual(self.other_process_cache().get_or_load('key', Mock()), 'new')
+
+    def test_stale_value_served_while_another_caller_loads(self):
+        redis_key = self.cache._get_redis_key('key')
+        self.redis_client.set(redis_key, json.dumps({'v': 'old', 'x': time.time() - 1}))
+        self.redis_client.set(f'{redis_key}:lock', 'other', ex=10)
+        loader = Mock()
+
+        value = self.cache.get_or_load('key', loader, ttl_secs=60)
+
+        self.assertEqual(value, 'old')
+        loader.assert_not_called()
+        self.assertEqual(self.cache.metrics.stale_hits, 1)
+
+    def test_waits_for_another_callers_load(self):
+        redis_key = self.cache._get_redis_key('key')
+        self.redis_client.set(f'{redis_key}:lock', 'other', ex=10)
+        other = self.other_process_cache()
+        timer = threading.Timer(0.1, lambda: other._set(redis_key, 'loaded', None))
+        timer.start()
+        self.addCleanup(timer.cancel)
+        loader = Mock()
+
+        value = self.cache.get_or_load('key', loader)
+
+        self.assertEqual(value, 'loaded')
+        loader.assert_not_called()
+        self.assertEqual(self.cache.metrics.lock_waits, 1)
+
+    def test_loads_after_waiting_too_long(self):
+        redis_key = self.cache._get_redis_key('key')
+        self.redis_client.set(f'{redis_key}:lock', 'other', ex=10)
+
+        with patch.object(TieredCache, 'WAIT_TIMEOUT_SECS', 0.1):
+            value = self.cache.get_or_load('key', lambda: 'mine')
+
+        self.assertEqual(value, 'mine')
+
+    def test_lock_released_after_load(self):
+        self.cache.get_or_load('key', lambda: 1)
+
+        self.assertFalse(self.redis_client.exists(f"{self.cache._get_redis_key('key')}:lock"))
+
+    def test_lock_released_when_loader_fails(self):
+        with self.assertRaises(ValueError):
+            self.cache.get_or_load('key', Mock(side_effect=ValueError('bad')))
+
+        self.assertFalse(self.redis_client.exists(f"{self.cache._get_redis_key('key')}:lock"))
+
+    def test_invalidate_drops_both_tiers(self):
+        self.cache.get_or_load('key', lambda: 'old')
+
+        self.cache.invalidate('key')
+
+        self.assertEqual(self.cache.get_or_load('key', lambda: 'new'), 'new')
+
+    def test_invalidate_all_starts_new_generation(self):
+        other = self.other_process_cache()
+        self.cache.get_or_load('a', lambda: 'old')
+        self.cache.get_or_load('b', lambda: 'old')
+        old_redis_key = self.cache._get_redis_key('a')
+
+        self.cache.invalidate_all()
+
+        self.assertEqual(self.cache.get_or_load('a', lambda: 'new'), 'new')
+        self.assertEqual(self.cache.get_or_load('b', lambda: 'new'), 'new')
+        self.assertFalse(self.redis_client.exists(old_redis_key))
+        # Other processes see the new generation once their local tier expires
+        other.clear_local()
+        self.assertEqual(other.get_or_load('a', Mock()), 'new')
+
+    def test_local_tier_is_bounded(self):
+        cache = TieredCache(namespace=self.namespace, max_local_entries=2)
+        for key in ['a', 'b', 'c']:
+            cache.get_or_load(key, lambda: key)
+
+        self.assertEqual(list(cache._local_entries), [cache._get_redis_key('b'), cache._get_redis_key('c')])
+
+    def test_local_tier_expires(self):
+        cache = TieredCache(namespace=self.namespace, ttl_local_secs=0.05)
+        cache.get_or_load('key', lambda: 'value')
+        time.sleep(0.1)
+
+        self.assertEqual(cache._get_local(cache._get_redis_key('key')), TieredCache._MISSING)
+
+    def test_works_without_redis(self):
+        loader = Mock(return_value='value')
+
+        with patch('tt.apps.common.tiered_cache.get_redis_client', return_value=None):
+            self.assertEqual(self.cache.get_or_load('key', loader), 'value')
+            self.assertEqual(self.cache.get_or_load('key', loader), 'value')
+            self.cache.invalidate_all()
+
+        loader.assert_called_once()
+
+    def test_metrics(self):
+        self.cache.get_or_load('key', lambda: 1)
+        self.cache.get_or_load('key', lambda: 1)
+        self.other_process_cache().get_or_load('key', lambda: 1)
+
+        metrics = self.cache.metrics.snapshot()
+        self.assertEqual(metrics['misses'], 1)
+        self.assertEqual(metrics['local_hits'], 1)
+        self.assertEqual(metrics['loads'], 1)
+        self.assertEqual(metrics['hit_rate'], 0.5)
+        self.assertIn(self.namespace, TieredCache.get_all_metrics())
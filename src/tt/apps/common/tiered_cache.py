@@ -0,0 +1,364 @@
+"""
+Two-tier cache for service-level caches.
+
+Tiers:
+- Local: bounded in-process LRU holding decoded values, so a hit needs no
+  Redis round trip or JSON decoding.  Invalidation only reaches the local
+  tier of the invalidating process, so entries live at most ttl_local_secs;
+  that bounds how stale other processes can be.
+- Redis: JSON values shared by all processes, with a TTL chosen per key
+  (None for no expiry, with explicit invalidation).
+
+Stampede protection: when a key is missing, one caller (in any process)
+takes a short-lived Redis lock and loads the value while the others poll
+for it, up to WAIT_TIMEOUT_SECS.  Values with a TTL stay in Redis for
+STALE_GRACE_SECS after they expire; during that time the lock holder
+reloads while everyone else is served the stale value.
+
+Namespaces are versioned: each Redis key includes the namespace generation,
+so invalidate_all() drops every entry with one INCR.  Other processes pick
+up the new generation within ttl_local_secs.
+
+If Redis is unavailable the local tier is still used, and values are
+loaded without locking.  Cached values are shared with other callers in
+the process and must be treated as read-only.
+"""
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .redis_client import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheMetrics:
+    """ In-process counters for one TieredCache. """
+
+    local_hits     : int    = 0
+    redis_hits     : int    = 0
+    stale_hits     : int    = 0   # Expired value served while another caller reloads
+    misses         : int    = 0
+    lock_waits     : int    = 0   # Waited for another caller's load
+    loads          : int    = 0
+    load_ms        : float  = 0.0
+    redis_reads    : int    = 0
+    redis_read_ms  : float  = 0.0
+    _lock          : threading.Lock = field( default_factory = threading.Lock, repr = False, compare = False )
+
+    def increment( self, name : str, value : int = 1 ) -> None:
+        with self._lock:
+            setattr( self, name, getattr( self, name ) + value )
+        return
+
+    def record_load( self, elapsed_ms : float ) -> None:
+        with self._lock:
+            self.loads += 1
+            self.load_ms += elapsed_ms
+        return
+
+    def record_redis_read( self, elapsed_ms : float ) -> None:
+        with self._lock:
+            self.redis_reads += 1
+            self.redis_read_ms += elapsed_ms
+        return
+
+    @property
+    def hit_rate( self ) -> float:
+        hits = self.local_hits + self.redis_hits + self.stale_hits
+        total = hits + self.misses
+        return hits / total if total else 0.0
+
+    def snapshot( self ) -> Dict[str, float]:
+        with self._lock:
+            return {
+                'local_hits': self.local_hits,
+                'redis_hits': self.redis_hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'lock_waits': self.lock_waits,
+                'hit_rate': self.hit_rate,
+                'loads': self.loads,
+                'avg_load_ms': self.load_ms / self.loads if self.loads else 0.0,
+                'redis_reads': self.redis_reads,
+                'avg_redis_read_ms': self.redis_read_ms / self.redis_reads if self.redis_reads else 0.0,
+            }
+
+    def reset( self ) -> None:
+        with self._lock:
+            self.local_hits = self.redis_hits = self.stale_hits = self.misses = 0
+            self.lock_waits = self.loads = self.redis_reads = 0
+            self.load_ms = self.redis_read_ms = 0.0
+        return
+
+
+class TieredCache:
+    """
+    Usage:
+        _cache = TieredCache( namespace = 'my_service' )
+
+        value = _cache.get_or_load( key, loader, ttl_secs = 3600 )
+        _cache.invalidate( key )
+        _cache.invalidate_all()
+
+    The loader takes no arguments and returns a JSON-serializable value.
+    """
+
+    MAX_LOCAL_ENTRIES = 1000
+    TTL_LOCAL_SECS = 10
+    STALE_GRACE_SECS = 60
+    LOCK_TIMEOUT_SECS = 10       # Bounds how long a crashed loader blocks others
+    WAIT_TIMEOUT_SECS = 2
+    WAIT_POLL_SECS = 0.05
+
+    _MISSING = object()
+    _all_caches = {}  # namespace -> TieredCache
+    _all_caches_lock = threading.Lock()
+
+    def __init__( self,
+                  namespace          : str,
+                  ttl_local_secs     : float  = TTL_LOCAL_SECS,
+                  max_local_entries  : int    = MAX_LOCAL_ENTRIES ):
+        self.namespace = namespace
+        self.ttl_local_secs = ttl_local_secs
+        self.max_local_entries = max_local_entries
+        self.metrics = CacheMetrics()
+        self._local_entries = OrderedDict()  # redis_key -> ( local_expires_at, value )
+        self._local_lock = threading.Lock()
+        self._generation = None
+        self._generation_expires_at = 0.0
+        with self._all_caches_lock:
+            self._all_caches[namespace] = self
+        return
+
+    @classmethod
+    def get_all_metrics( cls ) -> Dict[str, Dict[str, float]]:
+        with cls._all_caches_lock:
+            caches = list( cls._all_caches.values() )
+        return { cache.namespace: cache.metrics.snapshot() for cache in caches }
+
+    def get_or_load( self,
+                     key       : str,
+                     loader    : Callable[[], Any],
+                     ttl_secs  : Optional[int]      = None ) -> Any:
+        """
+        Returns the cached value for key, calling loader() to fill the cache
+        on a miss.  ttl_secs of None means no expiry.
+        """
+        redis_key = self._get_redis_key( key )
+        value = self._get_local( redis_key )
+        if value is not self._MISSING:
+            self.metrics.increment( 'local_hits' )
+            return value
+
+        stale_value = self._MISSING
+        stored = self._get_redis( redis_key )
+        if stored is not None:
+            value, expires_at = stored
+            if expires_at is None or expires_at > time.time():
+                self.metrics.increment( 'redis_hits' )
+                self._set_local( redis_key, value, expires_at )
+                return value
+            stale_value = value
+
+        may_load, lock_token = self._acquire_lock( redis_key )
+        if not may_load:
+            if stale_value is not self._MISSING:
+                self.metrics.increment( 'stale_hits' )
+                return stale_value
+            self.metrics.increment( 'lock_waits' )
+            stored = self._wait_for_value( redis_key )
+            if stored is not None:
+                value, expires_at = stored
+                self.metrics.increment( 'redis_hits' )
+                self._set_local( redis_key, value, expires_at )
+                return value
+            logger.debug( f'Gave up waiting for cache load, loading: {redis_key}' )
+
+        self.metrics.increment( 'misses' )
+        try:
+            start_time = time.monotonic()
+            value = loader()
+            self.metrics.record_load( ( time.monotonic() - start_time ) * 1000 )
+            self._set( redis_key, value, ttl_secs )
+        finally:
+            if lock_token:
+                self._release_lock( redis_key, lock_token )
+        return value
+
+    def invalidate( self, key : str ) -> None:
+        redis_key = self._get_redis_key( key )
+        with self._local_lock:
+            self._local_entries.pop( redis_key, None )
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                return
+            if redis_client.delete( redis_key ):
+                logger.info( f'Invalidated cache: {redis_key}' )
+            else:
+                logger.debug( f'No cache to invalidate: {redis_key}' )
+        except Exception as e:
+            logger.warning( f'Redis error invalidating cache: {e}' )
+        return
+
+    def invalidate_all( self ) -> None:
+        """ Start a new namespace generation and delete the old one's keys. """
+        self.clear_local()
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                return
+            generation = int( redis_client.incr( self._get_generation_key() ))
+            self._set_generation( generation )
+            logger.info( f'Invalidated cache namespace: {self.namespace}' )
+
+            # Old generation keys are unreachable now; deleting them is only
+            # to free memory for values stored without a TTL.
+            old_keys = list( redis_client.scan_iter(
+                match = f'{self.namespace}:g{generation - 1}:*',
+                count = 500,
+            ))
+            if old_keys:
+                redis_client.delete( *old_keys )
+        except Exception as e:
+            logger.warning( f'Redis error invalidating cache namespace: {e}' )
+        return
+
+    def clear_local( self ) -> None:
+        with self._local_lock:
+            self._local_entries.clear()
+            self._generation = None
+            self._generation_expires_at = 0.0
+        return
+
+    def _get_generation_key( self ) -> str:
+        return f'{self.namespace}:generation'
+
+    def _get_redis_key( self, key : str ) -> str:
+        return f'{self.namespace}:g{self._get_generation()}:{key}'
+
+    def _get_generation( self ) -> int:
+        if self._generation is not None and self._generation_expires_at > time.monotonic():
+            return self._generation
+        generation = self._generation or 0
+        try:
+            redis_client = get_redis_client()
+            if redis_client:
+                generation = int( redis_client.get( self._get_generation_key() ) or 0 )
+        except Exception as e:
+            logger.warning( f'Redis error getting cache generation: {e}' )
+        self._set_generation( generation )
+        return generation
+
+    def _set_generation( self, generation : int ) -> None:
+        with self._local_lock:
+            self._generation = generation
+            self._generation_expires_at = time.monotonic() + self.ttl_local_secs
+        return
+
+    def _get_local( self, redis_key : str ) -> Any:
+        with self._local_lock:
+            local_entry = self._local_entries.get( redis_key )
+            if local_entry is None:
+                return self._MISSING
+            local_expires_at, value = local_entry
+            if local_expires_at <= time.monotonic():
+                del self._local_entries[redis_key]
+                return self._MISSING
+            self._local_entries.move_to_end( redis_key )
+            return value
+
+    def _set_local( self, redis_key : str, value : Any, expires_at : Optional[float] ) -> None:
+        ttl_local_secs = self.ttl_local_secs
+        if expires_at is not None:
+            ttl_local_secs = min( ttl_local_secs, expires_at - time.time() )
+        if ttl_local_secs <= 0:
+            return
+        with self._local_lock:
+            self._local_entries[redis_key] = ( time.monotonic() + ttl_local_secs, value )
+            self._local_entries.move_to_end( redis_key )
+            while len( self._local_entries ) > self.max_local_entries:
+                self._local_entries.popitem( last = False )
+                continue
+        return
+
+    def _get_redis( self, redis_key : str ) -> Optional[Tuple[Any, Optional[float]]]:
+        """ The stored ( value, expires_at ), or None if missing or unavailable. """
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                return None
+            start_time = time.monotonic()
+            cached_data = redis_client.get( redis_key )
+            self.metrics.record_redis_read( ( time.monotonic() - start_time ) * 1000 )
+            if not cached_data:
+                return None
+            envelope = json.loads( cached_data )
+            return envelope['v'], envelope['x']
+        except Exception as e:
+            logger.warning( f'Redis error getting cached value: {e}' )
+            return None
+
+    def _set( self, redis_key : str, value : Any, ttl_secs : Optional[int] ) -> None:
+        expires_at = time.time() + ttl_secs if ttl_secs else None
+        self._set_local( redis_key, value, expires_at )
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                logger.debug( 'Redis not available, skipping cache storage' )
+                return
+            cached_data = json.dumps({ 'v': value, 'x': expires_at })
+            if ttl_secs:
+                redis_client.set( redis_key, cached_data, ex = ttl_secs + self.STALE_GRACE_SECS )
+            else:
+                redis_client.set( redis_key, cached_data )
+            logger.debug( f'Cached value (TTL={ttl_secs}s): {redis_key}' )
+        except Exception as e:
+            logger.warning( f'Redis error caching value: {e}' )
+        return
+
+    def _acquire_lock( self, redis_key : str ) -> Tuple[bool, Optional[str]]:
+        """
+        Returns ( may_load, lock_token ).  Without Redis, every caller may
+        load, with no lock to release.
+        """
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                return True, None
+            lock_token = uuid.uuid4().hex
+            if redis_client.set( f'{redis_key}:lock', lock_token, nx = True, ex = self.LOCK_TIMEOUT_SECS ):
+                return True, lock_token
+            return False, None
+        except Exception as e:
+            logger.warning( f'Redis error acquiring cache lock: {e}' )
+            return True, None
+
+    def _release_lock( self, redis_key : str, lock_token : str ) -> None:
+        # Not atomic: if the lock expired and another caller took it in
+        # between, that caller's lock is dropped and at worst one more
+        # caller loads the value.
+        try:
+            redis_client = get_redis_client()
+            if redis_client and redis_client.get( f'{redis_key}:lock' ) == lock_token:
+                redis_client.delete( f'{redis_key}:lock' )
+        except Exception as e:
+            logger.warning( f'Redis error releasing cache lock: {e}' )
+        return
+
+    def _wait_for_value( self, redis_key : str ) -> Optional[Tuple[Any, Optional[float]]]:
+        deadline = time.monotonic() + self.WAIT_TIMEOUT_SECS
+        while time.monotonic() < deadline:
+            time.sleep( self.WAIT_POLL_SECS )
+            stored = self._get_redis( redis_key )
+            if stored is not None:
+                return stored
+            continue
+        return None
@@ -51,3 +51,28 @@ class TripImageAdmin(admin.ModelAdmin):
             tags_display += f' (+{len(obj.tags) - 3} more)'
         return tags_display
     tags_preview.short_description = 'Tags'
+
+
+@admin.register(models.ImageUploadJob)
+class ImageUploadJobAdmin(admin.ModelAdmin):
+    show_full_result_count = False
+
+    list_display = (
+        'uuid',
+        'filename',
+        'status',
+        'uploaded_by_link',
+        'created_datetime',
+        'modified_datetime',
+    )
+
+    list_filter = (
+        'status',
+        'created_datetime',
+    )
+    search_fields = ['filename', 'uploaded_by__email']
+    readonly_fields = ('uuid', 'trip_image', 'spool_path', 'created_datetime', 'modified_datetime')
+
+    @admin_link('uploaded_by', 'Uploaded By')
+    def uploaded_by_link(self, user):
+        return user.email if user else 'Unknown'
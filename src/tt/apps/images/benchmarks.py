@@ -0,0 +1,313 @@
+"""
+Benchmark harnesses for image upload processing, over synthetic
+camera-sized photos (12MP by default, JPEG and HEIC).
+
+run_processing_benchmark times ImageUploadService.process_spooled_images
+over batches, serially in this process and fanned out to the image worker
+pool.  Only the CPU-bound steps are timed: database records and grid HTML
+are created the same way in both modes.
+
+run_decode_benchmark compares the full-resolution decode and resize path
+with the reduced-scale JPEG decode path (ImageProcessingConfig
+JPEG_DRAFT_DECODE and RESIZE_REDUCING_GAP) for time, peak memory and SSIM
+of the resulting web image.  Each measurement runs in a fresh process so
+that peak RSS reflects only that path.
+"""
+import io
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from PIL import Image, ImageFilter
+
+from .schemas import ImageProcessingConfig
+from .services import HEIF_SUPPORT_AVAILABLE, ImageUploadService
+from .workers import get_image_worker_pool, init_worker, process_image_file
+
+DEFAULT_BATCH_SIZES = [ 1, 10, 50 ]
+DEFAULT_MEGAPIXELS = 12.0
+
+# (format, megapixels) covering phone cameras through high resolution sensors
+DEFAULT_DECODE_SCENARIOS = [
+    ( 'JPEG', 12.0 ),
+    ( 'JPEG', 24.0 ),
+    ( 'JPEG', 48.0 ),
+    ( 'HEIF', 12.0 ),
+]
+
+SSIM_BLOCK_SIZE = 8
+
+FORMAT_EXTENSIONS = {
+    'JPEG': '.jpg',
+    'HEIF': '.heic',
+}
+
+
+@dataclass
+class ProcessingBenchmarkResult:
+    image_format    : str
+    batch_size      : int
+    file_bytes      : int
+    serial_seconds  : float
+    pool_seconds    : float
+    worker_count    : int
+    error_count     : int
+
+    @property
+    def serial_images_per_sec(self) -> float:
+        return self.batch_size / self.serial_seconds if self.serial_seconds else 0.0
+
+    @property
+    def pool_images_per_sec(self) -> float:
+        return self.batch_size / self.pool_seconds if self.pool_seconds else 0.0
+
+    @property
+    def speedup(self) -> float:
+        if not self.pool_seconds:
+            return 0.0
+        return self.serial_seconds / self.pool_seconds
+
+
+@dataclass
+class DecodeBenchmarkResult:
+    image_format         : str
+    megapixels           : float
+    file_bytes           : int
+    baseline_seconds     : float
+    fast_seconds         : float
+    baseline_peak_bytes  : int
+    fast_peak_bytes      : int
+    ssim                 : float   # Fast path web image against the baseline's
+
+    @property
+    def speedup(self) -> float:
+        if not self.fast_seconds:
+            return 0.0
+        return self.baseline_seconds / self.fast_seconds
+
+
+def get_benchmark_formats() -> List[str]:
+    if HEIF_SUPPORT_AVAILABLE:
+        return [ 'JPEG', 'HEIF' ]
+    return [ 'JPEG' ]
+
+
+def build_synthetic_photo( image_format : str, megapixels : float = DEFAULT_MEGAPIXELS ) -> bytes:
+    """
+    A 4:3 photo with smooth gradients plus fine grain, so that it encodes to
+    a camera-like file size rather than compressing away like a flat image.
+    """
+    width = int(( megapixels * 1_000_000 * 4 / 3 ) ** 0.5 )
+    height = width * 3 // 4
+    texture_size = ( max( 1, width // 16 ), max( 1, height // 16 ))
+    channels = []
+    for sigma in ( 60, 80, 100 ):
+        texture = Image.effect_noise( texture_size, sigma ).resize(( width, height ), Image.Resampling.BICUBIC )
+        channels.append( texture.filter( ImageFilter.GaussianBlur( 2 )))
+        continue
+    photo = Image.merge( 'RGB', channels )
+    grain = Image.effect_noise(( width, height ), 12 ).convert( 'RGB' )
+    photo = Image.blend( photo, grain, 0.15 )
+
+    photo_bytes = io.BytesIO()
+    photo.save( photo_bytes, format = image_format, quality = 90 )
+    return photo_bytes.getvalue()
+
+
+def _spool_batch( spool_dir : str, image_format : str, content : bytes, batch_size : int ) -> List[Tuple[str, str]]:
+    spooled_files = []
+    for index in range( batch_size ):
+        filename = f'photo-{index}{FORMAT_EXTENSIONS[image_format]}'
+        spool_path = os.path.join( spool_dir, filename )
+        with open( spool_path, 'wb' ) as spool_file:
+            spool_file.write( content )
+        spooled_files.append(( spool_path, filename ))
+        continue
+    return spooled_files
+
+
+def _time_processing( spooled_files     : List[Tuple[str, str]],
+                      use_process_pool  : bool,
+                      rounds            : int                   ) -> Tuple[float, int]:
+    service = ImageUploadService()
+    best = None
+    error_count = 0
+    for _ in range( rounds ):
+        start = time.perf_counter()
+        processing_results = service.process_spooled_images( spooled_files, use_process_pool = use_process_pool )
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min( best, elapsed )
+        error_count = sum( 1 for processed, _ in processing_results if processed is None )
+        continue
+    return best, error_count
+
+
+def run_processing_benchmark( batch_sizes  : List[int]  = None,
+                              formats      : List[str]  = None,
+                              megapixels   : float      = DEFAULT_MEGAPIXELS,
+                              rounds       : int        = 1 ) -> List[ProcessingBenchmarkResult]:
+    """ Time serial and worker pool processing for each format and batch size (best of rounds). """
+    worker_pool = get_image_worker_pool()
+    results = []
+    spool_dir = tempfile.mkdtemp( prefix = 'tt-image-benchmark-' )
+    try:
+        for image_format in ( formats or get_benchmark_formats() ):
+            content = build_synthetic_photo( image_format, megapixels = megapixels )
+
+            # Start the workers (and let each load Django) before timing
+            warm_up_files = _spool_batch( spool_dir, image_format, content, 1 )
+            warm_up_futures = [ worker_pool.submit( process_image_file, *warm_up_files[0] )
+                                for _ in range( worker_pool.max_workers ) ]
+            for future in warm_up_futures:
+                future.result()
+                continue
+
+            for batch_size in ( batch_sizes or DEFAULT_BATCH_SIZES ):
+                spooled_files = _spool_batch( spool_dir, image_format, content, batch_size )
+                serial_seconds, serial_errors = _time_processing( spooled_files, False, rounds )
+                pool_seconds, pool_errors = _time_processing( spooled_files, True, rounds )
+                results.append( ProcessingBenchmarkResult(
+                    image_format = image_format,
+                    batch_size = batch_size,
+                    file_bytes = len( content ),
+                    serial_seconds = serial_seconds,
+                    pool_seconds = pool_seconds,
+                    worker_count = worker_pool.max_workers,
+                    error_count = serial_errors + pool_errors,
+                ))
+                continue
+            continue
+    finally:
+        shutil.rmtree( spool_dir, ignore_errors = True )
+    return results
+
+
+def compute_ssim( image_a : Image.Image, image_b : Image.Image ) -> float:
+    """
+    Mean structural similarity of the luminance of two same-sized images,
+    over non-overlapping 8x8 blocks (1.0 = identical).
+    """
+    if image_a.size != image_b.size:
+        raise ValueError( f'Image sizes differ: {image_a.size} vs {image_b.size}' )
+    width, height = image_a.size
+    pixels_a = image_a.convert( 'L' ).tobytes()
+    pixels_b = image_b.convert( 'L' ).tobytes()
+    c1 = ( 0.01 * 255 ) ** 2
+    c2 = ( 0.03 * 255 ) ** 2
+    block = SSIM_BLOCK_SIZE
+    count = block * block
+
+    total = 0.0
+    block_count = 0
+    for top in range( 0, height - block + 1, block ):
+        for left in range( 0, width - block + 1, block ):
+            sum_a = sum_b = sum_aa = sum_bb = sum_ab = 0
+            for row in range( top, top + block ):
+                offset = row * width + left
+                for a, b in zip( pixels_a[offset:offset + block], pixels_b[offset:offset + block] ):
+                    sum_a += a
+                    sum_b += b
+                    sum_aa += a * a
+                    sum_bb += b * b
+                    sum_ab += a * b
+            mean_a = sum_a / count
+            mean_b = sum_b / count
+            var_a = sum_aa / count - mean_a * mean_a
+            var_b = sum_bb / count - mean_b * mean_b
+            covariance = sum_ab / count - mean_a * mean_b
+            total += ( ( 2 * mean_a * mean_b + c1 ) * ( 2 * covariance + c2 )
+                       / ( ( mean_a * mean_a + mean_b * mean_b + c1 ) * ( var_a + var_b + c2 )))
+            block_count += 1
+    return total / block_count if block_count else 1.0
+
+
+def _get_peak_rss_bytes() -> int:
+    """
+    Peak resident memory of this process.  Prefers VmHWM, which starts
+    fresh at exec; ru_maxrss can carry over the peak of the forking parent.
+    """
+    try:
+        with open( '/proc/self/status' ) as status_file:
+            for line in status_file:
+                if line.startswith( 'VmHWM:' ):
+                    return int( line.split()[1] ) * 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss * 1024
+
+
+def _measure_decode( spool_path : str, filename : str, fast_path : bool, rounds : int ) -> Tuple[float, int, bytes]:
+    """ Runs in a fresh worker process: (best seconds, peak RSS growth, web image bytes). """
+    ImageProcessingConfig.JPEG_DRAFT_DECODE = fast_path
+    ImageProcessingConfig.RESIZE_REDUCING_GAP = ImageProcessingConfig.RESIZE_REDUCING_GAP if fast_path else None
+    service = ImageUploadService()
+
+    start_peak_bytes = _get_peak_rss_bytes()
+    best = None
+    processed = None
+    for _ in range( rounds ):
+        start = time.perf_counter()
+        processed = service.process_spooled_image( spool_path, filename )
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min( best, elapsed )
+        continue
+    peak_bytes = _get_peak_rss_bytes() - start_peak_bytes
+    return best, peak_bytes, processed.web_bytes
+
+
+def _measure_decode_in_fresh_process( spool_path : str, filename : str, fast_path : bool, rounds : int ):
+    executor = ProcessPoolExecutor(
+        max_workers = 1,
+        mp_context = multiprocessing.get_context( 'spawn' ),
+        initializer = init_worker,
+    )
+    try:
+        return executor.submit( _measure_decode, spool_path, filename, fast_path, rounds ).result()
+    finally:
+        executor.shutdown( wait = True )
+
+
+def run_decode_benchmark( scenarios  : List[Tuple[str, float]]  = None,
+                          rounds     : int                      = 1 ) -> List[DecodeBenchmarkResult]:
+    """ Compare the full decode and reduced-scale decode paths for each (format, megapixels). """
+    if scenarios is None:
+        scenarios = [ scenario for scenario in DEFAULT_DECODE_SCENARIOS
+                      if scenario[0] in get_benchmark_formats() ]
+    results = []
+    spool_dir = tempfile.mkdtemp( prefix = 'tt-image-benchmark-' )
+    try:
+        for image_format, megapixels in scenarios:
+            content = build_synthetic_photo( image_format, megapixels = megapixels )
+            spool_path, filename = _spool_batch( spool_dir, image_format, content, 1 )[0]
+
+            baseline_seconds, baseline_peak_bytes, baseline_web_bytes = _measure_decode_in_fresh_process(
+                spool_path, filename, False, rounds,
+            )
+            fast_seconds, fast_peak_bytes, fast_web_bytes = _measure_decode_in_fresh_process(
+                spool_path, filename, True, rounds,
+            )
+            with Image.open( io.BytesIO( baseline_web_bytes )) as baseline_image, \
+                 Image.open( io.BytesIO( fast_web_bytes )) as fast_image:
+                ssim = compute_ssim( baseline_image, fast_image )
+
+            results.append( DecodeBenchmarkResult(
+                image_format = image_format,
+                megapixels = megapixels,
+                file_bytes = len( content ),
+                baseline_seconds = baseline_seconds,
+                fast_seconds = fast_seconds,
+                baseline_peak_bytes = baseline_peak_bytes,
+                fast_peak_bytes = fast_peak_bytes,
+                ssim = ssim,
+            ))
+            continue
+    finally:
+        shutil.rmtree( spool_dir, ignore_errors = True )
+    return results
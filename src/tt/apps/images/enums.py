@@ -5,8 +5,19 @@ from tt.apps.common.enums import LabeledEnum
 
 class UploadStatus( Enum ):
     """Status of image upload processing."""
-    SUCCESS = 'success'
-    ERROR   = 'error'
+    SUCCESS     = 'success'
+    ERROR       = 'error'
+    PENDING     = 'pending'      # Accepted, waiting for a worker
+    PROCESSING  = 'processing'
+
+    @property
+    def is_done(self):
+        return bool( self in [ UploadStatus.SUCCESS,
+                               UploadStatus.ERROR ] )
+
+    @classmethod
+    def choices(cls):
+        return [ ( x.value, x.name.title() ) for x in cls ]
 
 
 class ImageAccessRole( LabeledEnum ):
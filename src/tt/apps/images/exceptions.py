@@ -0,0 +1,6 @@
+class ImageValidationError(Exception):
+    """
+    Raised when an uploaded file is not an acceptable image.  The message is
+    shown to the user.
+    """
+    pass
@@ -0,0 +1,73 @@
+"""
+Management command to benchmark the reduced-scale JPEG decode path.
+
+Compares full-resolution decoding and resizing with draft (reduced DCT
+scale) decoding for time, peak memory and SSIM of the resulting web image,
+over synthetic camera-sized photos.
+
+Usage:
+    python manage.py benchmark_image_decode
+    python manage.py benchmark_image_decode --scenario JPEG:48 --rounds 3
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from tt.apps.common.command_utils import CommandLoggerMixin
+
+from ...benchmarks import get_benchmark_formats, run_decode_benchmark
+
+
+class Command( BaseCommand, CommandLoggerMixin ):
+    help = 'Benchmark full-resolution against reduced-scale image decoding'
+
+    MIN_SSIM = 0.95
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            default=[],
+            help='FORMAT:MEGAPIXELS pair to benchmark (repeatable; default: built-in set)',
+        )
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=1,
+            help='Timing rounds per scenario; the best round is reported (default: 1)',
+        )
+
+    def handle(self, *args, **options):
+        scenarios = []
+        for scenario in options['scenario']:
+            try:
+                image_format, megapixels = scenario.split(':')
+                image_format = image_format.upper()
+                megapixels = float( megapixels )
+            except ValueError:
+                raise CommandError( f'Invalid scenario "{scenario}", expected FORMAT:MEGAPIXELS' )
+            if image_format not in get_benchmark_formats():
+                raise CommandError( f'Unsupported format "{image_format}", expected one of {get_benchmark_formats()}' )
+            scenarios.append( ( image_format, megapixels ) )
+
+        results = run_decode_benchmark(
+            scenarios = scenarios or None,
+            rounds = max( 1, options['rounds'] ),
+        )
+
+        self.info( f'{"format":>6} {"MP":>5} {"file MB":>8} {"full ms":>8} {"draft ms":>9} {"speedup":>8}'
+                   f' {"full peak MB":>13} {"draft peak MB":>14} {"SSIM":>7}' )
+        for result in results:
+            line = (
+                f'{result.image_format:>6} {result.megapixels:>5g} {result.file_bytes / 1024 / 1024:>8.1f}'
+                f' {result.baseline_seconds * 1000:>8.0f} {result.fast_seconds * 1000:>9.0f} {result.speedup:>7.1f}x'
+                f' {result.baseline_peak_bytes / 1024 / 1024:>13.0f} {result.fast_peak_bytes / 1024 / 1024:>14.0f}'
+                f' {result.ssim:>7.4f}'
+            )
+            if result.ssim < self.MIN_SSIM:
+                self.error( line )
+            else:
+                self.message( line )
+
+        if any( result.ssim < self.MIN_SSIM for result in results ):
+            raise CommandError( f'Reduced-scale output differs from full decoding (SSIM < {self.MIN_SSIM})' )
+        self.success( 'Reduced-scale output matches full decoding' )
+        return
@@ -0,0 +1,85 @@
+"""
+Management command to benchmark image upload processing.
+
+Times the decode, EXIF, resize and encode steps for batches of synthetic
+camera-sized JPEG and HEIC photos, serially and in the image worker pool.
+
+Usage:
+    python manage.py benchmark_image_processing
+    python manage.py benchmark_image_processing --batch-size 10 --format JPEG
+    python manage.py benchmark_image_processing --megapixels 24 --rounds 3
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from tt.apps.common.command_utils import CommandLoggerMixin
+
+from ...benchmarks import DEFAULT_MEGAPIXELS, get_benchmark_formats, run_processing_benchmark
+from ...workers import get_image_worker_pool
+
+
+class Command( BaseCommand, CommandLoggerMixin ):
+    help = 'Benchmark serial and worker pool image processing throughput'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            action='append',
+            default=[],
+            help='Images per batch (repeatable; default: 1, 10 and 50)',
+        )
+        parser.add_argument(
+            '--format',
+            action='append',
+            default=[],
+            help='JPEG or HEIF (repeatable; default: all supported)',
+        )
+        parser.add_argument(
+            '--megapixels',
+            type=float,
+            default=DEFAULT_MEGAPIXELS,
+            help=f'Synthetic photo size (default: {DEFAULT_MEGAPIXELS:g})',
+        )
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=1,
+            help='Timing rounds per batch; the best round is reported (default: 1)',
+        )
+
+    def handle(self, *args, **options):
+        formats = [ image_format.upper() for image_format in options['format'] ]
+        for image_format in formats:
+            if image_format not in get_benchmark_formats():
+                raise CommandError( f'Unsupported format "{image_format}", expected one of {get_benchmark_formats()}' )
+        if any( batch_size < 1 for batch_size in options['batch_size'] ):
+            raise CommandError( 'Batch sizes must be at least 1' )
+
+        try:
+            results = run_processing_benchmark(
+                batch_sizes = options['batch_size'] or None,
+                formats = formats or None,
+                megapixels = options['megapixels'],
+                rounds = max( 1, options['rounds'] ),
+            )
+        finally:
+            get_image_worker_pool().shutdown()
+
+        self.info( f'{"format":>6} {"images":>7} {"file MB":>8} {"serial s":>9} {"serial img/s":>13}'
+                   f' {"pool s":>8} {"pool img/s":>11} {"workers":>8} {"speedup":>8}  errors' )
+        for result in results:
+            line = (
+                f'{result.image_format:>6} {result.batch_size:>7} {result.file_bytes / 1024 / 1024:>8.1f}'
+                f' {result.serial_seconds:>9.2f} {result.serial_images_per_sec:>13.2f}'
+                f' {result.pool_seconds:>8.2f} {result.pool_images_per_sec:>11.2f}'
+                f' {result.worker_count:>8} {result.speedup:>7.1f}x  {result.error_count}'
+            )
+            if result.error_count:
+                self.error( line )
+            else:
+                self.message( line )
+
+        if any( result.error_count for result in results ):
+            raise CommandError( 'Some images failed to process' )
+        self.success( 'All images processed' )
+        return
@@ -0,0 +1,45 @@
+"""
+Management command to prune old image upload jobs.
+
+Deletes ImageUploadJob rows older than the retention period, finished or
+not, along with the spooled files of jobs that were lost before they were
+processed and any stray spooled files that old.  Submitting uploads
+already prunes with the default retention once an hour
+(ImageUploadJobPruner); run this to prune now or with a different
+retention.
+
+Usage:
+    python manage.py prune_image_upload_jobs
+    python manage.py prune_image_upload_jobs --hours 6
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tt.apps.common import datetimeproxy
+from tt.apps.common.command_utils import CommandLoggerMixin
+
+from ...models import ImageUploadJob
+from ...services import ImageUploadService
+
+
+class Command( BaseCommand, CommandLoggerMixin ):
+    help = 'Delete image upload jobs and spooled files older than the retention period'
+
+    def add_arguments(self, parser):
+        default_hours = int( ImageUploadJob.RETENTION.total_seconds() // 3600 )
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=default_hours,
+            help=f'Retention in hours (default: {default_hours})',
+        )
+
+    def handle(self, *args, **options):
+        if options['hours'] < 1:
+            raise CommandError( '--hours must be at least 1' )
+
+        cutoff = datetimeproxy.now() - timedelta( hours = options['hours'] )
+        deleted_count = ImageUploadService().prune_upload_jobs( older_than = cutoff )
+        self.success( f'Deleted {deleted_count} image upload job(s) older than {cutoff.isoformat()}' )
+        return
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:28
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0002_add_upload_session_uuid'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageUploadJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('uuid', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('upload_session_uuid', models.UUIDField(blank=True, null=True)),
+                ('filename', models.CharField(max_length=255)),
+                ('spool_path', models.CharField(blank=True, help_text='Local path of the uploaded file until it is processed', max_length=1024)),
+                ('status', models.CharField(choices=[('success', 'Success'), ('error', 'Error'), ('pending', 'Pending'), ('processing', 'Processing')], default='pending', max_length=16)),
+                ('error_message', models.TextField(blank=True)),
+                ('created_datetime', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('modified_datetime', models.DateTimeField(auto_now=True)),
+                ('trip_image', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='images.tripimage')),
+                ('uploaded_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='image_upload_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0003_imageuploadjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imageuploadjob',
+            name='started_datetime',
+            field=models.DateTimeField(blank=True, help_text='When a worker started processing the spooled file', null=True),
+        ),
+    ]
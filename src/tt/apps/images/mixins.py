@@ -1,10 +1,18 @@
-from typing import Optional
+import logging
+from typing import List, Optional
 from uuid import UUID
 
-from django.http import HttpRequest
+from django.core.files.uploadedfile import UploadedFile
+from django.http import HttpRequest, JsonResponse
 
 from tt.environment.constants import TtConst
 
+from .enums import UploadStatus
+from .services import ImageUploadService
+from .upload_queue import get_image_upload_queue
+
+logger = logging.getLogger(__name__)
+
 
 class ImagesViewMixin:
     """Mixin providing common image upload functionality."""
@@ -17,3 +25,41 @@ class ImagesViewMixin:
             except ValueError:
                 pass
         return None
+
+    def enqueue_uploaded_images( self,
+                                 request         : HttpRequest,
+                                 uploaded_files  : List[UploadedFile] ) -> JsonResponse:
+        """
+        Spool the uploaded files and queue them for processing.
+
+        Returns JSON with a result for each file.  Files still being
+        processed have 'pending' (or 'processing') status and an upload_uuid
+        for polling the images_upload_status endpoint.
+        """
+        upload_session_uuid = self.get_upload_session_uuid(request)
+
+        service = ImageUploadService()
+        upload_queue = get_image_upload_queue()
+        jobs = []
+        for uploaded_file in uploaded_files:
+            job = service.create_upload_job(
+                uploaded_file,
+                request.user,
+                upload_session_uuid = upload_session_uuid,
+            )
+            jobs.append( job )
+            continue
+        upload_queue.enqueue_many( jobs )
+
+        results = [ service.get_upload_job_result( job, request = request ) for job in jobs ]
+
+        logger.debug(
+            f"Upload batch accepted: User {request.user.email} (ID: {request.user.id}) - "
+            f"{sum( result.status == UploadStatus.SUCCESS for result in results )} succeeded, "
+            f"{sum( result.status == UploadStatus.ERROR for result in results )} failed, "
+            f"{sum( not result.status.is_done for result in results )} queued "
+            f"out of {len(uploaded_files)} files"
+        )
+
+        # Return 200 even if some files failed - client checks individual status
+        return JsonResponse({'files': [ result.to_dict() for result in results ]})
@@ -1,9 +1,11 @@
 import uuid
+from datetime import timedelta
 
 from django.conf import settings
 from django.db import models
 
 from . import managers
+from .enums import UploadStatus
 
 
 def trip_image_upload_path_helper( instance, filename, suffix = '' ):
@@ -149,3 +151,66 @@ class TripImage(models.Model):
         if self.datetime_utc:
             return f"TripImage {self.uuid} ({self.datetime_utc.strftime('%Y-%m-%d')})"
         return f"TripImage {self.uuid}"
+
+
+class ImageUploadJob(models.Model):
+    """
+    An accepted upload waiting for (or finished with) background processing.
+
+    The upload request only spools the file to local disk and creates this
+    record; an image upload worker (see upload_queue) processes the spooled
+    file, creates the TripImage and records the outcome here for the status
+    endpoint.  The spooled file is deleted once processed.
+
+    Jobs older than RETENTION (and the spooled files of lost jobs) are
+    pruned (prune_image_upload_jobs, and hourly as jobs are submitted).
+    """
+    RETENTION = timedelta( days = 1 )
+
+    uuid = models.UUIDField(
+        default = uuid.uuid4,
+        unique = True,
+        editable = False,
+    )
+    uploaded_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete = models.CASCADE,
+        related_name = 'image_upload_jobs',
+    )
+    upload_session_uuid = models.UUIDField(
+        null = True,
+        blank = True,
+    )
+    filename = models.CharField( max_length = 255 )
+    spool_path = models.CharField(
+        max_length = 1024,
+        blank = True,
+        help_text = 'Local path of the uploaded file until it is processed',
+    )
+    status = models.CharField(
+        max_length = 16,
+        choices = UploadStatus.choices(),
+        default = UploadStatus.PENDING.value,
+    )
+    error_message = models.TextField( blank = True )
+    trip_image = models.ForeignKey(
+        TripImage,
+        on_delete = models.SET_NULL,
+        null = True,
+        blank = True,
+        related_name = '+',
+    )
+    started_datetime = models.DateTimeField(
+        null = True,
+        blank = True,
+        help_text = 'When a worker started processing the spooled file',
+    )
+    created_datetime = models.DateTimeField( auto_now_add = True, db_index = True )
+    modified_datetime = models.DateTimeField( auto_now = True )
+
+    @property
+    def upload_status(self) -> UploadStatus:
+        return UploadStatus( self.status )
+
+    def __str__(self):
+        return f"ImageUploadJob {self.uuid} ({self.filename}: {self.status})"
@@ -30,6 +30,11 @@ class ImageProcessingConfig:
     WEB_IMAGE_QUALITY = 90
     THUMBNAIL_QUALITY = 85
 
+    # Decoding and resize performance
+    JPEG_DRAFT_DECODE = True             # Decode JPEGs at a reduced (1/2, 1/4, 1/8) scale
+    RESIZE_REDUCING_GAP = 3.0            # Integer reduce() before LANCZOS; None = plain resize
+    MAX_DECODE_PIXELS = 64 * 1000 * 1000  # Ceiling on decoded size, bounds worker memory
+
     # Supported formats (base set, HEIF added conditionally)
     ALLOWED_FORMATS = {'JPEG', 'MPO', 'PNG'}
     ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
@@ -175,6 +180,20 @@ class ExifMetadata:
         """Create empty metadata (no EXIF data found)."""
         return cls()
 
+    @classmethod
+    def from_trip_image(cls, trip_image: TripImage) -> 'ExifMetadata':
+        """Rebuild metadata from a saved TripImage (e.g., for a finished upload job)."""
+        gps = None
+        if trip_image.latitude is not None and trip_image.longitude is not None:
+            gps = GpsCoordinate(latitude=trip_image.latitude, longitude=trip_image.longitude)
+        return cls(
+            datetime_utc=trip_image.datetime_utc,
+            gps=gps,
+            caption=trip_image.caption or None,
+            tags=tuple(trip_image.tags or ()),
+            timezone=trip_image.timezone,
+        )
+
     @property
     def has_exif(self) -> bool:
         """Check if any EXIF data was successfully extracted (calculated property)."""
@@ -324,6 +343,19 @@ class ValidationResult:
         return (self.is_valid, self.error_message)
 
 
+@dataclass(frozen=True)
+class ProcessedImage:
+    """
+    Immutable output of the CPU-bound image processing steps.
+
+    Produced by image worker processes, so it holds only picklable values
+    and no database objects.
+    """
+    metadata: ExifMetadata
+    web_bytes: bytes
+    thumb_bytes: bytes
+
+
 @dataclass(frozen=True)
 class ImageUploadResult:
     """
@@ -339,6 +371,7 @@ class ImageUploadResult:
     error_message  : Optional[str]           = None
     metadata       : Optional[ExifMetadata]  = None
     html           : Optional[str]           = None
+    upload_uuid    : Optional[str]           = None   # ImageUploadJob, for status polling
 
     @property
     def uuid(self) -> Optional[str]:
@@ -401,6 +434,30 @@ class ImageUploadResult:
             html=None,
         )
 
+    @classmethod
+    def pending(
+        cls,
+        filename    : str,
+        upload_uuid : str,
+        status      : UploadStatus = UploadStatus.PENDING,
+    ) -> 'ImageUploadResult':
+        """
+        Create result for an upload that is still being processed.
+
+        Args:
+            filename: Original uploaded filename
+            upload_uuid: ImageUploadJob UUID, used to poll for completion
+            status: PENDING or PROCESSING
+
+        Returns:
+            ImageUploadResult with PENDING or PROCESSING status
+        """
+        return cls(
+            status=status,
+            filename=filename,
+            upload_uuid=upload_uuid,
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert to JSON-serializable dictionary for API responses.
@@ -415,4 +472,5 @@ class ImageUploadResult:
             'error_message': self.error_message,
             'metadata': self.metadata.to_dict() if self.metadata else None,
             'html': self.html,
+            'upload_uuid': self.upload_uuid,
         }
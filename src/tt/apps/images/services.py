@@ -1,11 +1,15 @@
 import io
 import logging
+import os
 import re
+import tempfile
 from datetime import date as date_type, datetime, timezone, timedelta
 from uuid import UUID
-from typing import Optional, Tuple, Any
+from typing import Any, Callable, List, Optional, Tuple
 
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.files import File
 from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import UploadedFile
 from django.db import transaction
@@ -19,16 +23,20 @@ from tt.apps.common import datetimeproxy
 from tt.apps.common.singleton import Singleton
 from tt.apps.trips.models import Trip
 
+from .enums import UploadStatus
+from .exceptions import ImageValidationError
 from .helpers import TripImageHelpers
 from .schemas import (
     GpsCoordinate,
     ExifMetadata,
     ImageDimensions,
     ImageUploadResult,
+    ProcessedImage,
     ValidationResult,
     ImageProcessingConfig,
 )
-from .models import TripImage
+from .models import ImageUploadJob, TripImage
+from .workers import get_image_worker_pool, process_image_file
 
 logger = logging.getLogger(__name__)
 
@@ -137,8 +145,28 @@ class ImageUploadService(Singleton):
     - Image processing (resize, format conversion, orientation correction)
     - TripImage database record creation
     - Grid item HTML rendering for AJAX responses
+    - Upload jobs for background processing (see upload_queue)
+    - Fanning batches out to the image worker pool (see workers)
     """
 
+    # Jobs not finished this long after a worker started them (or, if never
+    # started, after they were created) were lost (e.g., worker restart) and
+    # are reported as failed.
+    STALE_UPLOAD_JOB_SECS = 10 * 60
+
+    SPOOL_FILE_PREFIX = 'tt-upload-'
+
+    PROCESSING_ERROR_MESSAGE = (
+        'Failed to process "{filename}". '
+        'Please verify the file is not corrupted and try again. '
+        'If the problem persists, contact support.'
+    )
+
+    INVALID_IMAGE_MESSAGE = (
+        'File "{filename}" appears to be invalid or corrupted. '
+        'Please ensure it is a valid image file.'
+    )
+
     def __init_singleton__(self):
         """Initialize service singleton."""
         logger.debug("ImageUploadService initialized")
@@ -156,8 +184,34 @@ class ImageUploadService(Singleton):
         Returns:
             ValidationResult with is_valid and optional error_message
         """
+        try:
+            self.open_image_file(uploaded_file)
+        except ImageValidationError as e:
+            return ValidationResult.failure(str(e))
+
+        # Reset file pointer for subsequent operations
+        uploaded_file.seek(0)
+        return ValidationResult.success()
+
+    def open_image_file(self, image_file: File) -> Image.Image:
+        """
+        Validate an uploaded image file and open it for processing.
+
+        Only the header is read here (format, dimensions and EXIF are all
+        available from it); the pixel data is decoded once, by
+        process_opened_image, which also rejects corrupt image data.
+
+        Args:
+            image_file: Django File (e.g., UploadedFile) to validate and open
+
+        Returns:
+            PIL Image, opened but not yet loaded
+
+        Raises:
+            ImageValidationError: If the file is not an acceptable image
+        """
         # Check file extension
-        filename_lower = uploaded_file.name.lower()
+        filename_lower = image_file.name.lower()
         file_extension = None
         for ext in ImageProcessingConfig.ALLOWED_EXTENSIONS:
             if filename_lower.endswith(ext):
@@ -166,63 +220,66 @@ class ImageUploadService(Singleton):
 
         if not file_extension:
             allowed_list = ', '.join(sorted(ImageProcessingConfig.ALLOWED_EXTENSIONS))
-            return ValidationResult.failure(
-                f'Invalid file format for "{uploaded_file.name}". '
+            raise ImageValidationError(
+                f'Invalid file format for "{image_file.name}". '
                 f'Allowed extensions: {allowed_list}'
             )
 
         # Check file size
-        if uploaded_file.size > ImageProcessingConfig.MAX_FILE_SIZE_BYTES:
-            file_size_mb = uploaded_file.size / (1024 * 1024)
-            return ValidationResult.failure(
-                f'File "{uploaded_file.name}" is too large ({file_size_mb:.1f}MB). '
+        if image_file.size > ImageProcessingConfig.MAX_FILE_SIZE_BYTES:
+            file_size_mb = image_file.size / (1024 * 1024)
+            raise ImageValidationError(
+                f'File "{image_file.name}" is too large ({file_size_mb:.1f}MB). '
                 f'Maximum size: {ImageProcessingConfig.MAX_FILE_SIZE_MB}MB'
             )
 
         # Validate actual image content (security check - not just extension)
         try:
-            uploaded_file.seek(0)
-            image = Image.open(uploaded_file)
-
-            # Verify the image data is valid
-            image.verify()
-
-            # Check that image format matches allowed formats
-            if image.format not in ImageProcessingConfig.ALLOWED_FORMATS:
-                allowed_list = ', '.join(sorted(ImageProcessingConfig.ALLOWED_FORMATS))
-                return ValidationResult.failure(
-                    f'Invalid image format "{image.format}" in file "{uploaded_file.name}". '
-                    f'Allowed formats: {allowed_list}'
-                )
-
-            # Verify format matches extension expectation
-            # Note: MPO (Multi-Picture Object) is accepted for .jpg files as it's a JPEG variant
-            expected_formats = {
-                '.jpg': ['JPEG', 'MPO'],
-                '.jpeg': ['JPEG', 'MPO'],
-                '.png': ['PNG'],
-                '.heic': ['HEIF'],  # PIL reports HEIC files with format='HEIF'
-            }
-            expected_format_list = expected_formats.get(file_extension)
-
-            if expected_format_list and image.format not in expected_format_list:
-                return ValidationResult.failure(
-                    f'File "{uploaded_file.name}": extension {file_extension} does not match '
-                    f'actual image format {image.format}. This may indicate file corruption or '
-                    f'incorrect file extension.'
-                )
+            image_file.seek(0)
+            image = Image.open(image_file)
 
-            # Reset file pointer for subsequent operations
-            uploaded_file.seek(0)
-            return ValidationResult.success()
+            # verify() does nothing for JPEG and HEIF; for PNG it checks the
+            # chunk CRCs, which decoding skips, so keep it (it consumes the
+            # image, hence the reopen).
+            if image.format == 'PNG':
+                image.verify()
+                image_file.seek(0)
+                image = Image.open(image_file)
 
         except Exception as e:
-            logger.warning(f"Image validation failed for {uploaded_file.name}: {e}")
-            return ValidationResult.failure(
-                f'File "{uploaded_file.name}" appears to be invalid or corrupted. '
-                f'Please ensure it is a valid image file.'
+            logger.warning(f"Image validation failed for {image_file.name}: {e}")
+            raise ImageValidationError(self.INVALID_IMAGE_MESSAGE.format(filename=image_file.name))
+
+        self._check_image_format(image, image_file.name, file_extension)
+        return image
+
+    def _check_image_format(self, image: Image.Image, filename: str, file_extension: str) -> None:
+        # Check that image format matches allowed formats
+        if image.format not in ImageProcessingConfig.ALLOWED_FORMATS:
+            allowed_list = ', '.join(sorted(ImageProcessingConfig.ALLOWED_FORMATS))
+            raise ImageValidationError(
+                f'Invalid image format "{image.format}" in file "{filename}". '
+                f'Allowed formats: {allowed_list}'
             )
 
+        # Verify format matches extension expectation
+        # Note: MPO (Multi-Picture Object) is accepted for .jpg files as it's a JPEG variant
+        expected_formats = {
+            '.jpg': ['JPEG', 'MPO'],
+            '.jpeg': ['JPEG', 'MPO'],
+            '.png': ['PNG'],
+            '.heic': ['HEIF'],  # PIL reports HEIC files with format='HEIF'
+        }
+        expected_format_list = expected_formats.get(file_extension)
+
+        if expected_format_list and image.format not in expected_format_list:
+            raise ImageValidationError(
+                f'File "{filename}": extension {file_extension} does not match '
+                f'actual image format {image.format}. This may indicate file corruption or '
+                f'incorrect file extension.'
+            )
+        return
+
     def extract_exif_metadata(self, image: Image.Image) -> ExifMetadata:
         """
         Extract EXIF metadata from PIL Image.
@@ -248,20 +305,25 @@ class ImageUploadService(Singleton):
         detected_timezone = None
 
         try:
-            exif_data = image._getexif()
+            # getexif() parses only the top-level IFD (and is shared with
+            # exif_transpose); the Exif and GPS sub-IFDs are parsed on demand,
+            # and tags are read by code rather than mapping every tag to a name.
+            exif_data = image.getexif()
             if not exif_data:
                 return ExifMetadata.empty()
+            exif_ifd = exif_data.get_ifd(ExifTags.IFD.Exif)
 
-            # Create reverse mapping of EXIF tag codes to names
-            exif_tag_names = {ExifTags.TAGS[k]: v for k, v in exif_data.items() if k in ExifTags.TAGS}
+            def get_tag(tag: ExifTags.Base) -> Any:
+                # Capture-time tags belong in the Exif IFD, but some writers
+                # put them in the top-level IFD.
+                value = exif_ifd.get(tag)
+                return exif_data.get(tag) if value is None else value
 
             # Extract datetime with timezone offset parsing
-            datetime_str = exif_tag_names.get('DateTimeOriginal') or exif_tag_names.get('DateTime')
-            offset_str = exif_tag_names.get('OffsetTimeOriginal') or exif_tag_names.get('OffsetTime')
+            datetime_str = get_tag(ExifTags.Base.DateTimeOriginal) or get_tag(ExifTags.Base.DateTime)
+            offset_str = get_tag(ExifTags.Base.OffsetTimeOriginal) or get_tag(ExifTags.Base.OffsetTime)
 
             if datetime_str:
-                # datetime_str is already the value from exif_tag_names, not a tag key
-
                 try:
                     dt = datetime.strptime(datetime_str, '%Y:%m:%d %H:%M:%S')
 
@@ -295,7 +357,7 @@ class ImageUploadService(Singleton):
                     logger.warning(f"Failed to parse EXIF datetime: {e}")
 
             # Extract GPS coordinates using GpsCoordinate value object
-            gps_info = exif_tag_names.get('GPSInfo')
+            gps_info = exif_data.get_ifd(ExifTags.IFD.GPSInfo)
             if gps_info:
                 try:
                     # GPS tags use numeric keys
@@ -322,13 +384,13 @@ class ImageUploadService(Singleton):
                 )
 
             # Extract caption/description
-            image_description = exif_tag_names.get('ImageDescription')
+            image_description = get_tag(ExifTags.Base.ImageDescription)
             if image_description:
                 caption = str(image_description).strip()
 
             # Extract keywords/tags
             # XPKeywords is a Windows-specific tag that stores keywords
-            xp_keywords = exif_tag_names.get('XPKeywords')
+            xp_keywords = get_tag(ExifTags.Base.XPKeywords)
             if xp_keywords:
                 try:
                     # XPKeywords is UTF-16 encoded
@@ -377,10 +439,57 @@ class ImageUploadService(Singleton):
         # Calculate new dimensions preserving aspect ratio
         new_dims = current_dims.calculate_resized_dimensions(max_dimension)
 
-        # Use LANCZOS for high-quality downsampling
-        resized_image = image.resize(new_dims.to_tuple(), Image.Resampling.LANCZOS)
+        # Use LANCZOS for high-quality downsampling.  With a reducing gap,
+        # Pillow first shrinks by an integer factor with a box filter, then
+        # applies LANCZOS over the remaining (at least reducing_gap) ratio.
+        resized_image = image.resize(
+            new_dims.to_tuple(),
+            Image.Resampling.LANCZOS,
+            reducing_gap=ImageProcessingConfig.RESIZE_REDUCING_GAP,
+        )
         return resized_image
 
+    def draft_for_web_image(self, image: Image.Image) -> None:
+        """
+        For JPEGs, configure the decoder to decode at the smallest DCT scale
+        (1/2, 1/4 or 1/8) that still covers the web image size, so large
+        originals are never decoded at full resolution.  The final resize
+        to the web size stays a high-quality LANCZOS resize.
+
+        Must be called before the image is loaded; no-op for other formats.
+
+        Args:
+            image: PIL Image, opened but not yet loaded
+        """
+        if not ImageProcessingConfig.JPEG_DRAFT_DECODE:
+            return
+        if image.format not in ('JPEG', 'MPO'):
+            return
+        current_dims = ImageDimensions(width=image.size[0], height=image.size[1])
+        if not current_dims.needs_resize(ImageProcessingConfig.WEB_IMAGE_MAX_DIMENSION):
+            return
+
+        # Pillow picks the largest scale whose output is at least this size
+        web_dims = current_dims.calculate_resized_dimensions(ImageProcessingConfig.WEB_IMAGE_MAX_DIMENSION)
+        image.draft(None, web_dims.to_tuple())
+        return
+
+    def check_decode_size(self, image: Image.Image, filename: str) -> None:
+        """
+        Refuse to decode images above the pixel-count ceiling (after any
+        draft scaling), so a huge panorama cannot exhaust worker memory.
+
+        Raises:
+            ImageValidationError: If the image is too large to process
+        """
+        width, height = image.size
+        if width * height <= ImageProcessingConfig.MAX_DECODE_PIXELS:
+            return
+        raise ImageValidationError(
+            f'Image "{filename}" is too large to process ({width} x {height} pixels). '
+            f'Maximum: {ImageProcessingConfig.MAX_DECODE_PIXELS // 1000000} megapixels.'
+        )
+
     def process_and_resize_images(self, original_image: Image.Image) -> Tuple[bytes, bytes]:
         """
         Process original image: resize web version, create thumbnail, convert to JPEG.
@@ -448,8 +557,26 @@ class ImageUploadService(Singleton):
         Returns:
             Created TripImage instance
         """
+        return self._create_trip_image_record(
+            user,
+            uploaded_file.name,
+            metadata,
+            web_bytes,
+            thumb_bytes,
+            upload_session_uuid,
+        )
+
+    def _create_trip_image_record(
+        self,
+        user: Any,
+        filename: str,
+        metadata: ExifMetadata,
+        web_bytes: bytes,
+        thumb_bytes: bytes,
+        upload_session_uuid: Optional[UUID] = None,
+    ) -> TripImage:
         # Use filename as caption if no EXIF caption available
-        caption = metadata.caption if metadata.caption else uploaded_file.name
+        caption = metadata.caption if metadata.caption else filename
 
         with transaction.atomic():
             # Create TripImage instance using dataclass fields directly
@@ -467,14 +594,14 @@ class ImageUploadService(Singleton):
 
             # Save web image file
             trip_image.web_image.save(
-                uploaded_file.name,
+                filename,
                 ContentFile(web_bytes),
                 save=False,
             )
 
             # Save thumbnail image file
             trip_image.thumbnail_image.save(
-                uploaded_file.name,
+                filename,
                 ContentFile(thumb_bytes),
                 save=False,
             )
@@ -482,7 +609,7 @@ class ImageUploadService(Singleton):
             # Save the TripImage instance with both image fields
             trip_image.save()
 
-        logger.info(f'Created TripImage {trip_image.uuid} from {uploaded_file.name}')
+        logger.info(f'Created TripImage {trip_image.uuid} from {filename}')
         return trip_image
 
     def render_grid_item_html(self, trip_image: TripImage, request: Optional[HttpRequest] = None) -> str:
@@ -515,25 +642,170 @@ class ImageUploadService(Singleton):
         Returns:
             ImageUploadResult with success or error status
         """
-        # Step 1: Validate file
-        validation = self.validate_image_file(uploaded_file)
-        if not validation.is_valid:
+        try:
+            # Steps 1-7: Validate, decode, extract EXIF, correct orientation and resize
+            processed = self.ingest_image_file(uploaded_file)
+            metadata = processed.metadata
+            web_bytes, thumb_bytes = processed.web_bytes, processed.thumb_bytes
+
+            # Step 8: Create database record
+            trip_image = self.create_trip_image(user, uploaded_file, metadata, web_bytes, thumb_bytes, upload_session_uuid)
+
+            # Step 9: Render grid item HTML (only if request provided)
+            html = None
+            if request is not None:
+                html = self.render_grid_item_html(trip_image, request)
+
+            # Step 10: Build success response
+            logger.info(f'Successfully processed image upload: {uploaded_file.name} -> {trip_image.uuid}')
+
+            return ImageUploadResult.success(
+                filename=uploaded_file.name,
+                trip_image=trip_image,
+                metadata=metadata,
+                html=html,
+            )
+
+        except ImageValidationError as e:
             return ImageUploadResult.failure(
                 filename=uploaded_file.name,
-                error_message=validation.error_message,
+                error_message=str(e),
             )
 
-        # Image objects to close for memory management
-        original_image = None
+        except Exception as e:
+            # Log detailed error for debugging
+            logger.exception(
+                f'Unexpected error processing image {uploaded_file.name} for user {user.email}: {e}'
+            )
+            return ImageUploadResult.failure(
+                filename=uploaded_file.name,
+                error_message=self.PROCESSING_ERROR_MESSAGE.format(filename=uploaded_file.name),
+            )
+
+    def process_spooled_images(
+        self,
+        spooled_files: List[Tuple[str, str]],
+        use_process_pool: Optional[bool] = None,
+    ) -> List[Tuple[Optional[ProcessedImage], Optional[str]]]:
+        """
+        Validate and process spooled uploads, in the image worker pool when
+        there is more than one.
+
+        Args:
+            spooled_files: (spool_path, filename) for each upload
+            use_process_pool: Override settings.IMAGE_BATCH_PROCESS_POOL
+
+        Returns:
+            (ProcessedImage, None) or (None, error_message) for each upload, in order
+        """
+        if use_process_pool is None:
+            use_process_pool = settings.IMAGE_BATCH_PROCESS_POOL
+        if not use_process_pool or len(spooled_files) < 2:
+            return [
+                self.get_processing_result(
+                    filename,
+                    lambda spool_path=spool_path, filename=filename: self.process_spooled_image(spool_path, filename),
+                )
+                for spool_path, filename in spooled_files
+            ]
+
+        worker_pool = get_image_worker_pool()
+        futures = [
+            worker_pool.submit(process_image_file, spool_path, filename)
+            for spool_path, filename in spooled_files
+        ]
+        return [
+            self.get_processing_result(filename, future.result)
+            for (_, filename), future in zip(spooled_files, futures)
+        ]
+
+    def get_processing_result(
+        self,
+        filename: str,
+        get_processed_image: Callable[[], ProcessedImage],
+    ) -> Tuple[Optional[ProcessedImage], Optional[str]]:
+        """
+        Run (or collect from a worker) image processing, turning failures
+        into user-facing error messages.
 
+        Returns:
+            (ProcessedImage, None) on success, (None, error_message) on failure
+        """
         try:
-            # Step 2: Load image with Pillow
-            uploaded_file.seek(0)
-            original_image = Image.open(uploaded_file)
+            return get_processed_image(), None
+        except ImageValidationError as e:
+            return None, str(e)
+        except Exception as e:
+            logger.exception(f'Unexpected error processing image {filename}: {e}')
+            return None, self.PROCESSING_ERROR_MESSAGE.format(filename=filename)
+
+    def process_image(self, image_file: Any, filename: str = '') -> ProcessedImage:
+        """
+        CPU-bound processing of an already validated image file (see
+        process_opened_image).
+
+        Args:
+            image_file: Path or file object positioned at the start of the image
+            filename: Original filename, for error messages
+
+        Returns:
+            ProcessedImage with metadata and encoded image bytes
+
+        Raises:
+            ImageValidationError: If the image is too large or fails to decode
+        """
+        return self.process_opened_image(Image.open(image_file), filename=filename)
+
+    def ingest_image_file(self, image_file: File) -> ProcessedImage:
+        """
+        Validate and process an uploaded image file, opening and parsing
+        it only once: the handle that validation opens is the one that is
+        decoded and resized.
+
+        Args:
+            image_file: Django File (e.g., UploadedFile) with the original filename
+
+        Returns:
+            ProcessedImage with metadata and encoded image bytes
+
+        Raises:
+            ImageValidationError: If the file is not an acceptable image
+        """
+        original_image = self.open_image_file(image_file)
+        return self.process_opened_image(original_image, filename=image_file.name)
+
+    def process_opened_image(self, original_image: Image.Image, filename: str = '') -> ProcessedImage:
+        """
+        Decode, extract EXIF, correct orientation and create the web and
+        thumbnail JPEGs.  Does not touch the database, so it can run in a
+        worker process.  Closes the image when done.
+
+        Args:
+            original_image: PIL Image, opened but not yet loaded
+            filename: Original filename, for error messages
 
+        Returns:
+            ProcessedImage with metadata and encoded image bytes
+
+        Raises:
+            ImageValidationError: If the image is too large or fails to decode
+        """
+        try:
             # Step 3: Extract EXIF metadata (BEFORE any modifications)
             metadata = self.extract_exif_metadata(original_image)
 
+            # Step 3b: Decode large JPEGs at reduced scale, within the size ceiling
+            self.draft_for_web_image(original_image)
+            self.check_decode_size(original_image, filename)
+
+            # Step 3c: Decode the pixel data.  This is also the content check
+            # for corrupt or truncated image data.
+            try:
+                original_image.load()
+            except (OSError, SyntaxError, ValueError, EOFError) as e:
+                logger.warning(f"Image decoding failed for {filename}: {e}")
+                raise ImageValidationError(self.INVALID_IMAGE_MESSAGE.format(filename=filename))
+
             # Step 4: Apply EXIF orientation correction
             transposed = ImageOps.exif_transpose(original_image)
             if transposed is not None:
@@ -550,39 +822,283 @@ class ImageUploadService(Singleton):
             # Step 7: Process and resize images
             web_bytes, thumb_bytes = self.process_and_resize_images(original_image)
 
-            # Step 8: Create database record
-            trip_image = self.create_trip_image(user, uploaded_file, metadata, web_bytes, thumb_bytes, upload_session_uuid)
+            return ProcessedImage(
+                metadata=metadata,
+                web_bytes=web_bytes,
+                thumb_bytes=thumb_bytes,
+            )
 
-            # Step 9: Render grid item HTML (only if request provided)
-            html = None
-            if request is not None:
-                html = self.render_grid_item_html(trip_image, request)
+        finally:
+            # Clean up image objects to free memory
+            original_image.close()
 
-            # Step 10: Build success response
-            logger.info(f'Successfully processed image upload: {uploaded_file.name} -> {trip_image.uuid}')
+    def process_spooled_image(self, spool_path: str, filename: str) -> ProcessedImage:
+        """
+        Validate and process an upload spooled to local disk.  This is what
+        image upload workers run.
 
-            return ImageUploadResult.success(
-                filename=uploaded_file.name,
-                trip_image=trip_image,
-                metadata=metadata,
-                html=html,
-            )
+        Args:
+            spool_path: Local path of the spooled upload
+            filename: Original uploaded filename
 
-        except Exception as e:
-            # Log detailed error for debugging
-            logger.exception(
-                f'Unexpected error processing image {uploaded_file.name} for user {user.email}: {e}'
+        Returns:
+            ProcessedImage with metadata and encoded image bytes
+
+        Raises:
+            ImageValidationError: If the file is not an acceptable image
+        """
+        with open(spool_path, 'rb') as spool_file:
+            return self.ingest_image_file(File(spool_file, name=filename))
+
+    def create_upload_job(
+        self,
+        uploaded_file: UploadedFile,
+        user: Any,
+        upload_session_uuid: Optional[UUID] = None,
+    ) -> ImageUploadJob:
+        """
+        Spool an uploaded file to local disk and create the job that tracks
+        its background processing.
+
+        Args:
+            uploaded_file: Django UploadedFile object
+            user: User who uploaded the file
+            upload_session_uuid: Optional UUID to group bulk uploads
+
+        Returns:
+            Created ImageUploadJob in PENDING status
+        """
+        spool_path = self._spool_uploaded_file(uploaded_file)
+        try:
+            return ImageUploadJob.objects.create(
+                uploaded_by=user,
+                upload_session_uuid=upload_session_uuid,
+                filename=uploaded_file.name[:255],
+                spool_path=spool_path,
             )
-            return ImageUploadResult.failure(
-                filename=uploaded_file.name,
-                error_message=(
-                    f'Failed to process "{uploaded_file.name}". '
-                    f'Please verify the file is not corrupted and try again. '
-                    f'If the problem persists, contact support.'
-                ),
+        except Exception:
+            self._delete_spool_file(spool_path)
+            raise
+
+    def run_upload_job(self, job: ImageUploadJob) -> ImageUploadJob:
+        """
+        Process an upload job synchronously, in the calling process.
+
+        Returns:
+            The finished ImageUploadJob
+        """
+        return self.run_upload_jobs([job])[0]
+
+    def run_upload_jobs(self, jobs: List[ImageUploadJob]) -> List[ImageUploadJob]:
+        """
+        Process upload jobs and wait for them, fanning the processing out to
+        the image worker pool in process pool mode.
+
+        Returns:
+            The finished ImageUploadJobs, in the same order
+        """
+        self.start_upload_jobs([job.id for job in jobs])
+        processing_results = self.process_spooled_images([(job.spool_path, job.filename) for job in jobs])
+        return [
+            self.finish_upload_job(job.id, processed=processed, error_message=error_message)
+            for job, (processed, error_message) in zip(jobs, processing_results)
+        ]
+
+    def start_upload_jobs(self, job_ids: List[int]) -> int:
+        """
+        Mark pending upload jobs as being processed, from now.  Jobs that
+        are no longer pending (e.g., already reported as failed) are left
+        alone.
+
+        Returns:
+            Number of jobs started
+        """
+        return ImageUploadJob.objects.filter(
+            id__in=job_ids,
+            status=UploadStatus.PENDING.value,
+        ).update(
+            status=UploadStatus.PROCESSING.value,
+            started_datetime=django_timezone.now(),
+        )
+
+    def finish_upload_job(
+        self,
+        job_id: int,
+        processed: Optional[ProcessedImage] = None,
+        error_message: Optional[str] = None,
+    ) -> Optional[ImageUploadJob]:
+        """
+        Record the outcome of processing an upload job: create the TripImage
+        on success, and delete the spooled file either way.  Results that
+        arrive after the job was already finished (e.g., reported as failed
+        when stale) or pruned are dropped.
+
+        Args:
+            job_id: ImageUploadJob primary key
+            processed: Processing output, or None if processing failed
+            error_message: User-facing error message if processing failed
+
+        Returns:
+            The finished ImageUploadJob, or None if it no longer exists
+        """
+        with transaction.atomic():
+            job = ImageUploadJob.objects.select_for_update().select_related('uploaded_by').filter(id=job_id).first()
+            if job is None:
+                logger.warning(f'Upload job {job_id} no longer exists, dropping its result')
+                return None
+            spool_path = job.spool_path
+
+            if job.upload_status.is_done:
+                logger.warning(f'Upload job {job.uuid} already {job.status}, dropping late result')
+            else:
+                if processed is not None:
+                    try:
+                        job.trip_image = self._create_trip_image_record(
+                            job.uploaded_by,
+                            job.filename,
+                            processed.metadata,
+                            processed.web_bytes,
+                            processed.thumb_bytes,
+                            job.upload_session_uuid,
+                        )
+                        job.status = UploadStatus.SUCCESS.value
+                        logger.info(f'Successfully processed upload job {job.uuid}: {job.filename} -> {job.trip_image.uuid}')
+                    except Exception as e:
+                        logger.exception(f'Unexpected error saving upload job {job.uuid} ({job.filename}): {e}')
+                        error_message = self.PROCESSING_ERROR_MESSAGE.format(filename=job.filename)
+                if job.trip_image is None:
+                    job.status = UploadStatus.ERROR.value
+                    job.error_message = error_message or self.PROCESSING_ERROR_MESSAGE.format(filename=job.filename)
+
+            job.spool_path = ''
+            job.save()
+
+        self._delete_spool_file(spool_path)
+        return job
+
+    def fail_stale_upload_job(self, job: ImageUploadJob) -> ImageUploadJob:
+        """
+        Report an upload job that was never finished as failed.  The spooled
+        file is kept, since a slow worker may still be reading it; its late
+        result is dropped (and the file deleted) by finish_upload_job, or the
+        file is deleted when the job is pruned.
+
+        Returns:
+            The job, refreshed from the database
+        """
+        ImageUploadJob.objects.filter(
+            id=job.id,
+            status__in=[UploadStatus.PENDING.value, UploadStatus.PROCESSING.value],
+        ).update(
+            status=UploadStatus.ERROR.value,
+            error_message=self.PROCESSING_ERROR_MESSAGE.format(filename=job.filename),
+            modified_datetime=django_timezone.now(),
+        )
+        job.refresh_from_db()
+        return job
+
+    def prune_upload_jobs(self, older_than: datetime) -> int:
+        """
+        Delete upload jobs created before older_than, finished or not, with
+        the spooled files of lost jobs, and any spooled files older than that
+        which no job refers to (e.g., the job row was never committed).
+
+        Returns:
+            Number of jobs deleted
+        """
+        old_jobs = ImageUploadJob.objects.filter(created_datetime__lt=older_than)
+        for spool_path in old_jobs.exclude(spool_path='').values_list('spool_path', flat=True):
+            self._delete_spool_file(spool_path)
+            continue
+        deleted_count, _ = old_jobs.delete()
+
+        spool_dir = self._get_spool_dir()
+        live_spool_paths = set(ImageUploadJob.objects.exclude(spool_path='').values_list('spool_path', flat=True))
+        older_than_timestamp = older_than.timestamp()
+        try:
+            with os.scandir(spool_dir) as spool_entries:
+                for spool_entry in spool_entries:
+                    if not spool_entry.name.startswith(self.SPOOL_FILE_PREFIX):
+                        continue
+                    if spool_entry.path in live_spool_paths:
+                        continue
+                    if spool_entry.stat().st_mtime < older_than_timestamp:
+                        self._delete_spool_file(spool_entry.path)
+                    continue
+        except OSError as e:
+            logger.warning(f'Could not scan upload spool directory {spool_dir}: {e}')
+        return deleted_count
+
+    def get_upload_job_result(self, job: ImageUploadJob, request: Optional[HttpRequest] = None) -> ImageUploadResult:
+        """
+        Build the upload result for a job, as returned by the upload and
+        status endpoints.  Jobs that never finished are reported as failed.
+
+        Args:
+            job: ImageUploadJob to report on
+            request: Optional HttpRequest object for rendering templates with context processors
+
+        Returns:
+            ImageUploadResult with the job's current status
+        """
+        if not job.upload_status.is_done:
+            age_secs = (django_timezone.now() - (job.started_datetime or job.created_datetime)).total_seconds()
+            if age_secs < self.STALE_UPLOAD_JOB_SECS:
+                return ImageUploadResult.pending(
+                    filename=job.filename,
+                    upload_uuid=str(job.uuid),
+                    status=job.upload_status,
+                )
+            logger.warning(f'Upload job {job.uuid} {job.status} for {age_secs:.0f}s, marking as failed')
+            job = self.fail_stale_upload_job(job)
+
+        if job.upload_status == UploadStatus.SUCCESS and job.trip_image:
+            html = None
+            if request is not None:
+                html = self.render_grid_item_html(job.trip_image, request)
+            return ImageUploadResult(
+                status=UploadStatus.SUCCESS,
+                filename=job.filename,
+                trip_image=job.trip_image,
+                metadata=ExifMetadata.from_trip_image(job.trip_image),
+                html=html,
+                upload_uuid=str(job.uuid),
             )
 
-        finally:
-            # Clean up image objects to free memory
-            if original_image:
-                original_image.close()
+        return ImageUploadResult(
+            status=UploadStatus.ERROR,
+            filename=job.filename,
+            error_message=job.error_message or self.PROCESSING_ERROR_MESSAGE.format(filename=job.filename),
+            upload_uuid=str(job.uuid),
+        )
+
+    def _spool_uploaded_file(self, uploaded_file: UploadedFile) -> str:
+        """ Copy an upload to a local file that worker processes can open. """
+        _, extension = os.path.splitext(uploaded_file.name)
+        spool_fd, spool_path = tempfile.mkstemp(
+            prefix=self.SPOOL_FILE_PREFIX,
+            suffix=extension.lower()[:16],
+            dir=self._get_spool_dir(),
+        )
+        try:
+            with os.fdopen(spool_fd, 'wb') as spool_file:
+                for chunk in uploaded_file.chunks():
+                    spool_file.write(chunk)
+        except Exception:
+            self._delete_spool_file(spool_path)
+            raise
+        return spool_path
+
+    def _get_spool_dir(self) -> str:
+        return settings.IMAGE_UPLOAD_SPOOL_DIR or settings.FILE_UPLOAD_TEMP_DIR or tempfile.gettempdir()
+
+    def _delete_spool_file(self, spool_path: str) -> None:
+        if not spool_path:
+            return
+        try:
+            os.remove(spool_path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f'Could not delete spooled upload {spool_path}: {e}')
+        return
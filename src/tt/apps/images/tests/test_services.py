@@ -11,14 +11,17 @@ import logging
 import tempfile
 from datetime import datetime, timezone
 from decimal import Decimal
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.test import TestCase, RequestFactory, override_settings
-from PIL import Image
+from PIL import ExifTags, Image
 
-from tt.apps.images.schemas import ExifMetadata, GpsCoordinate
+from tt.apps.images.benchmarks import compute_ssim
+from tt.apps.images.exceptions import ImageValidationError
+from tt.apps.images.schemas import ExifMetadata, GpsCoordinate, ImageProcessingConfig
 from tt.apps.images.models import TripImage
-from tt.apps.images.services import ImageUploadService
+from tt.apps.images.services import HEIF_SUPPORT_AVAILABLE, ImageUploadService
 from tt.apps.images.tests.synthetic_data import (
     create_test_image_bytes,
     create_test_image_with_exif,
@@ -229,6 +232,52 @@ class ExifExtractionTestCase(TestCase):
 
         image.close()
 
+    def create_image_with_exif_ifds(self, format='JPEG'):
+        """Image with capture time and GPS in the Exif and GPS sub-IFDs, as cameras write them."""
+        exif = Image.Exif()
+        exif[ExifTags.Base.ImageDescription] = 'Stephansplatz'
+        exif[ExifTags.IFD.Exif] = {
+            ExifTags.Base.DateTimeOriginal: '2024:06:15 10:00:00',
+            ExifTags.Base.OffsetTimeOriginal: '+02:00',
+        }
+        exif[ExifTags.IFD.GPSInfo] = {
+            ExifTags.GPS.GPSLatitudeRef: 'N',
+            ExifTags.GPS.GPSLatitude: (48.0, 12.0, 29.43),
+            ExifTags.GPS.GPSLongitudeRef: 'E',
+            ExifTags.GPS.GPSLongitude: (16.0, 22.0, 25.75),
+        }
+        image_bytes = io.BytesIO()
+        Image.new('RGB', (100, 100), color='blue').save(image_bytes, format=format, exif=exif)
+        image_bytes.seek(0)
+        return Image.open(image_bytes)
+
+    def test_extract_tags_from_exif_and_gps_ifds(self):
+        """Capture time, offset and GPS should be read from their sub-IFDs."""
+        image = self.create_image_with_exif_ifds()
+
+        metadata = self.service.extract_exif_metadata(image)
+
+        self.assertEqual(datetime(2024, 6, 15, 8, 0, 0, tzinfo=timezone.utc), metadata.datetime_utc)
+        self.assertIsNotNone(metadata.timezone)
+        self.assertAlmostEqual(48.208, float(metadata.gps.latitude), places=3)
+        self.assertAlmostEqual(16.374, float(metadata.gps.longitude), places=3)
+        self.assertEqual('Stephansplatz', metadata.caption)
+
+        image.close()
+
+    def test_extract_heif_exif(self):
+        """HEIF images should have their EXIF extracted like JPEGs."""
+        if not HEIF_SUPPORT_AVAILABLE:
+            self.skipTest('HEIF support not available')
+        image = self.create_image_with_exif_ifds(format='HEIF')
+
+        metadata = self.service.extract_exif_metadata(image)
+
+        self.assertEqual(datetime(2024, 6, 15, 8, 0, 0, tzinfo=timezone.utc), metadata.datetime_utc)
+        self.assertEqual('Stephansplatz', metadata.caption)
+
+        image.close()
+
     def test_gps_timezone_fallback_integration(self):
         """When GPS available but no offset, timezone should be derived from GPS.
 
@@ -341,6 +390,62 @@ class ImageProcessingTestCase(TestCase):
         web_image.close()
         thumb_image.close()
 
+    def test_draft_decodes_large_jpeg_at_reduced_scale(self):
+        """Large JPEG should decode at the smallest scale still covering the web size."""
+        image = Image.open(io.BytesIO(create_test_image_bytes(width=4000, height=3000)))
+
+        self.service.draft_for_web_image(image)
+
+        self.assertEqual((2000, 1500), image.size)
+        image.load()
+        self.assertEqual((2000, 1500), image.size)
+        image.close()
+
+    def test_draft_skips_small_and_non_jpeg_images(self):
+        """Images not needing a resize, and non-JPEGs, decode at full size."""
+        small_jpeg = Image.open(io.BytesIO(create_test_image_bytes(width=1600, height=1200)))
+        large_png = Image.open(io.BytesIO(create_test_image_bytes(width=4000, height=3000, format='PNG')))
+
+        self.service.draft_for_web_image(small_jpeg)
+        self.service.draft_for_web_image(large_png)
+
+        self.assertEqual((1600, 1200), small_jpeg.size)
+        self.assertEqual((4000, 3000), large_png.size)
+        small_jpeg.close()
+        large_png.close()
+
+    def test_process_image_draft_output_matches_full_decode(self):
+        """Reduced-scale decoding should still produce a full-size web image."""
+        image_bytes = create_test_image_with_exif(width=4000, height=3000)
+
+        processed = self.service.process_image(io.BytesIO(image_bytes))
+        with patch.object(ImageProcessingConfig, 'JPEG_DRAFT_DECODE', False):
+            full_decode_processed = self.service.process_image(io.BytesIO(image_bytes))
+
+        web_image = Image.open(io.BytesIO(processed.web_bytes))
+        full_decode_web_image = Image.open(io.BytesIO(full_decode_processed.web_bytes))
+        self.assertEqual((1600, 1200), web_image.size)
+        self.assertGreater(compute_ssim(web_image, full_decode_web_image), 0.98)
+
+    def test_process_image_rejects_images_over_pixel_ceiling(self):
+        """Images over the decode ceiling should fail validation, not decode."""
+        image_bytes = create_test_image_bytes(width=1000, height=1000, format='PNG')
+
+        with patch.object(ImageProcessingConfig, 'MAX_DECODE_PIXELS', 500 * 1000):
+            with self.assertRaises(ImageValidationError) as context:
+                self.service.process_image(io.BytesIO(image_bytes), filename='panorama.png')
+
+        self.assertIn('panorama.png', str(context.exception))
+
+    def test_pixel_ceiling_applies_after_draft(self):
+        """A large JPEG within the ceiling once drafted should be processed."""
+        image_bytes = create_test_image_bytes(width=4000, height=3000)
+
+        with patch.object(ImageProcessingConfig, 'MAX_DECODE_PIXELS', 4 * 1000 * 1000):
+            processed = self.service.process_image(io.BytesIO(image_bytes))
+
+        self.assertGreater(len(processed.web_bytes), 0)
+
 
 @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
 class TripImageCreationTestCase(TestCase):
@@ -472,3 +577,38 @@ class FullUploadIntegrationTestCase(TestCase):
 
         # Verify no TripImage was created
         self.assertEqual(0, TripImage.objects.count())
+
+    def test_process_uploaded_image_too_large_to_decode(self):
+        """Image over the decode pixel ceiling should return its own error message."""
+        from tt.apps.images.enums import UploadStatus
+
+        uploaded_file = create_uploaded_file(filename='huge.png', content=create_test_image_bytes(format='PNG'))
+
+        with patch.object(ImageProcessingConfig, 'MAX_DECODE_PIXELS', 1000):
+            result = self.service.process_uploaded_image(uploaded_file, self.user)
+
+        self.assertEqual(UploadStatus.ERROR, result.status)
+        self.assertIn('too large to process', result.error_message)
+        self.assertEqual(0, TripImage.objects.count())
+
+    def test_process_uploaded_image_truncated_data(self):
+        """Image data that fails to decode should be reported as corrupted."""
+        from tt.apps.images.enums import UploadStatus
+
+        content = create_test_image_bytes(width=800, height=600)
+        uploaded_file = create_uploaded_file(filename='cut.jpg', content=content[:len(content) // 2])
+
+        result = self.service.process_uploaded_image(uploaded_file, self.user)
+
+        self.assertEqual(UploadStatus.ERROR, result.status)
+        self.assertIn('invalid or corrupted', result.error_message)
+        self.assertEqual(0, TripImage.objects.count())
+
+    def test_process_uploaded_image_opens_file_once(self):
+        """Validation and processing should share one opened image."""
+        uploaded_file = create_uploaded_file(filename='test.jpg')
+
+        with patch('tt.apps.images.services.Image.open', wraps=Image.open) as mock_open:
+            self.service.process_uploaded_image(uploaded_file, self.user)
+
+        mock_open.assert_called_once()
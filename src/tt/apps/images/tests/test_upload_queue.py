@@ -0,0 +1,371 @@
+"""
+Tests for background image upload processing.
+
+Covers upload jobs in ImageUploadService (spooling, processing, results)
+the image upload queues and the image worker pool.
+"""
+import logging
+import os
+import tempfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import Mock, patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone as django_timezone
+
+from tt.apps.images import upload_queue
+from tt.apps.images.benchmarks import run_decode_benchmark, run_processing_benchmark
+from tt.apps.images.enums import UploadStatus
+from tt.apps.images.exceptions import ImageValidationError
+from tt.apps.images.models import ImageUploadJob, TripImage
+from tt.apps.images.schemas import ProcessedImage
+from tt.apps.images.services import ImageUploadService
+from tt.apps.images.tests.synthetic_data import create_test_image_with_exif, create_uploaded_file
+from tt.apps.images.upload_queue import LocalImageUploadQueue, WorkerPoolImageUploadQueue, get_image_upload_queue
+from tt.apps.images.workers import ImageWorkerPool, process_image_file
+
+User = get_user_model()
+logging.disable(logging.CRITICAL)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), IMAGE_UPLOAD_SPOOL_DIR=tempfile.mkdtemp())
+class ImageUploadJobServiceTestCase(TestCase):
+
+    def setUp(self):
+        self.service = ImageUploadService()
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123')
+
+    def create_job(self, uploaded_file=None):
+        return self.service.create_upload_job(uploaded_file or create_uploaded_file(), self.user)
+
+    def test_create_upload_job_spools_file(self):
+        uploaded_file = create_uploaded_file(filename='photo.JPG')
+
+        job = self.create_job(uploaded_file)
+
+        self.assertEqual(UploadStatus.PENDING, job.upload_status)
+        self.assertEqual('photo.JPG', job.filename)
+        self.assertTrue(job.spool_path.endswith('.jpg'))
+        with open(job.spool_path, 'rb') as spool_file:
+            uploaded_file.seek(0)
+            self.assertEqual(uploaded_file.read(), spool_file.read())
+
+    def test_run_upload_job_creates_trip_image(self):
+        content = create_test_image_with_exif(description='Beach')
+        job = self.create_job(create_uploaded_file(content=content))
+        spool_path = job.spool_path
+
+        job = self.service.run_upload_job(job)
+
+        self.assertEqual(UploadStatus.SUCCESS, job.upload_status)
+        self.assertEqual('Beach', job.trip_image.caption)
+        self.assertEqual(self.user, job.trip_image.uploaded_by)
+        self.assertEqual('', job.spool_path)
+        self.assertFalse(os.path.exists(spool_path))
+
+    def test_run_upload_job_invalid_file(self):
+        job = self.create_job(create_uploaded_file(filename='bad.jpg', content=b'NOT_AN_IMAGE'))
+        spool_path = job.spool_path
+
+        job = self.service.run_upload_job(job)
+
+        self.assertEqual(UploadStatus.ERROR, job.upload_status)
+        self.assertIn('bad.jpg', job.error_message)
+        self.assertIsNone(job.trip_image)
+        self.assertFalse(os.path.exists(spool_path))
+        self.assertEqual(0, TripImage.objects.count())
+
+    def test_process_spooled_image_raises_validation_error(self):
+        job = self.create_job(create_uploaded_file(filename='image.png'))
+
+        with self.assertRaises(ImageValidationError) as context:
+            self.service.process_spooled_image(job.spool_path, job.filename)
+
+        self.assertIn('does not match', str(context.exception))
+
+    def test_result_for_pending_job(self):
+        job = self.create_job()
+
+        result = self.service.get_upload_job_result(job)
+
+        self.assertEqual(UploadStatus.PENDING, result.status)
+        self.assertEqual(str(job.uuid), result.to_dict()['upload_uuid'])
+        self.assertIsNone(result.uuid)
+
+    def test_result_for_finished_job(self):
+        job = self.service.run_upload_job(self.create_job())
+
+        result = self.service.get_upload_job_result(job)
+
+        self.assertEqual(UploadStatus.SUCCESS, result.status)
+        self.assertEqual(str(job.trip_image.uuid), result.uuid)
+        self.assertEqual(str(job.uuid), result.upload_uuid)
+        self.assertIsNotNone(result.metadata)
+
+    def test_stale_job_reported_as_failed(self):
+        job = self.create_job()
+        created_datetime = job.created_datetime - timedelta(seconds=ImageUploadService.STALE_UPLOAD_JOB_SECS + 1)
+        ImageUploadJob.objects.filter(id=job.id).update(created_datetime=created_datetime)
+        job.refresh_from_db()
+
+        result = self.service.get_upload_job_result(job)
+
+        self.assertEqual(UploadStatus.ERROR, result.status)
+        self.assertIsNotNone(result.error_message)
+        self.assertEqual(UploadStatus.ERROR, ImageUploadJob.objects.get(id=job.id).upload_status)
+        # A slow worker may still be reading the spooled file
+        self.assertTrue(os.path.exists(job.spool_path))
+
+    def test_staleness_measured_from_start(self):
+        job = self.create_job()
+        created_datetime = job.created_datetime - timedelta(seconds=ImageUploadService.STALE_UPLOAD_JOB_SECS + 1)
+        ImageUploadJob.objects.filter(id=job.id).update(created_datetime=created_datetime)
+        self.service.start_upload_jobs([job.id])
+        job.refresh_from_db()
+
+        result = self.service.get_upload_job_result(job)
+
+        self.assertEqual(UploadStatus.PROCESSING, result.status)
+
+        started_datetime = job.started_datetime - timedelta(seconds=ImageUploadService.STALE_UPLOAD_JOB_SECS + 1)
+        ImageUploadJob.objects.filter(id=job.id).update(started_datetime=started_datetime)
+        job.refresh_from_db()
+
+        result = self.service.get_upload_job_result(job)
+
+        self.assertEqual(UploadStatus.ERROR, result.status)
+
+    @override_settings(IMAGE_UPLOAD_SPOOL_DIR=tempfile.mkdtemp())
+    def test_late_result_for_failed_job_dropped(self):
+        job = self.create_job()
+        processed = self.service.process_spooled_image(job.spool_path, job.filename)
+        self.service.fail_stale_upload_job(job)
+
+        job = self.service.finish_upload_job(job.id, processed=processed)
+
+        self.assertEqual(UploadStatus.ERROR, job.upload_status)
+        self.assertIsNone(job.trip_image)
+        self.assertEqual(0, TripImage.objects.count())
+        self.assertEqual('', job.spool_path)
+        self.assertEqual([], os.listdir(settings.IMAGE_UPLOAD_SPOOL_DIR))
+
+    def test_result_for_pruned_job_dropped(self):
+        job = self.create_job()
+        processed = self.service.process_spooled_image(job.spool_path, job.filename)
+        ImageUploadJob.objects.filter(id=job.id).delete()
+
+        self.assertIsNone(self.service.finish_upload_job(job.id, processed=processed))
+        self.assertEqual(0, TripImage.objects.count())
+
+    @override_settings(IMAGE_UPLOAD_SPOOL_DIR=tempfile.mkdtemp())
+    def test_prune_upload_jobs(self):
+        old_job = self.create_job()
+        new_job = self.create_job()
+        finished_job = self.service.run_upload_job(self.create_job())
+        stray_fd, stray_path = tempfile.mkstemp(prefix='tt-upload-', dir=settings.IMAGE_UPLOAD_SPOOL_DIR)
+        os.close(stray_fd)
+        cutoff = django_timezone.now() - timedelta(hours=1)
+        old_datetime = cutoff - timedelta(minutes=1)
+        ImageUploadJob.objects.filter(id__in=[old_job.id, finished_job.id]).update(created_datetime=old_datetime)
+        for spool_path in [old_job.spool_path, new_job.spool_path, stray_path]:
+            os.utime(spool_path, (old_datetime.timestamp(), old_datetime.timestamp()))
+            continue
+
+        deleted_count = self.service.prune_upload_jobs(older_than=cutoff)
+
+        self.assertEqual(2, deleted_count)
+        self.assertEqual([new_job.id], list(ImageUploadJob.objects.values_list('id', flat=True)))
+        self.assertEqual([os.path.basename(new_job.spool_path)], os.listdir(settings.IMAGE_UPLOAD_SPOOL_DIR))
+        self.assertTrue(TripImage.objects.filter(id=finished_job.trip_image_id).exists())
+
+    def test_prune_image_upload_jobs_command(self):
+        job = self.create_job()
+        old_datetime = job.created_datetime - ImageUploadJob.RETENTION - timedelta(minutes=1)
+        ImageUploadJob.objects.filter(id=job.id).update(created_datetime=old_datetime)
+        self.create_job()
+
+        call_command('prune_image_upload_jobs', stdout=StringIO())
+
+        self.assertEqual(1, ImageUploadJob.objects.count())
+        self.assertFalse(os.path.exists(job.spool_path))
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), IMAGE_UPLOAD_SPOOL_DIR=tempfile.mkdtemp())
+class ImageUploadQueueTestCase(TestCase):
+
+    def setUp(self):
+        self.service = ImageUploadService()
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123')
+        self.job = self.service.create_upload_job(create_uploaded_file(), self.user)
+
+    def test_local_queue_processes_immediately(self):
+        LocalImageUploadQueue().enqueue(self.job)
+
+        self.assertEqual(UploadStatus.SUCCESS, self.job.upload_status)
+        self.assertIsNotNone(self.job.trip_image)
+
+    def test_local_queue_processes_batch(self):
+        other_job = self.service.create_upload_job(create_uploaded_file(filename='bad.jpg', content=b'BAD'), self.user)
+
+        LocalImageUploadQueue().enqueue_many([self.job, other_job])
+
+        self.assertEqual(UploadStatus.SUCCESS, self.job.upload_status)
+        self.assertEqual(UploadStatus.ERROR, other_job.upload_status)
+
+    def test_worker_pool_submits_after_commit(self):
+        worker_pool = Mock()
+        queue = WorkerPoolImageUploadQueue(worker_pool=worker_pool)
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            queue.enqueue(self.job)
+        worker_pool.submit.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+
+        worker_pool.submit.assert_called_once_with(process_image_file, self.job.spool_path, self.job.filename)
+        job = ImageUploadJob.objects.get(id=self.job.id)
+        self.assertEqual(UploadStatus.PROCESSING, job.upload_status)
+        self.assertIsNotNone(job.started_datetime)
+
+    def test_worker_pool_skips_job_no_longer_pending(self):
+        worker_pool = Mock()
+        queue = WorkerPoolImageUploadQueue(worker_pool=worker_pool)
+        self.service.fail_stale_upload_job(self.job)
+
+        queue._submit(self.job.id, self.job.spool_path, self.job.filename)
+
+        worker_pool.submit.assert_not_called()
+
+    def finish(self, future):
+        queue = WorkerPoolImageUploadQueue(worker_pool=Mock())
+        with patch('tt.apps.images.upload_queue.close_old_connections'), \
+             patch('tt.apps.images.upload_queue.connection'):
+            queue._finish(self.job.id, self.job.filename, future)
+        return ImageUploadJob.objects.get(id=self.job.id)
+
+    def test_worker_pool_finish_success(self):
+        future = Future()
+        future.set_result(self.service.process_spooled_image(self.job.spool_path, self.job.filename))
+
+        job = self.finish(future)
+
+        self.assertEqual(UploadStatus.SUCCESS, job.upload_status)
+        self.assertIsNotNone(job.trip_image)
+
+    def test_worker_pool_finish_validation_error(self):
+        future = Future()
+        future.set_exception(ImageValidationError('Not an image'))
+
+        job = self.finish(future)
+
+        self.assertEqual(UploadStatus.ERROR, job.upload_status)
+        self.assertEqual('Not an image', job.error_message)
+
+    def test_worker_pool_finish_worker_died(self):
+        future = Future()
+        future.set_exception(BrokenProcessPool('worker died'))
+
+        job = self.finish(future)
+
+        self.assertEqual(UploadStatus.ERROR, job.upload_status)
+        self.assertIn(self.job.filename, job.error_message)
+
+    def test_get_image_upload_queue(self):
+        with patch.object(upload_queue, '_g_image_upload_queue', None):
+            with override_settings(IMAGE_UPLOAD_QUEUE='local'):
+                self.assertIsInstance(get_image_upload_queue(), LocalImageUploadQueue)
+
+        with patch.object(upload_queue, '_g_image_upload_queue', None):
+            with override_settings(IMAGE_UPLOAD_QUEUE='celery'):
+                with self.assertRaises(ImproperlyConfigured):
+                    get_image_upload_queue()
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp(), IMAGE_UPLOAD_SPOOL_DIR=tempfile.mkdtemp())
+class ImageWorkerPoolTestCase(TestCase):
+
+    def setUp(self):
+        self.service = ImageUploadService()
+        self.user = User.objects.create_user(email='test@example.com', password='testpass123')
+
+    def start_worker_pool(self):
+        worker_pool = ImageWorkerPool(max_workers=2)
+        self.addCleanup(worker_pool.shutdown)
+        for target in ['tt.apps.images.services.get_image_worker_pool', 'tt.apps.images.benchmarks.get_image_worker_pool']:
+            patcher = patch(target, return_value=worker_pool)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return worker_pool
+
+    def test_worker_process_processes_image(self):
+        worker_pool = self.start_worker_pool()
+        job = self.service.create_upload_job(create_uploaded_file(), self.user)
+
+        future = worker_pool.submit(process_image_file, job.spool_path, job.filename)
+        processed = future.result(timeout=120)
+
+        self.assertIsInstance(processed, ProcessedImage)
+        self.assertGreater(len(processed.web_bytes), 0)
+        self.assertGreater(len(processed.thumb_bytes), 0)
+
+    @override_settings(IMAGE_BATCH_PROCESS_POOL=True, IMAGE_UPLOAD_SPOOL_DIR=tempfile.mkdtemp())
+    def test_upload_jobs_processed_in_worker_pool(self):
+        self.start_worker_pool()
+        jobs = [
+            self.service.create_upload_job(
+                create_uploaded_file(filename='first.jpg', content=create_test_image_with_exif(description='First')),
+                self.user,
+            ),
+            self.service.create_upload_job(create_uploaded_file(filename='bad.jpg', content=b'NOT_AN_IMAGE'), self.user),
+            self.service.create_upload_job(
+                create_uploaded_file(filename='third.jpg', content=create_test_image_with_exif(description='Third')),
+                self.user,
+            ),
+        ]
+
+        jobs = self.service.run_upload_jobs(jobs)
+
+        self.assertEqual(['success', 'error', 'success'], [job.status for job in jobs])
+        self.assertEqual('First', jobs[0].trip_image.caption)
+        self.assertEqual('Third', jobs[2].trip_image.caption)
+        self.assertIn('bad.jpg', jobs[1].error_message)
+        self.assertEqual([], os.listdir(settings.IMAGE_UPLOAD_SPOOL_DIR))
+
+    def test_processing_benchmark(self):
+        self.start_worker_pool()
+
+        results = run_processing_benchmark(batch_sizes=[1, 3], formats=['JPEG'], megapixels=0.1)
+
+        self.assertEqual([1, 3], [result.batch_size for result in results])
+        for result in results:
+            self.assertEqual(0, result.error_count)
+            self.assertGreater(result.serial_images_per_sec, 0)
+            self.assertGreater(result.pool_images_per_sec, 0)
+
+    def test_decode_benchmark(self):
+        results = run_decode_benchmark(scenarios=[('JPEG', 4.0)])
+
+        self.assertEqual(1, len(results))
+        self.assertGreater(results[0].baseline_seconds, 0)
+        self.assertGreater(results[0].fast_seconds, 0)
+        self.assertGreater(results[0].ssim, 0.98)
+
+    def test_broken_executor_is_replaced(self):
+        worker_pool = ImageWorkerPool(max_workers=1)
+        broken_executor = Mock()
+        worker_pool._executor = broken_executor
+        future = Future()
+        future.set_exception(BrokenProcessPool('worker died'))
+
+        worker_pool._reset_if_broken(broken_executor, future)
+
+        self.assertIsNone(worker_pool._executor)
+        broken_executor.shutdown.assert_called_once()
@@ -11,7 +11,7 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 
-from tt.apps.images.models import TripImage
+from tt.apps.images.models import ImageUploadJob, TripImage
 from tt.apps.images.tests.synthetic_data import create_test_image_bytes
 
 User = get_user_model()
@@ -199,6 +199,66 @@ class ImagesHomeViewTestCase(TestCase):
 
 
 @override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ImageUploadStatusViewTestCase(TestCase):
+    """Test ImageUploadStatusView polling endpoint."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+        )
+        self.client.login(email='test@example.com', password='testpass123')
+        self.url = reverse('images_upload_status')
+
+    def test_requires_authentication(self):
+        self.client.logout()
+
+        response = self.client.get(self.url, {'uuids': ''})
+
+        self.assertEqual(302, response.status_code)
+
+    def test_returns_current_job_results(self):
+        pending_job = ImageUploadJob.objects.create(uploaded_by=self.user, filename='pending.jpg')
+        trip_image = TripImage.objects.create(uploaded_by=self.user, caption='Done')
+        done_job = ImageUploadJob.objects.create(
+            uploaded_by=self.user,
+            filename='done.jpg',
+            status='success',
+            trip_image=trip_image,
+        )
+
+        response = self.client.get(self.url, {'uuids': f'{pending_job.uuid},{done_job.uuid}'})
+
+        self.assertEqual(200, response.status_code)
+        files = response.json()['files']
+        self.assertEqual(2, len(files))
+        self.assertEqual('pending', files[0]['status'])
+        self.assertEqual(str(pending_job.uuid), files[0]['upload_uuid'])
+        self.assertEqual('success', files[1]['status'])
+        self.assertEqual(str(trip_image.uuid), files[1]['uuid'])
+        self.assertIsNotNone(files[1]['html'])
+
+    def test_other_users_jobs_not_returned(self):
+        other_user = User.objects.create_user(email='other@example.com', password='pass')
+        job = ImageUploadJob.objects.create(uploaded_by=other_user, filename='other.jpg')
+
+        response = self.client.get(self.url, {'uuids': str(job.uuid)})
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual([], response.json()['files'])
+
+    def test_invalid_uuid_returns_error(self):
+        response = self.client.get(self.url, {'uuids': 'not-a-uuid'})
+
+        self.assertEqual(400, response.status_code)
+
+    def test_missing_uuids_returns_error(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(400, response.status_code)
+
+
 class TripImageInspectViewTestCase(TestCase):
     """Test ImageInspectView modal endpoint."""
 
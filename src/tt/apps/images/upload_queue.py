@@ -0,0 +1,188 @@
+"""
+Queues that process ImageUploadJobs outside the upload request.
+
+Decoding, EXIF extraction, resizing and JPEG encoding are CPU-bound and
+hold the GIL, so the default queue runs them in the image worker pool (see
+workers).  The upload request only spools the file and returns; the worker's output
+(ProcessedImage) is handed back to a thread in the web process, which
+creates the TripImage and records the outcome on the job for the status
+endpoint to report.
+
+The pool lives in the web process (there is no separate task broker), so
+jobs in flight when the process exits are lost; they are reported as
+failed once stale (see ImageUploadService.STALE_UPLOAD_JOB_SECS), and
+their rows and spooled files are pruned after ImageUploadJob.RETENTION
+(ImageUploadJobPruner, prune_image_upload_jobs).
+
+Configured by settings.IMAGE_UPLOAD_QUEUE:
+    'worker_pool' - WorkerPoolImageUploadQueue (default)
+    'local'       - LocalImageUploadQueue: process in the request (tests)
+"""
+import logging
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+
+from tt.apps.common.redis_client import get_redis_client
+
+from .models import ImageUploadJob
+from .services import ImageUploadService
+from .workers import ImageWorkerPool, get_image_worker_pool, process_image_file
+
+logger = logging.getLogger(__name__)
+
+
+class ImageUploadQueue( ABC ):
+
+    @abstractmethod
+    def enqueue( self, job : ImageUploadJob ) -> None:
+        """ Arrange for the job to be processed and finished. """
+        pass
+
+    def enqueue_many( self, jobs : List[ImageUploadJob] ) -> None:
+        for job in jobs:
+            self.enqueue( job )
+            continue
+        return
+
+    def shutdown( self ) -> None:
+        return
+
+
+class LocalImageUploadQueue( ImageUploadQueue ):
+    """ Processes jobs immediately and waits for them, in the calling process. """
+
+    def enqueue( self, job : ImageUploadJob ) -> None:
+        self.enqueue_many( [ job ] )
+        return
+
+    def enqueue_many( self, jobs : List[ImageUploadJob] ) -> None:
+        # Processing fans out to the worker pool in process pool mode
+        # (settings.IMAGE_BATCH_PROCESS_POOL).
+        ImageUploadService().run_upload_jobs( jobs )
+        for job in jobs:
+            job.refresh_from_db()
+            continue
+        return
+
+
+class WorkerPoolImageUploadQueue( ImageUploadQueue ):
+    """
+    Processes jobs in the image worker pool.  A single finisher thread
+    writes the results to the database, which keeps database connections
+    (and SQLite writes) off the request threads.
+    """
+
+    def __init__( self, worker_pool : ImageWorkerPool = None ):
+        self._worker_pool = worker_pool
+        self._finisher = ThreadPoolExecutor(
+            max_workers = 1,
+            thread_name_prefix = 'image-upload-finisher',
+        )
+        return
+
+    def enqueue( self, job : ImageUploadJob ) -> None:
+        # The worker finishes the job from another connection, so it must
+        # not start before the job row is committed.
+        job_id, spool_path, filename = job.id, job.spool_path, job.filename
+        transaction.on_commit( lambda: self._submit( job_id, spool_path, filename ))
+        return
+
+    def shutdown( self ) -> None:
+        self._finisher.shutdown( wait = True )
+        return
+
+    @property
+    def worker_pool( self ) -> ImageWorkerPool:
+        return self._worker_pool or get_image_worker_pool()
+
+    def _submit( self, job_id : int, spool_path : str, filename : str ) -> None:
+        if not ImageUploadService().start_upload_jobs( [ job_id ] ):
+            logger.warning( f'Upload job {job_id} is no longer pending, not submitting it' )
+            return
+
+        future = self.worker_pool.submit( process_image_file, spool_path, filename )
+        future.add_done_callback(
+            lambda done_future: self._finisher.submit( self._finish, job_id, filename, done_future )
+        )
+        ImageUploadJobPruner.prune_if_due()
+        return
+
+    def _finish( self, job_id : int, filename : str, future : Future ) -> None:
+        service = ImageUploadService()
+        processed, error_message = service.get_processing_result( filename, future.result )
+
+        close_old_connections()
+        try:
+            service.finish_upload_job(
+                job_id,
+                processed = processed,
+                error_message = error_message,
+            )
+        except Exception as e:
+            logger.exception( f'Could not finish upload job {job_id}: {e}' )
+        finally:
+            connection.close()
+        return
+
+
+class ImageUploadJobPruner:
+    """
+    Prunes old ImageUploadJobs, and the spooled files of lost ones, as jobs
+    are submitted, so nothing depends on the status endpoint being polled
+    and no scheduler is needed.  A Redis key (images:upload:prune:lock)
+    expiring after PRUNE_INTERVAL lets one submit per interval run the
+    prune; without Redis nothing is pruned until prune_image_upload_jobs
+    is run.
+    """
+
+    LOCK_KEY = 'images:upload:prune:lock'
+    PRUNE_INTERVAL = 3600  # 1 hour
+
+    @classmethod
+    def prune_if_due( cls ) -> None:
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                return
+            if not redis_client.set( cls.LOCK_KEY, 1, nx = True, ex = cls.PRUNE_INTERVAL ):
+                return
+        except Exception as e:
+            logger.warning( f"Redis error checking upload job prune: {e}" )
+            return
+        try:
+            deleted_count = ImageUploadService().prune_upload_jobs(
+                older_than = timezone.now() - ImageUploadJob.RETENTION,
+            )
+            logger.info( f"Pruned {deleted_count} image upload job(s)" )
+        except Exception as e:
+            logger.warning( f"Error pruning image upload jobs: {e}" )
+        return
+
+
+_g_image_upload_queue = None
+_g_image_upload_queue_lock = threading.Lock()
+
+
+def get_image_upload_queue() -> ImageUploadQueue:
+    global _g_image_upload_queue
+
+    if _g_image_upload_queue:
+        return _g_image_upload_queue
+    with _g_image_upload_queue_lock:
+        if _g_image_upload_queue:
+            return _g_image_upload_queue
+        queue_type = settings.IMAGE_UPLOAD_QUEUE
+        if queue_type == 'worker_pool':
+            _g_image_upload_queue = WorkerPoolImageUploadQueue()
+        elif queue_type == 'local':
+            _g_image_upload_queue = LocalImageUploadQueue()
+        else:
+            raise ImproperlyConfigured( f'Unknown IMAGE_UPLOAD_QUEUE: {queue_type}' )
+    return _g_image_upload_queue
@@ -8,6 +8,11 @@ urlpatterns = [
         views.ImagesHomeView.as_view(),
         name='images_home'
     ),
+    path(
+        'uploads/status',
+        views.ImageUploadStatusView.as_view(),
+        name='images_upload_status'
+    ),
     path(
         'inspect/<uuid:image_uuid>',
         views.ImageInspectView.as_view(),
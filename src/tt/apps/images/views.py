@@ -24,11 +24,11 @@ from tt.context import FeaturePageContext
 from tt.enums import FeaturePageType
 
 from .context import ImagePageContext
-from .enums import ImageAccessRole, UploadStatus
+from .enums import ImageAccessRole
 from .forms import TripImageEditForm
-from .helpers import TripImageHelpers
+from .helpers import MAX_UPLOAD_BATCH_SIZE, TripImageHelpers
 from .mixins import ImagesViewMixin
-from .models import TripImage
+from .models import ImageUploadJob, TripImage
 from .services import ImagePickerService, ImageUploadService, HEIF_SUPPORT_AVAILABLE
 
 logger = logging.getLogger(__name__)
@@ -60,7 +60,8 @@ class ImagesHomeView( LoginRequiredMixin, ImagesViewMixin, View ):
 
     def post(self, request, *args, **kwargs) -> JsonResponse:
         """
-        Handle multiple image uploads with EXIF extraction and resizing.
+        Handle multiple image uploads.  EXIF extraction and resizing happen
+        in the image upload queue.
 
         Returns JSON with upload results for each file.
         """
@@ -76,39 +77,45 @@ class ImagesHomeView( LoginRequiredMixin, ImagesViewMixin, View ):
                 status=400,
             )
 
-        upload_session_uuid = self.get_upload_session_uuid(request)
+        return self.enqueue_uploaded_images( request, uploaded_files )
 
-        # Use ImageUploadService for processing
-        service = ImageUploadService()
-        results = []
-        success_count = 0
-        error_count = 0
-
-        for uploaded_file in uploaded_files:
-            result = service.process_uploaded_image(
-                uploaded_file,
-                request.user,
-                request=request,
-                upload_session_uuid=upload_session_uuid,
-            )
-            results.append(result)
 
-            if result.status == UploadStatus.SUCCESS:
-                success_count += 1
-            else:
-                error_count += 1
+class ImageUploadStatusView( LoginRequiredMixin, ImagesViewMixin, View ):
+    """
+    Polled by the upload page for uploads still being processed.
 
-        # Log upload summary
-        logger.debug(
-            f"Upload batch completed: User {request.user.email} (ID: {request.user.id}) - "
-            f"{success_count} succeeded, {error_count} failed out of {len(uploaded_files)} files"
-        )
+    GET ?uuids=<upload_uuid>,<upload_uuid>,... returns JSON with the current
+    result for each of the user's upload jobs, in the same format as the
+    upload response.
+    """
+
+    def get(self, request, *args, **kwargs) -> JsonResponse:
+        upload_uuids = []
+        for uuid_str in request.GET.get('uuids', '').split(','):
+            if not uuid_str.strip():
+                continue
+            try:
+                upload_uuids.append( UUID( uuid_str.strip() ))
+            except ValueError:
+                return JsonResponse( {'error': 'Invalid UUID format'}, status = 400 )
+            continue
+
+        if not upload_uuids:
+            return JsonResponse( {'error': 'No upload UUIDs provided'}, status = 400 )
+        if len( upload_uuids ) > MAX_UPLOAD_BATCH_SIZE:
+            return JsonResponse(
+                {'error': f'Too many upload UUIDs. Maximum allowed: {MAX_UPLOAD_BATCH_SIZE}'},
+                status = 400,
+            )
 
-        # Convert dataclass results to dicts for JSON response
-        results_dicts = [result.to_dict() for result in results]
+        jobs = ImageUploadJob.objects.filter(
+            uploaded_by = request.user,
+            uuid__in = upload_uuids,
+        ).select_related( 'trip_image' ).order_by( 'id' )
 
-        # Return 200 even if some files failed - client checks individual status
-        return JsonResponse({'files': results_dicts})
+        service = ImageUploadService()
+        results = [ service.get_upload_job_result( job, request = request ) for job in jobs ]
+        return JsonResponse({'files': [ result.to_dict() for result in results ]})
 
 
 class ImageInspectView( LoginRequiredMixin, TripViewMixin, ModalView ):
@@ -328,8 +335,8 @@ class EntityImageUploadView(LoginRequiredMixin, TripViewMixin, ImagesViewMixin,
         """
         Handle POST request: Process uploaded images.
 
-        Delegates image processing to ImageUploadService and returns
-        JSON response with upload results for each file.
+        Queues the images for processing and returns JSON response with
+        upload results for each file.
         """
         # Check permissions
         self.check_permission(request, *args, **kwargs)
@@ -358,39 +365,7 @@ class EntityImageUploadView(LoginRequiredMixin, TripViewMixin, ImagesViewMixin,
                 status=400,
             )
 
-        upload_session_uuid = self.get_upload_session_uuid(request)
-
-        # Use ImageUploadService for processing
-        service = ImageUploadService()
-        results = []
-        success_count = 0
-        error_count = 0
-
-        for uploaded_file in uploaded_files:
-            result = service.process_uploaded_image(
-                uploaded_file,
-                request.user,
-                request=request,
-                upload_session_uuid=upload_session_uuid,
-            )
-            results.append(result)
-
-            if result.status == UploadStatus.SUCCESS:
-                success_count += 1
-            else:
-                error_count += 1
-
-        # Log upload summary
-        logger.debug(
-            f"Upload batch completed: User {request.user.email} (ID: {request.user.id}) - "
-            f"{success_count} succeeded, {error_count} failed out of {len(uploaded_files)} files"
-        )
-
-        # Convert dataclass results to dicts for JSON response
-        results_dicts = [result.to_dict() for result in results]
-
-        # Return 200 even if some files failed - client checks individual status
-        return JsonResponse({'files': results_dicts})
+        return self.enqueue_uploaded_images( request, uploaded_files )
 
 
 class EntityImagePickerView(LoginRequiredMixin, TripViewMixin, ModalView, ABC):
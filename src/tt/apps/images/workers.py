@@ -0,0 +1,136 @@
+"""
+Process pool for CPU-bound image processing.
+
+Decoding, EXIF extraction, resizing and JPEG encoding hold the GIL, so they
+are fanned out to worker processes: queued upload jobs
+(upload_queue.WorkerPoolImageUploadQueue) and batches of jobs processed
+in the request (ImageUploadService.run_upload_jobs) share one pool per web
+process.
+Workers only ever see a spooled file path and return a ProcessedImage; all
+database access stays in the web process.
+
+Settings:
+    IMAGE_UPLOAD_WORKERS          - Pool size (None = one per CPU, up to 4)
+    IMAGE_WORKER_MAX_MEMORY_MB    - Address space cap per worker (None = no cap)
+    IMAGE_WORKER_MAX_TASKS        - Images a worker processes before it is
+                                    replaced, bounding heap fragmentation
+
+This module must not import models at load time: spawned workers import it
+(to run init_worker) before Django is set up.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable
+
+import django
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def init_worker( max_memory_mb : int = None ) -> None:
+    if max_memory_mb:
+        try:
+            import resource
+            max_memory_bytes = max_memory_mb * 1024 * 1024
+            resource.setrlimit( resource.RLIMIT_AS, ( max_memory_bytes, max_memory_bytes ))
+        except ( ImportError, ValueError, OSError ) as e:
+            logger.warning( f'Could not cap image worker memory at {max_memory_mb}MB: {e}' )
+    django.setup()
+    return
+
+
+def process_image_file( spool_path : str, filename : str ):
+    """ Runs in a worker process.  Returns a ProcessedImage; no database access. """
+    from .services import ImageUploadService
+    return ImageUploadService().process_spooled_image( spool_path, filename )
+
+
+class ImageWorkerPool:
+    """
+    Lazily started process pool that can be replaced when it breaks (e.g.,
+    a worker killed for exceeding its memory cap).
+    """
+
+    MAX_DEFAULT_WORKERS = 4
+
+    def __init__( self,
+                  max_workers    : int  = None,
+                  max_memory_mb  : int  = None,
+                  max_tasks      : int  = None ):
+        self.max_workers = max_workers or min( os.cpu_count() or 1, self.MAX_DEFAULT_WORKERS )
+        self.max_memory_mb = max_memory_mb
+        self.max_tasks = max_tasks
+        self._executor = None
+        self._lock = threading.Lock()
+        return
+
+    def get_executor( self ) -> ProcessPoolExecutor:
+        """ The executor, started on first use (or after it broke). """
+        with self._lock:
+            if self._executor is None:
+                logger.info( f'Starting image worker pool with {self.max_workers} workers' )
+                self._executor = ProcessPoolExecutor(
+                    max_workers = self.max_workers,
+                    mp_context = multiprocessing.get_context( 'spawn' ),
+                    initializer = init_worker,
+                    initargs = ( self.max_memory_mb, ),
+                    max_tasks_per_child = self.max_tasks,
+                )
+            return self._executor
+
+    def submit( self, func : Callable, *args ) -> Future:
+        """ Submit to the executor, replacing it first if it has broken. """
+        executor = self.get_executor()
+        try:
+            future = executor.submit( func, *args )
+        except BrokenProcessPool:
+            self.reset( executor )
+            executor = self.get_executor()
+            future = executor.submit( func, *args )
+        future.add_done_callback( lambda done_future: self._reset_if_broken( executor, done_future ))
+        return future
+
+    def _reset_if_broken( self, executor : ProcessPoolExecutor, future : Future ) -> None:
+        if not future.cancelled() and isinstance( future.exception(), BrokenProcessPool ):
+            self.reset( executor )
+        return
+
+    def reset( self, broken_executor : ProcessPoolExecutor ) -> None:
+        """ Discard a broken executor so the next caller starts a new one. """
+        with self._lock:
+            if self._executor is broken_executor:
+                logger.warning( 'Image worker pool broke, restarting it' )
+                self._executor = None
+        broken_executor.shutdown( wait = False, cancel_futures = True )
+        return
+
+    def shutdown( self ) -> None:
+        with self._lock:
+            if self._executor:
+                self._executor.shutdown( wait = True )
+                self._executor = None
+        return
+
+
+_g_image_worker_pool = None
+_g_image_worker_pool_lock = threading.Lock()
+
+
+def get_image_worker_pool() -> ImageWorkerPool:
+    global _g_image_worker_pool
+
+    if _g_image_worker_pool:
+        return _g_image_worker_pool
+    with _g_image_worker_pool_lock:
+        if not _g_image_worker_pool:
+            _g_image_worker_pool = ImageWorkerPool(
+                max_workers = settings.IMAGE_UPLOAD_WORKERS,
+                max_memory_mb = settings.IMAGE_WORKER_MAX_MEMORY_MB,
+                max_tasks = settings.IMAGE_WORKER_MAX_TASKS,
+            )
+    return _g_image_worker_pool
@@ -11,6 +11,7 @@ Usage:
 """
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from django.db.models import Q
 
 from tt.apps.journal.models import JournalEntry
 from tt.apps.travelog.models import TravelogEntry
@@ -80,7 +81,9 @@ class Command(BaseCommand):
 
         # Process TravelogEntry
         self.stdout.write(self.style.MIGRATE_HEADING('Processing TravelogEntry records...'))
-        travelog_entries = TravelogEntry.objects.exclude(text='').order_by('travelog', 'date')
+        travelog_entries = TravelogEntry.objects.select_related('text_blob').filter(
+            ~Q(inline_text='') | (Q(text_blob__isnull=False) & ~Q(text_blob__text=''))
+        ).order_by('travelog', 'date')
         self._process_entries(
             travelog_entries, 'TravelogEntry', stats, verbose, execute
         )
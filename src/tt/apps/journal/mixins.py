@@ -1,5 +1,10 @@
-from django.shortcuts import render
+from typing import Tuple
+from uuid import UUID
 
+from django.http import Http404, HttpRequest
+from django.shortcuts import get_object_or_404, render
+
+from tt.apps.members.member_resolver import TripMemberResolver
 from tt.apps.members.models import TripMember
 from tt.apps.trips.context import TripPageContext
 from tt.apps.trips.enums import TripPage
@@ -11,6 +16,36 @@ from .models import Journal, JournalEntry
 
 class JournalViewMixin:
 
+    def get_journal_member( self,
+                            request  : HttpRequest,
+                            journal  : Journal      ) -> TripMember:
+        """ Request user's membership of the journal's trip (memoized per request). """
+        request_member = TripMemberResolver.get_member_for_trip(
+            request = request,
+            trip = journal.trip,
+        )
+        if not request_member:
+            raise Http404()
+        return request_member
+
+    def get_journal_and_member( self,
+                                request       : HttpRequest,
+                                journal_uuid  : UUID         ) -> Tuple[Journal, TripMember]:
+        journal = get_object_or_404(
+            Journal.objects.select_related( 'trip' ),
+            uuid = journal_uuid,
+        )
+        return journal, self.get_journal_member( request, journal = journal )
+
+    def get_entry_and_member( self,
+                              request     : HttpRequest,
+                              entry_uuid  : UUID         ) -> Tuple[JournalEntry, TripMember]:
+        entry = get_object_or_404(
+            JournalEntry.objects.select_related( 'journal__trip' ),
+            uuid = entry_uuid,
+        )
+        return entry, self.get_journal_member( request, journal = entry.journal )
+
     def journal_view_only_response( self,
                                     request,
                                     request_member  : TripMember,
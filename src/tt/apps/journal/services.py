@@ -120,7 +120,7 @@ class JournalRestoreService:
                 "Cannot restore: Travelog does not belong to this journal"
             )
 
-        travelog_entries = TravelogEntry.objects.filter( travelog = travelog )
+        travelog_entries = TravelogEntry.objects.filter( travelog = travelog ).select_related( 'text_blob' )
         if not travelog_entries.exists():
             raise RestoreError(
                 "Cannot restore from a version with no entries"
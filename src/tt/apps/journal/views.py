@@ -4,7 +4,6 @@ from typing import Optional, Tuple
 from uuid import UUID
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.contrib.auth.models import User as UserType
 from django.db import transaction
 from django.http import HttpRequest, HttpResponseRedirect, HttpResponse, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
@@ -19,7 +18,6 @@ from tt.apps.images.enums import UploadStatus
 from tt.apps.images.helpers import TripImageHelpers
 from tt.apps.images.views import EntityImagePickerView, EntityImageUploadView
 from tt.apps.images.services import ImageUploadService, ImagePickerService
-from tt.apps.members.models import TripMember
 from tt.apps.travelog.models import Travelog
 from tt.apps.travelog.services import PublishingService
 from tt.apps.trips.context import TripPageContext
@@ -140,15 +138,7 @@ class JournalCreateView( LoginRequiredMixin, TripViewMixin, ModalView ):
 class JournalHomeView(LoginRequiredMixin, JournalViewMixin, TripViewMixin, View):
 
     def get(self, request, journal_uuid: UUID, *args, **kwargs) -> HttpResponse:
-        journal = get_object_or_404(
-            Journal,
-            uuid = journal_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = journal.trip,
-            user = request.user,
-        )
+        journal, request_member = self.get_journal_and_member( request, journal_uuid = journal_uuid )
         self.assert_is_viewer(request_member)
 
         if not request_member.can_edit_trip:
@@ -183,21 +173,13 @@ class JournalHomeView(LoginRequiredMixin, JournalViewMixin, TripViewMixin, View)
         return render(request, 'journal/pages/journal_home.html', context)
 
 
-class JournalEditView( LoginRequiredMixin, TripViewMixin, ModalView ):
+class JournalEditView( LoginRequiredMixin, JournalViewMixin, TripViewMixin, ModalView ):
 
     def get_template_name(self) -> str:
         return 'journal/modals/journal_edit.html'
 
     def get(self, request, journal_uuid: UUID, *args, **kwargs) -> HttpResponse:
-        journal = get_object_or_404(
-            Journal,
-            uuid = journal_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = journal.trip,
-            user = request.user,
-        )
+        journal, request_member = self.get_journal_and_member( request, journal_uuid = journal_uuid )
         self.assert_is_editor(request_member)
 
         form = JournalForm(instance=journal)
@@ -210,15 +192,7 @@ class JournalEditView( LoginRequiredMixin, TripViewMixin, ModalView ):
         return self.modal_response(request, context=context)
 
     def post(self, request, journal_uuid: UUID, *args, **kwargs) -> HttpResponse:
-        journal = get_object_or_404(
-            Journal,
-            uuid = journal_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = journal.trip,
-            user = request.user,
-        )
+        journal, request_member = self.get_journal_and_member( request, journal_uuid = journal_uuid )
         self.assert_is_editor(request_member)
 
         original_timezone = journal.timezone
@@ -256,7 +230,7 @@ class JournalEditView( LoginRequiredMixin, TripViewMixin, ModalView ):
         return self.modal_response(request, context=context, status=400)
 
 
-class JournalTimezonesBulkUpdateView(LoginRequiredMixin, TripViewMixin, ModalView):
+class JournalTimezonesBulkUpdateView(LoginRequiredMixin, JournalViewMixin, TripViewMixin, ModalView):
     """Bulk update all journal entry timezones."""
 
     def get_template_name(self) -> str:
@@ -265,15 +239,7 @@ class JournalTimezonesBulkUpdateView(LoginRequiredMixin, TripViewMixin, ModalVie
     def post(self, request, journal_uuid: UUID, *args, **kwargs) -> HttpResponse:
         from django.utils import timezone
 
-        journal = get_object_or_404(
-            Journal,
-            uuid=journal_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip=journal.trip,
-            user=request.user,
-        )
+        journal, request_member = self.get_journal_and_member( request, journal_uuid = journal_uuid )
         self.assert_is_editor(request_member)
 
         form = JournalTimezonesBulkUpdateForm(request.POST)
@@ -288,21 +254,13 @@ class JournalTimezonesBulkUpdateView(LoginRequiredMixin, TripViewMixin, ModalVie
         return self.refresh_response(request)
 
 
-class JournalVisibilityChangeView( LoginRequiredMixin, TripViewMixin, ModalView ):
+class JournalVisibilityChangeView( LoginRequiredMixin, JournalViewMixin, TripViewMixin, ModalView ):
 
     def get_template_name(self) -> str:
         return 'journal/modals/journal_visibility.html'
 
     def get(self, request, journal_uuid: UUID, *args, **kwargs) -> HttpResponse:
-        journal = get_object_or_404(
-            Journal,
-            uuid = journal_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = journal.trip,
-            user = request.user,
-        )
+        journal, request_member = self.get_journal_and_member( request, journal_uuid = journal_uuid )
         self.assert_is_admin(request_member)
 
         form = JournalVisibilityForm(journal=journal)
@@ -315,15 +273,7 @@ class JournalVisibilityChangeView( LoginRequiredMixin, TripViewMixin, ModalView
         return self.modal_response(request, context=context)
 
     def post(self, request, journal_uuid: UUID, *args, **kwargs) -> HttpResponse:
-        journal = get_object_or_404(
-            Journal,
-            uuid = journal_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = journal.trip,
-            user = request.user,
-        )
+        journal, request_member = self.get_journal_and_member( request, journal_uuid = journal_uuid )
         self.assert_is_admin(request_member)
 
         form = JournalVisibilityForm(request.POST, journal=journal)
@@ -382,15 +332,7 @@ class JournalEntryNewView( LoginRequiredMixin, JournalViewMixin, TripViewMixin,
         return ( date_class.today(), journal.timezone )
 
     def get( self, request, journal_uuid: UUID, *args, **kwargs ) -> HttpResponse:
-        journal = get_object_or_404(
-            Journal,
-            uuid = journal_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = journal.trip,
-            user = request.user,
-        )
+        journal, request_member = self.get_journal_and_member( request, journal_uuid = journal_uuid )
         self.assert_is_viewer(request_member)
 
         if not request_member.can_edit_trip:
@@ -442,15 +384,7 @@ class JournalEpilogueNewView( JournalEntryNewView ):
 class JournalEntryView( LoginRequiredMixin, JournalViewMixin, TripViewMixin, View ):
 
     def get(self, request, entry_uuid: UUID, *args, **kwargs) -> HttpResponse:
-        entry = get_object_or_404(
-            JournalEntry,
-            uuid = entry_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = entry.journal.trip,
-            user = request.user,
-        )
+        entry, request_member = self.get_entry_and_member( request, entry_uuid = entry_uuid )
         self.assert_is_viewer(request_member)
 
         if not request_member.can_edit_trip:
@@ -547,18 +481,10 @@ class JournalEntryView( LoginRequiredMixin, JournalViewMixin, TripViewMixin, Vie
         return render(request, 'journal/pages/journal_entry.html', context)
 
 
-class JournalEntryAutosaveView(LoginRequiredMixin, TripViewMixin, View):
+class JournalEntryAutosaveView(LoginRequiredMixin, JournalViewMixin, TripViewMixin, View):
 
     def post(self, request, entry_uuid: UUID, *args, **kwargs) -> JsonResponse:
-        entry = get_object_or_404(
-            JournalEntry,
-            uuid = entry_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = entry.journal.trip,
-            user = request.user,
-        )
+        entry, request_member = self.get_entry_and_member( request, entry_uuid = entry_uuid )
         self.assert_is_editor(request_member)
 
         autosave_request, error_response = JournalAutoSaveHelper.parse_autosave_request(
@@ -625,21 +551,13 @@ class JournalEntryAutosaveView(LoginRequiredMixin, TripViewMixin, View):
             )
 
 
-class JournalEntryDeleteModalView( LoginRequiredMixin, TripViewMixin, ModalView ):
+class JournalEntryDeleteModalView( LoginRequiredMixin, JournalViewMixin, TripViewMixin, ModalView ):
 
     def get_template_name(self) -> str:
         return 'journal/modals/journal_entry_delete.html'
 
     def get(self, request, entry_uuid: UUID, *args, **kwargs) -> HttpResponse:
-        entry = get_object_or_404(
-            JournalEntry,
-            uuid = entry_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = entry.journal.trip,
-            user = request.user,
-        )
+        entry, request_member = self.get_entry_and_member( request, entry_uuid = entry_uuid )
         self.assert_is_editor(request_member)
         trip = request_member.trip
         context = {
@@ -650,15 +568,7 @@ class JournalEntryDeleteModalView( LoginRequiredMixin, TripViewMixin, ModalView
         return self.modal_response(request, context=context)
 
     def post(self, request, entry_uuid: UUID, *args, **kwargs) -> HttpResponse:
-        entry = get_object_or_404(
-            JournalEntry,
-            uuid = entry_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = entry.journal.trip,
-            user = request.user,
-        )
+        entry, request_member = self.get_entry_and_member( request, entry_uuid = entry_uuid )
         self.assert_is_editor(request_member)
 
         with transaction.atomic():
@@ -668,18 +578,10 @@ class JournalEntryDeleteModalView( LoginRequiredMixin, TripViewMixin, ModalView
         return self.redirect_response( request, redirect_url )
 
 
-class JournalEditorMultiImagePickerView( LoginRequiredMixin, TripViewMixin, View ):
+class JournalEditorMultiImagePickerView( LoginRequiredMixin, JournalViewMixin, TripViewMixin, View ):
 
     def get(self, request, entry_uuid: UUID, *args, **kwargs) -> HttpResponse:
-        entry = get_object_or_404(
-            JournalEntry,
-            uuid = entry_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = entry.journal.trip,
-            user = request.user,
-        )
+        entry, request_member = self.get_entry_and_member( request, entry_uuid = entry_uuid )
         self.assert_is_viewer(request_member)
         trip = request_member.trip
 
@@ -740,13 +642,13 @@ class JournalEditorHelpView(LoginRequiredMixin, ModalView):
         return self.modal_response(request, context=context)
 
 
-class JournalPublishModalView(LoginRequiredMixin, TripViewMixin, ModalView):
+class JournalPublishModalView(LoginRequiredMixin, JournalViewMixin, TripViewMixin, ModalView):
 
     def get_template_name(self) -> str:
         return 'journal/modals/journal_publish.html'
 
     def get( self, request, journal_uuid: UUID, *args, **kwargs ) -> HttpResponse:
-        journal = self._get_journal_and_verify_access( journal_uuid, request.user )
+        journal = self._get_journal_and_verify_access( request, journal_uuid )
 
         publishing_status = PublishingStatusHelper.get_publishing_status( journal = journal )
         visibility_form = JournalVisibilityForm( journal = journal )
@@ -759,7 +661,7 @@ class JournalPublishModalView(LoginRequiredMixin, TripViewMixin, ModalView):
         return self.modal_response( request, context = context )
 
     def post(self, request, journal_uuid: UUID, *args, **kwargs) -> HttpResponse:
-        journal = self._get_journal_and_verify_access(journal_uuid, request.user)
+        journal = self._get_journal_and_verify_access( request, journal_uuid )
 
         publishing_status = PublishingStatusHelper.get_publishing_status( journal= journal )
         visibility_form = JournalVisibilityForm( request.POST, journal = journal )
@@ -810,13 +712,8 @@ class JournalPublishModalView(LoginRequiredMixin, TripViewMixin, ModalView):
                 status = 500
             )
 
-    def _get_journal_and_verify_access( self, journal_uuid: UUID, user : UserType ) -> Journal:
-        journal = get_object_or_404(Journal, uuid=journal_uuid)
-        request_member = get_object_or_404(
-            TripMember,
-            trip = journal.trip,
-            user = user,
-        )
+    def _get_journal_and_verify_access( self, request : HttpRequest, journal_uuid: UUID ) -> Journal:
+        journal, request_member = self.get_journal_and_member( request, journal_uuid = journal_uuid )
         self.assert_is_admin( request_member )
         return journal
 
@@ -834,21 +731,13 @@ class JournalPublishModalView(LoginRequiredMixin, TripViewMixin, ModalView):
         return self.modal_response(request, context=context, status=status)
 
 
-class JournalVersionHistoryView( LoginRequiredMixin, TripViewMixin, ModalView ):
+class JournalVersionHistoryView( LoginRequiredMixin, JournalViewMixin, TripViewMixin, ModalView ):
 
     def get_template_name(self) -> str:
         return 'journal/modals/version_history.html'
 
     def get(self, request, journal_uuid: UUID, *args, **kwargs) -> HttpResponse:
-        journal = get_object_or_404(
-            Journal,
-            uuid = journal_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = journal.trip,
-            user = request.user,
-        )
+        journal, request_member = self.get_journal_and_member( request, journal_uuid = journal_uuid )
         self.assert_is_viewer(request_member)
 
         # Get all published versions ordered by version number (newest first)
@@ -862,21 +751,13 @@ class JournalVersionHistoryView( LoginRequiredMixin, TripViewMixin, ModalView ):
         return self.modal_response(request, context=context)
 
 
-class JournalSetCurrentVersionView( LoginRequiredMixin, TripViewMixin, ModalView ):
+class JournalSetCurrentVersionView( LoginRequiredMixin, JournalViewMixin, TripViewMixin, ModalView ):
 
     def get_template_name(self) -> str:
         return 'journal/modals/journal_set_current_confirm.html'
 
     def get(self, request, journal_uuid: UUID, travelog_uuid: UUID, *args, **kwargs) -> HttpResponse:
-        journal = get_object_or_404(
-            Journal,
-            uuid = journal_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = journal.trip,
-            user = request.user,
-        )
+        journal, request_member = self.get_journal_and_member( request, journal_uuid = journal_uuid )
         self.assert_is_admin(request_member)
 
         travelog = get_object_or_404(
@@ -897,15 +778,7 @@ class JournalSetCurrentVersionView( LoginRequiredMixin, TripViewMixin, ModalView
         This only changes which version is publicly visible.
         Does not affect the journal's working entries.
         """
-        journal = get_object_or_404(
-            Journal,
-            uuid = journal_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = journal.trip,
-            user = request.user,
-        )
+        journal, request_member = self.get_journal_and_member( request, journal_uuid = journal_uuid )
         self.assert_is_admin(request_member)
 
         travelog = get_object_or_404(
@@ -919,21 +792,13 @@ class JournalSetCurrentVersionView( LoginRequiredMixin, TripViewMixin, ModalView
         return self.refresh_response( request )
 
 
-class JournalRestoreView( LoginRequiredMixin, TripViewMixin, ModalView ):
+class JournalRestoreView( LoginRequiredMixin, JournalViewMixin, TripViewMixin, ModalView ):
 
     def get_template_name(self) -> str:
         return 'journal/modals/journal_restore_confirm.html'
 
     def get(self, request, journal_uuid: UUID, travelog_uuid: UUID, *args, **kwargs) -> HttpResponse:
-        journal = get_object_or_404(
-            Journal,
-            uuid = journal_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = journal.trip,
-            user = request.user,
-        )
+        journal, request_member = self.get_journal_and_member( request, journal_uuid = journal_uuid )
         self.assert_is_admin(request_member)
 
         travelog = get_object_or_404(
@@ -954,15 +819,7 @@ class JournalRestoreView( LoginRequiredMixin, TripViewMixin, ModalView ):
         This DELETES all current journal entries and replaces them
         with entries from the selected version. DESTRUCTIVE operation.
         """
-        journal = get_object_or_404(
-            Journal,
-            uuid = journal_uuid,
-        )
-        request_member = get_object_or_404(
-            TripMember,
-            trip = journal.trip,
-            user = request.user,
-        )
+        journal, request_member = self.get_journal_and_member( request, journal_uuid = journal_uuid )
         self.assert_is_admin(request_member)
 
         travelog = get_object_or_404(
@@ -977,7 +834,7 @@ class JournalRestoreView( LoginRequiredMixin, TripViewMixin, ModalView ):
         return self.refresh_response( request )
 
 
-class JournalReferenceImagePickerView( EntityImagePickerView ):
+class JournalReferenceImagePickerView( JournalViewMixin, EntityImagePickerView ):
 
     def get_template_name(self) -> str:
         return 'journal/modals/journal_reference_image_picker.html'
@@ -989,11 +846,7 @@ class JournalReferenceImagePickerView( EntityImagePickerView ):
         return 'journal_uuid'
 
     def check_permission(self, request, entity: Journal) -> None:
-        request_member = get_object_or_404(
-            TripMember,
-            trip=entity.trip,
-            user=request.user,
-        )
+        request_member = self.get_journal_member( request, journal = entity )
         self.assert_is_editor(request_member)
 
     def get_default_date_and_timezone(self, entity: Journal) -> Tuple[date_class, str]:
@@ -1020,7 +873,7 @@ class JournalReferenceImagePickerView( EntityImagePickerView ):
         return reverse('journal_image_upload', kwargs={'journal_uuid': entity.uuid})
 
 
-class JournalImageUploadView(EntityImageUploadView):
+class JournalImageUploadView( JournalViewMixin, EntityImageUploadView ):
     """
     Single-image upload mode - automatically sets uploaded image as
     Journal's reference image and triggers page refresh on success.
@@ -1035,12 +888,7 @@ class JournalImageUploadView(EntityImageUploadView):
     def check_permission(self, request, *args, **kwargs) -> None:
         """Verify user has editor permission for the journal's trip."""
         journal_uuid = kwargs.get('journal_uuid')
-        journal = get_object_or_404(Journal, uuid=journal_uuid)
-        request_member = get_object_or_404(
-            TripMember,
-            trip=journal.trip,
-            user=request.user,
-        )
+        journal, request_member = self.get_journal_and_member( request, journal_uuid = journal_uuid )
         self.assert_is_editor(request_member)
 
     def get_upload_url(self, request, *args, **kwargs) -> str:
@@ -1057,12 +905,7 @@ class JournalImageUploadView(EntityImageUploadView):
         """
         
         journal_uuid = kwargs.get('journal_uuid')
-        journal = get_object_or_404(Journal, uuid=journal_uuid)
-        request_member = get_object_or_404(
-            TripMember,
-            trip=journal.trip,
-            user=request.user,
-        )
+        journal, request_member = self.get_journal_and_member( request, journal_uuid = journal_uuid )
         self.assert_is_editor(request_member)
 
         uploaded_files = request.FILES.getlist('files')
@@ -1093,7 +936,7 @@ class JournalImageUploadView(EntityImageUploadView):
         }, status=400)
 
 
-class JournalEntryImagePickerView( EntityImagePickerView ):
+class JournalEntryImagePickerView( JournalViewMixin, EntityImagePickerView ):
 
     def get_template_name(self) -> str:
         return 'journal/modals/journal_entry_reference_image_picker.html'
@@ -1105,11 +948,7 @@ class JournalEntryImagePickerView( EntityImagePickerView ):
         return 'entry_uuid'
 
     def check_permission(self, request, entity: JournalEntry) -> None:
-        request_member = get_object_or_404(
-            TripMember,
-            trip=entity.journal.trip,
-            user=request.user,
-        )
+        request_member = self.get_journal_member( request, journal = entity.journal )
         self.assert_is_editor(request_member)
 
     def get_default_date_and_timezone(self, entity: JournalEntry) -> Tuple[date_class, str]:
@@ -1152,7 +991,7 @@ class JournalEntryImagePickerView( EntityImagePickerView ):
         return False
 
 
-class JournalEntryImageUploadView(EntityImageUploadView):
+class JournalEntryImageUploadView( JournalViewMixin, EntityImageUploadView ):
     """
     Single-image upload mode - automatically sets uploaded image as
     JournalEntry's reference image and triggers page refresh on success.
@@ -1166,12 +1005,7 @@ class JournalEntryImageUploadView(EntityImageUploadView):
 
     def check_permission(self, request, *args, **kwargs) -> None:
         entry_uuid = kwargs.get('entry_uuid')
-        entry = get_object_or_404(JournalEntry, uuid=entry_uuid)
-        request_member = get_object_or_404(
-            TripMember,
-            trip=entry.journal.trip,
-            user=request.user,
-        )
+        entry, request_member = self.get_entry_and_member( request, entry_uuid = entry_uuid )
         self.assert_is_editor(request_member)
 
     def get_upload_url(self, request, *args, **kwargs) -> str:
@@ -1186,12 +1020,7 @@ class JournalEntryImageUploadView(EntityImageUploadView):
         JavaScript handles page refresh via onComplete callback.
         """
         entry_uuid = kwargs.get('entry_uuid')
-        entry = get_object_or_404(JournalEntry, uuid=entry_uuid)
-        request_member = get_object_or_404(
-            TripMember,
-            trip=entry.journal.trip,
-            user=request.user,
-        )
+        entry, request_member = self.get_entry_and_member( request, entry_uuid = entry_uuid )
         self.assert_is_editor(request_member)
 
         uploaded_files = request.FILES.getlist('files')
@@ -1222,7 +1051,7 @@ class JournalEntryImageUploadView(EntityImageUploadView):
         }, status=400)
 
 
-class JournalEditorMultiImageUploadView(EntityImageUploadView):
+class JournalEditorMultiImageUploadView( JournalViewMixin, EntityImageUploadView ):
     """
     Multi-image upload mode for the Journal Editor sidebar.
 
@@ -1239,12 +1068,7 @@ class JournalEditorMultiImageUploadView(EntityImageUploadView):
 
     def check_permission(self, request, *args, **kwargs) -> None:
         entry_uuid = kwargs.get('entry_uuid')
-        entry = get_object_or_404(JournalEntry, uuid=entry_uuid)
-        request_member = get_object_or_404(
-            TripMember,
-            trip=entry.journal.trip,
-            user=request.user,
-        )
+        entry, request_member = self.get_entry_and_member( request, entry_uuid = entry_uuid )
         self.assert_is_editor(request_member)
 
     def get_upload_url(self, request, *args, **kwargs) -> str:
@@ -0,0 +1,141 @@
+"""
+Keyset (cursor) pagination for location collections.
+
+Pages are read with a "strictly after the last row" filter on an indexed
+ordering instead of OFFSET, so each page costs the same however deep the
+client is, and concurrent inserts or deletes never shift rows between
+pages.  Only one page of model instances is held at a time, which also
+lets the NDJSON stream cover very large trips.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Iterator, List, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from tt.apps.locations.models import Location
+
+
+class LocationCursor:
+    """
+    Opaque client-facing position in a location ordering: the ordering
+    name plus the sort value and id of the last row returned.
+    """
+    PREFIX = 'l1:'
+
+    @classmethod
+    def encode( cls, ordering : str, sort_value : Any, location_id : int ) -> str:
+        if isinstance( sort_value, datetime ):
+            sort_value = sort_value.isoformat()
+        raw = cls.PREFIX + json.dumps([ ordering, sort_value, location_id ])
+        return base64.urlsafe_b64encode( raw.encode( 'utf-8' )).decode( 'ascii' ).rstrip( '=' )
+
+    @classmethod
+    def decode( cls, cursor : str ) -> Optional[Tuple[str, Any, int]]:
+        """ Returns ( ordering, sort_value, location_id ), or None if not one of ours. """
+        try:
+            padded = cursor + '=' * ( -len( cursor ) % 4 )
+            raw = base64.urlsafe_b64decode( padded.encode( 'ascii' )).decode( 'utf-8' )
+            if not raw.startswith( cls.PREFIX ):
+                return None
+            ordering, sort_value, location_id = json.loads( raw[len( cls.PREFIX ):] )
+        except ( ValueError, TypeError, UnicodeError ):
+            return None
+        if not isinstance( ordering, str ) or not isinstance( location_id, int ):
+            return None
+        return ordering, sort_value, location_id
+
+
+class LocationKeysetPaginator:
+    """
+    Pages through a location queryset ordered by ( sort field, id ).
+    """
+    # Ordering name -> sort field; id breaks ties
+    ORDERINGS = {
+        'title': 'title',
+        'modified': 'modified_datetime',
+    }
+    DEFAULT_ORDERING = 'title'
+    DEFAULT_PAGE_SIZE = 200
+    MAX_PAGE_SIZE = 1000
+
+    def __init__( self,
+                  queryset   : QuerySet,
+                  ordering   : str       = DEFAULT_ORDERING,
+                  page_size  : int       = DEFAULT_PAGE_SIZE ):
+        if ordering not in self.ORDERINGS:
+            raise ValueError( f'Unknown ordering: {ordering}' )
+        self.queryset = queryset
+        self.ordering = ordering
+        self.sort_field = self.ORDERINGS[ordering]
+        self.page_size = max( 1, min( page_size, self.MAX_PAGE_SIZE ))
+        return
+
+    def get_page( self, cursor : Optional[str] = None ) -> Tuple[List[Location], Optional[str]]:
+        """
+        Returns the page after the cursor (or the first page) and the cursor
+        for the next page, which is None on the last page.
+
+        Raises ValueError for a cursor that is invalid or from another ordering.
+        """
+        queryset = self.queryset.order_by( self.sort_field, 'id' )
+        if cursor:
+            queryset = queryset.filter( self._get_after_filter( cursor ))
+
+        # One extra row tells whether there is a next page
+        locations = list( queryset[:self.page_size + 1] )
+        if len( locations ) <= self.page_size:
+            return locations, None
+        locations = locations[:self.page_size]
+        last_location = locations[-1]
+        next_cursor = LocationCursor.encode(
+            self.ordering,
+            getattr( last_location, self.sort_field ),
+            last_location.id,
+        )
+        return locations, next_cursor
+
+    def iter_pages( self, cursor : Optional[str] = None ) -> Iterator[List[Location]]:
+        while True:
+            locations, cursor = self.get_page( cursor )
+            if locations:
+                yield locations
+            if not cursor:
+                return
+            continue
+
+    def _get_after_filter( self, cursor : str ) -> Q:
+        decoded = LocationCursor.decode( cursor )
+        if not decoded or decoded[0] != self.ordering:
+            raise ValueError( 'Invalid cursor' )
+        _, sort_value, location_id = decoded
+        if self.sort_field == 'modified_datetime':
+            try:
+                sort_value = datetime.fromisoformat( sort_value )
+            except ( TypeError, ValueError ):
+                raise ValueError( 'Invalid cursor' )
+        elif not isinstance( sort_value, str ):
+            raise ValueError( 'Invalid cursor' )
+        return (
+            Q( **{ f'{self.sort_field}__gt': sort_value } )
+            | Q( **{ self.sort_field: sort_value, 'id__gt': location_id } )
+        )
+
+
+class NDJSONRenderer( BaseRenderer ):
+    """
+    Newline-delimited JSON.  Collection views stream successful responses
+    themselves; this renders anything else (e.g., errors) as one line, and
+    lets content negotiation accept ?format=ndjson or an NDJSON Accept header.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render( self, data, accepted_media_type = None, renderer_context = None ):
+        if data is None:
+            return b''
+        return ( json.dumps( data, cls = JSONEncoder ) + '\n' ).encode( 'utf-8' )
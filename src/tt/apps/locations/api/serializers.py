@@ -1,5 +1,6 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List, Optional
 
+from django.db.models import QuerySet
 from rest_framework import serializers
 
 from tt.apps.api.constants import APIFields as F
@@ -115,33 +116,118 @@ class LocationSerializer( serializers.Serializer ):
     created_datetime = serializers.DateTimeField( read_only = True )
     modified_datetime = serializers.DateTimeField( read_only = True )
 
-    def to_representation( self, instance: Location ) -> Dict[str, Any]:
-        # Serialize location notes
-        location_notes: List[Dict[str, Any]] = []
-        for note in instance.location_notes.all():
-            location_notes.append( LocationNoteSerializer().to_representation( note ) )
+    # Representation of each API field, in response order.
+    FIELD_REPRESENTATIONS = {
+        F.UUID: lambda instance: str( instance.uuid ),
+        F.TRIP_UUID: lambda instance: str( instance.trip.uuid ),
+        F.GMM_ID: lambda instance: instance.gmm_id,
+        F.VERSION: lambda instance: instance.version,
+        F.TITLE: lambda instance: instance.title,
+        F.SUBCATEGORY_SLUG: lambda instance: instance.subcategory.slug if instance.subcategory else None,
+        F.CONTACT_INFO: lambda instance: [
+            ContactInfoSerializer().to_representation( info ) for info in instance.contact_info.all()
+        ],
+        F.RATING: lambda instance: float( instance.rating ) if instance.rating else None,
+        F.DESIRABILITY: lambda instance: str( instance.desirability ) if instance.desirability else None,
+        F.ADVANCED_BOOKING: lambda instance: str( instance.advanced_booking ) if instance.advanced_booking else None,
+        F.OPEN_DAYS_TIMES: lambda instance: instance.open_days_times,
+        F.LATITUDE: lambda instance: float( instance.latitude ) if instance.latitude else None,
+        F.LONGITUDE: lambda instance: float( instance.longitude ) if instance.longitude else None,
+        F.ELEVATION_FT: lambda instance: float( instance.elevation_ft ) if instance.elevation_ft else None,
+        F.CREATED_DATETIME: lambda instance: instance.created_datetime.isoformat(),
+        F.MODIFIED_DATETIME: lambda instance: instance.modified_datetime.isoformat(),
+        F.LOCATION_NOTES: lambda instance: [
+            LocationNoteSerializer().to_representation( note ) for note in instance.location_notes.all()
+        ],
+    }
+
+    # What each API field needs loaded: ( model fields, select_related, prefetch_related )
+    FIELD_SOURCES = {
+        F.UUID: ( [ 'uuid' ], [], [] ),
+        F.TRIP_UUID: ( [ 'trip__uuid' ], [ 'trip' ], [] ),
+        F.GMM_ID: ( [ 'gmm_id' ], [], [] ),
+        F.VERSION: ( [ 'version' ], [], [] ),
+        F.TITLE: ( [ 'title' ], [], [] ),
+        F.SUBCATEGORY_SLUG: ( [ 'subcategory__slug' ], [ 'subcategory' ], [] ),
+        F.CONTACT_INFO: ( [], [], [ 'contact_info' ] ),
+        F.RATING: ( [ 'rating' ], [], [] ),
+        F.DESIRABILITY: ( [ 'desirability' ], [], [] ),
+        F.ADVANCED_BOOKING: ( [ 'advanced_booking' ], [], [] ),
+        F.OPEN_DAYS_TIMES: ( [ 'open_days_times' ], [], [] ),
+        F.LATITUDE: ( [ 'latitude' ], [], [] ),
+        F.LONGITUDE: ( [ 'longitude' ], [], [] ),
+        F.ELEVATION_FT: ( [ 'elevation_ft' ], [], [] ),
+        F.CREATED_DATETIME: ( [ 'created_datetime' ], [], [] ),
+        F.MODIFIED_DATETIME: ( [ 'modified_datetime' ], [], [] ),
+        F.LOCATION_NOTES: ( [], [], [ 'location_notes' ] ),
+    }
+
+    def __init__( self, *args, fields: Optional[Iterable[str]] = None, **kwargs ):
+        """
+        Args:
+            fields: Optional sparse fieldset (see parse_fields); output is
+                limited to these fields, in the standard order.
+        """
+        super().__init__( *args, **kwargs )
+        self.output_fields = [
+            field_name for field_name in self.FIELD_REPRESENTATIONS
+            if fields is None or field_name in fields
+        ]
+        return
+
+    @classmethod
+    def parse_fields( cls, fields_param: Optional[str] ) -> Optional[List[str]]:
+        """
+        Parse a ?fields=a,b,c value.  Returns None when absent (all fields).
 
-        # Serialize contact info
-        contact_info: List[Dict[str, Any]] = []
-        for info in instance.contact_info.all():
-            contact_info.append( ContactInfoSerializer().to_representation( info ) )
+        Raises ValueError naming any unknown fields.
+        """
+        if fields_param is None:
+            return None
+        fields = [ field_name.strip() for field_name in fields_param.split( ',' ) if field_name.strip() ]
+        unknown = [ field_name for field_name in fields if field_name not in cls.FIELD_SOURCES ]
+        if unknown:
+            raise ValueError( 'Unknown fields: ' + ', '.join( unknown ) )
+        if not fields:
+            raise ValueError( 'fields must name at least one field' )
+        return fields
 
+    @classmethod
+    def prepare_queryset( cls,
+                          queryset            : QuerySet,
+                          fields              : Optional[Iterable[str]] = None,
+                          extra_model_fields  : Iterable[str]           = () ) -> QuerySet:
+        """
+        Load what the (sparse) representation needs.  Without fields, this is
+        the full rows with all relations; with fields, only the needed columns
+        are loaded and unrequested relations are not joined or prefetched.
+
+        Args:
+            extra_model_fields: Additional model fields the caller reads
+                (e.g., a sort field for pagination) when narrowing.
+        """
+        if fields is None:
+            return queryset.select_related( 'trip', 'subcategory' ).prefetch_related(
+                'location_notes', 'contact_info'
+            )
+        only_fields = list( extra_model_fields )
+        select_related = []
+        prefetch_related = []
+        for field_name in fields:
+            model_fields, related, prefetches = cls.FIELD_SOURCES[field_name]
+            only_fields.extend( model_fields )
+            select_related.extend( related )
+            prefetch_related.extend( prefetches )
+            continue
+        queryset = queryset.only( 'id', *only_fields )
+        if select_related:
+            queryset = queryset.select_related( *select_related )
+        if prefetch_related:
+            queryset = queryset.prefetch_related( *prefetch_related )
+        return queryset
+
+    def to_representation( self, instance: Location ) -> Dict[str, Any]:
         return {
-            F.UUID: str( instance.uuid ),
-            F.TRIP_UUID: str( instance.trip.uuid ),
-            F.GMM_ID: instance.gmm_id,
-            F.VERSION: instance.version,
-            F.TITLE: instance.title,
-            F.SUBCATEGORY_SLUG: instance.subcategory.slug if instance.subcategory else None,
-            F.CONTACT_INFO: contact_info,
-            F.RATING: float( instance.rating ) if instance.rating else None,
-            F.DESIRABILITY: str( instance.desirability ) if instance.desirability else None,
-            F.ADVANCED_BOOKING: str( instance.advanced_booking ) if instance.advanced_booking else None,
-            F.OPEN_DAYS_TIMES: instance.open_days_times,
-            F.LATITUDE: float( instance.latitude ) if instance.latitude else None,
-            F.LONGITUDE: float( instance.longitude ) if instance.longitude else None,
-            F.ELEVATION_FT: float( instance.elevation_ft ) if instance.elevation_ft else None,
-            F.CREATED_DATETIME: instance.created_datetime.isoformat(),
-            F.MODIFIED_DATETIME: instance.modified_datetime.isoformat(),
-            F.LOCATION_NOTES: location_notes,
+            field_name: self.FIELD_REPRESENTATIONS[field_name]( instance )
+            for field_name in self.output_fields
         }
@@ -0,0 +1,45 @@
+"""
+Tests for location keyset pagination cursors.
+"""
+import logging
+from datetime import datetime, timezone
+
+from django.test import SimpleTestCase
+
+from tt.apps.locations.api.pagination import LocationCursor, LocationKeysetPaginator
+from tt.apps.locations.models import Location
+
+logging.disable( logging.CRITICAL )
+
+
+class LocationCursorTestCase( SimpleTestCase ):
+
+    def test_round_trip( self ):
+        cursor = LocationCursor.encode( 'title', 'Café "Zürich"', 42 )
+        self.assertEqual( LocationCursor.decode( cursor ), ( 'title', 'Café "Zürich"', 42 ) )
+
+    def test_datetime_values_encoded_as_isoformat( self ):
+        modified = datetime( 2024, 5, 1, 12, 30, 15, 123456, tzinfo = timezone.utc )
+        cursor = LocationCursor.encode( 'modified', modified, 7 )
+        self.assertEqual( LocationCursor.decode( cursor ), ( 'modified', modified.isoformat(), 7 ) )
+
+    def test_cursor_is_url_safe( self ):
+        cursor = LocationCursor.encode( 'title', '???>>>', 1 )
+        self.assertNotIn( '+', cursor )
+        self.assertNotIn( '/', cursor )
+        self.assertNotIn( '=', cursor )
+
+    def test_foreign_values_rejected( self ):
+        for cursor in [ 'garbage', '', 'bDE6WzFd', 'YzE6MTIz' ]:
+            with self.subTest( cursor = cursor ):
+                self.assertIsNone( LocationCursor.decode( cursor ) )
+
+    def test_paginator_rejects_cursor_from_other_ordering( self ):
+        paginator = LocationKeysetPaginator( Location.objects.none(), ordering = 'modified' )
+        cursor = LocationCursor.encode( 'title', 'Alpha', 1 )
+        with self.assertRaises( ValueError ):
+            paginator.get_page( cursor )
+
+    def test_page_size_is_clamped( self ):
+        paginator = LocationKeysetPaginator( Location.objects.none(), page_size = 10**6 )
+        self.assertEqual( paginator.page_size, LocationKeysetPaginator.MAX_PAGE_SIZE )
@@ -1,17 +1,29 @@
 """
 Tests for Location API views.
 
-Tests the LocationCollectionView and LocationItemView endpoints.
+Tests the LocationCollectionView, LocationItemView, LocationBatchView and
+GMM ID lookup endpoints, including the cached location list with ETag
+support and ?fields= sparse fieldsets.
 """
+import json
 import logging
 from decimal import Decimal
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import F
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
+from tt.apps.api.models import SyncChange, SyncDeletionLog
 from tt.apps.api.services import APITokenService
+from tt.apps.common.redis_client import get_redis_client
+from tt.apps.contacts.enums import ContactType
+from tt.apps.contacts.models import ContactInfo
 from tt.apps.locations.models import Location, LocationCategory, LocationNote, LocationSubCategory
+from tt.apps.locations.services import LocationListCacheService
 from tt.apps.trips.enums import TripPermissionLevel, TripStatus
 from tt.apps.trips.tests.synthetic_data import TripSyntheticData
 
@@ -978,3 +990,748 @@ class LocationItemViewDeleteTestCase( TestCase ):
 
         # Verify notes also deleted
         self.assertEqual( LocationNote.objects.filter( location__uuid = location_uuid ).count(), 0 )
+
+
+# =============================================================================
+# LocationCollectionView Tests - GET caching and ETags
+# =============================================================================
+
+class LocationCollectionViewCacheTestCase( TestCase ):
+    """Test the cached, ETag-validated location list."""
+
+    @classmethod
+    def setUpTestData( cls ):
+        cls.user = User.objects.create_user(
+            email = 'cacheuser@example.com',
+            password = 'testpass123'
+        )
+        cls.token_data = APITokenService.create_token( cls.user, 'Test Token' )
+        cls.trip = TripSyntheticData.create_test_trip(
+            user = cls.user,
+            title = 'Cached Trip',
+        )
+
+    def setUp( self ):
+        redis_client = get_redis_client()
+        keys = list( redis_client.scan_iter( match = 'locations:list:*' ) )
+        if keys:
+            redis_client.delete( *keys )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION = 'Bearer ' + self.token_data.api_token_str
+        )
+        self.url = f'/api/v1/locations/?trip={self.trip.uuid}'
+        self.location = Location.objects.create( trip = self.trip, title = 'Cached Location' )
+
+    def add_contact( self, location, value ):
+        return ContactInfo.objects.create(
+            content_object = location,
+            contact_type = ContactType.PHONE,
+            value = value,
+        )
+
+    def test_response_has_etag_and_revalidation_headers( self ):
+        response = self.client.get( self.url )
+
+        self.assertEqual( response.status_code, 200 )
+        self.assertTrue( response['ETag'].startswith( '"' ) )
+        self.assertIn( 'no-cache', response['Cache-Control'] )
+        self.assertIn( 'private', response['Cache-Control'] )
+
+    def test_matching_if_none_match_returns_304( self ):
+        etag = self.client.get( self.url )['ETag']
+
+        response = self.client.get( self.url, HTTP_IF_NONE_MATCH = etag )
+
+        self.assertEqual( response.status_code, 304 )
+        self.assertEqual( response['ETag'], etag )
+        self.assertEqual( response.content, b'' )
+
+    def test_contact_info_loaded_without_per_location_queries( self ):
+        """Test contact_info is prefetched, so serialization queries are flat."""
+        self.add_contact( self.location, '555-0001' )
+        self.client.get( self.url )  # Warm up token auth
+
+        def count_uncached_queries():
+            LocationListCacheService.invalidate( self.trip.pk )
+            with CaptureQueriesContext( connection ) as context:
+                response = self.client.get( self.url )
+            self.assertEqual( response.status_code, 200 )
+            return len( context.captured_queries )
+
+        baseline = count_uncached_queries()
+        for n in range( 5 ):
+            location = Location.objects.create( trip = self.trip, title = f'More {n}' )
+            self.add_contact( location, f'555-010{n}' )
+        self.assertEqual( count_uncached_queries(), baseline )
+
+    def test_cached_list_skips_location_queries( self ):
+        self.client.get( self.url )
+
+        # Membership lookup and the watermark aggregate only
+        with self.assertNumQueries( 2 ):
+            response = self.client.get( self.url )
+        self.assertEqual( response.json()['data'][0]['title'], 'Cached Location' )
+
+    def test_location_save_changes_etag( self ):
+        etag = self.client.get( self.url )['ETag']
+
+        self.location.title = 'Renamed'
+        self.location.save()
+
+        response = self.client.get( self.url, HTTP_IF_NONE_MATCH = etag )
+        self.assertEqual( response.status_code, 200 )
+        self.assertEqual( response.json()['data'][0]['title'], 'Renamed' )
+
+    def test_queryset_update_detected_by_watermark( self ):
+        """Test writes that send no signals are still seen via the watermark."""
+        self.client.get( self.url )
+
+        Location.objects.filter( pk = self.location.pk ).update( title = 'Quiet', version = 5 )
+
+        response = self.client.get( self.url )
+        self.assertEqual( response.json()['data'][0]['title'], 'Quiet' )
+
+    def test_version_increment_below_max_detected_by_watermark( self ):
+        """Test updating a location other than the newest one still moves the watermark."""
+        newer = Location.objects.create( trip = self.trip, title = 'Newer' )
+        newer.save()
+        etag = self.client.get( self.url )['ETag']
+
+        Location.objects.filter( pk = self.location.pk ).update(
+            title = 'Quiet', version = F( 'version' ) + 1,
+        )
+
+        response = self.client.get( self.url, HTTP_IF_NONE_MATCH = etag )
+        self.assertEqual( response.status_code, 200 )
+        titles = { item['title'] for item in response.json()['data'] }
+        self.assertIn( 'Quiet', titles )
+
+    def test_location_invalidation_deferred_until_commit( self ):
+        """Test a GET racing an uncommitted location write cannot keep the old list."""
+        self.client.get( self.url )
+
+        with self.captureOnCommitCallbacks( execute = True ):
+            self.location.title = 'Pending'
+            self.location.save()
+            self.assertIsNotNone( get_redis_client().get(
+                LocationListCacheService._get_cache_key( self.trip.pk )
+            ))
+        self.assertIsNone( get_redis_client().get(
+            LocationListCacheService._get_cache_key( self.trip.pk )
+        ))
+
+    def test_note_write_invalidates( self ):
+        etag = self.client.get( self.url )['ETag']
+
+        with self.captureOnCommitCallbacks( execute = True ):
+            LocationNote.objects.create( location = self.location, text = 'New note' )
+
+        response = self.client.get( self.url, HTTP_IF_NONE_MATCH = etag )
+        self.assertEqual( response.status_code, 200 )
+        self.assertEqual( response.json()['data'][0]['location_notes'][0]['text'], 'New note' )
+
+    def test_contact_write_invalidates( self ):
+        self.client.get( self.url )
+
+        with self.captureOnCommitCallbacks( execute = True ):
+            contact = self.add_contact( self.location, '555-0002' )
+        response = self.client.get( self.url )
+        self.assertEqual( response.json()['data'][0]['contact_info'][0]['value'], '555-0002' )
+
+        with self.captureOnCommitCallbacks( execute = True ):
+            contact.delete()
+        response = self.client.get( self.url )
+        self.assertEqual( response.json()['data'][0]['contact_info'], [] )
+
+    def test_note_invalidation_deferred_until_commit( self ):
+        """Test a GET racing an uncommitted note write cannot keep the old list."""
+        self.client.get( self.url )
+
+        with self.captureOnCommitCallbacks( execute = True ) as callbacks:
+            LocationNote.objects.create( location = self.location, text = 'Pending' )
+            # Still cached until the writer commits
+            pending = LocationListCacheService.get_payload(
+                self.trip, LocationListCacheService.get_watermark( self.trip ),
+            )
+            self.assertIsNotNone( pending )
+        self.assertEqual( len( callbacks ), 1 )
+
+        response = self.client.get( self.url )
+        self.assertEqual( response.json()['data'][0]['location_notes'][0]['text'], 'Pending' )
+
+    def test_api_note_replacement_invalidates( self ):
+        self.client.get( self.url )
+
+        self.client.patch(
+            f'/api/v1/locations/{self.location.uuid}/',
+            { 'location_notes': [ { 'text': 'Via API' } ] },
+            format = 'json',
+        )
+
+        response = self.client.get( self.url )
+        self.assertEqual( response.json()['data'][0]['location_notes'][0]['text'], 'Via API' )
+
+    def test_redis_failure_serves_from_database( self ):
+        with patch( 'tt.apps.locations.services.get_redis_client', side_effect = Exception( 'down' ) ):
+            response = self.client.get( self.url )
+
+        self.assertEqual( response.status_code, 200 )
+        self.assertEqual( response.json()['data'][0]['title'], 'Cached Location' )
+
+
+# =============================================================================
+# LocationCollectionView Tests - GET keyset pagination and NDJSON streaming
+# =============================================================================
+
+class LocationCollectionViewKeysetTestCase( TestCase ):
+    """Test cursor-paginated and streamed location lists."""
+
+    @classmethod
+    def setUpTestData( cls ):
+        cls.user = User.objects.create_user(
+            email = 'pager@example.com',
+            password = 'testpass123'
+        )
+        cls.token_data = APITokenService.create_token( cls.user, 'Test Token' )
+        cls.trip = TripSyntheticData.create_test_trip(
+            user = cls.user,
+            title = 'Wishlist Trip',
+        )
+        # Duplicate titles exercise the id tie-breaker
+        for title in [ 'Delta', 'Alpha', 'Charlie', 'Bravo', 'Bravo', 'Echo', 'Alpha' ]:
+            Location.objects.create( trip = cls.trip, title = title )
+
+    def setUp( self ):
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION = 'Bearer ' + self.token_data.api_token_str
+        )
+        self.url = f'/api/v1/locations/?trip={self.trip.uuid}'
+
+    def collect_pages( self, extra = '' ):
+        uuids = []
+        titles = []
+        cursor = None
+        page_count = 0
+        while True:
+            url = f'{self.url}&limit=3{extra}'
+            if cursor:
+                url += f'&cursor={cursor}'
+            response = self.client.get( url )
+            self.assertEqual( response.status_code, 200 )
+            data = response.json()['data']
+            page_count += 1
+            uuids.extend( item['uuid'] for item in data['results'] )
+            titles.extend( item['title'] for item in data['results'] )
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        return uuids, titles, page_count
+
+    def test_pages_cover_all_locations_in_title_order( self ):
+        uuids, titles, page_count = self.collect_pages()
+
+        self.assertEqual( page_count, 3 )
+        self.assertEqual( titles, [ 'Alpha', 'Alpha', 'Bravo', 'Bravo', 'Charlie', 'Delta', 'Echo' ] )
+        self.assertEqual( len( set( uuids ) ), 7 )
+
+    def test_modified_ordering( self ):
+        Location.objects.get( trip = self.trip, title = 'Charlie' ).save()
+
+        uuids, titles, _ = self.collect_pages( '&order=modified' )
+
+        self.assertEqual( len( set( uuids ) ), 7 )
+        self.assertEqual( titles[-1], 'Charlie' )
+
+    def test_page_query_count_independent_of_depth( self ):
+        first = self.client.get( f'{self.url}&limit=2' )  # Also warms up token auth
+        cursor = first.json()['data']['next_cursor']
+
+        with CaptureQueriesContext( connection ) as first_context:
+            self.client.get( f'{self.url}&limit=2' )
+        with CaptureQueriesContext( connection ) as later_context:
+            self.client.get( f'{self.url}&limit=2&cursor={cursor}' )
+        self.assertEqual( len( first_context ), len( later_context ) )
+
+    def test_invalid_parameters_rejected( self ):
+        cursor = self.client.get( f'{self.url}&limit=2' ).json()['data']['next_cursor']
+
+        for query in [
+            '&cursor=garbage',
+            f'&cursor={cursor}&order=modified',
+            '&limit=2&order=rating',
+            '&limit=many',
+        ]:
+            with self.subTest( query = query ):
+                response = self.client.get( self.url + query )
+                self.assertEqual( response.status_code, 400 )
+
+    def test_ndjson_stream_by_format_parameter( self ):
+        response = self.client.get( f'{self.url}&format=ndjson&limit=2' )
+
+        self.assertEqual( response.status_code, 200 )
+        self.assertTrue( response.streaming )
+        self.assertEqual( response['Content-Type'], 'application/x-ndjson' )
+        lines = b''.join( response.streaming_content ).decode().splitlines()
+        titles = [ json.loads( line )['title'] for line in lines ]
+        self.assertEqual( titles, [ 'Alpha', 'Alpha', 'Bravo', 'Bravo', 'Charlie', 'Delta', 'Echo' ] )
+
+    def test_ndjson_stream_by_accept_header( self ):
+        response = self.client.get( self.url, HTTP_ACCEPT = 'application/x-ndjson' )
+
+        self.assertTrue( response.streaming )
+        lines = b''.join( response.streaming_content ).decode().splitlines()
+        self.assertEqual( len( lines ), 7 )
+
+    def test_ndjson_errors_are_not_streamed( self ):
+        response = self.client.get( f'{self.url}&format=ndjson&cursor=garbage' )
+
+        self.assertEqual( response.status_code, 400 )
+        self.assertIn( 'error', json.loads( response.content ) )
+
+    def test_unpaginated_list_unchanged( self ):
+        response = self.client.get( self.url )
+
+        self.assertEqual( response.status_code, 200 )
+        self.assertEqual( len( response.json()['data'] ), 7 )
+
+
+# =============================================================================
+# LocationBatchView Tests - POST
+# =============================================================================
+
+class LocationBatchViewTestCase( TestCase ):
+    """Test POST /api/v1/locations/batch/ endpoint."""
+
+    URL = '/api/v1/locations/batch/'
+
+    @classmethod
+    def setUpTestData( cls ):
+        cls.owner = User.objects.create_user(
+            email = 'owner@example.com',
+            password = 'testpass123'
+        )
+        cls.viewer = User.objects.create_user(
+            email = 'viewer@example.com',
+            password = 'testpass123'
+        )
+        cls.owner_token = APITokenService.create_token( cls.owner, 'Owner Token' )
+        cls.viewer_token = APITokenService.create_token( cls.viewer, 'Viewer Token' )
+        cls.trip = TripSyntheticData.create_test_trip(
+            user = cls.owner,
+            title = 'Batch Trip',
+        )
+        cls.other_trip = TripSyntheticData.create_test_trip(
+            user = cls.owner,
+            title = 'Other Trip',
+        )
+        TripSyntheticData.add_trip_member(
+            trip = cls.trip,
+            user = cls.viewer,
+            permission_level = TripPermissionLevel.VIEWER,
+            added_by = cls.owner
+        )
+        cls.category, _ = LocationCategory.objects.get_or_create(
+            slug = 'attractions',
+            defaults = { 'name': 'Attractions' }
+        )
+        cls.subcategory, _ = LocationSubCategory.objects.get_or_create(
+            slug = 'museum',
+            defaults = { 'category': cls.category, 'name': 'Museum' }
+        )
+
+    def setUp( self ):
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION = 'Bearer ' + self.owner_token.api_token_str
+        )
+        self.existing = Location.objects.create( trip = self.trip, title = 'Existing', gmm_id = 'gmm-existing' )
+        self.doomed = Location.objects.create( trip = self.trip, title = 'Doomed' )
+        LocationNote.objects.create( location = self.doomed, text = 'Doomed note' )
+
+    def post_batch( self, operations, trip = None ):
+        return self.client.post(
+            self.URL,
+            { 'trip_uuid': str( ( trip or self.trip ).uuid ), 'operations': operations },
+            format = 'json',
+        )
+
+    def test_mixed_operations_applied( self ):
+        """Test create, update and delete in one batch with per-item results."""
+        response = self.post_batch([
+            {
+                'action': 'create',
+                'data': {
+                    'title': 'New Place',
+                    'latitude': '48.858400',
+                    'longitude': '2.294500',
+                    'subcategory_slug': 'museum',
+                    'gmm_id': 'gmm-new',
+                    'location_notes': [ { 'text': 'Great views' } ],
+                    'contact_info': [ { 'contact_type': 'phone', 'value': '555-1234' } ],
+                },
+            },
+            {
+                'action': 'update',
+                'uuid': str( self.existing.uuid ),
+                'data': { 'title': 'Renamed', 'location_notes': [ { 'text': 'Replaced note' } ] },
+            },
+            { 'action': 'delete', 'uuid': str( self.doomed.uuid ) },
+        ])
+
+        self.assertEqual( response.status_code, 200 )
+        results = response.json()['data']['results']
+        self.assertEqual( [ result['status'] for result in results ], [ 'created', 'updated', 'deleted' ] )
+        self.assertIn( 'sync', response.json() )
+
+        created = Location.objects.get( uuid = results[0]['uuid'] )
+        self.assertEqual( created.title, 'New Place' )
+        self.assertEqual( created.subcategory, self.subcategory )
+        self.assertEqual( created.version, 1 )
+        self.assertEqual( results[0]['location']['location_notes'][0]['text'], 'Great views' )
+        self.assertEqual( results[0]['location']['contact_info'][0]['value'], '555-1234' )
+
+        self.existing.refresh_from_db()
+        self.assertEqual( self.existing.title, 'Renamed' )
+        self.assertEqual( self.existing.version, 2 )
+        self.assertEqual( results[1]['location']['version'], 2 )
+        self.assertEqual(
+            list( self.existing.location_notes.values_list( 'text', flat = True ) ),
+            [ 'Replaced note' ],
+        )
+
+        self.assertFalse( Location.objects.filter( uuid = self.doomed.uuid ).exists() )
+        self.assertEqual( SyncDeletionLog.objects.filter( uuid = self.doomed.uuid ).count(), 1 )
+        self.assertEqual( SyncChange.objects.filter( uuid = self.doomed.uuid, is_deleted = True ).count(), 1 )
+        self.assertTrue( SyncChange.objects.filter( uuid = self.existing.uuid, version = 2 ).exists() )
+        self.assertTrue( SyncChange.objects.filter( uuid = created.uuid, version = 1 ).exists() )
+
+    def test_query_count_independent_of_batch_size( self ):
+        """Test bulk statements keep the query count flat as the batch grows."""
+        def count_queries( prefix, count ):
+            operations = [
+                {
+                    'action': 'create',
+                    'data': {
+                        'title': f'{prefix} {n}',
+                        'gmm_id': f'{prefix}-{n}',
+                        'location_notes': [ { 'text': 'Note' } ],
+                    },
+                }
+                for n in range( count )
+            ]
+            with CaptureQueriesContext( connection ) as context:
+                response = self.post_batch( operations )
+            self.assertEqual( response.status_code, 200 )
+            return len( context.captured_queries )
+
+        count_queries( 'warmup', 1 )
+        self.assertEqual( count_queries( 'small', 2 ), count_queries( 'large', 25 ) )
+
+    def test_invalid_operation_rejects_whole_batch( self ):
+        """Test one invalid operation means nothing is applied."""
+        response = self.post_batch([
+            { 'action': 'create', 'data': { 'title': 'Valid' } },
+            { 'action': 'create', 'data': { 'latitude': '1.0' } },
+            { 'action': 'delete', 'uuid': str( self.doomed.uuid ) },
+        ])
+
+        self.assertEqual( response.status_code, 400 )
+        results = response.json()['results']
+        self.assertEqual( [ result['status'] for result in results ], [ 'valid', 'invalid', 'valid' ] )
+        self.assertIn( 'title', results[1]['errors'] )
+        self.assertFalse( Location.objects.filter( title = 'Valid' ).exists() )
+        self.assertTrue( Location.objects.filter( uuid = self.doomed.uuid ).exists() )
+
+    def test_location_from_other_trip_not_found( self ):
+        other_location = Location.objects.create( trip = self.other_trip, title = 'Elsewhere' )
+
+        response = self.post_batch([ { 'action': 'delete', 'uuid': str( other_location.uuid ) } ])
+
+        self.assertEqual( response.status_code, 400 )
+        self.assertEqual( response.json()['results'][0]['status'], 'not_found' )
+        self.assertTrue( Location.objects.filter( uuid = other_location.uuid ).exists() )
+
+    def test_mismatched_trip_uuid_rejected( self ):
+        response = self.post_batch([
+            { 'action': 'create', 'data': { 'title': 'Wrong', 'trip_uuid': str( self.other_trip.uuid ) } },
+        ])
+
+        self.assertEqual( response.status_code, 400 )
+        self.assertIn( 'trip_uuid', response.json()['results'][0]['errors'] )
+
+    def test_unknown_action_and_repeated_uuid_rejected( self ):
+        response = self.post_batch([
+            { 'action': 'upsert', 'data': { 'title': 'X' } },
+            { 'action': 'update', 'uuid': str( self.existing.uuid ), 'data': { 'title': 'A' } },
+            { 'action': 'delete', 'uuid': str( self.existing.uuid ) },
+        ])
+
+        self.assertEqual( response.status_code, 400 )
+        statuses = [ result['status'] for result in response.json()['results'] ]
+        self.assertEqual( statuses, [ 'invalid', 'valid', 'invalid' ] )
+
+    def test_duplicate_gmm_id_rolls_back( self ):
+        response = self.post_batch([
+            { 'action': 'delete', 'uuid': str( self.doomed.uuid ) },
+            { 'action': 'create', 'data': { 'title': 'Clash', 'gmm_id': 'gmm-existing' } },
+        ])
+
+        self.assertEqual( response.status_code, 400 )
+        self.assertTrue( Location.objects.filter( uuid = self.doomed.uuid ).exists() )
+        self.assertFalse( SyncDeletionLog.objects.filter( uuid = self.doomed.uuid ).exists() )
+
+    def test_non_object_data_rejected( self ):
+        response = self.post_batch([
+            { 'action': 'create', 'data': 'abc' },
+            { 'action': 'create', 'data': [ 1, 2 ] },
+            { 'action': 'update', 'uuid': str( self.existing.uuid ), 'data': 'abc' },
+        ])
+
+        self.assertEqual( response.status_code, 400 )
+        results = response.json()['results']
+        self.assertEqual( [ result['status'] for result in results ], [ 'invalid', 'invalid', 'invalid' ] )
+        self.assertIn( 'data', results[0]['errors'] )
+        self.assertIn( 'data', results[1]['errors'] )
+
+    def test_viewer_cannot_apply_batch( self ):
+        self.client.credentials(
+            HTTP_AUTHORIZATION = 'Bearer ' + self.viewer_token.api_token_str
+        )
+        response = self.post_batch([ { 'action': 'delete', 'uuid': str( self.doomed.uuid ) } ])
+
+        self.assertEqual( response.status_code, 403 )
+        self.assertTrue( Location.objects.filter( uuid = self.doomed.uuid ).exists() )
+
+    def test_operations_required_and_bounded( self ):
+        self.assertEqual( self.post_batch( [] ).status_code, 400 )
+
+        operations = [ { 'action': 'create', 'data': { 'title': 'X' } } ] * 501
+        self.assertEqual( self.post_batch( operations ).status_code, 400 )
+
+
+# =============================================================================
+# Sparse fieldsets - ?fields=
+# =============================================================================
+
+class LocationSparseFieldsTestCase( TestCase ):
+    """Test ?fields= projections on location GET endpoints."""
+
+    @classmethod
+    def setUpTestData( cls ):
+        cls.user = User.objects.create_user(
+            email = 'fields@example.com',
+            password = 'testpass123'
+        )
+        cls.token_data = APITokenService.create_token( cls.user, 'Test Token' )
+        cls.trip = TripSyntheticData.create_test_trip(
+            user = cls.user,
+            title = 'Fields Trip',
+        )
+        for index in range( 3 ):
+            location = Location.objects.create(
+                trip = cls.trip,
+                title = f'Place {index}',
+                gmm_id = f'gmm-{index}',
+                latitude = Decimal( '10.5' ),
+                longitude = Decimal( '20.25' ),
+            )
+            LocationNote.objects.create( location = location, text = 'Note' )
+
+    def setUp( self ):
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION = 'Bearer ' + self.token_data.api_token_str
+        )
+        self.url = f'/api/v1/locations/?trip={self.trip.uuid}'
+
+    def test_list_returns_only_requested_fields( self ):
+        response = self.client.get( f'{self.url}&fields=uuid,latitude,longitude,version' )
+
+        self.assertEqual( response.status_code, 200 )
+        data = response.json()['data']
+        self.assertEqual( len( data ), 3 )
+        # Standard field order, regardless of request order
+        self.assertEqual( list( data[0].keys() ), [ 'uuid', 'version', 'latitude', 'longitude' ] )
+        self.assertEqual( data[0]['latitude'], 10.5 )
+
+    def test_list_narrows_sql( self ):
+        self.client.get( self.url )  # Warms up token auth
+
+        with CaptureQueriesContext( connection ) as context:
+            response = self.client.get( f'{self.url}&fields=uuid,title' )
+        self.assertEqual( response.status_code, 200 )
+
+        location_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'locations_location' in query['sql']
+        ]
+        self.assertEqual( len( location_queries ), 1 )
+        self.assertNotIn( 'open_days_times', location_queries[0] )
+        self.assertFalse( any( 'locations_locationnote' in query['sql'] for query in context.captured_queries ))
+
+    def test_related_fields_are_loaded_without_extra_queries( self ):
+        self.client.get( self.url )  # Warms up token auth
+
+        with CaptureQueriesContext( connection ) as narrow_context:
+            self.client.get( f'{self.url}&fields=uuid' )
+        with CaptureQueriesContext( connection ) as notes_context:
+            response = self.client.get( f'{self.url}&fields=uuid,trip_uuid,location_notes' )
+
+        # One prefetch query for the notes, not one per location
+        self.assertEqual( len( notes_context ), len( narrow_context ) + 1 )
+        data = response.json()['data']
+        self.assertEqual( data[0]['trip_uuid'], str( self.trip.uuid ))
+        self.assertEqual( data[0]['location_notes'][0]['text'], 'Note' )
+
+    def test_unknown_field_rejected( self ):
+        response = self.client.get( f'{self.url}&fields=uuid,secret' )
+
+        self.assertEqual( response.status_code, 400 )
+        self.assertIn( 'secret', response.json()['error'] )
+
+    def test_sparse_list_bypasses_cache( self ):
+        self.client.get( self.url )  # Caches the full list
+
+        response = self.client.get( f'{self.url}&fields=title' )
+
+        self.assertEqual( response.json()['data'][0], { 'title': 'Place 0' } )
+        self.assertNotIn( 'ETag', response )
+
+    def test_keyset_page_with_fields( self ):
+        first = self.client.get( f'{self.url}&limit=2&fields=gmm_id' ).json()['data']
+        self.assertEqual( first['results'], [ { 'gmm_id': 'gmm-0' }, { 'gmm_id': 'gmm-1' } ] )
+
+        second = self.client.get(
+            f'{self.url}&limit=2&fields=gmm_id&cursor={first["next_cursor"]}'
+        ).json()['data']
+        self.assertEqual( second['results'], [ { 'gmm_id': 'gmm-2' } ] )
+
+    def test_ndjson_with_fields( self ):
+        response = self.client.get( f'{self.url}&format=ndjson&fields=title' )
+
+        lines = b''.join( response.streaming_content ).decode().splitlines()
+        self.assertEqual( [ json.loads( line ) for line in lines ], [
+            { 'title': 'Place 0' }, { 'title': 'Place 1' }, { 'title': 'Place 2' },
+        ])
+
+    def test_item_with_fields( self ):
+        location = Location.objects.get( trip = self.trip, gmm_id = 'gmm-1' )
+
+        response = self.client.get( f'/api/v1/locations/{location.uuid}/?fields=title,gmm_id' )
+
+        self.assertEqual( response.status_code, 200 )
+        self.assertEqual( response.json()['data'], { 'gmm_id': 'gmm-1', 'title': 'Place 1' } )
+
+    def test_by_gmm_id_with_fields( self ):
+        response = self.client.get( f'/api/v1/locations/by-gmm-id/{self.trip.uuid}/gmm-2/?fields=title' )
+
+        self.assertEqual( response.status_code, 200 )
+        self.assertEqual( response.json()['data'], { 'title': 'Place 2' } )
+
+
+# =============================================================================
+# LocationByGmmIdBatchView Tests - POST
+# =============================================================================
+
+class LocationByGmmIdBatchViewTestCase( TestCase ):
+    """Test POST /api/v1/locations/by-gmm-id/{trip_uuid}/ endpoint."""
+
+    @classmethod
+    def setUpTestData( cls ):
+        cls.user = User.objects.create_user(
+            email = 'reconcile@example.com',
+            password = 'testpass123'
+        )
+        cls.other_user = User.objects.create_user(
+            email = 'outsider@example.com',
+            password = 'testpass123'
+        )
+        cls.token_data = APITokenService.create_token( cls.user, 'Test Token' )
+        cls.other_token_data = APITokenService.create_token( cls.other_user, 'Other Token' )
+        cls.trip = TripSyntheticData.create_test_trip(
+            user = cls.user,
+            title = 'Map Trip',
+        )
+        for index in range( 20 ):
+            location = Location.objects.create(
+                trip = cls.trip,
+                title = f'Pin {index}',
+                gmm_id = f'gmm-{index}',
+            )
+            LocationNote.objects.create( location = location, text = f'Note {index}' )
+
+    def setUp( self ):
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION = 'Bearer ' + self.token_data.api_token_str
+        )
+        self.url = f'/api/v1/locations/by-gmm-id/{self.trip.uuid}/'
+
+    def post_lookup( self, gmm_ids, query = '' ):
+        return self.client.post( self.url + query, { 'gmm_ids': gmm_ids }, format = 'json' )
+
+    def test_resolves_found_and_missing_ids( self ):
+        response = self.post_lookup([ 'gmm-3', 'gmm-unknown', 'gmm-7' ])
+
+        self.assertEqual( response.status_code, 200 )
+        results = response.json()['data']['results']
+        self.assertEqual( list( results.keys() ), [ 'gmm-3', 'gmm-unknown', 'gmm-7' ] )
+        self.assertEqual( results['gmm-3']['title'], 'Pin 3' )
+        self.assertEqual( results['gmm-3']['location_notes'][0]['text'], 'Note 3' )
+        self.assertIsNone( results['gmm-unknown'] )
+
+    def test_query_count_independent_of_id_count( self ):
+        self.post_lookup([ 'gmm-0' ])  # Warms up token auth
+
+        with CaptureQueriesContext( connection ) as single_context:
+            self.post_lookup([ 'gmm-0' ])
+        with CaptureQueriesContext( connection ) as many_context:
+            response = self.post_lookup([ f'gmm-{index}' for index in range( 20 ) ])
+
+        self.assertEqual( len( many_context ), len( single_context ))
+        self.assertEqual( len( response.json()['data']['results'] ), 20 )
+
+    def test_fields_projection( self ):
+        response = self.post_lookup([ 'gmm-1' ], query = '?fields=uuid,version' )
+
+        result = response.json()['data']['results']['gmm-1']
+        self.assertEqual( list( result.keys() ), [ 'uuid', 'version' ] )
+
+    def test_other_trip_locations_not_resolved( self ):
+        other_trip = TripSyntheticData.create_test_trip( user = self.user, title = 'Other Trip' )
+        Location.objects.create( trip = other_trip, title = 'Elsewhere', gmm_id = 'gmm-elsewhere' )
+
+        response = self.post_lookup([ 'gmm-elsewhere' ])
+
+        self.assertIsNone( response.json()['data']['results']['gmm-elsewhere'] )
+
+    def test_viewer_can_lookup( self ):
+        TripSyntheticData.add_trip_member(
+            trip = self.trip,
+            user = self.other_user,
+            permission_level = TripPermissionLevel.VIEWER,
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION = 'Bearer ' + self.other_token_data.api_token_str
+        )
+
+        response = self.post_lookup([ 'gmm-0' ])
+
+        self.assertEqual( response.status_code, 200 )
+
+    def test_returns_404_for_non_member( self ):
+        self.client.credentials(
+            HTTP_AUTHORIZATION = 'Bearer ' + self.other_token_data.api_token_str
+        )
+
+        response = self.post_lookup([ 'gmm-0' ])
+
+        self.assertEqual( response.status_code, 404 )
+
+    def test_invalid_requests_rejected( self ):
+        for gmm_ids in [ [], 'gmm-0', [ 'gmm-0', 7 ], [ 'gmm-0', '' ], [ 'gmm-x' ] * 1001 ]:
+            with self.subTest( gmm_ids = str( gmm_ids )[:40] ):
+                self.assertEqual( self.post_lookup( gmm_ids ).status_code, 400 )
+        self.assertEqual( self.post_lookup( [ 'gmm-0' ], query = '?fields=bogus' ).status_code, 400 )
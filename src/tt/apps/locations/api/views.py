@@ -1,31 +1,73 @@
+import itertools
+import json
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 
+from django.db import IntegrityError
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from rest_framework import status
 from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
 
 from tt.apps.api.constants import APIFields as F
-from tt.apps.api.views import TtApiView
+from tt.apps.api.views import SyncableAPIView, TtApiView
 from tt.apps.locations.models import Location
-from tt.apps.locations.services import LocationService
+from tt.apps.locations.services import LocationListCacheService, LocationService
 from tt.apps.trips.mixins import TripViewMixin
 
+from .pagination import LocationKeysetPaginator, NDJSONRenderer
 from .serializers import LocationSerializer
 
 
-class LocationCollectionView( TripViewMixin, TtApiView ):
+class LocationFieldsMixin:
+    """
+    Support for the ?fields=a,b,c sparse fieldset on LocationSerializer
+    responses.  Requested fields also narrow the query: only the needed
+    columns are loaded and unrequested relations are not joined or
+    prefetched.
+    """
+
+    def get_requested_fields( self, request: Request ) -> Optional[List[str]]:
+        """ Raises ValueError for unknown field names. """
+        return LocationSerializer.parse_fields( request.query_params.get( 'fields' ))
+
+    def invalid_fields_response( self, error : ValueError ) -> Response:
+        return Response(
+            { F.ERROR: str( error ) },
+            status = status.HTTP_400_BAD_REQUEST,
+        )
+
+
+class LocationCollectionView( LocationFieldsMixin, TripViewMixin, TtApiView ):
     """
     List or create locations.
 
     GET /api/v1/locations/?trip={uuid}
-    Returns all locations for specified trip.
+    Returns all locations for specified trip.  The serialized list is
+    cached per trip (LocationListCacheService) and carries an ETag, so
+    polling clients sending If-None-Match get a 304 when nothing changed.
+
+    GET /api/v1/locations/?trip={uuid}&limit={n}[&cursor={c}][&order=title|modified]
+    Returns one keyset-paginated page: {"results": [...], "next_cursor": c},
+    with next_cursor null on the last page.
+
+    GET /api/v1/locations/?trip={uuid}&format=ndjson (or Accept: application/x-ndjson)
+    Streams every location (from cursor, if given) as one JSON object per
+    line, reading one page at a time.
+
+    All GET forms accept &fields=a,b,c to return only those fields.  Sparse
+    lists are not cached.
 
     POST /api/v1/locations/
     Creates new location. Requires trip_uuid in body.
     """
     permission_classes = [ IsAuthenticated ]
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [ NDJSONRenderer ]
 
     def get( self, request: Request ) -> Response:
         """List locations for a trip."""
@@ -44,17 +86,100 @@ class LocationCollectionView( TripViewMixin, TtApiView ):
                 status = status.HTTP_400_BAD_REQUEST,
             )
 
+        try:
+            fields = self.get_requested_fields( request )
+        except ValueError as e:
+            return self.invalid_fields_response( e )
+
         trip_member = self.get_trip_member( request, trip_uuid = trip_uuid )
         self.assert_is_viewer( trip_member )
+        trip = trip_member.trip
 
-        locations = Location.objects.filter(
-            trip = trip_member.trip
-        ).select_related( 'subcategory', 'trip' ).prefetch_related(
-            'location_notes'
-        ).order_by( 'title' )
+        is_streaming = bool( request.accepted_renderer.format == NDJSONRenderer.format )
+        if is_streaming or ( 'limit' in request.query_params ) or ( 'cursor' in request.query_params ):
+            return self._get_keyset( request, trip, is_streaming, fields )
 
-        serializer = LocationSerializer( locations, many = True )
-        return Response( serializer.data )
+        if fields is not None:
+            locations = LocationSerializer.prepare_queryset(
+                Location.objects.filter( trip = trip ).order_by( 'title' ),
+                fields = fields,
+            )
+            serializer = LocationSerializer( locations, many = True, fields = fields )
+            return Response( serializer.data )
+
+        watermark = LocationListCacheService.get_watermark( trip )
+        payload = LocationListCacheService.get_payload( trip, watermark )
+        if payload is None:
+            locations = Location.objects.filter(
+                trip = trip
+            ).select_related( 'subcategory', 'trip' ).prefetch_related(
+                'location_notes', 'contact_info'
+            ).order_by( 'title' )
+
+            serializer = LocationSerializer( locations, many = True )
+            payload = LocationListCacheService.build_payload( trip, watermark, serializer.data )
+
+        response = get_conditional_response( request, etag = payload.etag )
+        if response is None:
+            response = Response( payload.data )
+        response['ETag'] = payload.etag
+        patch_cache_control( response, private = True, no_cache = True )
+        return response
+
+    def _get_keyset( self, request: Request, trip, is_streaming: bool, fields: Optional[List[str]] ):
+        """Paginated page, or NDJSON stream of all pages."""
+        ordering = request.query_params.get( 'order', LocationKeysetPaginator.DEFAULT_ORDERING )
+        if ordering not in LocationKeysetPaginator.ORDERINGS:
+            return Response(
+                { F.ERROR: 'order must be one of: ' + ', '.join( LocationKeysetPaginator.ORDERINGS ) },
+                status = status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            page_size = int( request.query_params.get( 'limit', LocationKeysetPaginator.DEFAULT_PAGE_SIZE ))
+        except ValueError:
+            return Response(
+                { F.ERROR: 'limit must be an integer' },
+                status = status.HTTP_400_BAD_REQUEST,
+            )
+
+        paginator = LocationKeysetPaginator(
+            queryset = LocationSerializer.prepare_queryset(
+                Location.objects.filter( trip = trip ),
+                fields = fields,
+                # The paginator reads these for the next cursor
+                extra_model_fields = [ 'id', LocationKeysetPaginator.ORDERINGS[ordering] ],
+            ),
+            ordering = ordering,
+            page_size = page_size,
+        )
+        cursor = request.query_params.get( 'cursor' ) or None
+        try:
+            # Validates the cursor before any streaming starts
+            first_page, next_cursor = paginator.get_page( cursor )
+        except ValueError:
+            return Response(
+                { F.ERROR: 'Invalid cursor' },
+                status = status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not is_streaming:
+            serializer = LocationSerializer( first_page, many = True, fields = fields )
+            return Response({
+                F.RESULTS: serializer.data,
+                F.NEXT_CURSOR: next_cursor,
+            })
+
+        def generate_lines():
+            pages = [ first_page ]
+            if next_cursor:
+                pages = itertools.chain( pages, paginator.iter_pages( next_cursor ))
+            for locations in pages:
+                for location in locations:
+                    yield json.dumps( LocationSerializer( location, fields = fields ).data, cls = JSONEncoder ) + '\n'
+                    continue
+                continue
+
+        return StreamingHttpResponse( generate_lines(), content_type = NDJSONRenderer.media_type )
 
     def post( self, request: Request ) -> Response:
         """Create a new location."""
@@ -89,28 +214,33 @@ class LocationCollectionView( TripViewMixin, TtApiView ):
         return Response( output_serializer.data, status = status.HTTP_201_CREATED )
 
 
-class LocationItemView( TripViewMixin, TtApiView ):
+class LocationItemView( LocationFieldsMixin, TripViewMixin, TtApiView ):
     """
     Get, update, or delete a single location.
 
-    GET /api/v1/locations/{uuid}/
+    GET /api/v1/locations/{uuid}/[?fields=a,b,c]
     PATCH /api/v1/locations/{uuid}/
     DELETE /api/v1/locations/{uuid}/
     """
     permission_classes = [ IsAuthenticated ]
 
-    def _get_location_and_member( self, request: Request, location_uuid: UUID ):
+    def _get_location_and_member( self,
+                                  request        : Request,
+                                  location_uuid  : UUID,
+                                  fields         : Optional[List[str]] = None ):
         """
         Get location and verify access.
         Returns (location, trip_member) tuple.
         Returns (None, None) if location not found.
         """
+        queryset = LocationSerializer.prepare_queryset(
+            Location.objects.select_related( 'trip' ),
+            fields = fields,
+            # Needed for the membership check
+            extra_model_fields = [ 'trip__uuid' ],
+        )
         try:
-            location = Location.objects.select_related(
-                'trip', 'subcategory'
-            ).prefetch_related(
-                'location_notes'
-            ).get( uuid = location_uuid )
+            location = queryset.get( uuid = location_uuid )
         except Location.DoesNotExist:
             return None, None
 
@@ -119,13 +249,18 @@ class LocationItemView( TripViewMixin, TtApiView ):
 
     def get( self, request: Request, location_uuid: UUID ) -> Response:
         """Get single location."""
-        location, trip_member = self._get_location_and_member( request, location_uuid )
+        try:
+            fields = self.get_requested_fields( request )
+        except ValueError as e:
+            return self.invalid_fields_response( e )
+
+        location, trip_member = self._get_location_and_member( request, location_uuid, fields )
         if not location:
             return Response( status = status.HTTP_404_NOT_FOUND )
 
         self.assert_is_viewer( trip_member )
 
-        serializer = LocationSerializer( location )
+        serializer = LocationSerializer( location, fields = fields )
         return Response( serializer.data )
 
     def patch( self, request: Request, location_uuid: UUID ) -> Response:
@@ -160,28 +295,325 @@ class LocationItemView( TripViewMixin, TtApiView ):
         return Response( status = status.HTTP_204_NO_CONTENT )
 
 
-class LocationByGmmIdView( TripViewMixin, TtApiView ):
+class LocationByGmmIdView( LocationFieldsMixin, TripViewMixin, TtApiView ):
     """
     Get a location by its GMM ID within a trip.
 
-    GET /api/v1/locations/by-gmm-id/{trip_uuid}/{gmm_id}/
+    GET /api/v1/locations/by-gmm-id/{trip_uuid}/{gmm_id}/[?fields=a,b,c]
     Returns location if found and user is a member, 404 otherwise.
     """
     permission_classes = [ IsAuthenticated ]
 
     def get( self, request: Request, trip_uuid: UUID, gmm_id: str ) -> Response:
+        try:
+            fields = self.get_requested_fields( request )
+        except ValueError as e:
+            return self.invalid_fields_response( e )
+
         trip_member = self.get_trip_member( request, trip_uuid = trip_uuid )
         self.assert_is_viewer( trip_member )
 
-        location = Location.objects.filter(
-            trip = trip_member.trip,
-            gmm_id = gmm_id
-        ).select_related( 'subcategory', 'trip' ).prefetch_related(
-            'location_notes'
+        location = LocationSerializer.prepare_queryset(
+            Location.objects.filter(
+                trip = trip_member.trip,
+                gmm_id = gmm_id
+            ),
+            fields = fields,
         ).first()
 
         if not location:
             raise NotFound( 'No location found with this GMM ID' )
 
-        serializer = LocationSerializer( location )
+        serializer = LocationSerializer( location, fields = fields )
         return Response( serializer.data )
+
+
+class LocationByGmmIdBatchView( LocationFieldsMixin, TripViewMixin, TtApiView ):
+    """
+    Resolve many GMM IDs within a trip in one query.
+
+    POST /api/v1/locations/by-gmm-id/{trip_uuid}/[?fields=a,b,c]
+    { "gmm_ids": [ "...", ... ] }
+
+    Returns { "results": { gmm_id: location or null } }, with null for GMM
+    IDs that have no location in the trip, so a client can reconcile a
+    whole map in one request.
+    """
+    permission_classes = [ IsAuthenticated ]
+
+    MAX_GMM_IDS = 1000
+
+    def post( self, request: Request, trip_uuid: UUID ) -> Response:
+        try:
+            fields = self.get_requested_fields( request )
+        except ValueError as e:
+            return self.invalid_fields_response( e )
+
+        gmm_ids = request.data.get( F.GMM_IDS )
+        if ( not isinstance( gmm_ids, list )
+             or not gmm_ids
+             or not all( isinstance( gmm_id, str ) and gmm_id for gmm_id in gmm_ids )):
+            return Response(
+                { F.ERROR: 'gmm_ids must be a non-empty list of strings' },
+                status = status.HTTP_400_BAD_REQUEST,
+            )
+        if len( gmm_ids ) > self.MAX_GMM_IDS:
+            return Response(
+                { F.ERROR: f'At most {self.MAX_GMM_IDS} gmm_ids per request' },
+                status = status.HTTP_400_BAD_REQUEST,
+            )
+
+        trip_member = self.get_trip_member( request, trip_uuid = trip_uuid )
+        self.assert_is_viewer( trip_member )
+
+        locations = LocationSerializer.prepare_queryset(
+            Location.objects.filter(
+                trip = trip_member.trip,
+                gmm_id__in = set( gmm_ids ),
+            ),
+            fields = fields,
+            extra_model_fields = [ 'gmm_id' ],
+        )
+        locations_by_gmm_id = { location.gmm_id: location for location in locations }
+
+        results = {}
+        for gmm_id in gmm_ids:
+            location = locations_by_gmm_id.get( gmm_id )
+            if location:
+                results[gmm_id] = LocationSerializer( location, fields = fields ).data
+            else:
+                results[gmm_id] = None
+            continue
+        return Response( { F.RESULTS: results } )
+
+
+class LocationBatchView( TripViewMixin, SyncableAPIView ):
+    """
+    Create, update and delete many locations of one trip in one request.
+
+    POST /api/v1/locations/batch/
+    {
+        "trip_uuid": "...",
+        "operations": [
+            { "action": "create", "data": { ...location fields... } },
+            { "action": "update", "uuid": "...", "data": { ...partial fields... } },
+            { "action": "delete", "uuid": "..." }
+        ]
+    }
+
+    All operations are validated first (with LocationSerializer) and then
+    applied together in one transaction, or not at all.  The response has
+    one result per operation, in request order, plus a single sync envelope.
+    If any operation is invalid, nothing is applied and the 400 response
+    carries the per-operation errors.
+    """
+    permission_classes = [ IsAuthenticated ]
+
+    MAX_OPERATIONS = 500
+
+    ACTION_CREATE = 'create'
+    ACTION_UPDATE = 'update'
+    ACTION_DELETE = 'delete'
+
+    STATUS_CREATED = 'created'
+    STATUS_UPDATED = 'updated'
+    STATUS_DELETED = 'deleted'
+    STATUS_VALID = 'valid'
+    STATUS_INVALID = 'invalid'
+    STATUS_NOT_FOUND = 'not_found'
+
+    def post( self, request: Request ) -> Response:
+        trip_uuid_str = request.data.get( F.TRIP_UUID )
+        if not trip_uuid_str:
+            return Response(
+                { F.ERROR: 'trip_uuid is required' },
+                status = status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            trip_uuid = UUID( str( trip_uuid_str ) )
+        except ValueError:
+            return Response(
+                { F.ERROR: 'Invalid trip_uuid format' },
+                status = status.HTTP_400_BAD_REQUEST,
+            )
+
+        operations = request.data.get( F.OPERATIONS )
+        if not isinstance( operations, list ) or not operations:
+            return Response(
+                { F.ERROR: 'operations must be a non-empty list' },
+                status = status.HTTP_400_BAD_REQUEST,
+            )
+        if len( operations ) > self.MAX_OPERATIONS:
+            return Response(
+                { F.ERROR: f'At most {self.MAX_OPERATIONS} operations per batch' },
+                status = status.HTTP_400_BAD_REQUEST,
+            )
+
+        trip_member = self.get_trip_member( request, trip_uuid = trip_uuid )
+        self.assert_is_editor( trip_member )
+        trip = trip_member.trip
+
+        results, creates, updates, deletes = self._validate_operations( trip, operations )
+        if any( result[F.STATUS] != self.STATUS_VALID for result in results ):
+            return Response(
+                {
+                    F.ERROR: 'Invalid operations; no changes were applied',
+                    F.RESULTS: results,
+                },
+                status = status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            created, updated = LocationService.apply_batch(
+                trip = trip,
+                creates = [ data for _, data in creates ],
+                updates = [ ( location, data ) for _, location, data in updates ],
+                deletes = [ location for _, location in deletes ],
+            )
+        except IntegrityError:
+            return Response(
+                { F.ERROR: 'Operations conflict with existing locations (duplicate gmm_id); no changes were applied' },
+                status = status.HTTP_400_BAD_REQUEST,
+            )
+
+        for ( index, _ ), location in zip( creates, created ):
+            results[index].update( self._success_result( self.STATUS_CREATED, location ))
+            continue
+        for ( index, _, _ ), location in zip( updates, updated ):
+            results[index].update( self._success_result( self.STATUS_UPDATED, location ))
+            continue
+        for index, _ in deletes:
+            results[index][F.STATUS] = self.STATUS_DELETED
+            continue
+        return Response( { F.RESULTS: results } )
+
+    def _validate_operations( self, trip, operations : List[Any] ):
+        """
+        Returns ( results, creates, updates, deletes ), where the operation
+        lists hold the operation index along with the validated data and/or
+        the target location.
+        """
+        locations_by_uuid = self._get_target_locations( trip, operations )
+
+        results = []
+        creates : List[Tuple[int, Dict[str, Any]]] = []
+        updates : List[Tuple[int, Location, Dict[str, Any]]] = []
+        deletes : List[Tuple[int, Location]] = []
+        seen_uuids = set()
+        for index, operation in enumerate( operations ):
+            if not isinstance( operation, dict ):
+                results.append( self._error_result( None, None, { F.ERROR: 'Operation must be an object' }))
+                continue
+
+            action = operation.get( F.ACTION )
+            if action == self.ACTION_CREATE:
+                data = self._get_operation_data( operation, trip )
+                if data is None:
+                    results.append( self._error_result( action, None, { F.DATA: 'data must be an object' }))
+                    continue
+                serializer = LocationSerializer( data = data )
+                errors = self._get_errors( serializer, trip )
+                if errors:
+                    results.append( self._error_result( action, None, errors ))
+                else:
+                    results.append({ F.ACTION: action, F.STATUS: self.STATUS_VALID })
+                    creates.append( ( index, serializer.validated_data ) )
+                continue
+
+            if action not in ( self.ACTION_UPDATE, self.ACTION_DELETE ):
+                results.append( self._error_result( action, None, {
+                    F.ACTION: f'Must be one of: {self.ACTION_CREATE}, {self.ACTION_UPDATE}, {self.ACTION_DELETE}',
+                }))
+                continue
+
+            location_uuid = self._parse_uuid( operation.get( F.UUID ))
+            if location_uuid is None:
+                results.append( self._error_result( action, None, { F.UUID: 'A valid location uuid is required' }))
+                continue
+            if location_uuid in seen_uuids:
+                results.append( self._error_result( action, location_uuid, {
+                    F.UUID: 'Location appears in more than one operation',
+                }))
+                continue
+            seen_uuids.add( location_uuid )
+
+            location = locations_by_uuid.get( location_uuid )
+            if not location:
+                results.append({
+                    F.ACTION: action,
+                    F.UUID: str( location_uuid ),
+                    F.STATUS: self.STATUS_NOT_FOUND,
+                })
+                continue
+
+            if action == self.ACTION_DELETE:
+                results.append({ F.ACTION: action, F.UUID: str( location_uuid ), F.STATUS: self.STATUS_VALID })
+                deletes.append( ( index, location ) )
+                continue
+
+            serializer = LocationSerializer( location, data = operation.get( F.DATA ) or {}, partial = True )
+            errors = self._get_errors( serializer, trip )
+            if errors:
+                results.append( self._error_result( action, location_uuid, errors ))
+            else:
+                results.append({ F.ACTION: action, F.UUID: str( location_uuid ), F.STATUS: self.STATUS_VALID })
+                updates.append( ( index, location, serializer.validated_data ) )
+            continue
+
+        return results, creates, updates, deletes
+
+    def _get_target_locations( self, trip, operations : List[Any] ) -> Dict[UUID, Location]:
+        """ Load all locations targeted by updates and deletes in one query. """
+        target_uuids = set()
+        for operation in operations:
+            if isinstance( operation, dict ) and operation.get( F.ACTION ) != self.ACTION_CREATE:
+                location_uuid = self._parse_uuid( operation.get( F.UUID ))
+                if location_uuid:
+                    target_uuids.add( location_uuid )
+            continue
+        if not target_uuids:
+            return {}
+        locations = Location.objects.filter(
+            trip = trip,
+            uuid__in = target_uuids,
+        ).select_related( 'trip', 'subcategory' )
+        return { location.uuid: location for location in locations }
+
+    def _get_operation_data( self, operation : Dict[str, Any], trip ) -> Optional[Dict[str, Any]]:
+        """ Returns None when the operation data is not a JSON object. """
+        data = operation.get( F.DATA ) or {}
+        if not isinstance( data, dict ):
+            return None
+        data = dict( data )
+        data.setdefault( F.TRIP_UUID, str( trip.uuid ))
+        return data
+
+    def _get_errors( self, serializer : LocationSerializer, trip ) -> Optional[Dict[str, Any]]:
+        if not serializer.is_valid():
+            return serializer.errors
+        validated_trip_uuid = serializer.validated_data.get( F.TRIP_UUID )
+        if validated_trip_uuid and validated_trip_uuid != trip.uuid:
+            return { F.TRIP_UUID: 'Must match the batch trip_uuid' }
+        return None
+
+    def _parse_uuid( self, value : Any ) -> Optional[UUID]:
+        if not value:
+            return None
+        try:
+            return UUID( str( value ))
+        except ValueError:
+            return None
+
+    def _error_result( self, action, location_uuid : Optional[UUID], errors : Dict[str, Any] ) -> Dict[str, Any]:
+        result = { F.ACTION: action, F.STATUS: self.STATUS_INVALID, F.ERRORS: errors }
+        if location_uuid:
+            result[F.UUID] = str( location_uuid )
+        return result
+
+    def _success_result( self, result_status : str, location : Location ) -> Dict[str, Any]:
+        return {
+            F.UUID: str( location.uuid ),
+            F.STATUS: result_status,
+            F.LOCATION: LocationSerializer( location ).data,
+        }
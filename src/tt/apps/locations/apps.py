@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LocationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tt.apps.locations'
+
+    def ready(self):
+        import tt.apps.locations.signals  # noqa: F401
+        return
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.7 on 2026-10-16 19:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("locations", "0009_remove_condition_from_unique_trip_gmm_id"),
+        ("routes", "0001_initial"),
+        ("trips", "0005_gmm_map_id_unique"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="location",
+            index=models.Index(fields=["trip", "title"], name="locations_l_trip_id_c2d592_idx"),
+        ),
+    ]
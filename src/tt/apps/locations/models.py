@@ -1,6 +1,7 @@
 from django.db import models
 from django.contrib.contenttypes.fields import GenericRelation
 
+from tt.apps.api.enums import SyncObjectType
 from tt.apps.api.models import SyncableModel
 from tt.apps.common.model_fields import LabeledEnumField
 from tt.apps.contacts.models import ContactInfo
@@ -91,6 +92,9 @@ class Location( GeoPointModelMixin, SyncableModel ):
     """
     objects = managers.LocationManager()
 
+    SYNC_OBJECT_TYPE = SyncObjectType.LOCATION
+    SYNC_TRIP_UUID_FIELD = 'trip__uuid'
+
     trip = models.ForeignKey(
         Trip,
         on_delete = models.CASCADE,
@@ -157,6 +161,7 @@ class Location( GeoPointModelMixin, SyncableModel ):
         ordering = ['title']
         indexes = [
             models.Index( fields = ['trip', 'modified_datetime'] ),
+            models.Index( fields = ['trip', 'title'] ),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -165,6 +170,9 @@ class Location( GeoPointModelMixin, SyncableModel ):
             ),
         ]
 
+    def get_sync_trip_uuid(self):
+        return self.trip.uuid
+
 
 class LocationNote(models.Model):
     """
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+
+@dataclass
+class LocationListPayload:
+    """
+    Serialized location list of a trip, as cached by LocationListCacheService.
+    """
+    watermark  : str
+    etag       : str
+    data       : List[Dict[str, Any]]
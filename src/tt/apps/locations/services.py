@@ -4,16 +4,28 @@ Location service for CRUD operations.
 Handles database operations for Location model, keeping business logic
 separate from the API serializers and views.
 """
-from typing import Any, Dict, List
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
 
 from django.db import transaction
+from django.db.models import Count, Max, Sum
 
 from tt.apps.api.constants import APIFields as F
+from tt.apps.api.enums import SyncObjectType
+from tt.apps.api.models import SyncChange, SyncDeletionLog
+from tt.apps.api.signals import location_deletions_logged_in_bulk
+from tt.apps.api.sync import SyncWatermarks
+from tt.apps.common.redis_client import get_redis_client
 from tt.apps.contacts.models import ContactInfo
 from tt.apps.trips.models import Trip
 
 from .heuristics import apply_note_heuristics
 from .models import Location, LocationNote, LocationSubCategory
+from .schemas import LocationListPayload
+
+logger = logging.getLogger(__name__)
 
 
 class LocationService:
@@ -21,6 +33,19 @@ class LocationService:
     Service class for Location CRUD operations.
     """
 
+    # Explicit mapping: API field name -> model field name
+    API_TO_MODEL_FIELDS = {
+        F.TITLE: 'title',
+        F.LATITUDE: 'latitude',
+        F.LONGITUDE: 'longitude',
+        F.ELEVATION_FT: 'elevation_ft',
+        F.GMM_ID: 'gmm_id',
+        F.RATING: 'rating',
+        F.DESIRABILITY: 'desirability',
+        F.ADVANCED_BOOKING: 'advanced_booking',
+        F.OPEN_DAYS_TIMES: 'open_days_times',
+    }
+
     @classmethod
     def create(
         cls,
@@ -68,6 +93,8 @@ class LocationService:
             if contact_info_data:
                 cls._create_contact_info( location, contact_info_data )
 
+        # Bulk inserts send no signals, so invalidate once they are written
+        LocationListCacheService.invalidate( trip.pk )
         return location
 
     @classmethod
@@ -98,19 +125,7 @@ class LocationService:
                     location.subcategory = None
 
             # Update simple fields if present
-            # Explicit mapping: API field name -> model field name
-            api_to_model_fields = {
-                F.TITLE: 'title',
-                F.LATITUDE: 'latitude',
-                F.LONGITUDE: 'longitude',
-                F.ELEVATION_FT: 'elevation_ft',
-                F.GMM_ID: 'gmm_id',
-                F.RATING: 'rating',
-                F.DESIRABILITY: 'desirability',
-                F.ADVANCED_BOOKING: 'advanced_booking',
-                F.OPEN_DAYS_TIMES: 'open_days_times',
-            }
-            for api_field, model_field in api_to_model_fields.items():
+            for api_field, model_field in cls.API_TO_MODEL_FIELDS.items():
                 if api_field in validated_data:
                     setattr( location, model_field, validated_data[api_field] )
 
@@ -120,8 +135,215 @@ class LocationService:
             if F.LOCATION_NOTES in validated_data:
                 cls._replace_location_notes( location, validated_data[F.LOCATION_NOTES] )
 
+        LocationListCacheService.invalidate( location.trip_id )
         return location
 
+    @classmethod
+    def apply_batch(
+        cls,
+        trip: Trip,
+        creates: List[Dict[str, Any]],
+        updates: List[Tuple[Location, Dict[str, Any]]],
+        deletes: List[Location],
+    ) -> Tuple[List[Location], List[Location]]:
+        """
+        Apply a batch of already validated location changes in one transaction.
+
+        Uses bulk statements throughout, so the query count does not grow
+        with the batch size: deletes first (freeing their gmm_ids), then
+        updates, then creates.  Versions are incremented in the database
+        (Location.increment_versions) and the sync change feed and deletion
+        log rows are written in bulk.
+
+        Args:
+            trip: The Trip all locations belong to.
+            creates: Validated data for each location to create.
+            updates: (location, validated partial data) for each update.
+            deletes: Locations to delete.
+
+        Returns:
+            (created, updated) locations, re-read with related data.
+        """
+        with transaction.atomic():
+            subcategories = cls._get_subcategories_by_slug( creates + [ data for _, data in updates ] )
+            sync_changes = []
+
+            if deletes:
+                sync_changes.extend( cls._delete_batch( trip, deletes ))
+
+            notes_to_create = []
+            contacts_to_create = []
+            notes_replaced_location_ids = []
+            if updates:
+                cls._update_batch( updates, subcategories )
+                for location, data in updates:
+                    if F.LOCATION_NOTES in data:
+                        notes_replaced_location_ids.append( location.pk )
+                        notes_to_create.extend( cls._build_location_notes( location, data[F.LOCATION_NOTES] ))
+                    continue
+
+            created = []
+            if creates:
+                created = cls._create_batch( trip, creates, subcategories )
+                for location, data in zip( created, creates ):
+                    notes_to_create.extend( cls._build_location_notes( location, data.get( F.LOCATION_NOTES ) or [] ))
+                    contacts_to_create.extend( cls._build_contact_info( location, data.get( F.CONTACT_INFO ) or [] ))
+                    continue
+
+            if notes_replaced_location_ids:
+                LocationNote.objects.filter( location_id__in = notes_replaced_location_ids ).delete()
+            if notes_to_create:
+                LocationNote.objects.bulk_create( notes_to_create )
+            if contacts_to_create:
+                ContactInfo.objects.bulk_create( contacts_to_create )
+
+            sync_changes.extend([
+                {
+                    'object_type': SyncObjectType.LOCATION,
+                    'uuid': location.uuid,
+                    'trip_uuid': trip.uuid,
+                    'version': location.version,
+                }
+                for location in created
+            ])
+            if sync_changes:
+                SyncChange.objects.record_changes( sync_changes )
+            if updates:
+                Location.increment_versions([ location.pk for location, _ in updates ])
+            SyncWatermarks.bump_for_trip( trip.uuid )
+
+            changed_uuids = [ location.uuid for location in created ]
+            changed_uuids.extend([ location.uuid for location, _ in updates ])
+            changed_by_uuid = {}
+            if changed_uuids:
+                changed_by_uuid = {
+                    location.uuid: location
+                    for location in Location.objects.filter( uuid__in = changed_uuids ).select_related(
+                        'subcategory', 'trip'
+                    ).prefetch_related( 'location_notes', 'contact_info' )
+                }
+
+        LocationListCacheService.invalidate( trip.pk )
+        return (
+            [ changed_by_uuid[location.uuid] for location in created ],
+            [ changed_by_uuid[location.uuid] for location, _ in updates ],
+        )
+
+    @classmethod
+    def _get_subcategories_by_slug(
+        cls,
+        data_list: List[Dict[str, Any]],
+    ) -> Dict[str, LocationSubCategory]:
+        """
+        Resolve all subcategory slugs in one query.  Like the single-item
+        lookup (filter().first()), the first subcategory in default ordering
+        wins when a slug exists in several categories.
+        """
+        slugs = { data.get( F.SUBCATEGORY_SLUG ) for data in data_list }
+        slugs.discard( None )
+        slugs.discard( '' )
+        subcategories = {}
+        if slugs:
+            for subcategory in LocationSubCategory.objects.filter( slug__in = slugs ):
+                subcategories.setdefault( subcategory.slug, subcategory )
+                continue
+        return subcategories
+
+    @classmethod
+    def _delete_batch(
+        cls,
+        trip: Trip,
+        locations: List[Location],
+    ) -> List[Dict[str, Any]]:
+        """
+        Delete locations, writing their deletion log rows in bulk.
+        Returns the sync changes to record.
+        """
+        SyncDeletionLog.objects.bulk_create([
+            SyncDeletionLog(
+                uuid = location.uuid,
+                object_type = SyncObjectType.LOCATION,
+                trip_uuid = trip.uuid,
+                deleted_by = None,
+            )
+            for location in locations
+        ])
+        with location_deletions_logged_in_bulk():
+            Location.objects.filter( pk__in = [ location.pk for location in locations ] ).delete()
+        return [
+            {
+                'object_type': SyncObjectType.LOCATION,
+                'uuid': location.uuid,
+                'trip_uuid': trip.uuid,
+                'is_deleted': True,
+            }
+            for location in locations
+        ]
+
+    @classmethod
+    def _update_batch(
+        cls,
+        updates: List[Tuple[Location, Dict[str, Any]]],
+        subcategories: Dict[str, LocationSubCategory],
+    ) -> None:
+        """
+        Write the updated field values in one statement.  Versions are
+        incremented separately by the caller (Location.increment_versions).
+        """
+        update_fields = set()
+        locations = []
+        for location, data in updates:
+            if F.SUBCATEGORY_SLUG in data:
+                location.subcategory = subcategories.get( data[F.SUBCATEGORY_SLUG] )
+                update_fields.add( 'subcategory' )
+            for api_field, model_field in cls.API_TO_MODEL_FIELDS.items():
+                if api_field in data:
+                    setattr( location, model_field, data[api_field] )
+                    update_fields.add( model_field )
+                continue
+            locations.append( location )
+            continue
+        if update_fields:
+            Location.objects.bulk_update( locations, sorted( update_fields ))
+        return
+
+    @classmethod
+    def _create_batch(
+        cls,
+        trip: Trip,
+        creates: List[Dict[str, Any]],
+        subcategories: Dict[str, LocationSubCategory],
+    ) -> List[Location]:
+        locations = []
+        for data in creates:
+            model_data = {
+                model_field: data[api_field]
+                for api_field, model_field in cls.API_TO_MODEL_FIELDS.items()
+                if api_field in data
+            }
+            locations.append( Location(
+                trip = trip,
+                subcategory = subcategories.get( data.get( F.SUBCATEGORY_SLUG )),
+                **model_data,
+            ))
+            continue
+        Location.objects.bulk_create( locations )
+        cls._assign_missing_pks( locations )
+        return locations
+
+    @classmethod
+    def _assign_missing_pks( cls, locations: List[Location] ) -> None:
+        """ Some backends (MySQL) do not return primary keys from bulk_create. """
+        if all( location.pk for location in locations ):
+            return
+        pks_by_uuid = dict( Location.objects.filter(
+            uuid__in = [ location.uuid for location in locations ],
+        ).values_list( 'uuid', 'pk' ))
+        for location in locations:
+            location.pk = pks_by_uuid[location.uuid]
+            continue
+        return
+
     @classmethod
     def _replace_location_notes(
         cls,
@@ -142,7 +364,21 @@ class LocationService:
         # Delete existing notes
         location.location_notes.all().delete()
 
-        # Build note instances with heuristics applied
+        # Bulk create all notes
+        notes_to_create = cls._build_location_notes( location, notes_data )
+        if notes_to_create:
+            LocationNote.objects.bulk_create( notes_to_create )
+
+    @classmethod
+    def _build_location_notes(
+        cls,
+        location: Location,
+        notes_data: List[Dict[str, Any]],
+    ) -> List[LocationNote]:
+        """
+        Build (unsaved) LocationNote instances with heuristics applied,
+        skipping empty notes.
+        """
         notes_to_create = []
         sort_order = 0
         for note_data in notes_data:
@@ -160,10 +396,7 @@ class LocationService:
             apply_note_heuristics( note )
             notes_to_create.append( note )
             sort_order += 1
-
-        # Bulk create all notes
-        if notes_to_create:
-            LocationNote.objects.bulk_create( notes_to_create )
+        return notes_to_create
 
     @classmethod
     def _create_contact_info(
@@ -181,6 +414,19 @@ class LocationService:
             location: The Location to create contacts for.
             contact_info_data: List of contact dicts with contact_type, value, label, is_primary.
         """
+        contacts_to_create = cls._build_contact_info( location, contact_info_data )
+        if contacts_to_create:
+            ContactInfo.objects.bulk_create( contacts_to_create )
+
+    @classmethod
+    def _build_contact_info(
+        cls,
+        location: Location,
+        contact_info_data: List[Dict[str, Any]],
+    ) -> List[ContactInfo]:
+        """
+        Build (unsaved) ContactInfo instances, skipping empty values.
+        """
         contacts_to_create = []
         for info in contact_info_data:
             value = ( info.get( F.VALUE ) or '' ).strip()
@@ -195,6 +441,111 @@ class LocationService:
                 is_primary = info.get( F.IS_PRIMARY, False ),
             )
             contacts_to_create.append( contact )
+        return contacts_to_create
 
-        if contacts_to_create:
-            ContactInfo.objects.bulk_create( contacts_to_create )
+
+class LocationListCacheService:
+    """
+    Caches the serialized location list of a trip (GET /api/v1/locations/).
+
+    The extension polls the list, which otherwise re-serializes every
+    location of the trip each time.  One Redis key per trip holds the
+    serialized payload with its ETag and the trip's content watermark (sum
+    of location versions, location count and latest modified_datetime) at
+    the time it was built:
+
+    - A cached payload is only used while the watermark still matches, so
+      location saves, creates, deletes and version increments are picked up
+      by the next GET.  A queryset update() that moves neither version nor
+      modified_datetime does not move the watermark either
+    - Invalidation is therefore the real guarantee: all location, note and
+      contact writes delete the key (signals plus explicit calls after bulk
+      writes, which send no signals).  Signals delete it on commit, so a
+      concurrent GET cannot re-cache the old list under the new watermark
+
+    Keyed by trip id, which is all that location, note and contact rows
+    carry, so invalidation needs no extra queries.  Redis errors fall back
+    to serializing from the database.
+    """
+
+    TTL_LIST = 86400  # 1 day
+
+    @classmethod
+    def _get_cache_key( cls, trip_id : int ) -> str:
+        """
+        Format: locations:list:{trip_id}
+        """
+        return ':'.join([ 'locations', 'list', str( trip_id ) ])
+
+    @classmethod
+    def get_watermark( cls, trip : Trip ) -> str:
+        """
+        One aggregate query.  Versions only ever increase, so their sum moves
+        on every save or version increment of any location, not just the
+        newest one.  Includes the trip uuid so a payload is never served for
+        a different trip that reuses a deleted trip's id.
+        """
+        aggregates = Location.objects.filter( trip = trip ).aggregate(
+            version_sum = Sum( 'version' ),
+            location_count = Count( 'id' ),
+            max_modified = Max( 'modified_datetime' ),
+        )
+        max_modified = aggregates['max_modified']
+        return ':'.join([
+            str( trip.uuid ),
+            str( aggregates['version_sum'] or 0 ),
+            str( aggregates['location_count'] ),
+            max_modified.isoformat() if max_modified else '',
+        ])
+
+    @classmethod
+    def get_payload( cls, trip : Trip, watermark : str ) -> Optional[LocationListPayload]:
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                return None
+            cached_json = redis_client.get( cls._get_cache_key( trip.pk ))
+            if not cached_json:
+                return None
+            payload = LocationListPayload( **json.loads( cached_json ))
+        except Exception as e:
+            logger.warning( f"Redis error getting location list: {e}" )
+            return None
+        if payload.watermark != watermark:
+            return None
+        return payload
+
+    @classmethod
+    def build_payload( cls,
+                       trip       : Trip,
+                       watermark  : str,
+                       data       : List[Dict[str, Any]] ) -> LocationListPayload:
+        """ Wrap freshly serialized data with its ETag and cache it. """
+        data_json = json.dumps( data, sort_keys = True )
+        etag_source = f'{trip.uuid}|{data_json}'.encode( 'utf-8' )
+        payload = LocationListPayload(
+            watermark = watermark,
+            etag = f'"{hashlib.sha256( etag_source ).hexdigest()}"',
+            data = data,
+        )
+        try:
+            redis_client = get_redis_client()
+            if redis_client:
+                redis_client.set(
+                    cls._get_cache_key( trip.pk ),
+                    json.dumps( payload.__dict__ ),
+                    ex = cls.TTL_LIST,
+                )
+        except Exception as e:
+            logger.warning( f"Redis error caching location list: {e}" )
+        return payload
+
+    @classmethod
+    def invalidate( cls, trip_id : int ) -> None:
+        try:
+            redis_client = get_redis_client()
+            if redis_client:
+                redis_client.delete( cls._get_cache_key( trip_id ))
+        except Exception as e:
+            logger.warning( f"Redis error invalidating location list: {e}" )
+        return
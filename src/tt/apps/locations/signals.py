@@ -0,0 +1,65 @@
+"""
+Signal handlers keeping the cached location lists current.
+"""
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from tt.apps.contacts.models import ContactInfo
+from tt.apps.trips.models import Trip
+
+from .models import Location, LocationNote
+from .services import LocationListCacheService
+
+
+def _is_cascade_from( origin, *model_classes ) -> bool:
+    """ True if the deletion started from (a queryset of) one of model_classes. """
+    if isinstance( origin, QuerySet ):
+        return issubclass( origin.model, model_classes )
+    return isinstance( origin, model_classes )
+
+
+def _invalidate_on_commit( trip_id : int ) -> None:
+    """
+    Deleting the key before commit would let a concurrent GET re-cache the
+    old list, and not every write moves the list watermark.
+    """
+    transaction.on_commit( lambda: LocationListCacheService.invalidate( trip_id ))
+    return
+
+
+@receiver( post_save, sender = Location )
+@receiver( post_delete, sender = Location )
+def invalidate_location_list_for_location( sender, instance, **kwargs ):
+    _invalidate_on_commit( instance.trip_id )
+    return
+
+
+@receiver( post_save, sender = LocationNote )
+@receiver( post_delete, sender = LocationNote )
+def invalidate_location_list_for_note( sender, instance, origin = None, **kwargs ):
+    # The Location's own post_delete covers notes deleted along with it.
+    if _is_cascade_from( origin, Location, Trip ):
+        return
+    if LocationNote.location.is_cached( instance ):
+        trip_id = instance.location.trip_id
+    else:
+        trip_id = Location.objects.filter( pk = instance.location_id ).values_list( 'trip_id', flat = True ).first()
+    if trip_id:
+        _invalidate_on_commit( trip_id )
+    return
+
+
+@receiver( post_save, sender = ContactInfo )
+@receiver( post_delete, sender = ContactInfo )
+def invalidate_location_list_for_contact( sender, instance, origin = None, **kwargs ):
+    if _is_cascade_from( origin, Location, Trip ):
+        return
+    if ContentType.objects.get_for_id( instance.content_type_id ).model_class() is not Location:
+        return
+    trip_id = Location.objects.filter( pk = instance.object_id ).values_list( 'trip_id', flat = True ).first()
+    if trip_id:
+        _invalidate_on_commit( trip_id )
+    return
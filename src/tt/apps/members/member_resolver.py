@@ -0,0 +1,82 @@
+from typing import Optional, Union
+from uuid import UUID
+
+from django.http import HttpRequest
+
+from tt.apps.trips.models import Trip
+
+from .models import TripMember
+
+
+class TripMemberResolver:
+    """
+    Resolves the request user's TripMember for a trip, memoized on the request.
+
+    A page commonly needs the same membership several times (view permission
+    checks, visibility checks, helper mixins).  The first lookup fetches the
+    membership together with its trip in one joined query; later lookups for
+    the same trip, whether by trip instance, id or UUID, reuse the result
+    (including a negative result) for the rest of the request.
+    """
+
+    REQUEST_ATTR = '_tt_trip_member_cache'
+
+    @classmethod
+    def get_member_by_trip_uuid( cls,
+                                 request    : HttpRequest,
+                                 trip_uuid  : Union[UUID, str] ) -> Optional[TripMember]:
+        cache = cls._get_request_cache( request )
+        if cache is None:
+            return None
+        cache_key = ( 'uuid', str( trip_uuid ))
+        if cache_key not in cache:
+            trip_member = TripMember.objects.select_related( 'trip' ).filter(
+                trip__uuid = trip_uuid,
+                user = request.user,
+            ).first()
+            cls._store( cache, trip_member, cache_key )
+        return cache[cache_key]
+
+    @classmethod
+    def get_member_for_trip( cls,
+                             request  : HttpRequest,
+                             trip     : Trip         ) -> Optional[TripMember]:
+        cache = cls._get_request_cache( request )
+        if cache is None:
+            return None
+        cache_key = ( 'id', trip.pk )
+        if cache_key not in cache:
+            trip_member = TripMember.objects.filter( trip = trip, user = request.user ).first()
+            if trip_member:
+                # Reuse the caller's instance rather than lazily re-fetching it.
+                trip_member.trip = trip
+            cls._store( cache, trip_member, cache_key, ( 'uuid', str( trip.uuid )))
+        return cache[cache_key]
+
+    @classmethod
+    def clear( cls, request : HttpRequest ) -> None:
+        """ Forget memoized memberships, e.g., after changing the user's membership. """
+        if hasattr( request, cls.REQUEST_ATTR ):
+            delattr( request, cls.REQUEST_ATTR )
+        return
+
+    @classmethod
+    def _get_request_cache( cls, request : HttpRequest ) -> Optional[dict]:
+        user = getattr( request, 'user', None )
+        if not user or not user.is_authenticated:
+            return None
+        cache = getattr( request, cls.REQUEST_ATTR, None )
+        # Views can swap request.user (sign-in flows), so scope entries to the user.
+        if cache is None or cache['user_id'] != user.pk:
+            cache = { 'user_id': user.pk }
+            setattr( request, cls.REQUEST_ATTR, cache )
+        return cache
+
+    @classmethod
+    def _store( cls, cache : dict, trip_member : Optional[TripMember], *cache_keys ) -> None:
+        for cache_key in cache_keys:
+            cache[cache_key] = trip_member
+        if trip_member:
+            cache[( 'id', trip_member.trip_id )] = trip_member
+            cache[( 'uuid', str( trip_member.trip.uuid ))] = trip_member
+        return
@@ -0,0 +1,117 @@
+import logging
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.test import RequestFactory, TestCase
+
+from tt.apps.journal.enums import JournalVisibility
+from tt.apps.journal.models import Journal
+from tt.apps.members.member_resolver import TripMemberResolver
+from tt.apps.travelog.enums import ContentType
+from tt.apps.travelog.mixins import TravelogViewMixin
+from tt.apps.trips.mixins import TripViewMixin
+from tt.apps.trips.tests.synthetic_data import TripSyntheticData
+
+logging.disable(logging.CRITICAL)
+
+User = get_user_model()
+
+
+class TripMemberResolverTests(TestCase):
+    """Tests for request-scoped trip membership resolution."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='member@test.com', password='pass')
+        cls.other_user = User.objects.create_user(email='other@test.com', password='pass')
+        cls.trip = TripSyntheticData.create_test_trip(user=cls.user, title='Test Trip')
+
+    def _request(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        return request
+
+    def test_lookup_by_uuid_is_single_query_and_memoized(self):
+        """First lookup joins trip and membership; repeats are free."""
+        request = self._request(self.user)
+
+        with self.assertNumQueries(1):
+            trip_member = TripMemberResolver.get_member_by_trip_uuid(request, self.trip.uuid)
+            self.assertEqual(trip_member.trip.title, 'Test Trip')
+
+        with self.assertNumQueries(0):
+            TripMemberResolver.get_member_by_trip_uuid(request, self.trip.uuid)
+            TripMemberResolver.get_member_by_trip_uuid(request, str(self.trip.uuid))
+            TripMemberResolver.get_member_for_trip(request, self.trip)
+
+    def test_lookup_by_trip_reuses_trip_instance(self):
+        """Lookups by trip do not lazily re-fetch the trip."""
+        request = self._request(self.user)
+
+        with self.assertNumQueries(1):
+            trip_member = TripMemberResolver.get_member_for_trip(request, self.trip)
+            self.assertIs(trip_member.trip, self.trip)
+
+        with self.assertNumQueries(0):
+            TripMemberResolver.get_member_by_trip_uuid(request, self.trip.uuid)
+
+    def test_non_member_result_is_memoized(self):
+        """A missing membership is also only looked up once."""
+        request = self._request(self.other_user)
+
+        with self.assertNumQueries(1):
+            self.assertIsNone(TripMemberResolver.get_member_for_trip(request, self.trip))
+            self.assertIsNone(TripMemberResolver.get_member_for_trip(request, self.trip))
+
+    def test_anonymous_user_does_not_query(self):
+        request = self._request(AnonymousUser())
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(TripMemberResolver.get_member_for_trip(request, self.trip))
+
+    def test_user_change_is_not_served_stale_result(self):
+        """Swapping request.user (sign-in flows) starts a fresh cache."""
+        request = self._request(self.other_user)
+        self.assertIsNone(TripMemberResolver.get_member_for_trip(request, self.trip))
+
+        request.user = self.user
+        self.assertIsNotNone(TripMemberResolver.get_member_for_trip(request, self.trip))
+
+    def test_clear_forgets_memberships(self):
+        request = self._request(self.user)
+        TripMemberResolver.get_member_for_trip(request, self.trip)
+        TripMemberResolver.clear(request)
+
+        with self.assertNumQueries(1):
+            TripMemberResolver.get_member_for_trip(request, self.trip)
+
+    def test_trip_view_mixin_uses_single_query(self):
+        request = self._request(self.user)
+
+        with self.assertNumQueries(1):
+            trip_member = TripViewMixin().get_trip_member(request, trip_uuid=self.trip.uuid)
+            self.assertEqual(trip_member.trip, self.trip)
+
+    def test_trip_view_mixin_raises_404_for_non_member(self):
+        request = self._request(self.other_user)
+
+        with self.assertRaises(Http404):
+            TripViewMixin().get_trip_member(request, trip_uuid=self.trip.uuid)
+
+    def test_travelog_access_checks_share_membership_lookup(self):
+        """Draft and private journal checks query membership at most once per request."""
+        journal = Journal.objects.create(
+            trip=self.trip,
+            title='Private Journal',
+            visibility=JournalVisibility.PRIVATE,
+        )
+        journal = Journal.objects.select_related('trip').get(pk=journal.pk)
+        request = self._request(self.other_user)
+        mixin = TravelogViewMixin()
+
+        with self.assertNumQueries(1):
+            with self.assertRaises(Http404):
+                mixin.assert_has_journal_access(request, journal, ContentType.VIEW)
+            with self.assertRaises(Http404):
+                mixin.assert_has_journal_access(request, journal, ContentType.DRAFT)
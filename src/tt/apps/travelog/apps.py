@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class JournalPublicConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'tt.apps.travelog'
+
+    def ready(self):
+        import tt.apps.travelog.signals  # noqa: F401
+        return
@@ -0,0 +1,143 @@
+"""
+Benchmark harness for travelog image extraction.
+
+Generates synthetic journal HTML shaped like editor output (float-right
+groups in has-float-image paragraphs, full-width images, captions, prose and
+unrelated markup) and compares TravelogImageScanner against the reference
+html.parser based TravelogImageExtractor for both speed and identical output.
+"""
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+from tt.environment.constants import TtConst
+
+from .services import TravelogImageExtractor, TravelogImageScanner
+
+
+# (image_count, entry_count) pairs covering short trips through very long ones
+DEFAULT_SCENARIOS = [
+    ( 10, 1 ),
+    ( 50, 10 ),
+    ( 100, 30 ),
+    ( 250, 100 ),
+    ( 500, 200 ),
+    ( 500, 20 ),
+]
+
+PROSE_WORDS = (
+    'we', 'walked', 'along', 'the', 'harbor', 'before', 'breakfast', 'and', 'then',
+    'took', 'a', 'ferry', 'to', 'island', 'where', 'lunch', 'was', 'excellent',
+)
+
+
+@dataclass
+class ExtractorBenchmarkResult:
+    image_count      : int
+    entry_count      : int
+    html_bytes       : int
+    baseline_seconds : float
+    scanner_seconds  : float
+    outputs_match    : bool
+
+    @property
+    def speedup(self) -> float:
+        if not self.scanner_seconds:
+            return 0.0
+        return self.baseline_seconds / self.scanner_seconds
+
+
+def extract_with_html_parser( html_content : str ) -> List[dict]:
+    parser = TravelogImageExtractor()
+    parser.feed( html_content )
+    return parser.get_images()
+
+
+def _prose( rng : random.Random, word_count : int ) -> str:
+    return ' '.join( rng.choice( PROSE_WORDS ) for _ in range( word_count ))
+
+
+def _image_html( rng : random.Random, layout : str ) -> str:
+    image_uuid = str( uuid.UUID( int = rng.getrandbits( 128 )))
+    if rng.random() < 0.05:
+        image_uuid = 'not-a-uuid'
+    caption = ''
+    if rng.random() < 0.6:
+        caption = f'<span class="{TtConst.TRIP_IMAGE_CAPTION_CLASS}">{_prose( rng, 6 )} &amp; more</span>'
+    return (
+        f'<span class="{TtConst.JOURNAL_IMAGE_WRAPPER_CLASS}" data-{TtConst.LAYOUT_DATA_ATTR}="{layout}">'
+        f'<img class="{TtConst.JOURNAL_IMAGE_CLASS}" data-{TtConst.UUID_DATA_ATTR}="{image_uuid}"'
+        f' src="/media/trip/image/{image_uuid}.jpg" alt="">'
+        f'{caption}</span>'
+    )
+
+
+def build_synthetic_entry_html( rng : random.Random, image_count : int ) -> str:
+    """ Build one entry's HTML containing the given number of images. """
+    blocks = []
+    remaining = image_count
+    while remaining > 0 or not blocks:
+        roll = rng.random()
+        if remaining and roll < 0.5:
+            # Float-right group, sometimes broken up by text
+            group_size = min( remaining, rng.randint( 1, 3 ))
+            parts = []
+            for _ in range( group_size ):
+                parts.append( _image_html( rng, 'float-right' ))
+                if rng.random() < 0.3:
+                    parts.append( _prose( rng, 4 ))
+            blocks.append( f'<p class="has-float-image">{"".join( parts )}{_prose( rng, 40 )}</p>' )
+            remaining -= group_size
+        elif remaining and roll < 0.75:
+            blocks.append( f'<div class="full-width-image-group">{_image_html( rng, "full-width" )}</div>' )
+            remaining -= 1
+        else:
+            blocks.append( f'<p class="text-block">{_prose( rng, 60 )} <strong>{_prose( rng, 3 )}</strong><br></p>' )
+    return '\n'.join( blocks )
+
+
+def build_synthetic_journal( image_count : int, entry_count : int, seed : int = 0 ) -> List[str]:
+    """ Build entry HTML strings spreading image_count images over entry_count entries. """
+    rng = random.Random( seed )
+    entries = []
+    for entry_index in range( entry_count ):
+        entry_images = image_count // entry_count
+        if entry_index < image_count % entry_count:
+            entry_images += 1
+        entries.append( build_synthetic_entry_html( rng, entry_images ))
+    return entries
+
+
+def _time_extractor( extractor : Callable[[str], List[dict]],
+                     entries   : List[str],
+                     rounds    : int                         ) -> Tuple[float, List[List[dict]]]:
+    best = None
+    results = None
+    for _ in range( rounds ):
+        start = time.perf_counter()
+        results = [ extractor( entry_html ) for entry_html in entries ]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min( best, elapsed )
+    return best, results
+
+
+def run_extractor_benchmark( scenarios : List[Tuple[int, int]] = None,
+                             rounds    : int                   = 5,
+                             seed      : int                   = 0 ) -> List[ExtractorBenchmarkResult]:
+    """ Time both extractors over each scenario (best of rounds) and compare outputs. """
+    results = []
+    for image_count, entry_count in ( scenarios or DEFAULT_SCENARIOS ):
+        entries = build_synthetic_journal( image_count, entry_count, seed = seed )
+        baseline_seconds, baseline_images = _time_extractor( extract_with_html_parser, entries, rounds )
+        scanner_seconds, scanner_images = _time_extractor( TravelogImageScanner.extract_images, entries, rounds )
+        results.append( ExtractorBenchmarkResult(
+            image_count = image_count,
+            entry_count = entry_count,
+            html_bytes = sum( len( entry_html ) for entry_html in entries ),
+            baseline_seconds = baseline_seconds,
+            scanner_seconds = scanner_seconds,
+            outputs_match = bool( baseline_images == scanner_images ),
+        ))
+    return results
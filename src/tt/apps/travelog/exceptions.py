@@ -12,3 +12,13 @@ class PasswordRequiredException(Exception):
         self.journal_uuid = journal_uuid
         self.message = message
         super().__init__(self.message)
+
+
+class ExportNotAllowedError(Exception):
+    """
+    Exception raised when exporting a journal that is not public.
+
+    Exported sites carry no access control, so PRIVATE and PROTECTED
+    journals are only exported when explicitly allowed.
+    """
+    pass
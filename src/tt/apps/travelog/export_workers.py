@@ -0,0 +1,30 @@
+"""
+Process pool workers for static travelog export (see exporter).
+
+Template rendering holds the GIL, so exports with more than one worker
+render their pages in worker processes.  Workers receive the URL map once,
+when they start, and then only a template name and a prepared page context
+per page; they never access the database.
+
+This module must not import models at load time: spawned workers import it
+(to run init_render_worker) before Django is set up.
+"""
+from typing import Dict, Optional, Set, Tuple
+
+import django
+
+_g_url_map = None
+
+
+def init_render_worker( url_map : Dict[str, str] ) -> None:
+    global _g_url_map
+    django.setup()
+    _g_url_map = url_map
+    return
+
+
+def render_export_page( template_name : Optional[str], context : dict ) -> Tuple[str, Set[str]]:
+    """ Runs in a worker process.  Returns the page HTML and the static assets it links to. """
+    from .exporter import ExportPageRenderer
+    renderer = ExportPageRenderer( _g_url_map )
+    return renderer.render( template_name, context ), renderer.static_names
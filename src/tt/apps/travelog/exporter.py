@@ -0,0 +1,450 @@
+"""
+Static site export of published travelogs.
+
+Renders every public page of a published Travelog (TOC, day pages, gallery
+pages and image browse pages) with the same templates and page builders the
+live views use, and writes them, together with copies of the referenced
+images and static assets, to a directory or ZIP archive suitable for
+serving from a CDN bucket.
+
+All exported files live at the top level of the output (plus "images/" and
+"static/" folders) so that every rewritten link is a simple relative path.
+"""
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Dict, IO, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from tt.apps.common.pagination import compute_pagination
+from tt.apps.images.models import TripImage
+from tt.apps.journal.enums import JournalVisibility
+from tt.environment.context_processors import shared_constants
+from tt.environment.url_patterns import TtUrlPatterns
+
+from .context import TravelogPageContext
+from .enums import ContentType, TravelogPageType
+from .exceptions import ExportNotAllowedError
+from .export_workers import init_render_worker, render_export_page
+from .models import Travelog
+from .services import DayPageBuilder, TocPageBuilder, TravelogImageCacheService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TravelogExportResult:
+    output_path  : str
+    page_count   : int  = 0
+    image_count  : int  = 0
+    asset_count  : int  = 0
+
+
+class _DirectoryExportWriter:
+
+    def __init__( self, output_path : str ):
+        self._output_path = output_path
+        os.makedirs( output_path, exist_ok = True )
+        return
+
+    def _full_path( self, name : str ) -> str:
+        full_path = os.path.join( self._output_path, name )
+        os.makedirs( os.path.dirname( full_path ), exist_ok = True )
+        return full_path
+
+    def write_text( self, name : str, text : str ):
+        with open( self._full_path( name ), 'w', encoding = 'utf-8' ) as output_file:
+            output_file.write( text )
+        return
+
+    def write_stream( self, name : str, source : IO[bytes] ):
+        with open( self._full_path( name ), 'wb' ) as output_file:
+            shutil.copyfileobj( source, output_file )
+        return
+
+    def close( self ):
+        return
+
+
+class _ZipExportWriter:
+    """ Streams members into the archive on disk; nothing is buffered beyond one copy chunk. """
+
+    def __init__( self, output_path : str ):
+        self._zip_file = zipfile.ZipFile( output_path, 'w', compression = zipfile.ZIP_DEFLATED )
+        return
+
+    def write_text( self, name : str, text : str ):
+        self._zip_file.writestr( name, text )
+        return
+
+    def write_stream( self, name : str, source : IO[bytes] ):
+        # Images are already compressed, so store them as-is.
+        with self._zip_file.open( zipfile.ZipInfo( name ), 'w' ) as output_file:
+            shutil.copyfileobj( source, output_file )
+        return
+
+    def close( self ):
+        self._zip_file.close()
+        return
+
+
+class ExportPageRenderer:
+    """
+    Renders a page job and rewrites its links to the exported files.  Uses
+    no database, so it runs the same in a render worker process.
+    """
+
+    QUOTED_URL_RE = re.compile( r'''(["'])([^"'<>\s]+)\1''' )
+
+    def __init__( self, url_map : Dict[str, str] ):
+        self._url_map = url_map
+        self.static_names : Set[str] = set()
+        return
+
+    def render( self, template_name : Optional[str], context : dict ) -> str:
+        if template_name is None:
+            redirect_filename = context['redirect_filename']
+            return (
+                '<!doctype html><html><head>'
+                f'<meta http-equiv="refresh" content="0; url={redirect_filename}">'
+                f'</head><body><a href="{redirect_filename}">Continue</a></body></html>'
+            )
+        html = render_to_string( template_name, context )
+        return self.QUOTED_URL_RE.sub( self._rewrite_url_match, html )
+
+    def _rewrite_url_match( self, match ) -> str:
+        quote, url = match.group(1), match.group(2)
+        exported_path = self._get_exported_path( url )
+        if exported_path is None:
+            return match.group(0)
+        return f'{quote}{exported_path}{quote}'
+
+    def _get_exported_path( self, url : str ) -> Optional[str]:
+        if url in self._url_map:
+            return self._url_map[url]
+        # Drop ?version=N and similar: static hosting has a single version.
+        base_url = url.split( '?', 1 )[0].split( '#', 1 )[0]
+        if base_url in self._url_map:
+            return self._url_map[base_url]
+        static_base_url = staticfiles_storage.base_url
+        if static_base_url and base_url.startswith( static_base_url ):
+            static_name = base_url[len( static_base_url ):]
+            if static_name:
+                self.static_names.add( static_name )
+                return f'{TravelogStaticExporter.STATIC_DIR}/{static_name}'
+        if url.startswith( '/' ) and not url.startswith( '//' ):
+            # Anything else on the site (home page, user list) stays live.
+            return f'{settings.BASE_URL_FOR_EMAIL_LINKS.rstrip("/")}{url}'
+        return None
+
+
+class TravelogStaticExporter:
+    """
+    Exports a published Travelog as a self-contained static site.
+
+    Database access (content, entries, images) happens up front in the
+    calling process.  Template rendering holds the GIL, so with more than one
+    worker the prepared (pickled) page contexts are rendered in a pool of
+    worker processes, which only render and rewrite links.  Pages are written
+    as they finish with a bounded number in flight, so memory use does not
+    grow with the size of the travelog.
+
+    The output has no access control, so only PUBLIC journals are exported
+    unless allow_private is set.
+    """
+
+    DEFAULT_WORKERS = 4
+    IMAGES_DIR = 'images'
+    STATIC_DIR = 'static'
+
+    def __init__( self,
+                  travelog       : Travelog,
+                  output_path    : str,
+                  as_zip         : bool           = False,
+                  workers        : int            = DEFAULT_WORKERS,
+                  progress       : Optional[Callable[[str], None]] = None,
+                  allow_private  : bool           = False ):
+        if not allow_private and travelog.journal.visibility != JournalVisibility.PUBLIC:
+            raise ExportNotAllowedError(
+                f'Journal is {travelog.journal.visibility.label}, not Public: {travelog.journal.uuid}'
+            )
+        self._travelog = travelog
+        self._output_path = output_path
+        self._as_zip = as_zip
+        self._workers = max( 1, workers )
+        self._progress = progress
+        self._journal = travelog.journal
+        self._travelog_page_context = self._make_page_context( TravelogPageType.TOC )
+        self._url_map : Dict[str, str] = {}
+        self._static_names : Set[str] = set()
+        return
+
+    def export( self ) -> TravelogExportResult:
+        result = TravelogExportResult( output_path = self._output_path )
+
+        entries = list(
+            self._travelog.get_entries().select_related( 'reference_image' ).order_by( 'date' )
+        )
+        all_images = TravelogImageCacheService.get_images(
+            travelog_page_context = self._travelog_page_context,
+            content = self._travelog,
+        )
+        trip_images = self._get_trip_images( entries = entries, all_images = all_images )
+
+        # Resolve lazily computed values the templates touch, before the
+        # contexts are sent to render workers.
+        _ = self._journal.trip.owner
+
+        self._build_url_map( entries = entries, all_images = all_images, trip_images = trip_images )
+        page_jobs = self._get_page_jobs( entries = entries, all_images = all_images, trip_images = trip_images )
+
+        writer = _ZipExportWriter( self._output_path ) if self._as_zip else _DirectoryExportWriter( self._output_path )
+        try:
+            result.page_count = self._render_pages( writer = writer, page_jobs = page_jobs )
+            result.image_count = self._copy_images( writer = writer, trip_images = trip_images )
+            result.asset_count = self._copy_static_assets( writer = writer )
+        finally:
+            writer.close()
+        return result
+
+    def _make_page_context( self, page_type : TravelogPageType ) -> TravelogPageContext:
+        if self._travelog.is_current:
+            return TravelogPageContext(
+                journal = self._travelog.journal,
+                content_type = ContentType.VIEW,
+                page_type = page_type,
+            )
+        return TravelogPageContext(
+            journal = self._travelog.journal,
+            content_type = ContentType.VERSION,
+            page_type = page_type,
+            version_number = self._travelog.version_number,
+        )
+
+    def _get_trip_images( self, entries, all_images ) -> Dict[str, TripImage]:
+        image_uuids = { img.uuid for img in all_images }
+        image_uuids.update( str( entry.reference_image.uuid ) for entry in entries if entry.reference_image )
+        return { str( img.uuid ): img for img in TripImage.objects.filter( uuid__in = image_uuids ) }
+
+    @classmethod
+    def get_day_filename( cls, entry_date ) -> str:
+        return f'day-{entry_date.isoformat()}.html'
+
+    @classmethod
+    def get_gallery_filename( cls, page_num : int ) -> str:
+        return 'gallery.html' if page_num == 1 else f'gallery-{page_num}.html'
+
+    @classmethod
+    def get_browse_filename( cls, image_uuid : str ) -> str:
+        return f'image-{image_uuid}.html'
+
+    @classmethod
+    def get_image_filename( cls, image_field ) -> str:
+        return f'{cls.IMAGES_DIR}/{os.path.basename( image_field.name )}'
+
+    def _build_url_map( self, entries, all_images, trip_images ):
+        """ Map every live URL the pages can link to onto its exported relative path. """
+        journal_uuid = self._journal.uuid
+
+        toc_filename = 'index.html'
+        if len( entries ) == 1:
+            # The live TOC redirects straight to the only day page.
+            toc_filename = self.get_day_filename( entries[0].date )
+        self._url_map[reverse( 'travelog_toc', kwargs = { 'journal_uuid': journal_uuid } )] = toc_filename
+
+        for entry in entries:
+            day_url = reverse( 'travelog_day', kwargs = {
+                'journal_uuid': journal_uuid,
+                'date': entry.date.isoformat(),
+            })
+            self._url_map[day_url] = self.get_day_filename( entry.date )
+
+        self._url_map[reverse( 'travelog_gallery', kwargs = { 'journal_uuid': journal_uuid } )] = (
+            self.get_gallery_filename( 1 )
+        )
+        for page_num in range( 1, self._get_gallery_page_count( all_images ) + 1 ):
+            gallery_url = reverse( 'travelog_gallery_page', kwargs = {
+                'journal_uuid': journal_uuid,
+                'page_num': page_num,
+            })
+            self._url_map[gallery_url] = self.get_gallery_filename( page_num )
+
+        # Includes the placeholder URL the day page script uses to build browse links.
+        browse_uuids = [ img.uuid for img in all_images ] + [ TtUrlPatterns.PLACEHOLDER_UUID ]
+        for image_uuid in browse_uuids:
+            browse_url = reverse( 'travelog_image_browse', kwargs = {
+                'journal_uuid': journal_uuid,
+                'image_uuid': image_uuid,
+            })
+            self._url_map[browse_url] = self.get_browse_filename( image_uuid )
+
+        for trip_image in trip_images.values():
+            for image_field in ( trip_image.web_image, trip_image.thumbnail_image ):
+                if image_field:
+                    self._url_map[image_field.url] = self.get_image_filename( image_field )
+        return
+
+    def _get_gallery_page_count( self, all_images ) -> int:
+        from .views import TravelogImageGalleryView
+
+        return compute_pagination(
+            page_number = 1,
+            page_size = TravelogImageGalleryView.IMAGES_PER_PAGE,
+            item_count = len( all_images ),
+        ).page_count
+
+    def _get_page_jobs( self, entries, all_images, trip_images ) -> List[Tuple[str, str, dict]]:
+        """ Build (filename, template, context) for each page, mirroring the live views. """
+        from .views import TravelogImageGalleryView
+
+        journal = self._journal
+        is_multi_page = bool( len( entries ) > 1 )
+        base_context = {
+            'content': self._travelog,
+            'is_multi_page': is_multi_page,
+            'journal': journal,
+        }
+        base_context.update( shared_constants( request = None ) )
+        page_jobs = []
+
+        if is_multi_page:
+            page_jobs.append(( 'index.html', 'travelog/pages/travelog_toc.html', {
+                **base_context,
+                'toc_page': TocPageBuilder.build( entries = entries ),
+                'travelog_page': self._make_page_context( TravelogPageType.TOC ),
+            }))
+        elif entries:
+            page_jobs.append(( 'index.html', None, {
+                'redirect_filename': self.get_day_filename( entries[0].date ),
+            }))
+
+        day_page_context = self._make_page_context( TravelogPageType.DAY )
+        for entry in entries:
+            page_jobs.append(( self.get_day_filename( entry.date ), 'travelog/pages/travelog_day.html', {
+                **base_context,
+                'day_page': DayPageBuilder.build( entries = entries, target_date = entry.date ),
+                'travelog_page': day_page_context,
+            }))
+
+        gallery_page_context = self._make_page_context( TravelogPageType.IMAGE_GALLERY )
+        page_count = self._get_gallery_page_count( all_images )
+        for page_num in range( 1, page_count + 1 ):
+            pagination = compute_pagination(
+                page_number = page_num,
+                page_size = TravelogImageGalleryView.IMAGES_PER_PAGE,
+                item_count = len( all_images ),
+            )
+            page_image_metadata = all_images[pagination.start_offset:pagination.end_offset + 1]
+            page_jobs.append(( self.get_gallery_filename( page_num ), 'travelog/pages/travelog_image_gallery.html', {
+                **base_context,
+                'images': [
+                    {
+                        'metadata': metadata,
+                        'trip_image': trip_images.get( metadata.uuid ),
+                    }
+                    for metadata in page_image_metadata
+                ],
+                'pagination': pagination,
+                'travelog_page': gallery_page_context,
+            }))
+
+        browse_page_context = self._make_page_context( TravelogPageType.IMAGE_BROWSE )
+        for idx, image_metadata in enumerate( all_images ):
+            page_jobs.append(( self.get_browse_filename( image_metadata.uuid ), 'travelog/pages/travelog_image_browse.html', {
+                **base_context,
+                'image_metadata': image_metadata,
+                'trip_image': trip_images.get( image_metadata.uuid ),
+                'image_uuid': image_metadata.uuid,
+                'current_index': idx,
+                'total_images': len( all_images ),
+                'prev_image': all_images[idx - 1] if idx > 0 else None,
+                'next_image': all_images[idx + 1] if idx < len( all_images ) - 1 else None,
+                'travelog_page': browse_page_context,
+            }))
+        return page_jobs
+
+    def _render_pages( self, writer, page_jobs : List[Tuple[str, str, dict]] ) -> int:
+        workers = min( self._workers, len( page_jobs ))
+        if workers <= 1:
+            renderer = ExportPageRenderer( self._url_map )
+            for filename, template_name, context in page_jobs:
+                writer.write_text( filename, renderer.render( template_name, context ))
+                self._report( f'Rendered {filename}' )
+                continue
+            self._static_names.update( renderer.static_names )
+            return len( page_jobs )
+
+        max_in_flight = workers * 2
+        job_iter = iter( page_jobs )
+        page_count = 0
+        with ProcessPoolExecutor(
+                max_workers = workers,
+                mp_context = multiprocessing.get_context( 'spawn' ),
+                initializer = init_render_worker,
+                initargs = ( self._url_map, )) as executor:
+            pending = {}
+            while True:
+                while len( pending ) < max_in_flight:
+                    job = next( job_iter, None )
+                    if job is None:
+                        break
+                    filename, template_name, context = job
+                    pending[executor.submit( render_export_page, template_name, context )] = filename
+                if not pending:
+                    break
+                done, _ = wait( pending, return_when = FIRST_COMPLETED )
+                for future in done:
+                    filename = pending.pop( future )
+                    html, static_names = future.result()
+                    writer.write_text( filename, html )
+                    self._static_names.update( static_names )
+                    page_count += 1
+                    self._report( f'Rendered {filename}' )
+        return page_count
+
+    def _copy_images( self, writer, trip_images : Dict[str, TripImage] ) -> int:
+        image_count = 0
+        for trip_image in trip_images.values():
+            for image_field in ( trip_image.web_image, trip_image.thumbnail_image ):
+                if not image_field:
+                    continue
+                try:
+                    with image_field.storage.open( image_field.name, 'rb' ) as source:
+                        writer.write_stream( self.get_image_filename( image_field ), source )
+                    image_count += 1
+                except OSError as e:
+                    logger.warning( f'Could not export image {image_field.name}: {e}' )
+        self._report( f'Copied {image_count} image files' )
+        return image_count
+
+    def _copy_static_assets( self, writer ) -> int:
+        asset_count = 0
+        for static_name in sorted( self._static_names ):
+            source_path = finders.find( static_name )
+            try:
+                if source_path:
+                    with open( source_path, 'rb' ) as source:
+                        writer.write_stream( f'{self.STATIC_DIR}/{static_name}', source )
+                else:
+                    with staticfiles_storage.open( static_name, 'rb' ) as source:
+                        writer.write_stream( f'{self.STATIC_DIR}/{static_name}', source )
+                asset_count += 1
+            except OSError as e:
+                logger.warning( f'Could not export static asset {static_name}: {e}' )
+        self._report( f'Copied {asset_count} static assets' )
+        return asset_count
+
+    def _report( self, message : str ):
+        if self._progress:
+            self._progress( message )
+        return
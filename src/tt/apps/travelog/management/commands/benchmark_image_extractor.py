@@ -0,0 +1,75 @@
+"""
+Management command to benchmark travelog image extraction.
+
+Compares TravelogImageScanner with the html.parser based
+TravelogImageExtractor over synthetic journals and verifies both produce
+identical output.
+
+Usage:
+    python manage.py benchmark_image_extractor
+    python manage.py benchmark_image_extractor --rounds 10
+    python manage.py benchmark_image_extractor --scenario 500:200 --scenario 10:1
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from tt.apps.common.command_utils import CommandLoggerMixin
+
+from ...benchmarks import run_extractor_benchmark
+
+
+class Command( BaseCommand, CommandLoggerMixin ):
+    help = 'Benchmark the single-pass image scanner against the html.parser image extractor'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rounds',
+            type=int,
+            default=5,
+            help='Timing rounds per scenario; the best round is reported (default: 5)',
+        )
+        parser.add_argument(
+            '--scenario',
+            action='append',
+            default=[],
+            help='IMAGES:ENTRIES pair to benchmark (repeatable; default: built-in set)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed for synthetic journal generation',
+        )
+
+    def handle(self, *args, **options):
+        scenarios = []
+        for scenario in options['scenario']:
+            try:
+                image_count, entry_count = ( int(x) for x in scenario.split(':') )
+            except ValueError:
+                raise CommandError( f'Invalid scenario "{scenario}", expected IMAGES:ENTRIES' )
+            if entry_count < 1:
+                raise CommandError( f'Invalid scenario "{scenario}", need at least one entry' )
+            scenarios.append( ( image_count, entry_count ) )
+
+        results = run_extractor_benchmark(
+            scenarios = scenarios or None,
+            rounds = max( 1, options['rounds'] ),
+            seed = options['seed'],
+        )
+
+        self.info( f'{"images":>7} {"entries":>8} {"html KB":>8} {"parser ms":>10} {"scanner ms":>11} {"speedup":>8}  match' )
+        for result in results:
+            line = (
+                f'{result.image_count:>7} {result.entry_count:>8} {result.html_bytes / 1024:>8.1f}'
+                f' {result.baseline_seconds * 1000:>10.2f} {result.scanner_seconds * 1000:>11.2f}'
+                f' {result.speedup:>7.1f}x  {"yes" if result.outputs_match else "NO"}'
+            )
+            if result.outputs_match:
+                self.message( line )
+            else:
+                self.error( line )
+
+        if not all( result.outputs_match for result in results ):
+            raise CommandError( 'Scanner output differs from the html.parser extractor' )
+        self.success( 'Scanner output identical in all scenarios' )
+        return
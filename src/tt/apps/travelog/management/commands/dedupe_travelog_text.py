@@ -0,0 +1,116 @@
+"""
+Management command to move travelog entry text into shared text rows.
+
+TravelogEntry rows published before content-addressed text storage keep
+their HTML inline. This backfill moves it into TravelogEntryText, so entries
+with identical text across versions share one row, processing entries in
+batches of one transaction each. Safe by default (dry-run mode) and safe to
+re-run or interrupt.
+
+Afterwards it sweeps orphaned TravelogEntryText rows, which no entry
+references any more (e.g., texts of deleted journals left behind when their
+on-delete cleanup failed).
+
+Usage:
+    python manage.py dedupe_travelog_text                     # Dry run (preview)
+    python manage.py dedupe_travelog_text --execute           # Apply changes
+    python manage.py dedupe_travelog_text --execute --batch-size 200
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from tt.apps.common.command_utils import CommandLoggerMixin
+
+from ...models import TravelogEntry, TravelogEntryText
+
+
+class Command( BaseCommand, CommandLoggerMixin ):
+    help = 'Deduplicate published travelog entry text into shared content-addressed rows'
+
+    DEFAULT_BATCH_SIZE = 500
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--execute',
+            action='store_true',
+            help='Actually apply changes (default is dry-run)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=self.DEFAULT_BATCH_SIZE,
+            help=f'Entries per batch/transaction (default: {self.DEFAULT_BATCH_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        execute = options['execute']
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError( '--batch-size must be at least 1' )
+
+        if execute:
+            self.warning( '=== EXECUTE MODE - Changes will be saved ===' )
+        else:
+            self.message( '=== DRY RUN - No changes will be saved ===' )
+
+        entry_count = 0
+        inline_bytes = 0
+        seen_hashes = set()
+        last_id = 0
+        while True:
+            batch = list(
+                TravelogEntry.objects
+                .filter( text_blob__isnull = True, id__gt = last_id )
+                .order_by( 'id' )
+                .only( 'id', 'inline_text' )[:batch_size]
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            entry_count += len( batch )
+            for entry in batch:
+                inline_bytes += len( entry.inline_text.encode( 'utf-8' ))
+                seen_hashes.add( TravelogEntryText.hash_text( entry.inline_text ))
+                continue
+
+            if execute:
+                self._dedupe_batch( batch )
+            self.message( f'  {entry_count} entries scanned ({len( seen_hashes )} distinct texts)' )
+            continue
+
+        if not entry_count:
+            self.success( 'No travelog entries with inline text found.' )
+        else:
+            action_word = 'Moved' if execute else 'Would move'
+            self.success(
+                f'{action_word} {entry_count} entries into {len( seen_hashes )} distinct texts'
+                f' ({inline_bytes / 1024:.1f} KB of inline text)'
+            )
+
+        self._sweep_orphans( execute )
+        return
+
+    def _sweep_orphans( self, execute ):
+        if execute:
+            orphan_count = TravelogEntryText.objects.delete_unreferenced()
+        else:
+            orphan_count = TravelogEntryText.objects.unreferenced().count()
+        if not orphan_count:
+            self.success( 'No unreferenced travelog entry texts found.' )
+            return
+        action_word = 'Deleted' if execute else 'Would delete'
+        self.success( f'{action_word} {orphan_count} unreferenced travelog entry texts' )
+        return
+
+    def _dedupe_batch( self, batch ):
+        with transaction.atomic():
+            text_blobs = TravelogEntryText.objects.get_or_create_for_texts(
+                [ entry.inline_text for entry in batch ]
+            )
+            for entry in batch:
+                entry.text_blob = text_blobs[TravelogEntryText.hash_text( entry.inline_text )]
+                entry.inline_text = ''
+                continue
+            TravelogEntry.objects.bulk_update( batch, [ 'text_blob', 'inline_text' ] )
+        return
@@ -0,0 +1,104 @@
+"""
+Management command to export a published travelog as a static site.
+
+Renders the TOC, day, gallery and image browse pages of a published
+Travelog, and copies the referenced images and static assets, into a
+directory or ZIP archive that can be served as-is (e.g., from a CDN bucket).
+
+Usage:
+    python manage.py export_travelog <journal_uuid> /path/to/output
+    python manage.py export_travelog <journal_uuid> /path/to/site.zip --zip
+    python manage.py export_travelog <journal_uuid> /path/to/output --version-number 3
+    python manage.py export_travelog <journal_uuid> /path/to/output --workers 8
+    python manage.py export_travelog <journal_uuid> /path/to/output --allow-private
+
+Only PUBLIC journals are exported unless --allow-private is given, since
+the exported site has no access control.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from tt.apps.common.command_utils import CommandLoggerMixin
+from tt.apps.journal.models import Journal
+
+from ...exceptions import ExportNotAllowedError
+from ...exporter import TravelogStaticExporter
+from ...models import Travelog
+
+
+class Command( BaseCommand, CommandLoggerMixin ):
+    help = 'Export a published travelog as a self-contained static site (directory or ZIP)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'journal_uuid',
+            help='UUID of the journal whose travelog should be exported',
+        )
+        parser.add_argument(
+            'output_path',
+            help='Output directory (or ZIP file path with --zip)',
+        )
+        parser.add_argument(
+            '--version-number',
+            type=int,
+            dest='version_number',
+            help='Published version number to export (default: current version)',
+        )
+        parser.add_argument(
+            '--zip',
+            action='store_true',
+            help='Write a ZIP archive instead of a directory',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=TravelogStaticExporter.DEFAULT_WORKERS,
+            help=f'Number of page rendering worker processes, 1 to render in this process (default: {TravelogStaticExporter.DEFAULT_WORKERS})',
+        )
+        parser.add_argument(
+            '--allow-private',
+            action='store_true',
+            dest='allow_private',
+            help='Export even if the journal is not Public (the export has no access control)',
+        )
+        parser.add_argument(
+            '--verbose',
+            action='store_true',
+            help='Show each exported page',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            journal = Journal.objects.select_related( 'trip' ).get( uuid = options['journal_uuid'] )
+        except ( Journal.DoesNotExist, ValueError ):
+            raise CommandError( f'Journal not found: {options["journal_uuid"]}' )
+
+        version_number = options['version_number']
+        if version_number is None:
+            travelog = Travelog.objects.get_current( journal )
+            if not travelog:
+                raise CommandError( f'Journal has no published version: {journal.uuid}' )
+        else:
+            travelog = Travelog.objects.get_version( journal, version_number )
+            if not travelog:
+                raise CommandError( f'Journal has no version {version_number}: {journal.uuid}' )
+
+        try:
+            exporter = TravelogStaticExporter(
+                travelog = travelog,
+                output_path = options['output_path'],
+                as_zip = options['zip'],
+                workers = options['workers'],
+                progress = self.message if options['verbose'] else None,
+                allow_private = options['allow_private'],
+            )
+        except ExportNotAllowedError as e:
+            raise CommandError( f'{e} (use --allow-private to export anyway)' )
+
+        self.info( f'Exporting "{travelog.title}" (v{travelog.version_number}) to {options["output_path"]}' )
+        result = exporter.export()
+
+        self.success(
+            f'Exported {result.page_count} pages, {result.image_count} image files'
+            f' and {result.asset_count} static assets to {result.output_path}'
+        )
+        return
@@ -1,8 +1,8 @@
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 from django.db import models, transaction
 
 if TYPE_CHECKING:
-    from .models import Travelog, TravelogEntry
+    from .models import Travelog, TravelogEntry, TravelogEntryText
 
 from tt.apps.journal.models import Journal
 
@@ -70,3 +70,68 @@ class TravelogEntryManager(models.Manager):
     def get_by_date(self, travelog: 'Travelog', date) -> Optional['TravelogEntry']:
         """Get a specific entry snapshot by date."""
         return self.filter(travelog=travelog, date=date).first()
+
+
+class TravelogEntryTextManager(models.Manager):
+    """Manager for TravelogEntryText model."""
+
+    def get_or_create_for_text(self, text: str):
+        """Get the shared row for this text, creating it if needed."""
+        return self.get_or_create_for_texts([text])[self.model.hash_text(text)]
+
+    def get_or_create_for_texts(self, texts) -> Dict[str, 'TravelogEntryText']:
+        """
+        Get shared rows for many texts in a constant number of queries.
+
+        Returns a dict keyed by content hash. Rows inserted concurrently by
+        another publish are tolerated (ignore_conflicts) and re-read. The
+        rows are locked until the caller's transaction ends, so
+        delete_unreferenced cannot remove them before the caller's entries
+        refer to them; callers should create those entries in the same
+        transaction.
+        """
+        texts_by_hash = {self.model.hash_text(text): text for text in texts}
+        if not texts_by_hash:
+            return {}
+        with transaction.atomic():
+            locked_rows = self.select_for_update().order_by('pk')
+            blobs = locked_rows.in_bulk(list(texts_by_hash), field_name='content_hash')
+            missing = [
+                self.model(content_hash=content_hash, text=text)
+                for content_hash, text in texts_by_hash.items()
+                if content_hash not in blobs
+            ]
+            if missing:
+                self.bulk_create(missing, ignore_conflicts=True)
+                blobs.update(locked_rows.in_bulk([blob.content_hash for blob in missing],
+                                                 field_name='content_hash'))
+        return blobs
+
+    def unreferenced(self) -> models.QuerySet['TravelogEntryText']:
+        """Rows no TravelogEntry references (e.g., after a journal was deleted)."""
+        return self.filter(entries__isnull=True)
+
+    def delete_unreferenced(self, ids=None) -> int:
+        """
+        Delete unreferenced rows, optionally only among the given ids.
+
+        The candidate rows are locked and re-checked before deleting, so a
+        row a concurrent publish has just picked up (get_or_create_for_texts)
+        is kept once that publish commits its entries.
+
+        Returns the number of rows deleted.
+        """
+        queryset = self.unreferenced()
+        if ids is not None:
+            queryset = queryset.filter(pk__in=list(ids))
+        with transaction.atomic():
+            candidate_ids = list(
+                self.select_for_update()
+                .filter(pk__in=list(queryset.values_list('pk', flat=True)))
+                .order_by('pk')
+                .values_list('pk', flat=True)
+            )
+            if not candidate_ids:
+                return 0
+            deleted_count, _ = self.unreferenced().filter(pk__in=candidate_ids).delete()
+        return deleted_count
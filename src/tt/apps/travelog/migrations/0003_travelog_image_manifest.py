@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-16 19:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("travelog", "0002_alter_travelog_reference_image_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="travelog",
+            name="image_manifest",
+            field=models.JSONField(
+                blank=True,
+                editable=False,
+                help_text="Ordered image metadata extracted from entries when published (null if not yet computed)",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.7 on 2026-10-16 19:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("travelog", "0003_travelog_image_manifest"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TravelogEntryText",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "content_hash",
+                    models.CharField(editable=False, max_length=64, unique=True),
+                ),
+                ("text", models.TextField(blank=True, editable=False)),
+            ],
+            options={
+                "verbose_name": "Travelog Entry Text",
+                "verbose_name_plural": "Travelog Entry Texts",
+            },
+        ),
+        # The existing text column is kept as-is; only the model field name
+        # changes so TravelogEntry.text can resolve through text_blob.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveField(
+                    model_name="travelogentry",
+                    name="text",
+                ),
+                migrations.AddField(
+                    model_name="travelogentry",
+                    name="inline_text",
+                    field=models.TextField(blank=True, db_column="text"),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="travelogentry",
+            name="text_blob",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="entries",
+                to="travelog.travelogentrytext",
+            ),
+        ),
+    ]
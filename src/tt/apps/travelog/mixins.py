@@ -1,19 +1,24 @@
 from datetime import datetime, timedelta
+import hashlib
+from typing import Optional
 from uuid import UUID
 
+from django.conf import settings
 from django.core.exceptions import BadRequest, PermissionDenied
 from django.http import Http404, HttpRequest, HttpResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.http import url_has_allowed_host_and_scheme
 
-from tt.apps.journal.models import Journal
+from tt.apps.journal.models import Journal, JournalContent
 from tt.apps.journal.enums import JournalVisibility
-from tt.apps.members.models import TripMember
+from tt.apps.members.member_resolver import TripMemberResolver
 
 from .enums import ContentType, TravelogPageType
 from .exceptions import PasswordRequiredException
 from .context import TravelogPageContext
+from .models import Travelog
 from .services import TravelogImageCacheService
 
 
@@ -28,7 +33,7 @@ class TravelogViewMixin:
 
         Raises PasswordRequiredException, Http404, or PermissionDenied if access denied.
         """
-        journal = get_object_or_404( Journal, uuid = journal_uuid )
+        journal = get_object_or_404( Journal.objects.select_related( 'trip' ), uuid = journal_uuid )
 
         version_param = request.GET.get('version', '')
 
@@ -71,6 +76,77 @@ class TravelogViewMixin:
             version_number = version_number
         )
 
+    def get_travelog_etag( self,
+                           travelog_page_context  : TravelogPageContext,
+                           content                : JournalContent,
+                           **page_params                               ) -> Optional[str]:
+        """
+        Compute a strong ETag for a published travelog page.
+
+        Published content is immutable, so the response is fully determined by
+        the travelog version, journal settings that affect rendering or access,
+        the page parameters and the deployed server version. Computed from
+        already-loaded rows only, so it runs before any entry or image queries.
+
+        Returns None for DRAFT content (never conditionally served).
+        """
+        if travelog_page_context.is_draft() or not isinstance( content, Travelog ):
+            return None
+
+        journal = travelog_page_context.journal
+        etag_parts = [
+            str( journal.uuid ),
+            travelog_page_context.content_type.name,
+            str( content.version_number ),
+            str( journal.password_version ),
+            journal.visibility.name,
+            journal.theme.name,
+            travelog_page_context.page_type.name,
+            settings.ENV.VERSION,
+        ]
+        for param_name in sorted( page_params ):
+            etag_parts.append( f'{param_name}={page_params[param_name]}' )
+
+        digest = hashlib.sha256( '|'.join( etag_parts ).encode('utf-8') ).hexdigest()
+        return f'"{digest}"'
+
+    def get_not_modified_response( self,
+                                   request                : HttpRequest,
+                                   travelog_page_context  : TravelogPageContext,
+                                   etag                   : Optional[str]       ) -> Optional[HttpResponse]:
+        """
+        Return a 304 response if the request's If-None-Match matches the ETag.
+
+        Must only be called after access to the journal has been checked.
+        """
+        if not etag:
+            return None
+        response = get_conditional_response( request, etag = etag )
+        if response is None:
+            return None
+        return self.set_cache_validators( response, travelog_page_context, etag )
+
+    def set_cache_validators( self,
+                              response               : HttpResponse,
+                              travelog_page_context  : TravelogPageContext,
+                              etag                   : Optional[str]       ) -> HttpResponse:
+        """
+        Add ETag and Cache-Control headers to a published travelog page response.
+
+        Every use must be revalidated (no-cache) so access changes and new
+        versions are seen immediately. Only PUBLIC journals may be stored by
+        shared caches; other visibilities are restricted to the browser.
+        """
+        if not etag:
+            return response
+
+        response['ETag'] = etag
+        if travelog_page_context.journal.visibility == JournalVisibility.PUBLIC:
+            patch_cache_control( response, public = True, no_cache = True )
+        else:
+            patch_cache_control( response, private = True, no_cache = True )
+        return response
+
     def assert_has_journal_access( self,
                                    request       : HttpRequest,
                                    journal       : Journal,
@@ -86,12 +162,8 @@ class TravelogViewMixin:
 
         # Trip members can access all travelog variations (content types)
         # and also do not need a password for PROTECTED ones.
-        if request.user.is_authenticated:
-            try:
-                TripMember.objects.get( trip = journal.trip, user = request.user )
-                return
-            except TripMember.DoesNotExist:
-                pass
+        if self.is_journal_trip_member( request, journal ):
+            return
  
         if content_type == ContentType.DRAFT:
             # Drafts not visible unless logged in and a trip member.
@@ -101,6 +173,14 @@ class TravelogViewMixin:
             # VIEW and VERSION respect journal visibility settings
             self._check_journal_access( request, journal )
 
+    def is_journal_trip_member( self, request : HttpRequest, journal : Journal ) -> bool:
+        """ Memoized per request, so repeated access checks share one query. """
+        trip_member = TripMemberResolver.get_member_for_trip(
+            request = request,
+            trip = journal.trip,
+        )
+        return bool( trip_member is not None )
+
     def _check_journal_access( self,
                                request  : HttpRequest,
                                journal  : Journal ) -> None:
@@ -115,11 +195,7 @@ class TravelogViewMixin:
             # Edge case: PROTECTED without password should behave like PRIVATE
             if not journal.has_password:
                 # Treat as PRIVATE - must be authenticated trip member
-                if not request.user.is_authenticated:
-                    raise Http404()  # Don't reveal existence
-                try:
-                    TripMember.objects.get( trip = journal.trip, user = request.user )
-                except TripMember.DoesNotExist:
+                if not self.is_journal_trip_member( request, journal ):
                     raise Http404()  # Don't reveal existence
                 return
 
@@ -131,12 +207,7 @@ class TravelogViewMixin:
 
         elif journal.visibility == JournalVisibility.PRIVATE:
             # Must be authenticated and a trip member
-            if not request.user.is_authenticated:
-                raise Http404()  # Don't reveal existence of private journals
-
-            try:
-                TripMember.objects.get( trip = journal.trip, user = request.user )
-            except TripMember.DoesNotExist:
+            if not self.is_journal_trip_member( request, journal ):
                 raise Http404()  # Don't reveal existence of private journals
 
         else:
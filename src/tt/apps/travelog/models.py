@@ -1,5 +1,7 @@
+import hashlib
+
 from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 
 from tt.apps.journal.models import Journal, JournalEntry, JournalContent, JournalEntryContent
 
@@ -42,6 +44,14 @@ class Travelog( JournalContent ):
         auto_now_add = True,
     )
 
+    # Ordered image list (TravelogImageMetadata dicts) computed at publish time
+    image_manifest = models.JSONField(
+        null = True,
+        blank = True,
+        editable = False,
+        help_text = 'Ordered image metadata extracted from entries when published (null if not yet computed)',
+    )
+
     class Meta:
         verbose_name = 'Travelog'
         verbose_name_plural = 'Travelogs'
@@ -49,13 +59,46 @@ class Travelog( JournalContent ):
         unique_together = [('journal', 'version_number')]
 
     def get_entries(self):
-        return self.entries.all()
+        return self.entries.select_related( 'text_blob' )
 
     def __str__(self):
         current_indicator = ' [CURRENT]' if self.is_current else ''
         return f"{self.title} (v{self.version_number}){current_indicator}"
 
 
+class TravelogEntryText( models.Model ):
+    """
+    Content-addressed entry HTML shared by TravelogEntry snapshots.
+
+    Published text is immutable, so entries with identical text (typically the
+    unchanged days of each new version) reference the same row, keyed by the
+    SHA-256 of the text.
+    """
+
+    objects = managers.TravelogEntryTextManager()
+
+    content_hash = models.CharField(
+        max_length = 64,
+        unique = True,
+        editable = False,
+    )
+    text = models.TextField(
+        blank = True,
+        editable = False,
+    )
+
+    class Meta:
+        verbose_name = 'Travelog Entry Text'
+        verbose_name_plural = 'Travelog Entry Texts'
+
+    @staticmethod
+    def hash_text( text : str ) -> str:
+        return hashlib.sha256( text.encode( 'utf-8' )).hexdigest()
+
+    def __str__(self):
+        return self.content_hash
+
+
 class TravelogEntry( JournalEntryContent ):
     """
     Published version of a JournalEntry - immutable snapshot.
@@ -81,10 +124,54 @@ class TravelogEntry( JournalEntryContent ):
         related_name = 'travelog_snapshots',
     )
 
+    # Entry HTML lives in text_blob.  The inherited text column is kept (as
+    # inline_text) for rows not yet moved by the dedupe_travelog_text backfill.
+    text_blob = models.ForeignKey(
+        TravelogEntryText,
+        on_delete = models.PROTECT,
+        null = True,
+        blank = True,
+        related_name = 'entries',
+    )
+    inline_text = models.TextField(
+        blank = True,
+        db_column = 'text',
+    )
+
     class Meta:
         verbose_name = 'Travelog Entry'
         verbose_name_plural = 'Travelog Entries'
         ordering = ['date']
 
+    _pending_text = None
+
+    @property
+    def text(self) -> str:
+        if self._pending_text is not None:
+            return self._pending_text
+        if self.text_blob_id:
+            return self.text_blob.text
+        return self.inline_text
+
+    @text.setter
+    def text( self, value : str ):
+        # Stored on save(), so unsaved instances behave like other entry content.
+        self._pending_text = value
+        return
+
+    def save( self, *args, **kwargs ):
+        update_fields = kwargs.get( 'update_fields' )
+        if update_fields is not None and 'text' in update_fields:
+            kwargs['update_fields'] = [ x for x in update_fields if x != 'text' ] + [ 'text_blob', 'inline_text' ]
+        # The text row stays locked until this entry refers to it (see
+        # TravelogEntryTextManager.delete_unreferenced).
+        with transaction.atomic():
+            if self._pending_text is not None:
+                self.text_blob = TravelogEntryText.objects.get_or_create_for_text( self._pending_text )
+                self.inline_text = ''
+                self._pending_text = None
+            super().save( *args, **kwargs )
+        return
+
     def __str__(self):
         return f"{self.title} ({self.date})"
@@ -1,27 +1,40 @@
+import html
 import json
 import logging
 import re
 from datetime import date
 from html.parser import HTMLParser
-from typing import Callable, List, Optional, Tuple
+from typing import Callable, Iterable, List, Optional, Tuple
 from uuid import UUID
 
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.contrib.auth.models import User as UserType
 from django.core.exceptions import PermissionDenied
 from django.db import transaction
+from django.db.models import BigIntegerField, Count, Exists, Max, Min, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.http import Http404
 
 from tt.apps.common.redis_client import get_redis_client
+from tt.apps.common.tiered_cache import TieredCache
 from tt.apps.images.models import TripImage
-from tt.apps.journal.models import Journal, JournalContent, JournalEntryContent
+from tt.apps.journal.models import (
+    SPECIAL_DATES,
+    Journal,
+    JournalContent,
+    JournalEntry,
+    JournalEntryContent,
+)
+from tt.apps.members.models import TripMember
+from tt.apps.trips.enums import TripPermissionLevel
 from tt.apps.trips.models import Trip
 from tt.environment.constants import TtConst
 
 from .context import TravelogPageContext
 from .enums import ContentType
 from .exceptions import PasswordRequiredException
-from .models import Travelog, TravelogEntry
+from .models import Travelog, TravelogEntry, TravelogEntryText
 from .schemas import (
     DayEntryNavData,
     DayPageData,
@@ -50,15 +63,25 @@ class PublishingService:
         Creates an immutable snapshot of the journal and all its entries.
         Manages version numbering and ensures only one version is marked as current.
         """
-        journal_entries = journal.entries.filter(include_in_publish=True)
-        if not journal_entries.exists():
+        if not journal.entries.filter(include_in_publish=True).exists():
             raise ValueError("Cannot publish journal with no entries")
 
         # Lock the journal row for this transaction to prevent race conditions
         locked_journal = Journal.objects.select_for_update().get( pk = journal.pk )
 
+        # Read the entries only once locked, so an edit committed meanwhile
+        # is published rather than overwritten with stale text.
+        journal_entries = list( locked_journal.entries.filter(include_in_publish=True) )
+
         next_version = Travelog.objects.get_next_version_number( locked_journal )
 
+        # Published content is immutable, so the gallery image list is computed
+        # once here rather than re-parsing entry HTML on every cache miss.
+        image_manifest = [
+            img.to_dict()
+            for img in TravelogImageCacheService._extract_images_from_entries( journal_entries )
+        ]
+
         Travelog.objects.filter(
             journal = locked_journal,
             is_current = True
@@ -74,21 +97,30 @@ class PublishingService:
             title = locked_journal.title,
             description = locked_journal.description,
             reference_image = locked_journal.reference_image,
+            image_manifest = image_manifest,
         )
 
-        for journal_entry in journal_entries:
-            TravelogEntry.objects.create(
+        # Entries unchanged since earlier versions share their text rows.
+        text_blobs = TravelogEntryText.objects.get_or_create_for_texts(
+            [ journal_entry.text for journal_entry in journal_entries ]
+        )
+        TravelogEntry.objects.bulk_create([
+            TravelogEntry(
                 travelog = travelog,
 
                 # Copy entry content
                 date = journal_entry.date,
                 timezone = journal_entry.timezone,
                 title = journal_entry.title,
-                text = journal_entry.text,
-                reference_image = journal_entry.reference_image,
+                text_blob = text_blobs[TravelogEntryText.hash_text( journal_entry.text )],
+                reference_image_id = journal_entry.reference_image_id,
             )
+            for journal_entry in journal_entries
+        ])
 
-        # Invalidate VIEW cache since new version becomes current
+        # Invalidate rendered pages, owner lists and VIEW cache since new version becomes current
+        TravelogPageCacheService.invalidate_cache( journal_uuid = locked_journal.uuid )
+        TravelogPublicListBuilder.invalidate_cache( journal = locked_journal )
         TravelogImageCacheService.invalidate_cache(
             journal_uuid = locked_journal.uuid,
             content_type = ContentType.VIEW
@@ -122,7 +154,9 @@ class PublishingService:
         travelog.is_current = True
         travelog.save( update_fields = ['is_current'] )
 
-        # Invalidate VIEW cache since current version changed
+        # Invalidate rendered pages, owner lists and VIEW cache since current version changed
+        TravelogPageCacheService.invalidate_cache( journal_uuid = journal.uuid )
+        TravelogPublicListBuilder.invalidate_cache( journal = journal )
         TravelogImageCacheService.invalidate_cache(
             journal_uuid = journal.uuid,
             content_type = ContentType.VIEW
@@ -171,8 +205,19 @@ class TravelogPublicListBuilder:
     - Computing date ranges (excluding special entries)
     - Selecting display images (preferring dated entries)
     - Sorting chronologically
+
+    Date ranges, day counts and display image candidates are computed with
+    SQL aggregation (no entry text is loaded). The access-independent summary
+    rows are cached per user and invalidated on publish and journal changes;
+    access checks always run per request.
+
+    Cache Strategy:
+    - TTL_SUMMARIES: bounds staleness from working-copy entry edits, which
+      do not invalidate the cache
     """
 
+    TTL_SUMMARIES = 3600    # 1 hour
+
     @classmethod
     def build(
         cls,
@@ -190,18 +235,23 @@ class TravelogPublicListBuilder:
         Returns:
             List of TravelogListItemData sorted by latest date (newest first)
         """
-        # Query journals with published travelogs
-        trips = Trip.objects.owned_by( target_user )
-        journals = Journal.objects.filter(
-            trip__in=trips,
-            travelogs__is_current=True
-        ).distinct().select_related('trip').prefetch_related(
-            'entries', 'entries__reference_image'
-        )
+        summaries = cls._get_cached_summaries( target_user )
+        if summaries is None:
+            summaries = cls._compute_summaries( target_user )
+            cls._cache_summaries( target_user, summaries )
+
+        journal_ids = [ summary['journal_id'] for summary in summaries ]
+        journals_map = Journal.objects.select_related('trip').in_bulk( journal_ids )
+        image_ids = { summary['display_image_id'] for summary in summaries
+                      if summary['display_image_id'] is not None }
+        images_map = TripImage.objects.in_bulk( image_ids ) if image_ids else {}
 
         # Filter by access and build list items
         items = []
-        for journal in journals:
+        for summary in summaries:
+            journal = journals_map.get( summary['journal_id'] )
+            if not journal:
+                continue
             requires_password = False
 
             try:
@@ -211,7 +261,14 @@ class TravelogPublicListBuilder:
             except (Http404, PermissionDenied):
                 continue
 
-            items.append(cls._build_list_item(journal, requires_password))
+            items.append(TravelogListItemData(
+                journal=journal,
+                requires_password=requires_password,
+                earliest_entry_date=summary['earliest_entry_date'],
+                latest_entry_date=summary['latest_entry_date'],
+                day_count=summary['day_count'],
+                display_image=images_map.get( summary['display_image_id'] ),
+            ))
 
         # Sort by latest date (newest first)
         return sorted(
@@ -221,81 +278,127 @@ class TravelogPublicListBuilder:
         )
 
     @classmethod
-    def _build_list_item(
-        cls,
-        journal: Journal,
-        requires_password: bool
-    ) -> TravelogListItemData:
-        """
-        Build a single TravelogListItemData from a journal.
+    def _compute_summaries( cls, target_user: AbstractUser ) -> List[dict]:
         """
-        entries = list(journal.entries.order_by('date'))
+        Compute per-journal list data for all of a user's published journals.
 
-        earliest_date, latest_date, day_count = cls._compute_date_range(journal, entries)
-        display_image = cls._select_display_image(journal, entries)
+        Dated-entry date range and day count exclude prologue/epilogue entries
+        (which use sentinel dates), falling back to the current travelog's
+        published_datetime, or the journal's created_datetime, when there are
+        no dated entries. The display image prefers the journal reference image,
+        then the earliest dated entry's, then a special entry's.
+
+        Returns:
+            List of JSON-serializable dicts, one per journal
+        """
+        dated_entries = ~Q( entries__date__in = SPECIAL_DATES )
+        entry_images = JournalEntry.objects.filter(
+            journal = OuterRef('pk'),
+            reference_image__isnull = False,
+        ).order_by('date').values('reference_image')
+        current_travelogs = Travelog.objects.filter(
+            journal = OuterRef('pk'),
+            is_current = True,
+        )
 
-        return TravelogListItemData(
-            journal=journal,
-            requires_password=requires_password,
-            earliest_entry_date=earliest_date,
-            latest_entry_date=latest_date,
-            day_count=day_count,
-            display_image=display_image
+        journals = Journal.objects.filter(
+            trip__in = Trip.objects.owned_by( target_user ),
+        ).filter(
+            Exists( current_travelogs ),
+        ).annotate(
+            earliest_date = Min( 'entries__date', filter = dated_entries ),
+            latest_date = Max( 'entries__date', filter = dated_entries ),
+            day_count = Count( 'entries', filter = dated_entries ),
+            published_datetime = Subquery( current_travelogs.values('published_datetime')[:1] ),
+            display_image_id = Coalesce(
+                'reference_image',
+                Subquery( entry_images.exclude( date__in = SPECIAL_DATES )[:1] ),
+                Subquery( entry_images.filter( date__in = SPECIAL_DATES )[:1] ),
+                output_field = BigIntegerField(),
+            ),
+        ).order_by(
+            '-created_datetime',
+        ).values(
+            'id',
+            'created_datetime',
+            'earliest_date',
+            'latest_date',
+            'day_count',
+            'published_datetime',
+            'display_image_id',
         )
 
+        summaries = []
+        for row in journals:
+            if row['earliest_date']:
+                earliest_date = row['earliest_date'].strftime('%Y-%m-%d')
+                latest_date = row['latest_date'].strftime('%Y-%m-%d')
+            else:
+                fallback_datetime = row['published_datetime'] or row['created_datetime']
+                earliest_date = latest_date = fallback_datetime.strftime('%Y-%m-%d')
+
+            summaries.append({
+                'journal_id': row['id'],
+                'earliest_entry_date': earliest_date,
+                'latest_entry_date': latest_date,
+                'day_count': row['day_count'],
+                'display_image_id': row['display_image_id'],
+            })
+        return summaries
+
     @classmethod
-    def _compute_date_range(
-        cls,
-        journal: Journal,
-        entries: List
-    ) -> Tuple[Optional[str], Optional[str], int]:
+    def _get_cache_key( cls, user_uuid : UUID ) -> str:
         """
-        Compute earliest and latest dates and day count from dated entries only.
+        Generate Redis cache key for a user's travelog list summaries.
 
-        Excludes prologue/epilogue entries (which use sentinel dates).
-        Falls back to published_datetime or created_datetime if no dated entries.
-
-        Returns:
-            Tuple of (earliest_date, latest_date, day_count)
+        Format: travelog:user_list:{user_uuid}
         """
-        dated_entries = [e for e in entries if not e.is_special_entry]
-        day_count = len(dated_entries)
+        return ':'.join([ 'travelog', 'user_list', str(user_uuid) ])
 
-        if dated_entries:
-            earliest_date = dated_entries[0].date.strftime('%Y-%m-%d')
-            latest_date = dated_entries[-1].date.strftime('%Y-%m-%d')
-        else:
-            current_travelog = journal.travelogs.filter(is_current=True).first()
-            if current_travelog:
-                fallback_date = current_travelog.published_datetime.strftime('%Y-%m-%d')
-            else:
-                fallback_date = journal.created_datetime.strftime('%Y-%m-%d')
-            earliest_date = fallback_date
-            latest_date = fallback_date
+    @classmethod
+    def _get_cached_summaries( cls, target_user: AbstractUser ) -> Optional[List[dict]]:
+        try:
+            redis_client = get_redis_client()
+            if redis_client:
+                cached_data = redis_client.get( cls._get_cache_key( target_user.uuid ))
+                if cached_data:
+                    return json.loads( cached_data )
+        except Exception as e:
+            logger.warning(f"Redis error getting cached travelog list: {e}")
+        return None
 
-        return earliest_date, latest_date, day_count
+    @classmethod
+    def _cache_summaries( cls, target_user: AbstractUser, summaries: List[dict] ) -> None:
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                return
+            redis_client.setex(
+                cls._get_cache_key( target_user.uuid ),
+                cls.TTL_SUMMARIES,
+                json.dumps( summaries ),
+            )
+        except Exception as e:
+            logger.warning(f"Redis error caching travelog list: {e}")
 
     @classmethod
-    def _select_display_image(
-        cls,
-        journal: Journal,
-        entries: List
-    ) -> Optional[TripImage]:
+    def invalidate_cache( cls, journal: Journal ) -> None:
         """
-        Select display image, preferring dated entries over special entries.
+        Invalidate cached travelog lists of all owners of the journal's trip.
         """
-        if journal.reference_image:
-            return journal.reference_image
-
-        for entry in entries:
-            if not entry.is_special_entry and entry.reference_image:
-                return entry.reference_image
-
-        for entry in entries:
-            if entry.is_special_entry and entry.reference_image:
-                return entry.reference_image
-
-        return None
+        owner_uuids = TripMember.objects.filter(
+            trip_id = journal.trip_id,
+            permission_level = TripPermissionLevel.OWNER,
+        ).values_list( 'user__uuid', flat = True )
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                return
+            cache_keys = [ cls._get_cache_key( user_uuid ) for user_uuid in owner_uuids ]
+            if cache_keys:
+                redis_client.delete( *cache_keys )
+        except Exception as e:
+            logger.warning(f"Redis error invalidating travelog list cache: {e}")
 
 
 class TravelogImageExtractor(HTMLParser):
@@ -418,6 +521,197 @@ class TravelogImageExtractor(HTMLParser):
         return self.images
 
 
+class TravelogImageScanner:
+    """
+    Single-pass image extractor with the same output as TravelogImageExtractor.
+
+    HTMLParser dispatches every tag and builds an attribute list for each one.
+    This scanner walks the HTML with one compiled tokenizer pattern, only parses
+    attributes of p/div/span/img start tags whose raw text can contain one of
+    the classes of interest, and only looks at text between tags while inside a
+    caption or a float container. Float-right group reversal, caption
+    attachment and UUID validation follow TravelogImageExtractor exactly.
+
+    Usage:
+        images = TravelogImageScanner.extract_images(html_content)
+    """
+
+    TOKEN_PATTERN = re.compile(
+        r'<!--'
+        r'|<![^>]*>'
+        r'|<\?[^>]*>'
+        r'|<(/?)([a-zA-Z][^\t\n\r\f />\x00]*)((?:"[^"]*"|\'[^\']*\'|[^\'">])*)>'
+    )
+    # Attribute tokenizing follows html.parser (tolerant mode)
+    ATTR_SEPARATOR_PATTERN = re.compile( r'(?:\s|/(?!>))*' )
+    ATTR_PATTERN = re.compile(
+        r'((?<=[\'"\s/])[^\s/>][^\s/=>]*)(\s*=+\s*(\'[^\']*\'|"[^"]*"|(?![\'"])[^>\s]*))?(?:\s|/(?!>))*'
+    )
+    # Editor output: whitespace separated name="value" pairs, no entities (checked separately)
+    SIMPLE_ATTRS_PATTERN = re.compile( r'(?:\s+[\w:-]+="[^"]*")*\s*/?' )
+    SIMPLE_ATTR_PATTERN = re.compile( r'([\w:-]+)="([^"]*)"' )
+    RAW_TEXT_END_PATTERNS = {
+        'script': re.compile( r'</\s*script\s*>', re.IGNORECASE ),
+        'style': re.compile( r'</\s*style\s*>', re.IGNORECASE ),
+    }
+
+    FLOAT_CONTAINER_CLASS = 'has-float-image'
+    LAYOUT_ATTR = 'data-' + TtConst.LAYOUT_DATA_ATTR
+    UUID_ATTR = 'data-' + TtConst.UUID_DATA_ATTR
+    SPAN_CLASSES = ( TtConst.JOURNAL_IMAGE_WRAPPER_CLASS, TtConst.TRIP_IMAGE_CAPTION_CLASS )
+
+    @classmethod
+    def _parse_attrs( cls, html_content : str, start : int, end : int ) -> dict:
+        if (( '&' not in html_content[start:end] )
+                and cls.SIMPLE_ATTRS_PATTERN.fullmatch( html_content, start, end )):
+            return { name.lower(): value
+                     for name, value in cls.SIMPLE_ATTR_PATTERN.findall( html_content, start, end ) }
+        attrs = {}
+        pos = cls.ATTR_SEPARATOR_PATTERN.match( html_content, start, end ).end()
+        while pos < end:
+            match = cls.ATTR_PATTERN.match( html_content, pos, end )
+            if not match:
+                break
+            name, rest, value = match.group( 1, 2, 3 )
+            if not rest:
+                value = None
+            elif value[:1] == '\'' == value[-1:] or value[:1] == '"' == value[-1:]:
+                value = value[1:-1]
+            if value:
+                value = html.unescape( value )
+            attrs[name.lower()] = value
+            pos = match.end()
+        return attrs
+
+    @classmethod
+    def _may_have_class( cls, attr_text : str, class_names : Tuple[str, ...] ) -> bool:
+        # Entities could spell out a class name, so only trust the raw text without them.
+        if '&' in attr_text:
+            return True
+        return any( class_name in attr_text for class_name in class_names )
+
+    @classmethod
+    def extract_images( cls, html_content : str ) -> List[dict]:
+        """Return extracted images (uuid, layout, caption dicts) in display order."""
+        images = []
+        in_float_container = False
+        consecutive_float_images = []
+        text_since_last_image = False
+        in_wrapper = False
+        current_layout = None
+        in_caption = False
+        caption_parts = []
+
+        def flush_consecutive_group():
+            nonlocal consecutive_float_images, text_since_last_image
+            if consecutive_float_images:
+                images.extend( reversed( consecutive_float_images ))
+                consecutive_float_images = []
+            text_since_last_image = False
+
+        def handle_text( text : str, is_raw : bool = False ):
+            nonlocal text_since_last_image
+            if in_caption:
+                caption_parts.append( text if is_raw else html.unescape( text ))
+            elif in_float_container and not in_wrapper:
+                stripped = text.strip()
+                if stripped and ( is_raw or '&' not in stripped or html.unescape( stripped ).strip() ):
+                    text_since_last_image = True
+
+        def handle_endtag( tag : str ):
+            nonlocal in_caption, in_wrapper, current_layout, in_float_container
+            if tag == 'span':
+                if in_caption:
+                    in_caption = False
+                    target = consecutive_float_images if consecutive_float_images else images
+                    if target:
+                        target[-1]['caption'] = ''.join( caption_parts ).strip()
+                    caption_parts.clear()
+                elif in_wrapper:
+                    in_wrapper = False
+                    current_layout = None
+            elif tag in ( 'p', 'div' ) and in_float_container:
+                flush_consecutive_group()
+                in_float_container = False
+
+        pos = 0
+        length = len( html_content )
+        while pos < length:
+            match = cls.TOKEN_PATTERN.search( html_content, pos )
+            if not match:
+                break
+            if ( in_caption or in_float_container ) and match.start() > pos:
+                handle_text( html_content[pos:match.start()] )
+            pos = match.end()
+
+            end_slash, tag, attr_text = match.groups()
+            if tag is None:
+                if match.group(0) == '<!--':
+                    comment_end = html_content.find( '-->', pos )
+                    if comment_end < 0:
+                        break
+                    pos = comment_end + 3
+                continue
+
+            tag = tag.lower()
+            if end_slash:
+                handle_endtag( tag )
+                continue
+
+            if tag in ( 'p', 'div' ):
+                if cls._may_have_class( attr_text, ( cls.FLOAT_CONTAINER_CLASS, )):
+                    classes = cls._parse_attrs( html_content, match.start(3), match.end(3) ).get( 'class' ) or ''
+                    if cls.FLOAT_CONTAINER_CLASS in classes:
+                        in_float_container = True
+                        consecutive_float_images = []
+                        text_since_last_image = False
+
+            elif tag == 'span':
+                if cls._may_have_class( attr_text, cls.SPAN_CLASSES ):
+                    attrs = cls._parse_attrs( html_content, match.start(3), match.end(3) )
+                    classes = attrs.get( 'class' ) or ''
+                    if TtConst.JOURNAL_IMAGE_WRAPPER_CLASS in classes:
+                        in_wrapper = True
+                        current_layout = attrs.get( cls.LAYOUT_ATTR, 'float-right' )
+                    elif TtConst.TRIP_IMAGE_CAPTION_CLASS in classes:
+                        in_caption = True
+                        caption_parts.clear()
+
+            elif tag == 'img':
+                if cls._may_have_class( attr_text, ( TtConst.JOURNAL_IMAGE_CLASS, )):
+                    attrs = cls._parse_attrs( html_content, match.start(3), match.end(3) )
+                    classes = attrs.get( 'class' ) or ''
+                    uuid = attrs.get( cls.UUID_ATTR ) or ''
+                    if ( TtConst.JOURNAL_IMAGE_CLASS in classes
+                         and TravelogImageExtractor.UUID_PATTERN.match( uuid )):
+                        img_data = {
+                            'uuid': uuid,
+                            'layout': current_layout or 'float-right',
+                            'caption': '',
+                        }
+                        if in_float_container and current_layout == 'float-right':
+                            if text_since_last_image and consecutive_float_images:
+                                flush_consecutive_group()
+                            consecutive_float_images.append( img_data )
+                            text_since_last_image = False
+                        else:
+                            images.append( img_data )
+
+            if attr_text.endswith( '/' ):
+                # Self-closing syntax closes the element too (as handle_startendtag does)
+                handle_endtag( tag )
+            elif tag in cls.RAW_TEXT_END_PATTERNS:
+                raw_text_end = cls.RAW_TEXT_END_PATTERNS[tag].search( html_content, pos )
+                if not raw_text_end:
+                    break
+                if ( in_caption or in_float_container ) and raw_text_end.start() > pos:
+                    handle_text( html_content[pos:raw_text_end.start()], is_raw = True )
+                pos = raw_text_end.end()
+
+        flush_consecutive_group()
+        return images
+
+
 class TravelogImageCacheService:
     """
     Service for caching image lists extracted from travelog HTML content.
@@ -429,6 +723,14 @@ class TravelogImageCacheService:
     - DRAFT: 1 hour TTL (content changes frequently)
     - VIEW: Infinite TTL with manual invalidation (immutable published content)
     - VERSION: 24 hour TTL (historical versions rarely accessed)
+
+    Lists are held in the shared two-tier cache (see TieredCache), so
+    repeated gallery requests are usually served in-process, and concurrent
+    misses for the same list are loaded only once.
+
+    Published content (VIEW/VERSION) also has its image list persisted on the
+    Travelog at publish time, so the cache only accelerates it; a cache miss
+    reads the stored manifest instead of re-parsing entry HTML.
     """
 
     # Cache TTL values in seconds
@@ -436,17 +738,19 @@ class TravelogImageCacheService:
     TTL_VIEW = None         # Infinite (manual invalidation only)
     TTL_VERSION = 86400     # 24 hours
 
+    _cache = TieredCache( namespace = 'travelog:images' )
+
     @classmethod
     def _get_cache_key( cls,
                         journal_uuid    : UUID,
                         content_type    : ContentType,
                         version_number  : Optional[int]  = None ) -> str:
         """
-        Generate Redis cache key for image list.
+        Generate cache key for image list, within the travelog:images namespace.
 
-        Format: travelog:images:{journal_uuid}:{content_type}:{version?}
+        Format: {journal_uuid}:{content_type}:{version?}
         """
-        key_parts = [ 'travelog', 'images', str(journal_uuid), content_type.name ]
+        key_parts = [ str(journal_uuid), content_type.name ]
         if version_number is not None:
             key_parts.append( str(version_number) )
         return ':'.join( key_parts )
@@ -471,9 +775,10 @@ class TravelogImageCacheService:
         """
         Extract image metadata from HTML content.
 
-        Uses TravelogImageExtractor (html.parser based) to parse HTML structure
-        and extract image metadata. Handles float-right image reordering by
-        detecting images in has-float-image containers.
+        Uses TravelogImageScanner (single-pass, same output as the html.parser
+        based TravelogImageExtractor) to extract image metadata. Handles
+        float-right image reordering by detecting images in has-float-image
+        containers.
 
         Args:
             html_content: HTML string containing trip-image elements
@@ -484,10 +789,7 @@ class TravelogImageCacheService:
         Returns:
             List of TravelogImageMetadata objects
         """
-        # Use HTML parser for robust extraction and float-right reordering
-        parser = TravelogImageExtractor()
-        parser.feed(html_content)
-        images = parser.get_images()
+        images = TravelogImageScanner.extract_images( html_content )
 
         # Convert to TravelogImageMetadata with document_order
         result = []
@@ -517,13 +819,20 @@ class TravelogImageCacheService:
         Returns:
             List of unique TravelogImageMetadata objects in chronological order
         """
+        return cls._extract_images_from_entries( content.get_entries().order_by('date') )
+
+    @classmethod
+    def _extract_images_from_entries( cls,
+                                      entries : Iterable[JournalEntryContent] ) -> List[TravelogImageMetadata]:
+        """
+        Extract all images from entries, which must already be in chronological order.
+
+        Deduplicates images - only the first occurrence of each image UUID is kept.
+        """
         all_images = []
         seen_uuids = set()
         document_order = 1
 
-        # Get entries in chronological order
-        entries = content.get_entries().order_by('date')
-
         for entry in entries:
             if not entry.text:
                 continue
@@ -546,17 +855,40 @@ class TravelogImageCacheService:
 
         return all_images
 
+    @classmethod
+    def _get_images_from_content(cls, content: JournalContent) -> List[TravelogImageMetadata]:
+        """
+        Get images for content, preferring the manifest persisted at publish time.
+
+        Drafts are always extracted from entry HTML. Travelogs published before
+        manifests existed are extracted once and the manifest is saved.
+        """
+        if not isinstance( content, Travelog ):
+            return cls._extract_images_from_content( content )
+
+        if content.image_manifest is not None:
+            return [ TravelogImageMetadata.from_dict(img) for img in content.image_manifest ]
+
+        logger.debug(f"Backfilling image manifest for travelog: {content.pk}")
+        images = cls._extract_images_from_content( content )
+        content.image_manifest = [ img.to_dict() for img in images ]
+        content.save( update_fields = ['image_manifest'] )
+        return images
+
     @classmethod
     def get_images( cls,
-                    travelog_page_context  : TravelogPageContext ) -> List[TravelogImageMetadata]:
+                    travelog_page_context  : TravelogPageContext,
+                    content                : Optional[JournalContent] = None ) -> List[TravelogImageMetadata]:
         """
-        Get cached image list or extract from content if not cached.
+        Get cached image list, falling back to the travelog's persisted manifest.
 
         Cache invalidation is handled separately via invalidate_cache() method.
-        If cache was invalidated before this call, images will be re-extracted.
+        Only DRAFT content is re-extracted from HTML after invalidation; published
+        content reads the manifest stored with the Travelog.
 
         Args:
             travelog_page_context: Context containing journal and content type info
+            content: Already resolved content, if the caller has it (avoids re-query)
 
         Returns:
             List of TravelogImageMetadata objects in chronological order
@@ -566,95 +898,173 @@ class TravelogImageCacheService:
             travelog_page_context.content_type,
             travelog_page_context.version_number
         )
-        
-        # Try to get from cache
-        try:
-            redis_client = get_redis_client()
-            if redis_client:
-                cached_data = redis_client.get(cache_key)
-                if cached_data:
-                    logger.debug(f"Cache hit for images: {cache_key}")
-                    # Deserialize from JSON using from_dict
-                    images_data = json.loads(cached_data)
-                    return [ TravelogImageMetadata.from_dict(img) for img in images_data ]
-                logger.debug(f"Cache miss for images: {cache_key}")
-        except Exception as e:
-            logger.warning(f"Redis error getting cached images: {e}")
-            # Fall through to extraction
-
-        # Cache miss - extract from content
-        logger.debug(f"Extracting images from content for: {cache_key}")
-        content = ContentResolutionService.resolve_content( travelog_page_context )
-        images = cls._extract_images_from_content( content )
 
-        # Cache the result
-        cls._cache_images(
-            travelog_page_context.journal.uuid,
-            travelog_page_context.content_type,
-            travelog_page_context.version_number,
-            images
+        def load_images():
+            nonlocal content
+            logger.debug(f"Loading images from content for: {cache_key}")
+            if content is None:
+                content = ContentResolutionService.resolve_content( travelog_page_context )
+            return [ img.to_dict() for img in cls._get_images_from_content( content ) ]
+
+        images_data = cls._cache.get_or_load(
+            cache_key,
+            load_images,
+            ttl_secs = cls._get_ttl_for_content_type( travelog_page_context.content_type ),
         )
+        return [ TravelogImageMetadata.from_dict(img) for img in images_data ]
 
-        return images
+    @classmethod
+    def invalidate_cache( cls,
+                          journal_uuid    : UUID,
+                          content_type    : ContentType,
+                          version_number  : Optional[int] = None ) -> None:
+        """
+        Invalidate cached image list for specific journal/content type.
+        """
+        cls._cache.invalidate( cls._get_cache_key( journal_uuid, content_type, version_number ))
+        return
+
+    @classmethod
+    def invalidate_all(cls) -> None:
+        """
+        Invalidate every cached image list, e.g., after changing how images are extracted.
+        """
+        cls._cache.invalidate_all()
+        return
+
+
+class TravelogPageCacheService:
+    """
+    Service for caching fully rendered travelog pages for published content.
+
+    Published travelog versions are immutable, so the rendered HTML of a page
+    is fully determined by the travelog version, the page being viewed and the
+    journal theme. Access control is always checked by the view before the
+    cache is consulted, so cached pages are never served to unauthorized users.
+
+    Cache Strategy:
+    - DRAFT: Never cached (content changes constantly)
+    - VIEW/VERSION: One Redis hash per journal, one field per rendered page
+    - Invalidation deletes the whole journal hash (publish, set current,
+      visibility or theme changes)
+    - The hash expires TTL_PAGES after the last page was added
+    """
+
+    TTL_PAGES = 7 * 86400   # 7 days
+
+    @classmethod
+    def _get_cache_key( cls, journal_uuid : UUID ) -> str:
+        """
+        Generate Redis cache key for the journal's rendered pages hash.
+
+        Format: travelog:pages:{journal_uuid}
+        """
+        return ':'.join([ 'travelog', 'pages', str(journal_uuid) ])
+
+    @classmethod
+    def _get_page_field( cls,
+                         travelog_page_context  : TravelogPageContext,
+                         travelog               : Travelog,
+                         page_date              : Optional[date]      = None ) -> str:
+        """
+        Generate the hash field identifying one rendered page.
+
+        Includes the server version so pages rendered with a previous
+        deploy's templates and static asset URLs are not served after it.
+
+        Format: {content_type}:{version_number}:{page_type}:{date?}:{theme}:{server_version}
+        """
+        return ':'.join([
+            travelog_page_context.content_type.name,
+            str( travelog.version_number ),
+            travelog_page_context.page_type.name,
+            page_date.isoformat() if page_date else '',
+            travelog_page_context.journal.theme.name,
+            settings.ENV.VERSION,
+        ])
 
     @classmethod
-    def _cache_images( cls,
-                       journal_uuid    : UUID,
-                       content_type    : ContentType,
-                       version_number  : Optional[int],
-                       images          : List[TravelogImageMetadata] ) -> None:
+    def get_page( cls,
+                  travelog_page_context  : TravelogPageContext,
+                  content                : JournalContent,
+                  page_date              : Optional[date]      = None ) -> Optional[str]:
         """
-        Store images in Redis cache with appropriate TTL.
+        Get the cached rendered HTML for a page, or None if not cached.
+
+        Always returns None for DRAFT content.
+        """
+        if travelog_page_context.is_draft() or not isinstance( content, Travelog ):
+            return None
+
+        cache_key = cls._get_cache_key( travelog_page_context.journal.uuid )
+        field = cls._get_page_field( travelog_page_context, content, page_date )
+        try:
+            redis_client = get_redis_client()
+            if not redis_client:
+                return None
+            cached_html = redis_client.hget( cache_key, field )
+            if cached_html is not None:
+                logger.debug(f"Cache hit for page: {cache_key} {field}")
+            else:
+                logger.debug(f"Cache miss for page: {cache_key} {field}")
+            return cached_html
+
+        except Exception as e:
+            logger.warning(f"Redis error getting cached page: {e}")
+            return None
+
+    @classmethod
+    def cache_page( cls,
+                    travelog_page_context  : TravelogPageContext,
+                    content                : JournalContent,
+                    html                   : str,
+                    page_date              : Optional[date]      = None ) -> None:
+        """
+        Store rendered page HTML in the journal's page hash.
+
+        No-op for DRAFT content.
         """
+        if travelog_page_context.is_draft() or not isinstance( content, Travelog ):
+            return
+
+        cache_key = cls._get_cache_key( travelog_page_context.journal.uuid )
+        field = cls._get_page_field( travelog_page_context, content, page_date )
         try:
             redis_client = get_redis_client()
             if not redis_client:
-                logger.debug("Redis not available, skipping cache storage")
+                logger.debug("Redis not available, skipping page cache storage")
                 return
 
-            cache_key = cls._get_cache_key(journal_uuid, content_type, version_number)
-            ttl = cls._get_ttl_for_content_type(content_type)
-
-            # Serialize to JSON using to_dict
-            images_data = [ img.to_dict() for img in images ]
-            cached_data = json.dumps(images_data)
-            
-            # Store with appropriate TTL
-            if ttl is None:
-                # Infinite TTL - no expiration
-                redis_client.set(cache_key, cached_data)
-                logger.debug(f"Cached images (no expiration): {cache_key}")
-            else:
-                redis_client.setex(cache_key, ttl, cached_data)
-                logger.debug(f"Cached images (TTL={ttl}s): {cache_key}")
+            pipeline = redis_client.pipeline()
+            pipeline.hset( cache_key, field, html )
+            pipeline.expire( cache_key, cls.TTL_PAGES )
+            pipeline.execute()
+            logger.debug(f"Cached page (TTL={cls.TTL_PAGES}s): {cache_key} {field}")
 
         except Exception as e:
-            logger.warning(f"Redis error caching images: {e}")
+            logger.warning(f"Redis error caching page: {e}")
             # Not fatal - system continues without cache
 
     @classmethod
-    def invalidate_cache( cls,
-                          journal_uuid    : UUID,
-                          content_type    : ContentType,
-                          version_number  : Optional[int] = None ) -> None:
+    def invalidate_cache( cls, journal_uuid : UUID ) -> None:
         """
-        Invalidate cached image list for specific journal/content type.
+        Invalidate all cached rendered pages for a journal.
         """
         try:
             redis_client = get_redis_client()
             if not redis_client:
                 return
 
-            cache_key = cls._get_cache_key(journal_uuid, content_type, version_number)
-            deleted = redis_client.delete(cache_key)
+            cache_key = cls._get_cache_key( journal_uuid )
+            deleted = redis_client.delete( cache_key )
 
             if deleted:
-                logger.info(f"Invalidated image cache: {cache_key}")
+                logger.info(f"Invalidated page cache: {cache_key}")
             else:
-                logger.debug(f"No cache to invalidate: {cache_key}")
+                logger.debug(f"No page cache to invalidate: {cache_key}")
 
         except Exception as e:
-            logger.warning(f"Redis error invalidating cache: {e}")
+            logger.warning(f"Redis error invalidating page cache: {e}")
 
 
 class DayPageBuilder:
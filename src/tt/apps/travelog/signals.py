@@ -0,0 +1,62 @@
+"""
+Signal handlers for travelog cache invalidation and entry text cleanup.
+
+Invalidates the rendered page cache and the owners' travelog lists when a
+journal changes, since the journal's visibility, theme and reference image
+affect how its travelog pages and list entries are served.
+
+Deleting a travelog (always via its journal or trip) also deletes the shared
+entry text rows that no remaining version references.
+"""
+import logging
+
+from django.db import DatabaseError, transaction
+from django.db.models import ProtectedError
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from tt.apps.journal.models import Journal
+
+from .models import Travelog, TravelogEntry, TravelogEntryText
+from .services import TravelogPageCacheService, TravelogPublicListBuilder
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Journal)
+@receiver(post_delete, sender=Journal)
+def invalidate_on_journal_change(sender, instance, **kwargs):
+    """
+    Invalidate rendered travelog pages and travelog lists when a Journal changes.
+    """
+    TravelogPageCacheService.invalidate_cache( journal_uuid = instance.uuid )
+    TravelogPublicListBuilder.invalidate_cache( journal = instance )
+
+
+@receiver(pre_delete, sender=Travelog)
+def delete_unreferenced_entry_text(sender, instance, **kwargs):
+    """
+    Delete the travelog's entry text rows once no other version uses them.
+
+    The ids are read before the entries are deleted and the rows deleted on
+    commit. delete_unreferenced locks and re-checks them, so rows a
+    concurrent publish has picked up again are kept; rows left behind (e.g.,
+    if the delete fails) are removed by the dedupe_travelog_text orphan sweep.
+    """
+    text_blob_ids = set(
+        TravelogEntry.objects
+        .filter( travelog = instance, text_blob__isnull = False )
+        .values_list( 'text_blob_id', flat = True )
+    )
+    if not text_blob_ids:
+        return
+
+    def delete_text_blobs():
+        try:
+            TravelogEntryText.objects.delete_unreferenced( ids = text_blob_ids )
+        except ( ProtectedError, DatabaseError ) as e:
+            logger.warning( f'Could not delete unreferenced travelog entry text: {e}' )
+        return
+
+    transaction.on_commit( delete_text_blobs )
+    return
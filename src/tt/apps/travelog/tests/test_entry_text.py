@@ -0,0 +1,221 @@
+"""
+Tests for content-addressed travelog entry text.
+
+Covers sharing of TravelogEntryText rows across published versions, the
+TravelogEntry.text accessor, restoring from deduplicated versions, deleting
+unreferenced rows and the dedupe_travelog_text backfill command.
+"""
+import logging
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from tt.apps.journal.models import Journal, JournalEntry
+from tt.apps.journal.services import JournalRestoreService
+from tt.apps.trips.tests.synthetic_data import TripSyntheticData
+
+from ..models import Travelog, TravelogEntry, TravelogEntryText
+from ..services import PublishingService
+
+logging.disable(logging.CRITICAL)
+
+User = get_user_model()
+
+
+class TravelogEntryTextTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='test@example.com', password='pass')
+        cls.trip = TripSyntheticData.create_test_trip(user=cls.user, title='Test Trip')
+        cls.journal = Journal.objects.create(trip=cls.trip, title='Test Journal')
+
+    def add_entries(self, count, text='<p>Day {n}</p>'):
+        for n in range(1, count + 1):
+            JournalEntry.objects.create(
+                journal=self.journal,
+                date=date(2024, 1, n),
+                title=f'Day {n}',
+                text=text.format(n=n),
+            )
+
+    def publish(self):
+        with patch('tt.apps.travelog.services.get_redis_client'):
+            return PublishingService.publish_journal(self.journal, self.user)
+
+
+class TestPublishEntryText(TravelogEntryTextTestCase):
+
+    def test_publish_stores_text_in_shared_rows(self):
+        self.add_entries(2)
+        travelog = self.publish()
+
+        entries = list(travelog.get_entries())
+        self.assertEqual([entry.text for entry in entries], ['<p>Day 1</p>', '<p>Day 2</p>'])
+        self.assertTrue(all(entry.text_blob_id for entry in entries))
+        self.assertTrue(all(entry.inline_text == '' for entry in entries))
+
+    def test_unchanged_entries_share_rows_across_versions(self):
+        self.add_entries(3)
+        first = self.publish()
+        JournalEntry.objects.filter(journal=self.journal, date=date(2024, 1, 2)).update(text='<p>Edited</p>')
+        second = self.publish()
+
+        self.assertEqual(TravelogEntryText.objects.count(), 4)
+        first_blobs = {entry.date: entry.text_blob_id for entry in first.get_entries()}
+        second_blobs = {entry.date: entry.text_blob_id for entry in second.get_entries()}
+        self.assertEqual(first_blobs[date(2024, 1, 1)], second_blobs[date(2024, 1, 1)])
+        self.assertNotEqual(first_blobs[date(2024, 1, 2)], second_blobs[date(2024, 1, 2)])
+
+    def test_publish_query_count_independent_of_entry_count(self):
+        self.add_entries(2)
+        with patch('tt.apps.travelog.services.get_redis_client'):
+            with self.assertNumQueries(15):
+                PublishingService.publish_journal(self.journal, self.user)
+
+        JournalEntry.objects.filter(journal=self.journal).delete()
+        self.add_entries(20, text='<p>More {n}</p>')
+        with patch('tt.apps.travelog.services.get_redis_client'):
+            with self.assertNumQueries(15):
+                PublishingService.publish_journal(self.journal, self.user)
+
+    def test_get_entries_loads_text_without_extra_queries(self):
+        self.add_entries(5)
+        travelog = self.publish()
+
+        with self.assertNumQueries(1):
+            texts = [entry.text for entry in travelog.get_entries()]
+        self.assertEqual(len(texts), 5)
+
+
+class TestTravelogEntryTextAccessor(TravelogEntryTextTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.travelog = Travelog.objects.create(journal=cls.journal, version_number=1, title='V1')
+
+    def test_create_with_text_uses_shared_row(self):
+        first = TravelogEntry.objects.create(travelog=self.travelog, date=date(2024, 1, 1), text='Same')
+        second = TravelogEntry.objects.create(travelog=self.travelog, date=date(2024, 1, 2), text='Same')
+
+        self.assertEqual(first.text_blob_id, second.text_blob_id)
+        self.assertEqual(TravelogEntry.objects.get(pk=first.pk).text, 'Same')
+
+    def test_update_text_does_not_modify_shared_row(self):
+        first = TravelogEntry.objects.create(travelog=self.travelog, date=date(2024, 1, 1), text='Same')
+        second = TravelogEntry.objects.create(travelog=self.travelog, date=date(2024, 1, 2), text='Same')
+
+        second.text = 'Changed'
+        second.save(update_fields=['text'])
+
+        self.assertEqual(TravelogEntry.objects.get(pk=first.pk).text, 'Same')
+        self.assertEqual(TravelogEntry.objects.get(pk=second.pk).text, 'Changed')
+
+    def test_inline_text_rows_still_readable(self):
+        entry = TravelogEntry.objects.create(travelog=self.travelog, date=date(2024, 1, 1), inline_text='Legacy')
+
+        self.assertIsNone(entry.text_blob_id)
+        self.assertEqual(TravelogEntry.objects.get(pk=entry.pk).text, 'Legacy')
+
+
+class TestRestoreFromDedupedVersion(TravelogEntryTextTestCase):
+
+    def test_restore_copies_resolved_text(self):
+        self.add_entries(2)
+        travelog = self.publish()
+        JournalEntry.objects.filter(journal=self.journal).update(text='<p>Draft</p>')
+
+        JournalRestoreService.restore_from_version(self.journal, travelog, self.user)
+
+        texts = list(JournalEntry.objects.filter(journal=self.journal).order_by('date').values_list('text', flat=True))
+        self.assertEqual(texts, ['<p>Day 1</p>', '<p>Day 2</p>'])
+
+
+class TestDeleteUnreferencedEntryText(TravelogEntryTextTestCase):
+
+    def test_journal_delete_removes_unshared_text(self):
+        self.add_entries(2)
+        self.publish()
+        other_journal = Journal.objects.create(trip=self.trip, title='Other Journal')
+        other_travelog = Travelog.objects.create(journal=other_journal, version_number=1, title='V1')
+        TravelogEntry.objects.create(travelog=other_travelog, date=date(2024, 1, 1), text='<p>Day 1</p>')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.journal.delete()
+
+        self.assertEqual(list(TravelogEntryText.objects.values_list('text', flat=True)), ['<p>Day 1</p>'])
+
+    def test_text_kept_until_commit(self):
+        self.add_entries(1)
+        self.publish()
+
+        with self.captureOnCommitCallbacks(execute=False):
+            self.journal.delete()
+
+        self.assertEqual(TravelogEntryText.objects.count(), 1)
+
+
+class TestDedupeTravelogTextCommand(TravelogEntryTextTestCase):
+
+    def setUp(self):
+        self.versions = []
+        for version_number in (1, 2, 3):
+            travelog = Travelog.objects.create(
+                journal=self.journal, version_number=version_number, title=f'V{version_number}'
+            )
+            TravelogEntry.objects.create(travelog=travelog, date=date(2024, 1, 1), inline_text='<p>Same</p>')
+            TravelogEntry.objects.create(
+                travelog=travelog, date=date(2024, 1, 2), inline_text=f'<p>Version {version_number}</p>'
+            )
+            self.versions.append(travelog)
+
+    def test_dry_run_changes_nothing(self):
+        out = StringIO()
+        call_command('dedupe_travelog_text', stdout=out)
+
+        self.assertIn('Would move 6 entries into 4 distinct texts', out.getvalue())
+        self.assertEqual(TravelogEntryText.objects.count(), 0)
+        self.assertFalse(TravelogEntry.objects.filter(text_blob__isnull=False).exists())
+
+    def test_execute_deduplicates_in_batches(self):
+        out = StringIO()
+        call_command('dedupe_travelog_text', '--execute', '--batch-size', '4', stdout=out)
+
+        self.assertIn('Moved 6 entries into 4 distinct texts', out.getvalue())
+        self.assertEqual(TravelogEntryText.objects.count(), 4)
+        self.assertFalse(TravelogEntry.objects.filter(text_blob__isnull=True).exists())
+        self.assertFalse(TravelogEntry.objects.exclude(inline_text='').exists())
+        self.assertEqual(
+            TravelogEntry.objects.filter(date=date(2024, 1, 1)).values('text_blob').distinct().count(), 1
+        )
+        for version_number, travelog in enumerate(self.versions, 1):
+            texts = [entry.text for entry in travelog.get_entries()]
+            self.assertEqual(texts, ['<p>Same</p>', f'<p>Version {version_number}</p>'])
+
+    def test_execute_is_idempotent(self):
+        call_command('dedupe_travelog_text', '--execute', stdout=StringIO())
+        out = StringIO()
+        call_command('dedupe_travelog_text', '--execute', stdout=out)
+
+        self.assertIn('No travelog entries with inline text found', out.getvalue())
+        self.assertEqual(TravelogEntryText.objects.count(), 4)
+
+    def test_sweeps_orphaned_text(self):
+        call_command('dedupe_travelog_text', '--execute', stdout=StringIO())
+        TravelogEntryText.objects.get_or_create_for_text('<p>Orphan</p>')
+
+        out = StringIO()
+        call_command('dedupe_travelog_text', stdout=out)
+        self.assertIn('Would delete 1 unreferenced travelog entry texts', out.getvalue())
+        self.assertEqual(TravelogEntryText.objects.count(), 5)
+
+        out = StringIO()
+        call_command('dedupe_travelog_text', '--execute', stdout=out)
+        self.assertIn('Deleted 1 unreferenced travelog entry texts', out.getvalue())
+        self.assertFalse(TravelogEntryText.objects.filter(text='<p>Orphan</p>').exists())
+        self.assertEqual(TravelogEntryText.objects.count(), 4)
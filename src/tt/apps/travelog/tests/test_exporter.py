@@ -0,0 +1,203 @@
+"""
+Tests for TravelogStaticExporter and the export_travelog management command.
+"""
+import logging
+import os
+import tempfile
+import zipfile
+from datetime import date
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from tt.apps.images.models import TripImage
+from tt.apps.journal.enums import JournalVisibility
+from tt.apps.journal.models import Journal, JournalEntry
+from tt.apps.trips.tests.synthetic_data import TripSyntheticData
+
+from ..exceptions import ExportNotAllowedError
+from ..exporter import TravelogStaticExporter
+from ..services import PublishingService
+
+logging.disable(logging.CRITICAL)
+
+User = get_user_model()
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class TestTravelogStaticExporter(TestCase):
+    """Test exporting a published travelog to a directory or ZIP."""
+
+    def setUp(self):
+        self.redis_patcher = patch('tt.apps.travelog.services.get_redis_client', return_value=None)
+        self.redis_patcher.start()
+        self.addCleanup(self.redis_patcher.stop)
+
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.trip = TripSyntheticData.create_test_trip(
+            user=self.user,
+            title='Test Trip'
+        )
+        self.journal = Journal.objects.create(
+            trip=self.trip,
+            title='Test Journal',
+            visibility=JournalVisibility.PUBLIC,
+        )
+        self.trip_image = TripImage.objects.create(uploaded_by=self.user)
+        self.trip_image.web_image.save('web.jpg', ContentFile(b'web-bytes'), save=False)
+        self.trip_image.thumbnail_image.save('thumb.jpg', ContentFile(b'thumb-bytes'), save=False)
+        self.trip_image.save()
+
+        JournalEntry.objects.create(
+            journal=self.journal,
+            date=date(2024, 1, 10),
+            title='Day One',
+            text=(
+                '<span class="trip-image-wrapper" data-layout="full-width">'
+                f'<img class="trip-image" data-uuid="{self.trip_image.uuid}"'
+                f' src="{self.trip_image.web_image.url}"></span>'
+            ),
+        )
+        JournalEntry.objects.create(
+            journal=self.journal,
+            date=date(2024, 1, 11),
+            title='Day Two',
+            text='<p>Second day</p>',
+        )
+        self.travelog = PublishingService.publish_journal(self.journal, self.user)
+
+        self.output_dir = tempfile.mkdtemp()
+
+    def _read(self, name):
+        with open(os.path.join(self.output_dir, name), encoding='utf-8') as f:
+            return f.read()
+
+    def test_exports_all_page_types_and_images(self):
+        """Test TOC, day, gallery and browse pages plus image copies are written."""
+        result = TravelogStaticExporter(
+            travelog=self.travelog,
+            output_path=self.output_dir,
+            workers=1,
+        ).export()
+
+        image_uuid = str(self.trip_image.uuid)
+        expected_pages = [
+            'index.html',
+            'day-2024-01-10.html',
+            'day-2024-01-11.html',
+            'gallery.html',
+            f'image-{image_uuid}.html',
+        ]
+        for name in expected_pages:
+            self.assertTrue(os.path.exists(os.path.join(self.output_dir, name)), name)
+        self.assertEqual(result.page_count, len(expected_pages))
+        self.assertEqual(result.image_count, 2)
+
+        web_name = TravelogStaticExporter.get_image_filename(self.trip_image.web_image)
+        with open(os.path.join(self.output_dir, web_name), 'rb') as f:
+            self.assertEqual(f.read(), b'web-bytes')
+
+    def test_pages_rendered_in_worker_processes(self):
+        """Test rendering in worker processes writes the same pages, with links rewritten."""
+        result = TravelogStaticExporter(travelog=self.travelog, output_path=self.output_dir, workers=2).export()
+
+        self.assertEqual(result.page_count, 5)
+        self.assertEqual(result.image_count, 2)
+        self.assertGreater(result.asset_count, 0)
+        day_html = self._read('day-2024-01-10.html')
+        web_name = TravelogStaticExporter.get_image_filename(self.trip_image.web_image)
+        self.assertIn(f'src="{web_name}"', day_html)
+        self.assertIn('href="day-2024-01-11.html"', day_html)
+        self.assertNotIn(f'/travelog/{self.journal.uuid}', day_html)
+
+    def test_links_are_rewritten_to_exported_files(self):
+        """Test live URLs are replaced with relative links into the export."""
+        TravelogStaticExporter(travelog=self.travelog, output_path=self.output_dir, workers=1).export()
+
+        toc_html = self._read('index.html')
+        self.assertIn('href="day-2024-01-10.html"', toc_html)
+        self.assertIn('href="gallery.html"', toc_html)
+        self.assertNotIn(f'/travelog/{self.journal.uuid}', toc_html)
+
+        day_html = self._read('day-2024-01-10.html')
+        web_name = TravelogStaticExporter.get_image_filename(self.trip_image.web_image)
+        self.assertIn(f'src="{web_name}"', day_html)
+        self.assertIn('href="day-2024-01-11.html"', day_html)
+        self.assertNotIn(f'/travelog/{self.journal.uuid}', day_html)
+
+        gallery_html = self._read('gallery.html')
+        self.assertIn(f'href="image-{self.trip_image.uuid}.html"', gallery_html)
+
+    def test_static_assets_are_copied(self):
+        """Test referenced static assets are copied and linked relatively."""
+        result = TravelogStaticExporter(travelog=self.travelog, output_path=self.output_dir, workers=1).export()
+
+        footer_icon = 'static/img/tt-on-primary-icon-48x48.png'
+        self.assertIn(f'src="{footer_icon}"', self._read('index.html'))
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, footer_icon)))
+        self.assertGreater(result.asset_count, 0)
+
+    def test_export_to_zip(self):
+        """Test ZIP output contains the same files as the directory output."""
+        zip_path = os.path.join(self.output_dir, 'travelog.zip')
+        TravelogStaticExporter(travelog=self.travelog, output_path=zip_path, as_zip=True, workers=1).export()
+
+        with zipfile.ZipFile(zip_path) as zip_file:
+            names = zip_file.namelist()
+            self.assertIn('index.html', names)
+            self.assertIn('day-2024-01-10.html', names)
+            self.assertIn(TravelogStaticExporter.get_image_filename(self.trip_image.thumbnail_image), names)
+            self.assertIsNone(zip_file.testzip())
+
+    def test_single_entry_index_redirects_to_day(self):
+        """Test the index of a single-entry travelog forwards to its day page (as the live TOC does)."""
+        JournalEntry.objects.filter(journal=self.journal, date=date(2024, 1, 11)).delete()
+        travelog = PublishingService.publish_journal(self.journal, self.user)
+
+        TravelogStaticExporter(travelog=travelog, output_path=self.output_dir, workers=1).export()
+
+        self.assertIn('url=day-2024-01-10.html', self._read('index.html'))
+
+    def test_management_command_exports_current_version(self):
+        """Test the management command exports the current version."""
+        out = StringIO()
+        call_command('export_travelog', str(self.journal.uuid), self.output_dir, '--workers', '1', stdout=out)
+
+        self.assertIn('Exported 5 pages', out.getvalue())
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, 'index.html')))
+
+    def test_management_command_rejects_unknown_version(self):
+        """Test the management command fails for a version that does not exist."""
+        with self.assertRaises(CommandError):
+            call_command('export_travelog', str(self.journal.uuid), self.output_dir, '--version-number', '99')
+
+    def test_non_public_journal_refused(self):
+        """Test private and protected journals are not exported unless explicitly allowed."""
+        for visibility in (JournalVisibility.PRIVATE, JournalVisibility.PROTECTED):
+            self.journal.visibility = visibility
+            self.journal.save()
+            self.travelog.refresh_from_db()
+
+            with self.assertRaises(ExportNotAllowedError):
+                TravelogStaticExporter(travelog=self.travelog, output_path=self.output_dir)
+            with self.assertRaises(CommandError):
+                call_command('export_travelog', str(self.journal.uuid), self.output_dir, stdout=StringIO())
+            self.assertEqual(os.listdir(self.output_dir), [])
+
+    def test_non_public_journal_exported_when_allowed(self):
+        """Test --allow-private exports a private journal."""
+        self.journal.visibility = JournalVisibility.PRIVATE
+        self.journal.save()
+
+        out = StringIO()
+        call_command('export_travelog', str(self.journal.uuid), self.output_dir, '--allow-private', '--workers', '1', stdout=out)
+
+        self.assertIn('Exported 5 pages', out.getvalue())
@@ -0,0 +1,143 @@
+"""
+Tests for TravelogImageScanner.
+
+The scanner must produce exactly the output of the html.parser based
+TravelogImageExtractor, so most tests compare the two on the same input.
+"""
+import logging
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from ..benchmarks import build_synthetic_journal, extract_with_html_parser, run_extractor_benchmark
+from ..services import TravelogImageScanner
+
+logging.disable(logging.CRITICAL)
+
+UUID_1 = '11111111-1111-1111-1111-111111111111'
+UUID_2 = '22222222-2222-2222-2222-222222222222'
+UUID_3 = '33333333-3333-3333-3333-333333333333'
+
+
+def image(uuid, layout='float-right', caption=None, wrapper_extra=''):
+    caption_html = ''
+    if caption is not None:
+        caption_html = f'<span class="trip-image-caption">{caption}</span>'
+    return (
+        f'<span class="trip-image-wrapper" data-layout="{layout}"{wrapper_extra}>'
+        f'<img class="trip-image" data-uuid="{uuid}" src="/{uuid}.jpg">'
+        f'{caption_html}</span>'
+    )
+
+
+class TestTravelogImageScanner(SimpleTestCase):
+    """Test TravelogImageScanner matches TravelogImageExtractor."""
+
+    def assertSameAsParser(self, html_content):
+        expected = extract_with_html_parser(html_content)
+        self.assertEqual(TravelogImageScanner.extract_images(html_content), expected)
+        return expected
+
+    def test_consecutive_float_right_group_reversed(self):
+        """Test consecutive float-right images in a container are reversed."""
+        images = self.assertSameAsParser(
+            f'<p class="has-float-image">{image(UUID_1)}{image(UUID_2)}Some text</p>'
+        )
+        self.assertEqual([img['uuid'] for img in images], [UUID_2, UUID_1])
+
+    def test_text_breaks_float_group(self):
+        """Test text between float-right images splits the group."""
+        images = self.assertSameAsParser(
+            f'<p class="has-float-image">{image(UUID_1)} words {image(UUID_2)}{image(UUID_3)}</p>'
+        )
+        self.assertEqual([img['uuid'] for img in images], [UUID_1, UUID_3, UUID_2])
+
+    def test_whitespace_entities_do_not_break_float_group(self):
+        """Test non-breaking spaces count as whitespace, as with html.parser."""
+        images = self.assertSameAsParser(
+            f'<p class="has-float-image">{image(UUID_1)}&nbsp;\n{image(UUID_2)}</p>'
+        )
+        self.assertEqual([img['uuid'] for img in images], [UUID_2, UUID_1])
+
+    def test_caption_entities_and_nested_markup(self):
+        """Test captions are unescaped and include nested element text."""
+        images = self.assertSameAsParser(
+            image(UUID_1, layout='full-width', caption=' Fish &amp; <em>chips</em> ')
+        )
+        self.assertEqual(images[0]['caption'], 'Fish & chips')
+
+    def test_invalid_uuid_skipped(self):
+        """Test images without a valid UUID are ignored."""
+        images = self.assertSameAsParser(
+            image('not-a-uuid') + image(UUID_1, layout='full-width')
+            + '<img class="trip-image" data-uuid="<script>alert(1)</script>">'
+        )
+        self.assertEqual([img['uuid'] for img in images], [UUID_1])
+
+    def test_comments_and_raw_text_ignored(self):
+        """Test images inside comments and script bodies are not extracted."""
+        self.assertSameAsParser(
+            f'<!-- {image(UUID_1)} -->'
+            f'<script>var s = \'{image(UUID_2)}\';</script>'
+            f'{image(UUID_3, layout="full-width")}'
+        )
+
+    def test_unterminated_comment_stops_extraction(self):
+        """Test an unterminated comment hides the rest of the document."""
+        images = self.assertSameAsParser(
+            f'{image(UUID_1, layout="full-width")}<!-- {image(UUID_2, layout="full-width")}'
+        )
+        self.assertEqual(len(images), 1)
+
+    def test_attribute_variants(self):
+        """Test single quotes, bare values, uppercase names and entities in attributes."""
+        self.assertSameAsParser(
+            "<P CLASS='has-float-image'>"
+            "<SPAN Class=trip-image-wrapper DATA-LAYOUT=float-right>"
+            f"<IMG class='trip-image' data-uuid={UUID_1} /></SPAN>"
+            '<span class="trip&#45;image-wrapper" data-layout="float-right">'
+            f'<img class="trip&#x2d;image" data-uuid="{UUID_2}"></span>'
+            '</P>'
+        )
+
+    def test_self_closing_span_closes_wrapper(self):
+        """Test self-closing syntax ends the element as html.parser does."""
+        self.assertSameAsParser(
+            '<p class="has-float-image">'
+            '<span class="trip-image-wrapper" data-layout="full-width"/>'
+            f'<img class="trip-image" data-uuid="{UUID_1}">'
+            f'{image(UUID_2)}</p>'
+        )
+
+    def test_missing_layout_defaults_to_float_right(self):
+        """Test wrappers without data-layout are treated as float-right."""
+        images = self.assertSameAsParser(
+            '<p class="has-float-image">'
+            f'<span class="trip-image-wrapper"><img class="trip-image" data-uuid="{UUID_1}"></span>'
+            f'<span class="trip-image-wrapper"><img class="trip-image" data-uuid="{UUID_2}"></span>'
+            '</p>'
+        )
+        self.assertEqual([img['layout'] for img in images], ['float-right', 'float-right'])
+
+    def test_synthetic_journals_match(self):
+        """Test identical output over generated journals of varying shape."""
+        for image_count, entry_count in [(10, 1), (40, 7), (120, 30)]:
+            for seed in range(3):
+                for entry_html in build_synthetic_journal(image_count, entry_count, seed=seed):
+                    self.assertSameAsParser(entry_html)
+
+
+class TestImageExtractorBenchmark(SimpleTestCase):
+    """Test the benchmark harness and its management command."""
+
+    def test_run_extractor_benchmark_reports_match(self):
+        results = run_extractor_benchmark(scenarios=[(20, 4)], rounds=1)
+        self.assertEqual(len(results), 1)
+        self.assertTrue(results[0].outputs_match)
+        self.assertGreater(results[0].html_bytes, 0)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_image_extractor', '--rounds', '1', '--scenario', '10:2', stdout=out)
+        self.assertIn('identical', out.getvalue())
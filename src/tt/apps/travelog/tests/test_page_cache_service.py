@@ -0,0 +1,254 @@
+"""
+Tests for TravelogPageCacheService.
+
+Tests the rendered page caching for published travelog content, including
+cache key composition, draft exclusion and invalidation triggers.
+"""
+import logging
+from datetime import date
+from unittest.mock import patch, MagicMock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from tt.apps.journal.enums import JournalTheme, JournalVisibility
+from tt.apps.journal.models import Journal, JournalEntry
+from tt.apps.trips.tests.synthetic_data import TripSyntheticData
+
+from ..context import TravelogPageContext
+from ..enums import ContentType, TravelogPageType
+from ..services import PublishingService, TravelogPageCacheService
+
+logging.disable(logging.CRITICAL)
+
+User = get_user_model()
+
+
+class TestTravelogPageCacheService(TestCase):
+    """Test the TravelogPageCacheService class."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        cls.trip = TripSyntheticData.create_test_trip(
+            user=cls.user,
+            title='Test Trip'
+        )
+        cls.journal = Journal.objects.create(
+            trip=cls.trip,
+            title='Test Journal',
+            visibility=JournalVisibility.PUBLIC,
+            theme=JournalTheme.OCEAN,
+        )
+        JournalEntry.objects.create(
+            journal=cls.journal,
+            date=date(2024, 1, 10),
+            title='Day 1',
+            text='<p>Day 1</p>'
+        )
+        with patch('tt.apps.travelog.services.get_redis_client'):
+            cls.travelog = PublishingService.publish_journal(cls.journal, cls.user)
+
+    def _make_context(self, content_type, page_type=TravelogPageType.DAY, version_number=None):
+        return TravelogPageContext(
+            journal=self.journal,
+            content_type=content_type,
+            page_type=page_type,
+            version_number=version_number,
+        )
+
+    def test_page_field_includes_version_page_date_and_theme(self):
+        """Test page field identifies version, page type, date, theme and server version."""
+        context = self._make_context(ContentType.VIEW)
+        field = TravelogPageCacheService._get_page_field(
+            context, self.travelog, date(2024, 1, 10)
+        )
+        self.assertEqual(
+            field,
+            f'VIEW:{self.travelog.version_number}:DAY:2024-01-10:OCEAN:{settings.ENV.VERSION}'
+        )
+
+    def test_page_field_differs_by_server_version(self):
+        """Test pages rendered before a deploy are not served after it."""
+        context = self._make_context(ContentType.VIEW)
+        field = TravelogPageCacheService._get_page_field(context, self.travelog)
+        with patch('tt.apps.travelog.services.settings') as mock_settings:
+            mock_settings.ENV.VERSION = f'{settings.ENV.VERSION}-next'
+            next_field = TravelogPageCacheService._get_page_field(context, self.travelog)
+        self.assertNotEqual(field, next_field)
+
+    def test_page_field_differs_by_content_type(self):
+        """Test VIEW and VERSION pages never share a field (rendered links differ)."""
+        view_field = TravelogPageCacheService._get_page_field(
+            self._make_context(ContentType.VIEW), self.travelog
+        )
+        version_field = TravelogPageCacheService._get_page_field(
+            self._make_context(ContentType.VERSION, version_number=1), self.travelog
+        )
+        self.assertNotEqual(view_field, version_field)
+
+    @patch('tt.apps.travelog.services.get_redis_client')
+    def test_get_page_skips_draft(self, mock_get_redis):
+        """Test draft content is never read from the page cache."""
+        context = self._make_context(ContentType.DRAFT)
+        self.assertIsNone(TravelogPageCacheService.get_page(context, self.journal))
+        mock_get_redis.assert_not_called()
+
+    @patch('tt.apps.travelog.services.get_redis_client')
+    def test_cache_page_skips_draft(self, mock_get_redis):
+        """Test draft content is never written to the page cache."""
+        context = self._make_context(ContentType.DRAFT)
+        TravelogPageCacheService.cache_page(context, self.journal, '<html></html>')
+        mock_get_redis.assert_not_called()
+
+    @patch('tt.apps.travelog.services.get_redis_client')
+    def test_cache_page_stores_field_with_ttl(self, mock_get_redis):
+        """Test cache_page writes the page into the journal hash and refreshes expiry."""
+        mock_redis = MagicMock()
+        mock_pipeline = MagicMock()
+        mock_redis.pipeline.return_value = mock_pipeline
+        mock_get_redis.return_value = mock_redis
+
+        context = self._make_context(ContentType.VIEW, page_type=TravelogPageType.TOC)
+        TravelogPageCacheService.cache_page(context, self.travelog, '<html>toc</html>')
+
+        cache_key = TravelogPageCacheService._get_cache_key(self.journal.uuid)
+        mock_pipeline.hset.assert_called_once_with(
+            cache_key,
+            f'VIEW:{self.travelog.version_number}:TOC::OCEAN:{settings.ENV.VERSION}',
+            '<html>toc</html>'
+        )
+        mock_pipeline.expire.assert_called_once_with(cache_key, TravelogPageCacheService.TTL_PAGES)
+        mock_pipeline.execute.assert_called_once()
+
+    @patch('tt.apps.travelog.services.get_redis_client')
+    def test_get_page_returns_cached_html(self, mock_get_redis):
+        """Test get_page returns cached HTML from the journal hash."""
+        mock_redis = MagicMock()
+        mock_redis.hget.return_value = '<html>cached</html>'
+        mock_get_redis.return_value = mock_redis
+
+        context = self._make_context(ContentType.VIEW)
+        html = TravelogPageCacheService.get_page(context, self.travelog, date(2024, 1, 10))
+
+        self.assertEqual(html, '<html>cached</html>')
+
+    @patch('tt.apps.travelog.services.get_redis_client')
+    def test_get_page_graceful_degradation_on_redis_failure(self, mock_get_redis):
+        """Test Redis failures are treated as a cache miss."""
+        mock_get_redis.return_value.hget.side_effect = Exception('Redis down')
+
+        context = self._make_context(ContentType.VIEW)
+        self.assertIsNone(TravelogPageCacheService.get_page(context, self.travelog))
+
+    @patch('tt.apps.travelog.services.get_redis_client')
+    def test_publishing_invalidates_page_cache(self, mock_get_redis):
+        """Test that publishing a journal deletes its rendered pages."""
+        mock_redis = MagicMock()
+        mock_get_redis.return_value = mock_redis
+
+        PublishingService.publish_journal(self.journal, self.user)
+
+        deleted_keys = [call[0][0] for call in mock_redis.delete.call_args_list]
+        self.assertIn(TravelogPageCacheService._get_cache_key(self.journal.uuid), deleted_keys)
+
+    @patch('tt.apps.travelog.services.get_redis_client')
+    def test_set_as_current_invalidates_page_cache(self, mock_get_redis):
+        """Test that changing the current version deletes rendered pages."""
+        mock_redis = MagicMock()
+        mock_get_redis.return_value = mock_redis
+        PublishingService.publish_journal(self.journal, self.user)
+        self.travelog.refresh_from_db()
+        mock_redis.reset_mock()
+
+        PublishingService.set_as_current(self.journal, self.travelog)
+
+        deleted_keys = [call[0][0] for call in mock_redis.delete.call_args_list]
+        self.assertIn(TravelogPageCacheService._get_cache_key(self.journal.uuid), deleted_keys)
+
+    @patch('tt.apps.travelog.services.get_redis_client')
+    def test_journal_save_invalidates_page_cache(self, mock_get_redis):
+        """Test that visibility or theme changes (journal saves) delete rendered pages."""
+        mock_redis = MagicMock()
+        mock_get_redis.return_value = mock_redis
+
+        self.journal.theme = JournalTheme.FOREST
+        self.journal.save()
+
+        mock_redis.delete.assert_any_call(
+            TravelogPageCacheService._get_cache_key(self.journal.uuid)
+        )
+
+
+class TestTravelogPageCacheViews(TestCase):
+    """Test the TOC and day views serve and fill the page cache."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        cls.trip = TripSyntheticData.create_test_trip(
+            user=cls.user,
+            title='Test Trip'
+        )
+        cls.journal = Journal.objects.create(
+            trip=cls.trip,
+            title='Test Journal',
+            visibility=JournalVisibility.PUBLIC,
+        )
+        for day in (10, 11):
+            JournalEntry.objects.create(
+                journal=cls.journal,
+                date=date(2024, 1, day),
+                title=f'Day {day}',
+                text=f'<p>Entry for day {day}</p>'
+            )
+        with patch('tt.apps.travelog.services.get_redis_client'):
+            PublishingService.publish_journal(cls.journal, cls.user)
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_day_view_serves_cached_page(self):
+        """Test a cached page is returned without rendering."""
+        url = reverse('travelog_day', kwargs={
+            'journal_uuid': self.journal.uuid,
+            'date': '2024-01-10',
+        })
+        with patch.object(TravelogPageCacheService, 'get_page', return_value='<html>cached</html>'):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'<html>cached</html>')
+
+    def test_day_view_fills_cache_on_miss(self):
+        """Test a rendered page is stored on cache miss."""
+        url = reverse('travelog_day', kwargs={
+            'journal_uuid': self.journal.uuid,
+            'date': '2024-01-10',
+        })
+        with patch.object(TravelogPageCacheService, 'get_page', return_value=None), \
+             patch.object(TravelogPageCacheService, 'cache_page') as mock_cache_page:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        mock_cache_page.assert_called_once()
+        self.assertIn('Entry for day 10', mock_cache_page.call_args.kwargs['html'])
+        self.assertEqual(mock_cache_page.call_args.kwargs['page_date'], date(2024, 1, 10))
+
+    def test_toc_view_fills_cache_on_miss(self):
+        """Test the TOC page is stored on cache miss."""
+        url = reverse('travelog_toc', kwargs={'journal_uuid': self.journal.uuid})
+        with patch.object(TravelogPageCacheService, 'get_page', return_value=None), \
+             patch.object(TravelogPageCacheService, 'cache_page') as mock_cache_page:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        mock_cache_page.assert_called_once()
@@ -393,3 +393,100 @@ class TestTravelogPublicListBuilderDisplayImage(TransactionTestCase):
         self.assertEqual(len(items), 1)
         # Should fall back to prologue image
         self.assertEqual(items[0].display_image, self.prologue_image)
+
+
+class TestTravelogPublicListBuilderQueries(TransactionTestCase):
+    """Test aggregate query behavior and per-user caching."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.trip = TripSyntheticData.create_test_trip(
+            user=self.user,
+            title='Test Trip'
+        )
+        self.redis_patcher = patch('tt.apps.travelog.services.get_redis_client', return_value=None)
+        self.redis_patcher.start()
+        self.addCleanup(self.redis_patcher.stop)
+
+    def _create_published_journal(self, title, entry_dates):
+        journal = Journal.objects.create(
+            trip=self.trip, title=title, visibility=JournalVisibility.PUBLIC
+        )
+        for entry_date in entry_dates:
+            JournalEntry.objects.create(
+                journal=journal, date=entry_date, title='Day', text='<p>Long text</p>'
+            )
+        PublishingService.publish_journal(journal, self.user)
+        return journal
+
+    def test_query_count_independent_of_journal_count(self):
+        """Aggregation uses a fixed number of queries regardless of journal count."""
+        for idx in range(5):
+            self._create_published_journal(
+                f'Journal {idx}',
+                [PROLOGUE_DATE, date(2024, 1, idx + 1), date(2024, 2, idx + 1)],
+            )
+
+        # Aggregate summaries, journals, no images
+        with self.assertNumQueries(2):
+            items = TravelogPublicListBuilder.build(
+                target_user=self.user,
+                access_checker=lambda j: None
+            )
+
+        self.assertEqual(len(items), 5)
+        self.assertTrue(all(item.day_count == 2 for item in items))
+
+    def test_only_current_published_journals_listed(self):
+        """Journals without a current travelog are excluded."""
+        self._create_published_journal('Published', [date(2024, 1, 1)])
+        Journal.objects.create(
+            trip=self.trip, title='Never Published', visibility=JournalVisibility.PUBLIC
+        )
+
+        items = TravelogPublicListBuilder.build(
+            target_user=self.user,
+            access_checker=lambda j: None
+        )
+
+        self.assertEqual([item.journal.title for item in items], ['Published'])
+
+    def test_cached_summaries_skip_aggregation(self):
+        """Cached summaries are used instead of re-running the aggregate query."""
+        journal = self._create_published_journal('Cached', [date(2024, 1, 1)])
+        summaries = [{
+            'journal_id': journal.id,
+            'earliest_entry_date': '2020-01-01',
+            'latest_entry_date': '2020-01-02',
+            'day_count': 7,
+            'display_image_id': None,
+        }]
+
+        with patch.object(TravelogPublicListBuilder, '_get_cached_summaries', return_value=summaries), \
+             patch.object(TravelogPublicListBuilder, '_compute_summaries') as mock_compute:
+            items = TravelogPublicListBuilder.build(
+                target_user=self.user,
+                access_checker=lambda j: None
+            )
+
+        mock_compute.assert_not_called()
+        self.assertEqual(items[0].day_count, 7)
+        self.assertEqual(items[0].latest_entry_date, '2020-01-02')
+
+    def test_publish_invalidates_owner_list_cache(self):
+        """Publishing deletes the cached list of every trip owner."""
+        journal = self._create_published_journal('Journal', [date(2024, 1, 1)])
+
+        with patch('tt.apps.travelog.services.get_redis_client') as mock_get_redis:
+            PublishingService.publish_journal(journal, self.user)
+
+        deleted_keys = [
+            key
+            for call in mock_get_redis.return_value.delete.call_args_list
+            for key in call[0]
+        ]
+        self.assertIn(TravelogPublicListBuilder._get_cache_key(self.user.uuid), deleted_keys)
@@ -10,7 +10,7 @@ Tests critical transaction and locking patterns including:
 """
 import logging
 from datetime import date
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.test import TransactionTestCase
@@ -22,7 +22,7 @@ from tt.apps.trips.tests.synthetic_data import TripSyntheticData
 from tt.apps.journal.models import PROLOGUE_DATE, EPILOGUE_DATE
 
 from ..models import Travelog, TravelogEntry
-from ..services import PublishingService, PublishingError, DayPageBuilder
+from ..services import PublishingService, PublishingError, DayPageBuilder, TravelogImageCacheService
 
 logging.disable(logging.CRITICAL)
 
@@ -165,7 +165,7 @@ class TestPublishingServicePublishJournal(TransactionTestCase):
 
         # We can verify SELECT FOR UPDATE was used by checking query execution
         with patch('tt.apps.travelog.services.get_redis_client'):
-            with self.assertNumQueries(9):  # Exact count may vary, but queries should be executed
+            with self.assertNumQueries(15):  # Exact count may vary, but queries should be executed
                 PublishingService.publish_journal(self.journal, self.user)
 
         # In TransactionTestCase, we can verify the transaction was atomic
@@ -173,6 +173,25 @@ class TestPublishingServicePublishJournal(TransactionTestCase):
         self.assertEqual(Travelog.objects.filter(journal=self.journal).count(), 1)
         self.assertEqual(TravelogEntry.objects.count(), 1)
 
+    def test_publish_journal_reads_entries_after_lock(self):
+        """Test that an edit committed while waiting for the journal lock is published."""
+        entry = JournalEntry.objects.create(
+            journal=self.journal,
+            date=date(2024, 1, 10),
+            title='Day 1',
+            text='Old content'
+        )
+        original_select_for_update = Journal.objects.select_for_update
+
+        def edit_then_lock(*args, **kwargs):
+            JournalEntry.objects.filter(pk=entry.pk).update(text='New content')
+            return original_select_for_update(*args, **kwargs)
+
+        with patch.object(Journal.objects, 'select_for_update', side_effect=edit_then_lock):
+            travelog = PublishingService.publish_journal(self.journal, self.user)
+
+        self.assertEqual(['New content'], [e.text for e in travelog.get_entries()])
+
     def test_publish_journal_invalidates_view_cache(self):
         """Test that publishing invalidates VIEW cache."""
         JournalEntry.objects.create(
@@ -182,17 +201,12 @@ class TestPublishingServicePublishJournal(TransactionTestCase):
             text='Content'
         )
 
-        mock_redis = MagicMock()
-        mock_redis.delete.return_value = 1
-
-        with patch('tt.apps.travelog.services.get_redis_client', return_value=mock_redis):
-            PublishingService.publish_journal(self.journal, self.user)
+        with patch('tt.apps.travelog.services.get_redis_client'):
+            with patch.object(TravelogImageCacheService._cache, 'invalidate') as mock_invalidate:
+                PublishingService.publish_journal(self.journal, self.user)
 
         # Verify cache invalidation was called
-        mock_redis.delete.assert_called()
-        cache_key = mock_redis.delete.call_args[0][0]
-        self.assertIn(str(self.journal.uuid), cache_key)
-        self.assertIn('VIEW', cache_key)
+        mock_invalidate.assert_called_once_with(f'{self.journal.uuid}:VIEW')
 
     def test_publish_journal_copies_reference_image(self):
         """Test that reference_image is properly copied to travelog from journal."""
@@ -233,7 +247,7 @@ class TestPublishingServicePublishJournal(TransactionTestCase):
         )
 
         # Force an error during entry creation
-        with patch('tt.apps.travelog.models.TravelogEntry.objects.create',
+        with patch('tt.apps.travelog.models.TravelogEntry.objects.bulk_create',
                    side_effect=Exception('Simulated error')):
             with self.assertRaises(Exception):
                 with patch('tt.apps.travelog.services.get_redis_client'):
@@ -336,17 +350,12 @@ class TestPublishingServiceSetAsCurrent(TransactionTestCase):
 
     def test_set_as_current_invalidates_view_cache(self):
         """Test that set_as_current invalidates VIEW cache."""
-        mock_redis = MagicMock()
-        mock_redis.delete.return_value = 1
-
-        with patch('tt.apps.travelog.services.get_redis_client', return_value=mock_redis):
-            PublishingService.set_as_current(self.journal, self.travelog1)
+        with patch('tt.apps.travelog.services.get_redis_client'):
+            with patch.object(TravelogImageCacheService._cache, 'invalidate') as mock_invalidate:
+                PublishingService.set_as_current(self.journal, self.travelog1)
 
         # Verify cache invalidation was called
-        mock_redis.delete.assert_called()
-        cache_key = mock_redis.delete.call_args[0][0]
-        self.assertIn(str(self.journal.uuid), cache_key)
-        self.assertIn('VIEW', cache_key)
+        mock_invalidate.assert_called_once_with(f'{self.journal.uuid}:VIEW')
 
     def test_set_as_current_atomic_operation(self):
         """Test that set_as_current is atomic - all or nothing."""
@@ -0,0 +1,145 @@
+"""
+Tests for conditional GET (ETag / 304) handling in the public travelog views.
+"""
+import logging
+from datetime import date
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from tt.apps.journal.enums import JournalTheme, JournalVisibility
+from tt.apps.journal.models import Journal, JournalEntry
+from tt.apps.trips.tests.synthetic_data import TripSyntheticData
+
+from ..services import PublishingService
+
+logging.disable(logging.CRITICAL)
+
+User = get_user_model()
+
+IMAGE_UUID = '11111111-1111-1111-1111-111111111111'
+
+
+class TestTravelogConditionalGet(TestCase):
+    """Test ETag validators and 304 responses for published travelog pages."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123'
+        )
+        cls.trip = TripSyntheticData.create_test_trip(
+            user=cls.user,
+            title='Test Trip'
+        )
+        cls.journal = Journal.objects.create(
+            trip=cls.trip,
+            title='Test Journal',
+            visibility=JournalVisibility.PUBLIC,
+        )
+        for day in (10, 11):
+            JournalEntry.objects.create(
+                journal=cls.journal,
+                date=date(2024, 1, day),
+                title=f'Day {day}',
+                text=(
+                    '<span class="trip-image-wrapper" data-layout="full-width">'
+                    f'<img class="trip-image" data-uuid="{IMAGE_UUID}" src="/1.jpg"></span>'
+                ),
+            )
+        with patch('tt.apps.travelog.services.get_redis_client'):
+            PublishingService.publish_journal(cls.journal, cls.user)
+
+    def setUp(self):
+        self.client = Client()
+        self.redis_patcher = patch('tt.apps.travelog.services.get_redis_client', return_value=None)
+        self.redis_patcher.start()
+        self.addCleanup(self.redis_patcher.stop)
+
+    def _day_url(self, day='2024-01-10'):
+        return reverse('travelog_day', kwargs={'journal_uuid': self.journal.uuid, 'date': day})
+
+    def _page_urls(self):
+        return [
+            reverse('travelog_toc', kwargs={'journal_uuid': self.journal.uuid}),
+            self._day_url(),
+            reverse('travelog_gallery', kwargs={'journal_uuid': self.journal.uuid}),
+            reverse('travelog_image_browse', kwargs={
+                'journal_uuid': self.journal.uuid,
+                'image_uuid': IMAGE_UUID,
+            }),
+        ]
+
+    def test_public_pages_send_etag_and_public_cache_control(self):
+        """Test published pages of PUBLIC journals are cacheable by shared caches."""
+        for url in self._page_urls():
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertTrue(response['ETag'].startswith('"'), url)
+            self.assertIn('public', response['Cache-Control'], url)
+            self.assertIn('no-cache', response['Cache-Control'], url)
+
+    def test_matching_if_none_match_returns_304(self):
+        """Test a matching validator returns 304 for every page type."""
+        for url in self._page_urls():
+            etag = self.client.get(url)['ETag']
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304, url)
+            self.assertEqual(response['ETag'], etag, url)
+
+    def test_etag_differs_by_page_parameters(self):
+        """Test different days produce different validators."""
+        etag_day1 = self.client.get(self._day_url('2024-01-10'))['ETag']
+        etag_day2 = self.client.get(self._day_url('2024-01-11'))['ETag']
+        self.assertNotEqual(etag_day1, etag_day2)
+
+    def test_theme_change_invalidates_etag(self):
+        """Test a theme change makes old validators stale."""
+        etag = self.client.get(self._day_url())['ETag']
+
+        self.journal.theme = JournalTheme.SUNSET
+        self.journal.save()
+
+        response = self.client.get(self._day_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_new_version_invalidates_etag(self):
+        """Test publishing a new version makes old validators stale."""
+        etag = self.client.get(self._day_url())['ETag']
+
+        PublishingService.publish_journal(self.journal, self.user)
+
+        response = self.client.get(self._day_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_draft_is_never_conditional(self):
+        """Test draft pages carry no validators."""
+        self.client.force_login(self.user)
+        response = self.client.get(self._day_url() + '?version=draft')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+
+    def test_access_checked_before_304(self):
+        """Test a valid validator does not bypass access control."""
+        etag = self.client.get(self._day_url())['ETag']
+
+        self.journal.visibility = JournalVisibility.PRIVATE
+        self.journal.save()
+
+        response = self.client.get(self._day_url(), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 404)
+
+    def test_non_public_pages_are_private(self):
+        """Test non-PUBLIC journals are restricted to private caches."""
+        self.journal.visibility = JournalVisibility.PRIVATE
+        self.journal.save()
+        self.client.force_login(self.user)
+
+        response = self.client.get(self._day_url())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
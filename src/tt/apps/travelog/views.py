@@ -18,6 +18,7 @@ from .mixins import TravelogViewMixin
 from .services import (
     ContentResolutionService,
     TravelogImageCacheService,
+    TravelogPageCacheService,
     TravelogPublicListBuilder,
     DayPageBuilder,
     TocPageBuilder,
@@ -86,6 +87,17 @@ class TravelogTableOfContentsView(TravelogViewMixin, View):
         content = ContentResolutionService.resolve_content(
             travelog_page_context = travelog_page_context,
         )
+        etag = self.get_travelog_etag( travelog_page_context, content )
+        not_modified_response = self.get_not_modified_response( request, travelog_page_context, etag )
+        if not_modified_response:
+            return not_modified_response
+
+        cached_html = TravelogPageCacheService.get_page(
+            travelog_page_context = travelog_page_context,
+            content = content,
+        )
+        if cached_html is not None:
+            return self.set_cache_validators( HttpResponse( cached_html ), travelog_page_context, etag )
 
         entries = list( content.get_entries().order_by('date') )
         if len(entries) == 1:
@@ -105,7 +117,13 @@ class TravelogTableOfContentsView(TravelogViewMixin, View):
             'is_multi_page': bool( len(entries) > 1 ),
             'journal': travelog_page_context.journal,
         }
-        return render(request, 'travelog/pages/travelog_toc.html', context)
+        response = render(request, 'travelog/pages/travelog_toc.html', context)
+        TravelogPageCacheService.cache_page(
+            travelog_page_context = travelog_page_context,
+            content = content,
+            html = response.content.decode( response.charset ),
+        )
+        return self.set_cache_validators( response, travelog_page_context, etag )
 
 
 class TravelogDayView(TravelogViewMixin, View):
@@ -136,6 +154,19 @@ class TravelogDayView(TravelogViewMixin, View):
         content = ContentResolutionService.resolve_content(
             travelog_page_context = travelog_page_context,
         )
+        etag = self.get_travelog_etag( travelog_page_context, content, date = date.isoformat() )
+        not_modified_response = self.get_not_modified_response( request, travelog_page_context, etag )
+        if not_modified_response:
+            return not_modified_response
+
+        cached_html = TravelogPageCacheService.get_page(
+            travelog_page_context = travelog_page_context,
+            content = content,
+            page_date = date,
+        )
+        if cached_html is not None:
+            return self.set_cache_validators( HttpResponse( cached_html ), travelog_page_context, etag )
+
         entries = list( content.get_entries().order_by('date') )
         day_page = DayPageBuilder.build(
             entries = entries,
@@ -148,7 +179,14 @@ class TravelogDayView(TravelogViewMixin, View):
             'is_multi_page': bool( len(entries) > 1 ),
             'journal': travelog_page_context.journal,
         }
-        return render(request, 'travelog/pages/travelog_day.html', context)
+        response = render(request, 'travelog/pages/travelog_day.html', context)
+        TravelogPageCacheService.cache_page(
+            travelog_page_context = travelog_page_context,
+            content = content,
+            html = response.content.decode( response.charset ),
+            page_date = date,
+        )
+        return self.set_cache_validators( response, travelog_page_context, etag )
 
 
 class TravelogImageGalleryView(TravelogViewMixin, View):
@@ -181,11 +219,17 @@ class TravelogImageGalleryView(TravelogViewMixin, View):
         content = ContentResolutionService.resolve_content(
             travelog_page_context = travelog_page_context,
         )
+        etag = self.get_travelog_etag( travelog_page_context, content, page_num = page_num )
+        not_modified_response = self.get_not_modified_response( request, travelog_page_context, etag )
+        if not_modified_response:
+            return not_modified_response
+
         is_multi_page = bool( content.get_entries().count() > 1 )
         
         # Get cached images (cache already invalidated in mixin if refresh=true)
         all_images = TravelogImageCacheService.get_images(
-            travelog_page_context = travelog_page_context
+            travelog_page_context = travelog_page_context,
+            content = content,
         )
 
         # Compute pagination
@@ -220,7 +264,8 @@ class TravelogImageGalleryView(TravelogViewMixin, View):
             'journal': travelog_page_context.journal,
         }
 
-        return render(request, 'travelog/pages/travelog_image_gallery.html', context)
+        response = render(request, 'travelog/pages/travelog_image_gallery.html', context)
+        return self.set_cache_validators( response, travelog_page_context, etag )
 
 
 class TravelogImageBrowseView(TravelogViewMixin, View):
@@ -252,11 +297,17 @@ class TravelogImageBrowseView(TravelogViewMixin, View):
         content = ContentResolutionService.resolve_content(
             travelog_page_context = travelog_page_context,
         )
+        etag = self.get_travelog_etag( travelog_page_context, content, image_uuid = image_uuid )
+        not_modified_response = self.get_not_modified_response( request, travelog_page_context, etag )
+        if not_modified_response:
+            return not_modified_response
+
         is_multi_page = bool( content.get_entries().count() > 1 )
 
         # Get cached images (cache already invalidated in mixin if refresh=true)
         all_images = TravelogImageCacheService.get_images(
-            travelog_page_context = travelog_page_context
+            travelog_page_context = travelog_page_context,
+            content = content,
         )
 
         # Find current image and calculate navigation
@@ -298,7 +349,8 @@ class TravelogImageBrowseView(TravelogViewMixin, View):
             'journal': travelog_page_context.journal,
         }
 
-        return render(request, 'travelog/pages/travelog_image_browse.html', context)
+        response = render(request, 'travelog/pages/travelog_image_browse.html', context)
+        return self.set_cache_validators( response, travelog_page_context, etag )
 
 
 class TravelogPasswordEntryView(TravelogViewMixin, View):
@@ -5,10 +5,10 @@ from django.contrib.auth import get_user_model
 from django.core.exceptions import BadRequest, PermissionDenied
 from django.http import Http404, HttpRequest
 
+from tt.apps.members.member_resolver import TripMemberResolver
 from tt.apps.members.models import TripMember
 
 from .enums import TripPermissionLevel
-from .models import Trip
 
 User = get_user_model()
 
@@ -35,13 +35,13 @@ class TripViewMixin:
             except ValueError:
                 raise BadRequest( 'Invalid UUID format' )
 
-        try:
-            trip = Trip.objects.get( uuid = trip_uuid )
-            return TripMember.objects.get( trip = trip, user = request.user )
-        except Trip.DoesNotExist:
-            raise Http404()
-        except TripMember.DoesNotExist:
+        trip_member = TripMemberResolver.get_member_by_trip_uuid(
+            request = request,
+            trip_uuid = trip_uuid,
+        )
+        if not trip_member:
             raise Http404()
+        return trip_member
 
     def assert_has_permission( self,
                                trip_member     : TripMember,
@@ -1,5 +1,6 @@
 from django.db import models
 
+from tt.apps.api.enums import SyncObjectType
 from tt.apps.api.models import SyncableModel
 from tt.apps.common.model_fields import LabeledEnumField
 
@@ -20,6 +21,9 @@ class Trip( SyncableModel ):
     """
     objects = managers.TripManager()
 
+    SYNC_OBJECT_TYPE = SyncObjectType.TRIP
+    SYNC_TRIP_UUID_FIELD = 'uuid'
+
     title = models.CharField(
         max_length = 200,
     )
@@ -53,6 +57,9 @@ class Trip( SyncableModel ):
     def __repr__(self):
         return f'{self.title} [{self.pk}]'
 
+    def get_sync_trip_uuid(self):
+        return self.uuid
+
     def __str__(self):
         return f'{self.title} [{self.pk}]'
 
@@ -141,6 +141,7 @@ MIDDLEWARE = [
     'tt.middleware.ExceptionMiddleware',
     'tt.middleware.ViewMiddleware',
     'tt.apps.user.middleware.AuthenticationMiddleware',
+    'tt.apps.common.middleware.RateLimitHeadersMiddleware',
 ]
 
 ROOT_URLCONF = 'tt.urls'
@@ -236,6 +237,19 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 MEDIA_ROOT = ENV.MEDIA_ROOT
 MEDIA_URL = '/media/'
 
+# Image upload processing (see tt.apps.images.upload_queue).  'worker_pool'
+# processes uploads in background worker processes; 'local' processes them
+# in the request, for tests and debugging.
+IMAGE_UPLOAD_QUEUE = 'worker_pool'
+IMAGE_UPLOAD_SPOOL_DIR = None  # None = FILE_UPLOAD_TEMP_DIR or the system default
+
+# Image worker processes (see tt.apps.images.workers), shared by the upload
+# queue and by multi-file batches processed in the request.
+IMAGE_BATCH_PROCESS_POOL = True  # Fan multi-file batches out to the workers
+IMAGE_UPLOAD_WORKERS = None  # None = one per CPU, up to 4
+IMAGE_WORKER_MAX_MEMORY_MB = None  # Address space cap per worker, None = no cap
+IMAGE_WORKER_MAX_TASKS = 200  # Images per worker before it is replaced
+
 PIPELINE = {
     'DISABLE_WRAPPER': True,  # Important since some scripts assume global scope
 
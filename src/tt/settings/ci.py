@@ -20,6 +20,10 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 # Suppress background monitoring tasks during tests
 SUPPRESS_MONITORS = True
 
+# Process image uploads in the request rather than in worker processes
+IMAGE_UPLOAD_QUEUE = 'local'
+IMAGE_BATCH_PROCESS_POOL = False
+
 # Minimal logging for cleaner test output
 LOGGING = {
     'version': 1,
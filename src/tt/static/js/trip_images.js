@@ -16,6 +16,7 @@
  *     uploadedGridSelector: '#my-grid',           // Optional: uploaded images display
  *     uploadedCountSelector: '#my-uploaded',      // Optional: total uploaded count
  *     uploadEndpoint: '/custom/upload/',          // Optional: defaults to current URL
+ *     uploadStatusEndpoint: '/images/uploads/status', // Optional: polled for queued uploads
  *     maxFiles: 10,                               // Optional: defaults to no limit
  *     onSuccess: function(result) { ... },        // Optional: per-file success callback
  *     onError: function(error) { ... },           // Optional: per-file error callback
@@ -135,6 +136,7 @@
         uploadedGridSelector: null,
         uploadedCountSelector: null,
         uploadEndpoint: null,  // null = use current URL
+        uploadStatusEndpoint: null,  // Polled for uploads the server is still processing
         maxFiles: null,  // null = no limit
         onSuccess: null,  // Callback: function(results) { }
         onError: null,    // Callback: function(error) { }
@@ -143,6 +145,8 @@
 
     // Global timeout constant
     var UPLOAD_TIMEOUT_MS = 120000; // 2 minutes per file
+    var STATUS_POLL_INTERVAL_MS = 1000;
+    var PROCESSING_TIMEOUT_MS = 600000; // 10 minutes, matches server-side stale job limit
 
     /**
      * Create a configurable image upload component
@@ -170,6 +174,8 @@
         var currentXhr = null;       // Reference to current AJAX request for abort
         var currentTimeoutId = null; // Reference to current timeout for cleanup
         var isCancelled = false;     // Flag to stop queue processing
+        var pendingUploads = {};     // upload_uuid -> queued item the server is still processing
+        var statusPollTimeoutId = null;
 
         // DOM element cache
         var $uploadZone;
@@ -394,22 +400,10 @@
                 return;
             }
 
-            // Check if all files are processed
+            // Check if all files are uploaded
             if (currentUploadIndex >= uploadQueue.length) {
                 isUploading = false;
-                hideCancelButton();
-
-                // Call onComplete callback if provided
-                if (settings.onComplete && typeof settings.onComplete === 'function') {
-                    var allResults = uploadQueue.map(function(item) {
-                        return {
-                            file: item.file,
-                            status: item.status,
-                            result: item.result
-                        };
-                    });
-                    settings.onComplete(allResults);
-                }
+                completeIfDone();
                 return;
             }
 
@@ -503,6 +497,30 @@
             // Get the first (and only) file result
             var fileResult = data.files[0];
 
+            if (fileResult.status === 'pending' || fileResult.status === 'processing') {
+                // Server queued the image for processing: poll for the outcome
+                updateFileStatus(fileItem.id, 'processing', 'Processing...', 100);
+                uploadQueue[index].status = 'processing';
+                pendingUploads[fileResult.upload_uuid] = {
+                    fileItem: fileItem,
+                    index: index,
+                    startTime: Date.now()
+                };
+                scheduleStatusPoll();
+            } else {
+                applyFileResult(fileItem, index, fileResult);
+            }
+
+            // Move to next file
+            currentUploadIndex++;
+            isUploading = false;
+            uploadNextFile();
+        }
+
+        /**
+         * Apply the final (success or error) result for a file
+         */
+        function applyFileResult(fileItem, index, fileResult) {
             if (fileResult.status === 'success') {
                 completedCount++;
                 var details = buildSuccessDetails(fileResult);
@@ -539,11 +557,109 @@
 
             updateProgressCount();
             updateUploadedCount();
+        }
 
-            // Move to next file
-            currentUploadIndex++;
-            isUploading = false;
-            uploadNextFile();
+        /**
+         * Poll the status endpoint for uploads the server is still processing
+         */
+        function scheduleStatusPoll() {
+            if (statusPollTimeoutId || isCancelled) {
+                return;
+            }
+            statusPollTimeoutId = setTimeout(pollPendingUploads, STATUS_POLL_INTERVAL_MS);
+        }
+
+        function pollPendingUploads() {
+            statusPollTimeoutId = null;
+            var uploadUuids = Object.keys(pendingUploads);
+            if (isCancelled || uploadUuids.length === 0) {
+                return;
+            }
+
+            if (!settings.uploadStatusEndpoint) {
+                console.error('createImageUpload: uploadStatusEndpoint is required for queued uploads');
+                failPendingUploads(uploadUuids, 'Upload status unavailable');
+                return;
+            }
+
+            $.ajax({
+                url: settings.uploadStatusEndpoint,
+                type: 'GET',
+                data: { uuids: uploadUuids.join(',') },
+                headers: {
+                    'X-Requested-With': 'XMLHttpRequest'
+                },
+                timeout: UPLOAD_TIMEOUT_MS,
+                success: function(data) {
+                    if (isCancelled) {
+                        return;
+                    }
+                    (data.files || []).forEach(function(fileResult) {
+                        var pending = pendingUploads[fileResult.upload_uuid];
+                        if (!pending) return;
+                        if (fileResult.status === 'success' || fileResult.status === 'error') {
+                            delete pendingUploads[fileResult.upload_uuid];
+                            applyFileResult(pending.fileItem, pending.index, fileResult);
+                        }
+                    });
+                    afterStatusPoll();
+                },
+                error: function(xhr, textStatus, errorThrown) {
+                    // Transient failures are retried until the processing timeout
+                    console.warn('Upload status poll failed:', textStatus, errorThrown);
+                    afterStatusPoll();
+                }
+            });
+        }
+
+        function afterStatusPoll() {
+            var now = Date.now();
+            var timedOutUuids = Object.keys(pendingUploads).filter(function(uploadUuid) {
+                return now - pendingUploads[uploadUuid].startTime > PROCESSING_TIMEOUT_MS;
+            });
+            failPendingUploads(timedOutUuids, 'Processing timed out - please try again');
+
+            if (Object.keys(pendingUploads).length > 0) {
+                scheduleStatusPoll();
+            } else {
+                completeIfDone();
+            }
+        }
+
+        function failPendingUploads(uploadUuids, errorMsg) {
+            uploadUuids.forEach(function(uploadUuid) {
+                var pending = pendingUploads[uploadUuid];
+                delete pendingUploads[uploadUuid];
+                applyFileResult(pending.fileItem, pending.index, {
+                    status: 'error',
+                    error_message: errorMsg
+                });
+            });
+        }
+
+        /**
+         * Finish the batch once every file is uploaded and processed
+         */
+        function completeIfDone() {
+            if (isCancelled || isUploading || currentUploadIndex < uploadQueue.length) {
+                return;
+            }
+            if (Object.keys(pendingUploads).length > 0) {
+                return;
+            }
+            hideCancelButton();
+
+            // Call onComplete callback if provided
+            if (settings.onComplete && typeof settings.onComplete === 'function') {
+                var allResults = uploadQueue.map(function(item) {
+                    return {
+                        file: item.file,
+                        status: item.status,
+                        result: item.result
+                    };
+                });
+                settings.onComplete(allResults);
+            }
         }
 
         /**
@@ -769,6 +885,19 @@
                 currentTimeoutId = null;
             }
 
+            // Stop polling; the server still finishes images it already received
+            if (statusPollTimeoutId) {
+                clearTimeout(statusPollTimeoutId);
+                statusPollTimeoutId = null;
+            }
+            Object.keys(pendingUploads).forEach(function(uploadUuid) {
+                var pending = pendingUploads[uploadUuid];
+                uploadQueue[pending.index].status = 'cancelled';
+                updateFileStatus(pending.fileItem.id, 'cancelled', 'Cancelled', null,
+                                 'Stopped waiting - the image may still be added');
+            });
+            pendingUploads = {};
+
             // Mark all remaining queued files as cancelled
             for (var i = currentUploadIndex; i < uploadQueue.length; i++) {
                 var fileItem = uploadQueue[i];
@@ -825,7 +954,7 @@
         // Return public API
         return {
             cancel: cancelAllUploads,
-            isUploading: function() { return isUploading; }
+            isUploading: function() { return isUploading || Object.keys(pendingUploads).length > 0; }
         };
     }
 